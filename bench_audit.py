@@ -0,0 +1,210 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+K-MUDANG 일관성 감사기 확장성 벤치마크 v1.0
+사용법: python bench_audit.py [--scales 1,10,100] [--out bench_report.json]
+                              [--baseline 이전_bench_report.json] [--tolerance 0.25] [--memory]
+
+현재 ko/en/jp 번들을 배율별 합성 번들로 키워(<script> 블록 — 일주 DB 항목·신살
+라벨 포함 — 을 복제해 </body> 앞에 추가) 배율마다 별도 프로세스에서
+verify_consistency.py --profile 을 실행하고, 리포트 timings 로 단계별 확장성을 본다.
+--memory 를 주면 단계별 최대 메모리는 따로 한 번 더 (--profile-memory) 재서 붙인다 —
+tracemalloc 부하가 시간 지수를 흐리지 않도록 시간은 추적 없는 실행 값만 쓴다.
+복제본은 원본 뒤에 오므로 감사 결과는 배율과 무관하게 같아야 한다.
+
+단계별 지수 = log(최대 배율 값 / 최소 배율 값) / log(배율 비) — 1 이면 선형.
+· 스캔 크기 지수는 결정적이라 1 + tolerance 를 넘으면 바로 초선형 판정
+· 시간 지수는 잡음이 있어 최대 배율 시간이 TIME_FLOOR_MS 이상일 때만 판정
+--baseline 을 주면 이전 실행보다 지수가 tolerance 이상 오른 단계도 회귀로 본다.
+"""
+
+import os, sys, json, math, argparse, subprocess, tempfile
+
+from verify_consistency import SCRIPT_BLOCK_RE
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+BUNDLES = {'ko': 'ko.html', 'en': 'en.html', 'jp': 'jp.html'}
+TIME_FLOOR_MS = 50.0
+
+
+# ── 합성 번들 ─────────────────────────────────────────────────────────────────
+
+def synthesize(html, scale):
+    """원본 번들을 scale 배 크기로 — 스크립트 블록 묶음을 목표 크기가 될 때까지 반복 추가"""
+    if scale <= 1:
+        return html
+    payload = '\n'.join(m.group(0) for m in SCRIPT_BLOCK_RE.finditer(html))
+    if not payload:
+        raise ValueError('<script> 블록이 없는 번들')
+    copies = math.ceil((scale - 1) * len(html) / len(payload))
+    at = html.rfind('</body>')
+    at = len(html) if at < 0 else at
+    return html[:at] + ('\n' + payload) * copies + '\n' + html[at:]
+
+
+# ── 실행 ──────────────────────────────────────────────────────────────────────
+
+def run_scale(scale, sources, pages_dir, workdir, memory=False):
+    """배율 1개: 합성 번들 저장 → --profile 감사 실행 → (리포트, 번들 크기 합)"""
+    paths = []
+    size = 0
+    for lang, html in sources.items():
+        path = os.path.join(workdir, BUNDLES[lang])
+        text = synthesize(html, scale)
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write(text)
+        paths.append(path)
+        size += len(text)
+    cmd = [sys.executable, os.path.join(HERE, 'verify_consistency.py'), *paths,
+           '--profile-memory' if memory else '--profile', '--no-cache', '--jobs', '1']
+    cmd += ['--pages', pages_dir] if pages_dir else ['--no-pages']
+    proc = subprocess.run(cmd, cwd=workdir, capture_output=True, text=True, encoding='utf-8')
+    report_path = os.path.join(workdir, 'audit_report.json')
+    if not os.path.exists(report_path):
+        raise RuntimeError(f'{scale}× 감사 실패 (rc={proc.returncode}):\n{proc.stdout[-2000:]}{proc.stderr[-2000:]}')
+    with open(report_path, encoding='utf-8') as f:
+        report = json.load(f)
+    os.remove(report_path)
+    return report, size
+
+
+def _exponent(lo, hi, ratio):
+    if lo <= 0 or hi <= 0:
+        return None
+    return round(math.log(hi / lo) / math.log(ratio), 3)
+
+
+def analyse(runs, tolerance, baseline=None):
+    """배율별 timings → 단계별 확장성 표 + 경고 목록"""
+    scales = sorted(runs)
+    lo, hi = scales[0], scales[-1]
+    ratio = runs[hi]['size'] / runs[lo]['size']
+    steps = {}
+    for scale in scales:
+        for record in runs[scale]['timings']['steps']:
+            entry = steps.setdefault(record['step'], {'wall_ms': {}, 'cpu_ms': {}, 'peak_kb': {}, 'scan_size': {}})
+            entry['wall_ms'][scale] = record['wall_ms']
+            entry['cpu_ms'][scale] = record['cpu_ms']
+            entry['peak_kb'][scale] = record['peak_kb']
+            entry['scan_size'][scale] = sum(e['size'] for e in record['scans'].values())
+    warnings = []
+    base_steps = (baseline or {}).get('steps', {})
+    for name, entry in steps.items():
+        if lo not in entry['wall_ms'] or hi not in entry['wall_ms']:
+            continue
+        entry['time_exponent'] = _exponent(entry['wall_ms'][lo], entry['wall_ms'][hi], ratio)
+        entry['size_exponent'] = _exponent(entry['scan_size'][lo], entry['scan_size'][hi], ratio)
+        if entry['size_exponent'] is not None and entry['size_exponent'] > 1 + tolerance:
+            warnings.append(f"{name}: 스캔 크기 초선형 (지수 {entry['size_exponent']})")
+        if (entry['time_exponent'] is not None and entry['time_exponent'] > 1 + tolerance
+                and entry['wall_ms'][hi] >= TIME_FLOOR_MS):
+            warnings.append(f"{name}: 시간 초선형 (지수 {entry['time_exponent']}, {entry['wall_ms'][hi]:.0f}ms)")
+        prev = base_steps.get(name, {})
+        for key, label in (('size_exponent', '스캔 크기'), ('time_exponent', '시간')):
+            if entry[key] is None or prev.get(key) is None:
+                continue
+            if entry[key] - prev[key] > tolerance and (key == 'size_exponent' or entry['wall_ms'][hi] >= TIME_FLOOR_MS):
+                warnings.append(f"{name}: {label} 지수 회귀 {prev[key]} → {entry[key]}")
+    summaries = {scale: runs[scale]['summary'] for scale in scales}
+    if any(s != summaries[lo] for s in summaries.values()):
+        warnings.append(f"배율에 따라 감사 결과가 달라짐: {summaries}")
+    return steps, warnings
+
+
+def _fmt_size(n):
+    for unit, div in (('M', 1e6), ('k', 1e3)):
+        if n >= div:
+            return f'{n / div:.1f}{unit}'
+    return str(int(n))
+
+
+def print_table(runs, steps):
+    scales = sorted(runs)
+    print("\n" + "="*70)
+    print("📈 단계별 확장성 (벽시계 ms, 괄호 = 스캔 크기)")
+    print("="*70)
+    print(f"  {'단계':<34}" + ''.join(f"{f'{s}×':>18}" for s in scales) + f"{'시간지수':>10}{'크기지수':>10}")
+    for name, entry in steps.items():
+        cells = ''.join(f"{entry['wall_ms'].get(s, 0):>10.1f}({_fmt_size(entry['scan_size'].get(s, 0)):>6})" for s in scales)
+        t, z = entry.get('time_exponent'), entry.get('size_exponent')
+        print(f"  {name:<34}{cells}{t if t is not None else '-':>10}{z if z is not None else '-':>10}")
+    for s in scales:
+        total = runs[s]['timings']['total']
+        print(f"  {s:>4}× 입력 {runs[s]['size'] // 1024}KB → 합계 {total['wall_ms']:.0f}ms, "
+              f"최대 RSS {total['max_rss_kb']}KB")
+
+
+# ── 진입점 ──────────────────────────────────────────────────────────────────
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='K-MUDANG 감사기 확장성 벤치마크')
+    parser.add_argument('--scales', default='1,10,100', help='번들 배율 목록 (쉼표 구분, 기본 1,10,100)')
+    parser.add_argument('--dir', default=HERE, help='원본 번들·archetype-pages 가 있는 디렉터리')
+    parser.add_argument('--out', default='bench_report.json', help='결과 저장 경로')
+    parser.add_argument('--baseline', default=None, help='비교할 이전 bench_report.json')
+    parser.add_argument('--tolerance', type=float, default=0.25, help='허용 지수 초과폭 (기본 0.25)')
+    parser.add_argument('--memory', action='store_true',
+                        help='배율마다 tracemalloc 실행을 한 번 더 해 단계별 최대 메모리도 기록')
+    args = parser.parse_args()
+
+    try:
+        scales = sorted({int(s) for s in args.scales.split(',') if s.strip()})
+    except ValueError:
+        parser.error(f'--scales 형식 오류: {args.scales}')
+    if len(scales) < 2 or scales[0] < 1:
+        parser.error('--scales 에는 1 이상의 서로 다른 배율이 2개 이상 필요')
+
+    sources = {}
+    for lang, name in BUNDLES.items():
+        path = os.path.join(args.dir, name)
+        if not os.path.exists(path):
+            print(f"❌ 파일 없음: {path}")
+            sys.exit(1)
+        with open(path, encoding='utf-8') as f:
+            sources[lang] = f.read()
+    pages_dir = os.path.join(os.path.abspath(args.dir), 'archetype-pages')
+    pages_dir = pages_dir if os.path.isdir(pages_dir) else None
+
+    baseline = None
+    if args.baseline:
+        with open(args.baseline, encoding='utf-8') as f:
+            baseline = json.load(f)
+
+    runs = {}
+    with tempfile.TemporaryDirectory(prefix='kmudang-bench-') as workdir:
+        for scale in scales:
+            print(f"🔍 {scale}× 합성 번들 감사 중...", flush=True)
+            try:
+                report, size = run_scale(scale, sources, pages_dir, workdir)
+                if args.memory:
+                    traced, _ = run_scale(scale, sources, pages_dir, workdir, memory=True)
+                    peaks = {r['step']: r['peak_kb'] for r in traced['timings']['steps']}
+                    for record in report['timings']['steps']:
+                        record['peak_kb'] = peaks.get(record['step'])
+                    report['timings']['total']['peak_kb'] = traced['timings']['total']['peak_kb']
+            except (RuntimeError, ValueError) as e:
+                print(f"❌ {e}")
+                sys.exit(1)
+            runs[scale] = {'size': size, 'summary': report['summary'], 'timings': report['timings']}
+            print(f"  ✅ 입력 {size // 1024}KB · {report['timings']['total']['wall_ms']:.0f}ms")
+
+    steps, warnings = analyse(runs, args.tolerance, baseline)
+    print_table(runs, steps)
+
+    result = {
+        'scales': scales,
+        'tolerance': args.tolerance,
+        'runs': {str(s): runs[s] for s in scales},
+        'steps': {name: {k: ({str(s): v for s, v in val.items()} if isinstance(val, dict) else val)
+                         for k, val in entry.items()} for name, entry in steps.items()},
+        'warnings': warnings,
+    }
+    with open(args.out, 'w', encoding='utf-8') as f:
+        json.dump(result, f, ensure_ascii=False, indent=2)
+    print(f"\n✅ {args.out} 저장 완료")
+
+    if warnings:
+        print(f"\n❌ 확장성 경고 {len(warnings)}건:")
+        for w in warnings:
+            print(f"  - {w}")
+        sys.exit(1)
+    print("✅ 모든 단계 선형 이내")
@@ -0,0 +1,219 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+K-MUDANG 명식 서비스 부하 테스트 v1.0
+사용법: python bench_chart_service.py [--charts 10000] [--batch 500] [--concurrency 4]
+                                      [--passes 2] [--seed 7] [--url http://127.0.0.1:8765]
+                                      [--min-rate 0] [--out chart_bench.json]
+
+--url 이 없으면 chart_service.py 를 빈 포트의 하위 프로세스로 띄워 오프라인으로 잰다.
+고정 시드의 무작위 출생 정보(1940~2010년, 약 10% 시주 모름, 성별 무작위)를 --batch 건씩
+POST /charts 로 보내고, --concurrency 개의 keep-alive 연결이 요청을 나눠 든다.
+같은 출생 목록을 --passes 번 반복하므로 1회차는 빈 캐시, 이후는 데운 캐시 처리량이다.
+회차마다 초당 명식 수·요청 지연(p50/p95/p99)과, /stats 차이로 본 단계별 캐시 적중률을 낸다.
+--charts 기본값은 chart_engine.CACHE_SIZES 의 4주 전체 단계(strength·gods·format, 16,384건)보다
+작게 둔다 — 이보다 크면 2회차도 LRU 가 밀려나 데운 캐시가 아니라 캐시 교체 비용을 재게 된다.
+--min-rate: 마지막 회차 초당 명식 수가 이보다 낮으면 종료 코드 1
+"""
+
+import os, sys, json, time, random, socket, asyncio, argparse, subprocess
+from urllib.parse import urlsplit
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+STARTUP_TIMEOUT = 60.0
+
+
+# ── 입력 ────────────────────────────────────────────────────────────────────
+
+def random_births(n, seed):
+    rng = random.Random(seed)
+    births = []
+    for _ in range(n):
+        y, m = rng.randint(1940, 2010), rng.randint(1, 12)
+        d = rng.randint(1, 28 if m == 2 else 30)
+        births.append({'year': y, 'month': m, 'day': d,
+                       'siji': -1 if rng.random() < 0.1 else rng.randint(0, 11),
+                       'gender': rng.choice('mf')})
+    return births
+
+
+# ── HTTP 클라이언트 (keep-alive) ─────────────────────────────────────────────
+
+class Connection:
+    def __init__(self, host, port):
+        self.host, self.port = host, port
+        self.reader = self.writer = None
+
+    async def request(self, method, path, body=b''):
+        """→ (상태, 본문 바이트)"""
+        if self.writer is None:
+            self.reader, self.writer = await asyncio.open_connection(self.host, self.port)
+        self.writer.write(f'{method} {path} HTTP/1.1\r\nHost: {self.host}\r\n'
+                          f'Content-Type: application/json\r\nContent-Length: {len(body)}\r\n\r\n'
+                          .encode('latin-1') + body)
+        await self.writer.drain()
+        head = await self.reader.readuntil(b'\r\n\r\n')
+        lines = head.decode('latin-1').split('\r\n')
+        status = int(lines[0].split()[1])
+        headers = {k.strip().lower(): v.strip() for k, _, v in (line.partition(':') for line in lines[1:] if line)}
+        data = await self.reader.readexactly(int(headers.get('content-length', '0')))
+        if headers.get('connection', '').lower() == 'close':
+            await self.close()
+        return status, data
+
+    async def close(self):
+        if self.writer is not None:
+            self.writer.close()
+            self.reader = self.writer = None
+
+
+async def get_json(host, port, path):
+    conn = Connection(host, port)
+    try:
+        status, data = await conn.request('GET', path)
+    finally:
+        await conn.close()
+    if status != 200:
+        raise RuntimeError(f'GET {path} → {status}: {data[:200]!r}')
+    return json.loads(data)
+
+
+async def run_pass(host, port, bodies, concurrency):
+    """요청 본문 목록을 concurrency 개 연결로 나눠 전송 → (걸린 초, 요청별 지연 초, 받은 명식 수)"""
+    queue = list(reversed(bodies))
+    latencies, received = [], [0]
+
+    async def worker():
+        conn = Connection(host, port)
+        try:
+            while queue:
+                body = queue.pop()
+                t0 = time.perf_counter()
+                status, data = await conn.request('POST', '/charts', body)
+                latencies.append(time.perf_counter() - t0)
+                if status != 200:
+                    raise RuntimeError(f'POST /charts → {status}: {data[:200]!r}')
+                received[0] += json.loads(data)['count']
+        finally:
+            await conn.close()
+
+    t0 = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return time.perf_counter() - t0, latencies, received[0]
+
+
+def percentile(values, q):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(q * len(values)))] if values else 0.0
+
+
+def cache_delta(before, after):
+    """/stats caches 두 시점 → 단계별 {hits, misses, hit_rate} (구간 값)"""
+    out = {}
+    for name, cur in after['caches'].items():
+        prev = before['caches'].get(name, {'hits': 0, 'misses': 0})
+        hits, misses = cur['hits'] - prev['hits'], cur['misses'] - prev['misses']
+        out[name] = {'hits': hits, 'misses': misses,
+                     'hit_rate': round(hits / (hits + misses), 4) if hits + misses else None}
+    return out
+
+
+def effective_hits(caches):
+    """단계별 실제 적중률 — JSON 조각 캐시가 있는 단계는 조각 캐시 값 (단계 캐시는 조각 미스 때만 불림)"""
+    return {name: caches.get(name + ':json', c) for name, c in caches.items()
+            if ':' not in name and caches.get(name + ':json', c)['hit_rate'] is not None}
+
+
+# ── 서비스 기동 ──────────────────────────────────────────────────────────────
+
+def free_port():
+    with socket.socket() as s:
+        s.bind(('127.0.0.1', 0))
+        return s.getsockname()[1]
+
+
+async def wait_ready(host, port, proc):
+    deadline = time.time() + STARTUP_TIMEOUT
+    while time.time() < deadline:
+        if proc is not None and proc.poll() is not None:
+            raise RuntimeError(f'chart_service.py 가 종료됨 (코드 {proc.returncode})')
+        try:
+            return await get_json(host, port, '/health')
+        except OSError:
+            await asyncio.sleep(0.2)
+    raise RuntimeError(f'{STARTUP_TIMEOUT:.0f}초 안에 서비스가 뜨지 않음')
+
+
+async def bench(args):
+    proc = None
+    if args.url:
+        url = urlsplit(args.url)
+        host, port = url.hostname, url.port or 80
+    else:
+        host, port = '127.0.0.1', free_port()
+        proc = subprocess.Popen([sys.executable, os.path.join(HERE, 'chart_service.py'),
+                                 '--html', args.html, '--host', host, '--port', str(port)],
+                                cwd=HERE, stdout=subprocess.DEVNULL)
+    try:
+        health = await wait_ready(host, port, proc)
+        if health.get('stale'):
+            print(f"⚠️ 서비스 이식 함수 불일치: {', '.join(health['stale'])}")
+        births = random_births(args.charts, args.seed)
+        bodies = [json.dumps({'births': births[i:i + args.batch]}).encode()
+                  for i in range(0, len(births), args.batch)]
+        print(f"🔍 명식 {len(births):,}건 · 요청 {len(bodies)}개 (묶음 {args.batch}) · 연결 {args.concurrency}개")
+        passes = []
+        for n in range(1, args.passes + 1):
+            before = await get_json(host, port, '/stats')
+            elapsed, latencies, received = await run_pass(host, port, bodies, args.concurrency)
+            after = await get_json(host, port, '/stats')
+            if received != len(births):
+                raise RuntimeError(f'받은 명식 {received}건 ≠ 보낸 {len(births)}건')
+            rate = received / elapsed
+            result = {'pass': n, 'charts': received, 'seconds': round(elapsed, 3),
+                      'charts_per_s': round(rate, 1),
+                      'latency_ms': {f'p{q}': round(percentile(latencies, q / 100) * 1000, 1) for q in (50, 95, 99)},
+                      'caches': cache_delta(before, after)}
+            passes.append(result)
+            lat = result['latency_ms']
+            print(f"  {'🧊' if n == 1 else '🔥'} {n}회차: {rate:>9,.0f} 명식/s  ({elapsed:.2f}s, "
+                  f"p50 {lat['p50']}ms · p95 {lat['p95']}ms · p99 {lat['p99']}ms)")
+            print('     적중률 ' + ' · '.join(f"{name} {c['hit_rate']:.0%}"
+                                             for name, c in effective_hits(result['caches']).items()))
+        return passes
+    finally:
+        if proc is not None:
+            proc.terminate()
+            proc.wait()
+
+
+# ── 진입점 ──────────────────────────────────────────────────────────────────
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='K-MUDANG 명식 서비스 부하 테스트')
+    parser.add_argument('--charts', type=int, default=10000,
+                        help='회차당 명식 수 (4주 전체 단계 캐시 16,384건 이하라야 2회차가 데운 캐시)')
+    parser.add_argument('--batch', type=int, default=500, help='요청 1개당 명식 수')
+    parser.add_argument('--concurrency', type=int, default=4, help='동시 연결 수')
+    parser.add_argument('--passes', type=int, default=2, help='같은 입력 반복 횟수 (1회차 = 빈 캐시)')
+    parser.add_argument('--seed', type=int, default=7)
+    parser.add_argument('--html', default='ko.html', help='직접 띄울 때 서비스 번들')
+    parser.add_argument('--url', default=None, help='이미 떠 있는 서비스 주소 (없으면 직접 띄움)')
+    parser.add_argument('--min-rate', type=float, default=0.0, help='마지막 회차 최소 명식/s')
+    parser.add_argument('--out', default=None, help='JSON 리포트 경로')
+    args = parser.parse_args()
+
+    try:
+        passes = asyncio.run(bench(args))
+    except (RuntimeError, OSError) as e:
+        print(f"❌ {e}")
+        sys.exit(1)
+    if args.out:
+        with open(args.out, 'w', encoding='utf-8') as f:
+            json.dump({'charts': args.charts, 'batch': args.batch, 'concurrency': args.concurrency,
+                       'seed': args.seed, 'passes': passes}, f, ensure_ascii=False, indent=2)
+        print(f"📄 리포트 저장: {args.out}")
+    last = passes[-1]['charts_per_s']
+    if last < args.min_rate:
+        print(f"❌ 처리량 {last:,.0f} 명식/s < 기준 {args.min_rate:,.0f}")
+        sys.exit(1)
+    print(f"✅ 처리량 {last:,.0f} 명식/s")
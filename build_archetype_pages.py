@@ -0,0 +1,377 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+K-MUDANG 아키타입 페이지·사이트맵 생성기 v1.0
+사용법: python build_archetype_pages.py [--jobs N] [--force] [--check] [--date YYYY-MM-DD]
+
+archetype_data.json (60갑자 항목 + 오행·천간·지지 이름표) 하나와 templates/ 로
+archetype-pages/ 의 60개 페이지와 index.html, sitemap.xml 을 만든다.
+출력마다 (생성기 코드, 쓰는 템플릿, 실제로 채우는 값) 해시를 키로 archetype-deps.json 에
+기록해 두고, 키가 그대로이고 디스크 파일도 마지막 출력 그대로인 출력은 다시 렌더링하지 않는다.
+다시 렌더링할 출력이 PARALLEL_MIN 개 이상이면 프로세스 풀에서 나눠 만든다.
+내용이 실제로 바뀐 페이지만 lastmod 를 --date(기본: 오늘)로 올리고, sitemap.xml 은 그 lastmod 로 쓴다.
+
+데이터: elements 는 상생 순서(목→화→토→금→수)로 적는다 — 천간·지지 오행 관계 문단(relations)을
+        이 순서에서 계산한다. 출생 연도는 year_range 안의 같은 갑자 해(60년 주기).
+--check: 쓰지 않고, 다시 만들 출력(데이터·템플릿 변경, 수동 수정, 누락)이 있으면 종료 코드 1
+--force: 키와 무관하게 전부 다시 렌더링 (내용이 같으면 파일·lastmod 는 그대로)
+"""
+
+import os, re, sys, json, time, argparse, hashlib
+from datetime import date
+from string import Template
+from concurrent.futures import ProcessPoolExecutor
+
+from gapja import GAPJA, expected_page_file
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+DATA_NAME = 'archetype_data.json'
+TEMPLATE_DIR = 'templates'
+PAGES_DIR = 'archetype-pages'
+SITEMAP_NAME = 'sitemap.xml'
+DEPS_NAME = 'archetype-deps.json'
+DEPS_VERSION = 1
+PARALLEL_MIN = 8  # 이보다 적으면 프로세스 풀 기동 비용이 렌더링보다 큼
+
+# 출력 종류별 템플릿 (templates/ 기준) — 키에 들어가는 의존 템플릿 목록이기도 함
+TEMPLATES = {
+    'page': ('archetype.html',),
+    'index': ('archetype-index.html', 'archetype-group.html', 'archetype-card.html'),
+    'sitemap': ('sitemap.xml', 'sitemap-url.xml'),
+}
+# 천간 오행 → 지지 오행 거리(상생 순서 기준) → relations 문단 키
+RELATION_KINDS = {0: 'same', 1: 'generates', 2: 'controls', 3: 'controlled_by', 4: 'generated_by'}
+
+LASTMOD_RE = re.compile(r'<loc>([^<]+)</loc>\s*<lastmod>([^<]+)</lastmod>')
+
+with open(__file__, 'rb') as _src:
+    # 컨텍스트 계산 규칙이 바뀌면 모든 출력의 키가 바뀜
+    CODE_VERSION = hashlib.sha256(_src.read()).hexdigest()[:16]
+
+
+def _digest(data):
+    if isinstance(data, str):
+        data = data.encode('utf-8')
+    return hashlib.sha256(data).hexdigest()[:16]
+
+
+def _series(items):
+    """['a', 'b', 'c'] → 'a, b, and c'"""
+    if len(items) < 3:
+        return ' and '.join(items)
+    return ', '.join(items[:-1]) + ', and ' + items[-1]
+
+
+# ── 데이터 → 템플릿 컨텍스트 ─────────────────────────────────────────────────
+
+def load_data(path):
+    """archetype_data.json 읽기 + 갑자 순서·페이지 파일명 검증"""
+    with open(path, encoding='utf-8') as f:
+        data = json.load(f)
+    if list(data['archetypes']) != GAPJA:
+        raise ValueError(f'{DATA_NAME}: archetypes 는 60갑자 순서 그대로여야 함')
+    for g in GAPJA:
+        stem, branch = data['stems'].get(g[0]), data['branches'].get(g[1])
+        if not stem or not branch:
+            raise ValueError(f'{DATA_NAME}: {g} 의 천간/지지 항목 없음')
+        for el in (stem['element'], branch['element']):
+            if el not in data['elements']:
+                raise ValueError(f'{DATA_NAME}: {g} 의 오행 {el} 항목 없음')
+        if page_file(data, g) != expected_page_file(g):
+            raise ValueError(f'{DATA_NAME}: {g} 페이지 파일명 {page_file(data, g)} ≠ {expected_page_file(g)}')
+    return data
+
+
+def page_file(data, gapja):
+    return f"{data['stems'][gapja[0]]['color'].lower()}-{data['branches'][gapja[1]]['slug']}.html"
+
+
+def archetype_name(data, gapja):
+    return f"{data['stems'][gapja[0]]['color']} {data['branches'][gapja[1]]['slug'].title()}"
+
+
+def relation_kind(data, stem_element, branch_element):
+    order = list(data['elements'])
+    return RELATION_KINDS[(order.index(branch_element) - order.index(stem_element)) % len(order)]
+
+
+def birth_years(data, gapja):
+    first, last = data['year_range']
+    index = GAPJA.index(gapja)
+    return [y for y in range(first, last + 1) if (y - 4) % 60 == index]
+
+
+def page_context(data, gapja):
+    """아키타입 페이지 1개의 템플릿 값 (키 계산에도 그대로 사용)"""
+    stem, branch = data['stems'][gapja[0]], data['branches'][gapja[1]]
+    element, branch_element = data['elements'][stem['element']], data['elements'][branch['element']]
+    entry = data['archetypes'][gapja]
+    name = archetype_name(data, gapja)
+    palette = element['palette']
+    relation = Template(data['relations'][relation_kind(data, stem['element'], branch['element'])]).substitute(
+        name=name, stem_element=stem['element'], branch_element=branch['element'],
+        stem_trait=element['traits'][0], branch_trait=branch_element['traits'][0],
+        element_traits=_series(element['traits']))
+    return {
+        'site': data['site'], 'url': f"{data['site']}/{PAGES_DIR}/{page_file(data, gapja)}",
+        'gapja': gapja, 'stem': gapja[0], 'branch': gapja[1],
+        'name': name, 'name_ko': f"{stem['color_ko']} {branch['animal_ko']}", 'color': stem['color'],
+        'slug': branch['slug'], 'slug_title': branch['slug'].title(), 'animal': branch['animal'],
+        'persona': entry['persona'], 'nickname': entry['nickname'], 'nickname_lower': entry['nickname'].lower(),
+        'desc': entry['desc'],
+        'element': stem['element'], 'element_hanja': element['hanja'], 'element_emoji': element['emoji'],
+        'branch_element': branch['element'],
+        'primary': palette['primary'], 'accent': palette['accent'], 'bg': palette['bg'], 'text': palette['text'],
+        'gradient_from': palette['gradient'][0], 'gradient_mid': palette['gradient'][1],
+        'gradient_to': palette['gradient'][2],
+        'polarity': data['polarity_labels'][stem['polarity']], 'hours': branch['hours'],
+        'relation': relation,
+        'element_trait': element['traits'][0], 'element_traits': _series(element['traits']),
+        'element_strength': element['strengths'][0], 'element_strength_2': element['strengths'][1],
+        'element_strengths': _series(element['strengths']),
+        'element_shadow': element['shadows'][0], 'element_shadows': _series(element['shadows']),
+        'season': element['season'], 'season_lower': element['season'].lower(), 'organs': element['organs'],
+        'animal_trait': branch['traits'][0], 'animal_trait_2': branch['traits'][1],
+        'animal_trait_last': branch['traits'][-1], 'animal_traits': _series(branch['traits']),
+        'best': branch['best'], 'support': branch['support'], 'trine': ', '.join(branch['trine']),
+        'trine_element': branch['trine_element'], 'clash': branch['clash'],
+        'birth_years': ', '.join(map(str, birth_years(data, gapja))),
+    }
+
+
+def index_context(data):
+    """index.html: 천간 오행별 묶음 (묶음 안은 갑자 순서)"""
+    groups = []
+    for el_name, element in data['elements'].items():
+        cards = []
+        for g in GAPJA:
+            stem, branch = data['stems'][g[0]], data['branches'][g[1]]
+            if stem['element'] != el_name:
+                continue
+            cards.append({
+                'site': data['site'], 'file': page_file(data, g), 'primary': element['palette']['primary'],
+                'slug': branch['slug'], 'animal': branch['animal'], 'name': archetype_name(data, g),
+                'persona': data['archetypes'][g]['persona'], 'gapja': g,
+                'name_ko': f"{stem['color_ko']} {branch['animal_ko']}",
+            })
+        groups.append({'element': el_name, 'element_hanja': element['hanja'], 'element_emoji': element['emoji'],
+                       'cards': cards})
+    return {'site': data['site'], 'groups': groups}
+
+
+def sitemap_context(data, lastmods):
+    """sitemap.xml: 인덱스 + 60개 페이지 (lastmod 는 페이지 단계 결과)"""
+    urls = [{'site': data['site'], 'name': archetype_name(data, g), 'file': page_file(data, g),
+             'lastmod': lastmods[f'{PAGES_DIR}/{page_file(data, g)}']} for g in GAPJA]
+    return {'site': data['site'], 'index_lastmod': lastmods[f'{PAGES_DIR}/index.html'], 'urls': urls}
+
+
+# ── 렌더링 (프로세스 풀 워커에서도 실행) ──────────────────────────────────────
+
+_TEMPLATES = {}
+
+
+def _init_worker(templates):
+    _TEMPLATES.update(templates)
+
+
+def render(kind, context):
+    t = _TEMPLATES
+    if kind == 'page':
+        return Template(t['archetype.html']).substitute(context)
+    if kind == 'index':
+        groups = [Template(t['archetype-group.html']).substitute(
+                      group, cards='\n'.join(Template(t['archetype-card.html']).substitute(c) for c in group['cards']))
+                  for group in context['groups']]
+        return Template(t['archetype-index.html']).substitute(context, groups='\n'.join(groups))
+    if kind == 'sitemap':
+        urls = '\n'.join(Template(t['sitemap-url.xml']).substitute(u) for u in context['urls'])
+        return Template(t['sitemap.xml']).substitute(context, urls=urls)
+    raise ValueError(f'알 수 없는 출력 종류: {kind}')
+
+
+def _render_task(task):
+    return render(*task)
+
+
+def load_templates(template_dir):
+    templates = {}
+    for names in TEMPLATES.values():
+        for name in names:
+            with open(os.path.join(template_dir, name), encoding='utf-8') as f:
+                templates[name] = f.read()
+    return templates
+
+
+# ── 의존성 매니페스트 ────────────────────────────────────────────────────────
+
+def output_key(kind, context, templates):
+    """(코드 버전, 의존 템플릿 내용, 컨텍스트) 해시 — 이 중 하나라도 바뀌면 다시 렌더링"""
+    parts = [CODE_VERSION, kind] + [templates[name] for name in TEMPLATES[kind]]
+    parts.append(json.dumps(context, ensure_ascii=False, sort_keys=True, separators=(',', ':')))
+    return _digest('\0'.join(parts))
+
+
+def load_deps(path):
+    if not os.path.exists(path):
+        return {}
+    with open(path, encoding='utf-8') as f:
+        deps = json.load(f)
+    return deps.get('outputs', {}) if deps.get('version') == DEPS_VERSION else {}
+
+
+def sitemap_lastmods(path, site):
+    """기존 sitemap.xml 의 {출력 상대 경로: lastmod} — 매니페스트가 없을 때 lastmod 를 이어받는 용도"""
+    if not os.path.exists(path):
+        return {}
+    with open(path, encoding='utf-8') as f:
+        text = f.read()
+    prefix = f'{site}/'
+    lastmods = {}
+    for loc, lastmod in LASTMOD_RE.findall(text):
+        if loc.startswith(prefix):
+            rel = loc[len(prefix):]
+            lastmods[rel + 'index.html' if rel.endswith('/') or not rel else rel] = lastmod
+    return lastmods
+
+
+def _read(path):
+    if not os.path.exists(path):
+        return None
+    with open(path, encoding='utf-8') as f:
+        return f.read()
+
+
+# ── 빌드 ──────────────────────────────────────────────────────────────────────
+
+class Builder:
+    def __init__(self, root, jobs=None, force=False, today=None):
+        self.root = root
+        self.jobs = jobs or os.cpu_count() or 1
+        self.force = force
+        self.today = today or date.today().isoformat()
+        self.data = load_data(os.path.join(root, DATA_NAME))
+        self.templates = load_templates(os.path.join(root, TEMPLATE_DIR))
+        _init_worker(self.templates)
+        self.deps_path = os.path.join(root, DEPS_NAME)
+        self.previous = load_deps(self.deps_path)
+        self.fallback_lastmods = sitemap_lastmods(os.path.join(root, SITEMAP_NAME), self.data['site'])
+        self.outputs = {}
+        self.stats = {'reused': 0, 'rendered': 0, 'written': [], 'overwritten': [], 'stale': {}}
+
+    def plan(self, specs):
+        """[(상대 경로, 종류, 컨텍스트)] → 다시 렌더링할 것 [(상대 경로, 종류, 컨텍스트, 키, 디스크 내용)]"""
+        todo = []
+        for rel, kind, context in specs:
+            key = output_key(kind, context, self.templates)
+            prev = self.previous.get(rel)
+            on_disk = _read(os.path.join(self.root, rel))
+            disk_sha = _digest(on_disk) if on_disk is not None else None
+            if on_disk is None:
+                reason = '누락'
+            elif not prev:
+                reason = '매니페스트에 없음'
+            elif disk_sha != prev['sha']:
+                reason = '수동 수정'
+            elif prev['key'] != key:
+                reason = '데이터·템플릿 변경'
+            elif self.force:
+                reason = '--force'
+            else:
+                self.outputs[rel] = prev
+                self.stats['reused'] += 1
+                continue
+            self.stats['stale'][rel] = reason
+            todo.append((rel, kind, context, key, on_disk))
+        return todo
+
+    def run(self, todo, write=True):
+        """렌더링 → 바뀐 것만 쓰기, lastmod 는 내용이 바뀐 출력만 today"""
+        tasks = [(kind, context) for _, kind, context, _, _ in todo]
+        if len(tasks) >= PARALLEL_MIN and self.jobs > 1:
+            workers = min(self.jobs, len(tasks))
+            with ProcessPoolExecutor(workers, initializer=_init_worker, initargs=(self.templates,)) as pool:
+                texts = list(pool.map(_render_task, tasks, chunksize=max(1, len(tasks) // (workers * 4))))
+        else:
+            texts = [_render_task(t) for t in tasks]
+        self.stats['rendered'] += len(texts)
+        for (rel, kind, context, key, on_disk), text in zip(todo, texts):
+            prev = self.previous.get(rel, {})
+            if text == on_disk:
+                lastmod = prev.get('lastmod') or self.fallback_lastmods.get(rel) or self.today
+            else:
+                lastmod = self.today
+                if on_disk is not None and self.stats['stale'][rel] == '수동 수정':
+                    self.stats['overwritten'].append(rel)
+                if write:
+                    path = os.path.join(self.root, rel)
+                    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+                    with open(path, 'w', encoding='utf-8') as f:
+                        f.write(text)
+                self.stats['written'].append(rel)
+            self.outputs[rel] = {'key': key, 'sha': _digest(text), 'lastmod': lastmod}
+
+    def build(self, write=True):
+        data = self.data
+        specs = [(f'{PAGES_DIR}/{page_file(data, g)}', 'page', page_context(data, g)) for g in GAPJA]
+        specs.append((f'{PAGES_DIR}/index.html', 'index', index_context(data)))
+        self.run(self.plan(specs), write)
+        # 사이트맵은 페이지 lastmod 가 정해진 뒤에 (lastmod 가 키에 들어감)
+        lastmods = {rel: entry['lastmod'] for rel, entry in self.outputs.items()}
+        self.run(self.plan([(SITEMAP_NAME, 'sitemap', sitemap_context(data, lastmods))]), write)
+        if write:
+            self.save_deps()
+
+    def save_deps(self):
+        deps = {'version': DEPS_VERSION, 'outputs': dict(sorted(self.outputs.items()))}
+        text = json.dumps(deps, ensure_ascii=False, indent=2) + '\n'
+        if text != _read(self.deps_path):
+            with open(self.deps_path, 'w', encoding='utf-8') as f:
+                f.write(text)
+
+
+# ── 진입점 ──────────────────────────────────────────────────────────────────
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='K-MUDANG 아키타입 페이지·사이트맵 생성')
+    parser.add_argument('--root', default=HERE, help='사이트 루트 (기본: 이 스크립트 위치)')
+    parser.add_argument('--jobs', type=int, default=None, help='렌더링 프로세스 수 (기본: CPU 수)')
+    parser.add_argument('--force', action='store_true', help='키와 무관하게 전부 다시 렌더링')
+    parser.add_argument('--check', action='store_true', help='쓰지 않고 다시 만들 출력이 있는지만 검사')
+    parser.add_argument('--date', default=None, help='바뀐 페이지의 lastmod (기본: 오늘, YYYY-MM-DD)')
+    args = parser.parse_args()
+    if args.date:
+        try:
+            date.fromisoformat(args.date)
+        except ValueError:
+            parser.error(f'--date 형식 오류: {args.date}')
+
+    t0 = time.perf_counter()
+    try:
+        builder = Builder(args.root, args.jobs, args.force, args.date)
+    except (OSError, ValueError, KeyError) as e:
+        print(f"❌ {e}")
+        sys.exit(1)
+
+    if args.check:
+        builder.build(write=False)
+        stale = builder.stats['stale']
+        # 렌더링 결과가 디스크와 같은 출력(매니페스트만 없는 경우)은 최신으로 봄
+        stale = {rel: reason for rel, reason in stale.items() if rel in builder.stats['written']}
+        if stale:
+            print(f"❌ 다시 만들어야 할 출력 {len(stale)}개 — python build_archetype_pages.py 실행 필요")
+            for rel, reason in stale.items():
+                print(f"  🔄 {rel} ({reason})")
+            sys.exit(1)
+        print(f"✅ 출력 {len(builder.outputs)}개 모두 최신")
+        sys.exit(0)
+
+    builder.build()
+    stats = builder.stats
+    elapsed = (time.perf_counter() - t0) * 1000
+    print(f"🔍 출력 {len(builder.outputs)}개: 재사용 {stats['reused']} · 렌더링 {stats['rendered']} "
+          f"· 내용 변경 {len(stats['written'])} ({elapsed:.0f}ms)")
+    for rel in stats['written']:
+        print(f"  🔄 {rel} ({stats['stale'][rel]}) lastmod {builder.outputs[rel]['lastmod']}")
+    for rel in stats['overwritten']:
+        print(f"  ⚠️ {rel}: 수동 수정을 덮어씀 — {DATA_NAME} 나 {TEMPLATE_DIR}/ 를 고치세요")
+    print(f"✅ {DEPS_NAME} 갱신" if stats['rendered'] else "✅ 모두 최신")
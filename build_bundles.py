@@ -0,0 +1,486 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+K-MUDANG 번들 빌드 — 공용 JS 엔진 / 로케일 데이터 팩 분리 v1.1
+사용법: python build_bundles.py ko.html en.html jp.html [--out dist]
+
+세 번들의 인라인 <script> 에서 최상위 함수 선언을 찾아, 모든 번들에서
+바이트 단위로 같은 함수만 내용 해시 이름의 공용 스크립트(engine.<해시>.js)로 옮긴다.
+번들에는 로케일 문자열·표와 언어별로 다른 함수만 남고, 공용 스크립트는
+옮긴 함수를 처음 담고 있던 <script> 바로 앞에서 동기 로드한다 (함수 선언만
+들어 있어 실행 시점 부작용이 없고, 호출 시점에는 이미 정의돼 있다).
+한 번들 안에서 같은 이름이 두 번 선언된 함수(덮어쓰기 순서가 바뀜)와 <head> 스크립트의
+함수는 옮기지 않는다. <out> 의 번들·공용 스크립트를 원본 번들 자리에 함께 배포한다.
+
+결과 화면에서만 쓰는 일주 표(DATA_TABLES)는 로케일별 JSON 데이터 팩으로 빼고, 번들에는
+빈 객체 자리와 작은 로더만 남긴다. 로더는 첫 입력(포인터·키·포커스) 또는 페이지 load 뒤
+유휴 시간에 팩을 받아 같은 객체에 채운다 — 첫 화면 파싱에서 표 리터럴이 빠진다.
+표를 읽는 결과 화면 진입 함수(DATA_ENTRY_POINTS)는 팩을 기다린 뒤 실행되고, 받기에 실패하면
+다음 입력·호출 때 다시 받는다.
+
+출력: <out>/ko.html 등 + engine.<해시>.js + engine-manifest.json (함수별 해시, 페이지별 절감량)
+      + data/<로케일>.<해시>.json + data/manifest.json (표별 항목 수, 원본·빌드 번들 해시)
+함수 해시: sha = 원문 바이트 해시, logic = 문자열·템플릿 리터럴 내용을 가린 토큰열 해시
+(logic 이 같으면 로케일 문구만 다르고 엔진 로직은 같다 — verify_consistency CHECK 11 이 사용)
+"""
+
+import os, re, sys, json, gzip, argparse, hashlib
+
+# 실행 스크립트 블록: src 없고 type 이 없거나 JS 인 것만 (ld+json·외부 스크립트 제외)
+SCRIPT_RE = re.compile(r'<script\b([^>]*)>(.*?)</script>', re.S | re.I)
+JS_TYPES = {'', 'text/javascript', 'application/javascript'}
+ENGINE_PREFIX = 'engine.'
+MANIFEST_NAME = 'engine-manifest.json'
+
+# 데이터 팩 분리 대상: 팩 키 → 번들 변수명 후보 (로케일마다 이름이 다름)
+DATA_TABLES = {
+    'ui': ('ILJU_IMAGE_KR', 'ILJU_IMAGE'),  # UI 일주 캐릭터 (name, emoji, desc)
+    'archetype': ('ARCHETYPE_60',),         # 아키타입 (ko, en, color, pko, pen)
+    'prompt': ('iljuData',),                # getIljuDesc 일주론 (t, d, s)
+}
+DATA_DIR = 'data'
+DATA_MANIFEST_NAME = 'manifest.json'
+DATA_GLOBAL = 'KM_DATA'
+# 팩 표를 읽는 화면의 진입 함수 (사주·궁합 결과, 부적 카드·공유 이미지) — 없는 이름은 건너뜀
+DATA_ENTRY_POINTS = ('analyzeSajuCore', 'analyzeMatchCore', 'updateMatchMyInfo',
+                     'createHighResTalisman', 'generateMatchTalisman')
+DATA_LOADER = """<script>
+const {g} = {{{stubs}}};
+{g}.load = () => {g}.ready || ({g}.ready = fetch('{url}').then(r => {{ if (!r.ok) throw new Error(r.status); return r.json(); }}).then(p => {{ for (const k in p) Object.assign({g}[k], p[k]); }}).catch(e => {{ {g}.ready = null; throw e; }}));
+{g}.wait = async (tries = 3) => {{ for (let i = 1; ; i++) {{ try {{ return await {g}.load(); }} catch (e) {{ if (i >= tries) throw e; await new Promise(r => setTimeout(r, 500 * i)); }} }} }};
+['pointerdown', 'keydown', 'focusin'].forEach(t => addEventListener(t, () => {g}.load().catch(() => {{}}), {{passive: true, capture: true}}));
+addEventListener('load', () => (window.requestIdleCallback || setTimeout)(() => {g}.load().catch(() => {{}})));
+addEventListener('DOMContentLoaded', () => [{entries}].forEach(n => {{ const fn = window[n]; if (typeof fn === 'function') window[n] = async function (...a) {{ await {g}.wait(); return fn.apply(this, a); }}; }}));
+</script>
+"""
+
+
+# ── JS 토크나이저 ────────────────────────────────────────────────────────────
+# 함수 경계·해시 계산에 필요한 만큼만: 문자열/템플릿/정규식 리터럴과 주석을
+# 건너뛰어 괄호 깊이를 정확히 센다. 정규식 '/' 와 나눗셈 '/' 는 직전 토큰으로 구분.
+
+REGEX_AFTER_WORDS = {'return', 'typeof', 'instanceof', 'in', 'of', 'new', 'delete', 'void',
+                     'throw', 'case', 'do', 'else', 'yield', 'await'}
+REGEX_AFTER_PUNCT = set('(,=:[!&|?{};+-*%<>~^')
+TOKEN_RE = re.compile(r"""
+    (?P<skip>\s+|//[^\n]*|/\*.*?(?:\*/|\Z))
+  | (?P<str>'(?:[^'\\\n]|\\.)*'?|"(?:[^"\\\n]|\\.)*"?)
+  | (?P<word>[A-Za-z0-9_$\u0080-\U0010ffff]+)
+  | (?P<punct>===|!==|\*\*=|\.\.\.|<<=|>>=|>>>|&&=|\|\|=|\?\?=
+      |=>|==|!=|<=|>=|&&|\|\||\?\?|\?\.|\+\+|--|[-+*/%&|^]=|<<|>>|\*\*|.)
+""", re.S | re.X)
+REGEX_LITERAL_RE = re.compile(r'/(?:[^/\\\[\n]|\\.|\[(?:[^\]\\\n]|\\.)*\]?)*/?[A-Za-z0-9_$]*')
+TEMPLATE_RE = re.compile(r'(?:[^`\\$]|\\.|\$(?!\{))*(?:`|\$\{|\Z)', re.S)
+
+
+def tokenize(src):
+    """(종류, 시작, 끝) 토큰 목록. 종류: word, str, tmpl(템플릿 문자열 조각), regex, punct
+
+    템플릿 리터럴은 `...${ 까지, }...${ 사이, }...` 조각을 tmpl 로 내보내고
+    ${ } 안의 식은 일반 토큰으로 이어서 읽는다.
+    """
+    tokens = []
+    stack = []  # 여는 괄호 / 'tmpl' (템플릿 치환식 안)
+    i, n = 0, len(src)
+    prev = None  # 직전 토큰 — 원문은 '/' 판정 때만 잘라 봄
+    append = tokens.append
+    token_match, regex_match, template_match = TOKEN_RE.match, REGEX_LITERAL_RE.match, TEMPLATE_RE.match
+    while i < n:
+        c = src[i]
+        if c == '`' or (c == '}' and stack and stack[-1] == 'tmpl'):
+            if c == '}':
+                stack.pop()
+            j = template_match(src, i + 1).end()
+            kind = 'tmpl'
+            if src.endswith('${', i, j):
+                stack.append('tmpl')
+        elif (c == '/' and src[i + 1:i + 2] not in ('/', '*')
+              and (prev is None or (prev[0] == 'punct' and src[prev[1]:prev[2]] in REGEX_AFTER_PUNCT)
+                   or (prev[0] == 'word' and src[prev[1]:prev[2]] in REGEX_AFTER_WORDS))):
+            j = regex_match(src, i).end()
+            kind = 'regex'
+        else:
+            m = token_match(src, i)
+            j, kind = m.end(), m.lastgroup
+            if kind == 'skip':
+                i = j
+                continue
+            if kind == 'punct':
+                if c in '{([':
+                    stack.append(c)
+                elif c in '})]' and stack:
+                    stack.pop()
+        prev = (kind, i, j)
+        append(prev)
+        i = j
+    return tokens
+
+
+def _function_spans(src, tokens):
+    """최상위 함수 선언 → [(이름, 시작, 끝, 첫 토큰, 끝 토큰 다음)] (async 포함, 함수 식·중첩 함수 제외)"""
+    found = []
+    depth = 0
+    stmt_start = True
+    k, n = 0, len(tokens)
+    while k < n:
+        kind, a, b = tokens[k]
+        start = None
+        if depth == 0 and stmt_start and kind == 'word':
+            text = src[a:b]
+            if text == 'function':
+                start = k
+            elif text == 'async' and k + 1 < n and src[tokens[k + 1][1]:tokens[k + 1][2]] == 'function':
+                start, k = k, k + 1
+        if start is not None:
+            j = k + 1
+            if j < n and src[tokens[j][1]:tokens[j][2]] == '*':
+                j += 1
+            name = src[tokens[j][1]:tokens[j][2]] if j < n and tokens[j][0] == 'word' else ''
+            # 매개변수 ( ) 를 지나 본문 { } 의 짝 괄호까지 (괄호는 한 글자 punct 만)
+            level, body = 0, False
+            while j < n:
+                tk, ta, tb = tokens[j]
+                if tk == 'punct' and tb - ta == 1:
+                    t = src[ta]
+                    if t in '([{':
+                        level += 1
+                        body = body or (t == '{' and level == 1)
+                    elif t in ')]}':
+                        level -= 1
+                        if level == 0 and body:
+                            break
+                j += 1
+            if name and j < n:
+                found.append((name, tokens[start][1], tokens[j][2], start, j + 1))
+            k = j + 1
+            stmt_start = True
+            continue
+        if kind == 'punct' and b - a == 1:
+            c = src[a]
+            if c in '{([':
+                depth += 1
+            elif c in '})]':
+                depth -= 1
+            stmt_start = depth == 0 and c in ';}'
+        else:
+            stmt_start = False
+        k += 1
+    return found
+
+
+def top_level_functions(src):
+    """스크립트 최상위 함수 선언 → [(이름, 시작, 끝)]"""
+    return [span[:3] for span in _function_spans(src, tokenize(src))]
+
+
+def logic_digest(src, tokens=None):
+    """문자열·템플릿 리터럴 내용을 가린 토큰열 해시 — 로케일 문구만 다르면 같은 값"""
+    parts = []
+    for kind, a, b in tokenize(src) if tokens is None else tokens:
+        if kind == 'str':
+            parts.append('"')
+        elif kind == 'tmpl':
+            parts.append('`' + ('${' if src.endswith('${', a, b) else ''))
+        else:
+            parts.append(src[a:b])
+    return hashlib.sha256('\x00'.join(parts).encode('utf-8')).hexdigest()[:16]
+
+
+def source_sha(text):
+    """원문 해시 (줄바꿈은 LF 로 맞춤 — 감사기는 번들을 텍스트 모드로 읽는다)"""
+    return hashlib.sha256(text.replace('\r\n', '\n').encode('utf-8')).hexdigest()[:16]
+
+
+def script_functions(script):
+    """인라인 스크립트 본문 1개 → [(이름, 시작, 끝, sha, logic)] (감사기 인덱스가 구간별로 사용)"""
+    tokens = tokenize(script)
+    return [(name, a, b, source_sha(script[a:b]), logic_digest(script, tokens[lo:hi]))
+            for name, a, b, lo, hi in _function_spans(script, tokens)]
+
+
+# ── 데이터 리터럴 ────────────────────────────────────────────────────────────
+
+JS_ESCAPES = {'n': '\n', 't': '\t', 'r': '\r', 'b': '\b', 'f': '\f', 'v': '\v', '0': '\0'}
+JS_ESCAPE_RE = re.compile(r'\\(u\{[0-9a-fA-F]+\}|u[0-9a-fA-F]{4}|x[0-9a-fA-F]{2}|\r\n|[\s\S])')
+NUMBER_RE = re.compile(r'\d+')
+
+
+def js_string(token):
+    """따옴표를 포함한 JS 문자열 토큰 → 값"""
+    def unescape(m):
+        e = m.group(1)
+        if e[0] == 'u' and len(e) > 1:
+            return chr(int(e[1:].strip('{}'), 16))
+        if e[0] == 'x' and len(e) == 3:
+            return chr(int(e[1:], 16))
+        if e in ('\n', '\r\n', '\r', '\u2028', '\u2029'):  # 줄 잇기
+            return ''
+        return JS_ESCAPES.get(e, e)
+    return JS_ESCAPE_RE.sub(unescape, token[1:-1])
+
+
+def js_literal(src, tokens, k=0):
+    """tokens[k] 부터의 JSON 호환 JS 리터럴 → (값, 다음 토큰 번호)
+
+    객체(따옴표 없는 키 허용)·배열·문자열·정수/소수·true/false/null 과 끝 쉼표만 허용하고,
+    식·템플릿 리터럴·변수 참조가 있으면 ValueError — 분리 대상은 순수 데이터 표뿐이다.
+    """
+    def text(i):
+        return src[tokens[i][1]:tokens[i][2]] if i < len(tokens) else ''
+
+    def expect(i, *allowed):
+        if text(i) not in allowed:
+            raise ValueError(f'데이터 리터럴이 아님: {text(i)!r} (위치 {tokens[i][1] if i < len(tokens) else len(src)})')
+
+    def value(i):
+        kind, t = (tokens[i][0] if i < len(tokens) else None), text(i)
+        if kind == 'str':
+            return js_string(t), i + 1
+        if t == '{':
+            obj, i = {}, i + 1
+            while text(i) != '}':
+                if i >= len(tokens) or tokens[i][0] not in ('str', 'word'):
+                    expect(i, '}')
+                key = js_string(text(i)) if tokens[i][0] == 'str' else text(i)
+                expect(i + 1, ':')
+                obj[key], i = value(i + 2)
+                expect(i, ',', '}')
+                i += text(i) == ','
+            return obj, i + 1
+        if t == '[':
+            arr, i = [], i + 1
+            while text(i) != ']':
+                item, i = value(i)
+                arr.append(item)
+                expect(i, ',', ']')
+                i += text(i) == ','
+            return arr, i + 1
+        if t == '-' and NUMBER_RE.fullmatch(text(i + 1)):
+            number, i = value(i + 1)
+            return -number, i
+        if kind == 'word':
+            if t in ('true', 'false', 'null'):
+                return {'true': True, 'false': False, 'null': None}[t], i + 1
+            if NUMBER_RE.fullmatch(t):
+                if text(i + 1) == '.' and NUMBER_RE.fullmatch(text(i + 2)):
+                    return float(f'{t}.{text(i + 2)}'), i + 3
+                return int(t), i + 1
+        expect(i, '{', '[')
+
+    return value(k)
+
+
+# ── 번들 분석 ────────────────────────────────────────────────────────────────
+
+def executable_scripts(html):
+    """실행되는 인라인 스크립트 → [(본문 시작, 본문 끝, <script> 태그 시작)]"""
+    out = []
+    for m in SCRIPT_RE.finditer(html):
+        attrs = m.group(1)
+        type_m = re.search(r'\btype\s*=\s*["\']?([^"\'\s>]+)', attrs, re.I)
+        if re.search(r'\bsrc\s*=', attrs, re.I) or (type_m and type_m.group(1).lower() not in JS_TYPES):
+            continue
+        out.append((m.start(2), m.end(2), m.start()))
+    return out
+
+
+def bundle_functions(html):
+    """번들 최상위 함수 → ({이름: (절대 시작, 끝, 태그 시작)}, 옮기면 안 되는 이름 집합)
+
+    옮기면 안 되는 이름: 번들 안 중복 선언, <head> 스크립트의 함수 (공용 스크립트를
+    <head> 에서 동기 로드하면 첫 화면 렌더링이 요청 1개만큼 늦어진다).
+    """
+    table, pinned = {}, set()
+    head_end = html.find('</head>')
+    for body_start, body_end, tag_start in executable_scripts(html):
+        for name, a, b in top_level_functions(html[body_start:body_end]):
+            if name in table or tag_start < head_end:
+                pinned.add(name)
+            table[name] = (body_start + a, body_start + b, tag_start)
+    return table, pinned
+
+
+def shared_functions(htmls):
+    """모든 번들에서 바이트 단위로 같고 각 번들에 한 번만 선언된 함수 → 첫 번들 선언 순서 이름 목록"""
+    tables = {}
+    for lang, html in htmls.items():
+        table, pinned = bundle_functions(html)
+        tables[lang] = ({k: v for k, v in table.items() if k not in pinned}, html)
+    first = next(iter(tables))
+    names = sorted(tables[first][0], key=lambda k: tables[first][0][k][0])
+    shared = []
+    for name in names:
+        bodies = set()
+        for table, html in tables.values():
+            span = table.get(name)
+            bodies.add(html[span[0]:span[1]] if span else None)
+        if len(bodies) == 1 and None not in bodies:
+            shared.append(name)
+    return shared, {lang: table for lang, (table, _) in tables.items()}
+
+
+def data_tables(html):
+    """데이터 팩 대상 표 → {팩 키: (변수명, 값, 리터럴 절대 시작, 끝, <script> 태그 시작)}
+
+    번들 안에서 두 번 이상 선언된 표(어느 쪽이 쓰일지 호출 위치에 달림)와
+    순수 데이터가 아닌 표는 그대로 둔다.
+    """
+    wanted = {var: key for key, names in DATA_TABLES.items() for var in names}
+    found, seen = {}, {}
+    for body_start, body_end, tag_start in executable_scripts(html):
+        src = html[body_start:body_end]
+        tokens = tokenize(src)
+        for k in range(len(tokens) - 3):
+            if tokens[k][0] != 'word' or src[tokens[k][1]:tokens[k][2]] not in ('const', 'let', 'var'):
+                continue
+            name = src[tokens[k + 1][1]:tokens[k + 1][2]]
+            if name not in wanted or [src[a:b] for _, a, b in tokens[k + 2:k + 4]] != ['=', '{']:
+                continue
+            key = wanted[name]
+            seen[key] = seen.get(key, 0) + 1
+            try:
+                value, end = js_literal(src, tokens, k + 3)
+            except ValueError:
+                continue
+            found.setdefault(key, (name, value, body_start + tokens[k + 3][1], body_start + tokens[end - 1][2], tag_start))
+    return {key: entry for key, entry in found.items() if seen[key] == 1}
+
+
+def _apply_edits(html, edits):
+    """(시작, 끝, 바꿀 문자열) 목록을 원본 좌표 기준으로 한 번에 적용 (시작 == 끝 이면 삽입)"""
+    parts, pos = [], 0
+    for start, end, text in sorted(edits, key=lambda e: (e[0], e[1])):
+        parts.append(html[pos:start])
+        parts.append(text)
+        pos = end
+    parts.append(html[pos:])
+    return ''.join(parts)
+
+
+def _replace_stale(directory, prefix, suffix, keep):
+    """이전 빌드의 내용 해시 파일 정리"""
+    for name in os.listdir(directory):
+        if name.startswith(prefix) and name.endswith(suffix) and name != keep:
+            os.remove(os.path.join(directory, name))
+
+
+def _gz(data):
+    return len(gzip.compress(data, 9, mtime=0))
+
+
+# ── 빌드 ──────────────────────────────────────────────────────────────────────
+
+def build(paths, out_dir):
+    """번들 분리 → (매니페스트 dict). paths: {로케일: 번들 경로}"""
+    htmls = {}
+    for lang, path in paths.items():
+        with open(path, encoding='utf-8', newline='') as f:
+            htmls[lang] = f.read()
+    shared, tables = shared_functions(htmls)
+    packs = {lang: data_tables(html) for lang, html in htmls.items()}
+    # 데이터 표를 품은 함수(getIljuDesc 등)는 빌드 결과가 원본과 달라지므로 공용 엔진에서 제외
+    shared = [n for n in shared
+              if not any(a < tables[lang][n][1] and tables[lang][n][0] < b
+                         for lang in htmls for _, _, a, b, _ in packs[lang].values())]
+    first = next(iter(htmls))
+    sources = {n: htmls[first][tables[first][n][0]:tables[first][n][1]] for n in shared}
+    engine = '\n'.join(sources.values()) + '\n'
+    engine_bytes = engine.encode('utf-8')
+    script_name = f"{ENGINE_PREFIX}{hashlib.sha256(engine_bytes).hexdigest()[:12]}.js"
+
+    data_dir = os.path.join(out_dir, DATA_DIR)
+    os.makedirs(data_dir, exist_ok=True)
+    _replace_stale(out_dir, ENGINE_PREFIX, '.js', script_name)
+    with open(os.path.join(out_dir, script_name), 'wb') as f:
+        f.write(engine_bytes)
+
+    pages, data = {}, {}
+    for lang, html in htmls.items():
+        edits = []
+        spans = [tables[lang][n] for n in shared]
+        for start, end, _ in spans:
+            # 함수 한 줄이 통째로 빠지면 빈 줄도 제거
+            edits.append((start, end + html.startswith('\n', end), ''))
+        if spans:
+            # 옮긴 함수·표는 모두 삽입 위치 <script> 태그 뒤에 있으므로 원본 좌표로 함께 적용
+            edits.append((min(tag for _, _, tag in spans),) * 2 + (f'<script src="{script_name}"></script>\n',))
+        pack = packs[lang]
+        if pack:
+            pack_bytes = json.dumps({key: entry[1] for key, entry in pack.items()},
+                                    ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+            pack_name = f"{lang}.{hashlib.sha256(pack_bytes).hexdigest()[:12]}.json"
+            _replace_stale(data_dir, f'{lang}.', '.json', pack_name)
+            with open(os.path.join(data_dir, pack_name), 'wb') as f:
+                f.write(pack_bytes)
+            for key, (_, _, start, end, _) in pack.items():
+                edits.append((start, end, f'{DATA_GLOBAL}.{key}'))
+            loader = DATA_LOADER.format(g=DATA_GLOBAL, url=f'{DATA_DIR}/{pack_name}',
+                                        stubs=', '.join(f'{key}: {{}}' for key in pack),
+                                        entries=', '.join(f"'{name}'" for name in DATA_ENTRY_POINTS))
+            edits.append((min(entry[4] for entry in pack.values()),) * 2 + (loader,))
+        out = _apply_edits(html, edits)
+        if pack:
+            data[lang] = {
+                'file': pack_name,
+                'bundle': os.path.basename(paths[lang]),
+                'bytes': len(pack_bytes), 'bytes_gz': _gz(pack_bytes),
+                'source_sha': source_sha(html), 'output_sha': source_sha(out),
+                'tables': {key: {'var': entry[0], 'entries': len(entry[1])} for key, entry in pack.items()},
+            }
+        before, after = html.encode('utf-8'), out.encode('utf-8')
+        with open(os.path.join(out_dir, os.path.basename(paths[lang])), 'wb') as f:
+            f.write(after)
+        pages[lang] = {
+            'file': os.path.basename(paths[lang]),
+            'before': len(before), 'after': len(after),
+            'saved': len(before) - len(after),
+            'before_gz': _gz(before), 'after_gz': _gz(after),
+        }
+
+    manifest = {
+        'script': script_name,
+        'bytes': len(engine_bytes),
+        'bytes_gz': _gz(engine_bytes),
+        'functions': {name: {'sha': source_sha(src), 'logic': logic_digest(src)} for name, src in sources.items()},
+        'pages': pages,
+    }
+    with open(os.path.join(out_dir, MANIFEST_NAME), 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, ensure_ascii=False, indent=2)
+    with open(os.path.join(data_dir, DATA_MANIFEST_NAME), 'w', encoding='utf-8') as f:
+        json.dump(data, f, ensure_ascii=False, indent=2)
+    return manifest, data
+
+
+# ── 진입점 ──────────────────────────────────────────────────────────────────
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='K-MUDANG 공용 JS 엔진 분리 빌드')
+    parser.add_argument('bundles', nargs='+', help='번들 HTML (파일명 앞부분 = 로케일, 예: ko.html)')
+    parser.add_argument('--out', default='dist', help='출력 디렉터리 (기본: dist)')
+    args = parser.parse_args()
+
+    paths = {}
+    for path in args.bundles:
+        if not os.path.exists(path):
+            print(f"❌ 파일 없음: {path}")
+            sys.exit(1)
+        paths[os.path.splitext(os.path.basename(path))[0]] = path
+    if len(paths) < 2:
+        parser.error('번들이 2개 이상 필요')
+    if os.path.abspath(args.out) in {os.path.dirname(os.path.abspath(p)) for p in paths.values()}:
+        parser.error('--out 은 원본 번들과 다른 디렉터리여야 함')
+
+    manifest, data = build(paths, args.out)
+    print(f"✅ 공용 엔진: 함수 {len(manifest['functions'])}개 → {args.out}/{manifest['script']} "
+          f"({manifest['bytes'] / 1024:.1f}KB, gzip {manifest['bytes_gz'] / 1024:.1f}KB)")
+    print(f"  {'페이지':<10}{'이전':>12}{'이후':>12}{'절감':>12}{'gzip 절감':>12}")
+    for lang, page in manifest['pages'].items():
+        print(f"  {page['file']:<10}{page['before']:>12,}{page['after']:>12,}{page['saved']:>12,}"
+              f"{page['before_gz'] - page['after_gz']:>12,}")
+    for lang, pack in data.items():
+        counts = ', '.join(f"{t['var']} {t['entries']}" for t in pack['tables'].values())
+        print(f"  📦 {DATA_DIR}/{pack['file']}: {pack['bytes'] / 1024:.1f}KB "
+              f"(gzip {pack['bytes_gz'] / 1024:.1f}KB) — {counts}")
+    saved = sum(p['saved'] for p in manifest['pages'].values())
+    print(f"  → 첫 화면 파싱 기준 페이지당 평균 {saved / len(manifest['pages']) / 1024:.1f}KB 절감 "
+          f"(공용 스크립트 {manifest['bytes'] / 1024:.1f}KB 는 언어 전환 시 캐시 재사용, 데이터 팩은 첫 입력·유휴 시 로드)")
+    print(f"✅ {args.out}/{MANIFEST_NAME}, {args.out}/{DATA_DIR}/{DATA_MANIFEST_NAME} 저장 완료")
@@ -0,0 +1,520 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+K-MUDANG 오늘의 운세 샤드 사전 생성기 v1.0
+사용법: python build_fortune_shards.py [--from 2026-10-18] [--days 365] [--out dist] [--jobs N]
+                                       [--html ko.html en.html jp.html] [--no-verify]
+
+getTodayFortune (한눈 운세 카드) 과 genTodayFortune (오늘의 운세 탭) 의 모든 변형을 날짜 구간 ×
+로케일마다 미리 계산해 <out>/fortune/<로케일>/<YYYY-MM-DD>.json 으로 쓴다.
+두 함수가 날짜에서 쓰는 것은 그날 일진 하나(와 월·일), 명식에서 쓰는 것은 일간과 용신·희신·기신
+오행뿐이다. 그래서 HTML 은 로케일마다 <out>/fortune/<로케일>/template.json 에 한 번만 두고,
+날짜 샤드에는 그날 달라지는 값만 둔다.
+  샤드: gz (일진 60갑자), today.class[용신*25 + 희신*5 + 기신] (대길/길/조심/평온 4분류),
+        daily.bonus[용신*5 + 기신] (용신일/기신일/보통 3분류), values{칸: 값} (월·일 칸)
+  템플릿: today·daily = 문자열 조각과 칸 번호가 번갈아 나오는 목록,
+          slots[칸] = {scope, expr, values} — values 를 읽는 색인은 scope 별로
+            pillar [gz]   god [gz%10*10 + 일간]   state [gz%12*10 + 일간]   class [분류]
+            bonus [분류]   god_bonus [(gz%10*10 + 일간)*3 + 분류]   hours [용신*5 + 기신]
+            date  샤드 values 에 있음
+오행 번호는 EL_ORDER 순서. fill() 이 클라이언트와 같은 방식으로 HTML 을 조립한다.
+
+문구·템플릿은 번들의 함수 본문(객체 리터럴·문자열·템플릿 리터럴)에서 그대로 읽고, 분기 구조만
+이식했다. 세 로케일의 로직 해시(build_bundles.logic_digest)가 이식 당시와 다르면 경고한다.
+쓴 뒤에는 같은 날·같은 변형의 별점이 로케일 간 같은지, 변형을 가르는 문구(등급·조언, 십신 풀이·
+보너스)의 극성이 FORTUNE_POS/FORTUNE_NEG 단어 목록 기준으로 기준 로케일(ko)과 어긋나지
+않는지 검사하고, 어긋나면 종료 코드 1 (--no-verify 로 생략).
+검사할 때는 템플릿 + 샤드로 조립한 HTML 이 직접 렌더링한 것과 같은지도 본다.
+내용이 같은 샤드는 다시 쓰지 않는다. 날짜는 프로세스 풀에서 나눠 렌더링한다.
+출력: <out>/fortune/manifest.json (구간, 로케일별 파일 수·용량, 번들 해시)
+"""
+
+import os, re, sys, json, time, gzip, argparse, hashlib
+from datetime import date, timedelta
+from functools import lru_cache
+from concurrent.futures import ProcessPoolExecutor
+
+from build_bundles import bundle_functions, tokenize, js_string, js_literal, logic_digest, source_sha
+from chart_engine import TEN_GOD_KEYS, load_tables
+from saju_engine import BASE_JDN, _days_scalar
+from taekil_engine import TWELVE_STARTS, UNIX_JDN
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+FORTUNE_DIR = 'fortune'
+MANIFEST_NAME = 'manifest.json'
+TEMPLATE_NAME = 'template.json'
+HTML_DEFAULT = ['ko.html', 'en.html', 'jp.html']
+REFERENCE_LOCALE = 'ko'   # 극성 비교 기준
+FORTUNE_TABLE_NAMES = ('STEM', 'BRANCH', 'ELEMENT', 'EL_ORDER', 'TEN_GODS', 'TWELVE_STATES')
+# 템플릿 변수 → 칸 값 표의 색인 (모듈 설명 참고). date 는 날짜마다 달라 샤드에 둔다
+SLOT_SCOPES = {'dp': 'pillar', 'ELEMENT': 'pillar', 'god': 'god', 'state': 'state',
+               'rating': 'class', 'advice': 'class', 'bonus': 'bonus', 'info': 'god_bonus',
+               'goodH': 'hours', 'badH': 'hours', 'tm': 'date', 'td': 'date'}
+
+# 이식 당시 로직 해시 (문구를 가린 토큰열) — 로케일마다 템플릿 식이 조금씩 달라 여러 개
+PORTED_LOGIC = {
+    'getTodayFortune': ('f2298fdca9dcbd70',),
+    'genTodayFortune': ('df066744924fd6a7', '1e6dc4316b40a30b', '602e8229492325fd'),
+}
+
+# ── 운세 극성 판단 단어 목록 ─────────────────────────────────────────────────
+FORTUNE_NEG = {
+    'ko': ['조심','주의','무리하지','미루','압박','긴장','빠져나가','피하세요','대들'],
+    'en': ['caution','cautious','avoid','postpone','pressure','tense','slip away','alert','overexert','watch out','challenge'],
+    'jp': ['注意','無理せず','延ばし','圧迫','緊張','出ていき','避け','逆らい'],
+}
+FORTUNE_POS = {
+    'ko': ['대길','길(吉)','행운','좋은','순조','인정','최고','도움','여유','맛있','술술','잘 될'],
+    'en': ['great','good','lucky','smooth','recogni','best','help','pleasant','delightful','fortune','go well'],
+    'jp': ['大吉','吉','幸運','良い','順調','認め','最高','助け','ゆったり','美味しい','スラスラ','うまく'],
+}
+
+JOIN_EXPR_RE = re.compile(r"(\w+)\.length\s*\?\s*\1\.join\(('[^']*')\)\s*:\s*('[^']*')")
+REPEAT_EXPR_RE = re.compile(r"('[^']*')\.repeat\((.+)\)")
+SUB_EXPR_RE = re.compile(r"(\d+)\s*-\s*(.+)")
+PATH_EXPR_RE = re.compile(r"(\w+)((?:\.\w+|\[[\w.]+\])*)")
+PATH_STEP_RE = re.compile(r"\.(\w+)|\[([\w.]+)\]")
+ROOT_RE = re.compile(r"[A-Za-z_]\w*")
+
+
+def _digest(data):
+    return hashlib.sha256(data).hexdigest()[:16]
+
+
+def polarity(text, lang):
+    """텍스트의 운세 극성: 'pos' | 'neg' | 'neutral' (verify_consistency 배우자운 극성과 같은 규칙)"""
+    text = text.lower()
+    neg = sum(1 for w in FORTUNE_NEG[lang] if w in text)
+    pos = sum(1 for w in FORTUNE_POS[lang] if w in text)
+    return 'neg' if neg > pos else 'pos' if pos > neg else 'neutral'
+
+
+# ── 함수 본문 → 문구·템플릿 ───────────────────────────────────────────────────
+
+class FunctionSource:
+    """번들 함수 1개의 토큰열에서 리터럴·템플릿을 찾아 읽는다"""
+
+    def __init__(self, html, functions, name):
+        if name not in functions:
+            raise ValueError(f'{name} 함수 없음')
+        start, end, _ = functions[name]
+        self.name, self.src = name, html[start:end]
+        self.tokens = tokenize(self.src)
+        self.logic = logic_digest(self.src, self.tokens)
+
+    def text(self, k):
+        return self.src[self.tokens[k][1]:self.tokens[k][2]] if k < len(self.tokens) else ''
+
+    def _find(self, *seq):
+        """토큰 문자열 시퀀스가 시작하는 위치 목록"""
+        return [k for k in range(len(self.tokens)) if all(self.text(k + i) == t for i, t in enumerate(seq))]
+
+    def literal(self, *seq):
+        """seq 바로 뒤의 데이터 리터럴 (첫 출현)"""
+        found = self._find(*seq)
+        if not found:
+            raise ValueError(f"{self.name}: '{' '.join(seq)}' 없음")
+        return js_literal(self.src, self.tokens, found[0] + len(seq))[0]
+
+    def strings(self, name):
+        """`name = '문자열'` 대입들의 값 (문서 순서)"""
+        return [js_string(self.text(k + 2)) for k in self._find(name, '=')
+                if self.tokens[k + 2][0] == 'str' and self.text(k + 3) in (';', '}')]
+
+    def template(self):
+        """return 뒤 템플릿 리터럴 → [(문자열 조각, 식 원문 | None), ...]"""
+        k = next((k + 1 for k in self._find('return') if self.tokens[k + 1][0] == 'tmpl'), None)
+        if k is None:
+            raise ValueError(f'{self.name}: return 템플릿 없음')
+        parts = []
+        while True:
+            piece = self.text(k)
+            if not piece.endswith('${'):
+                parts.append((js_string(piece), None))
+                return parts
+            j = next(j for j in range(k + 1, len(self.tokens)) if self.tokens[j][0] == 'tmpl')
+            if self.text(j).startswith('`'):
+                raise ValueError(f'{self.name}: 중첩 템플릿은 이식하지 않음')
+            parts.append((js_string(piece[:-1]), self.src[self.tokens[k][2]:self.tokens[j][1]].strip()))
+            k = j
+
+
+@lru_cache(maxsize=None)
+def compile_expr(expr):
+    """템플릿 ${} 식 → env 를 받는 함수 (두 함수에 나오는 형태만):
+    경로, ELEMENT[경로].k, 'x'.repeat(식), 정수 - 식, a.length ? a.join('x') : 'y'"""
+    m = JOIN_EXPR_RE.fullmatch(expr)
+    if m:
+        name, sep, empty = m.group(1), js_string(m.group(2)), js_string(m.group(3))
+        return lambda env: sep.join(env[name]) if env[name] else empty
+    m = REPEAT_EXPR_RE.fullmatch(expr)
+    if m:
+        unit, count = js_string(m.group(1)), compile_expr(m.group(2).strip())
+        return lambda env: unit * max(0, count(env))
+    m = SUB_EXPR_RE.fullmatch(expr)
+    if m:
+        n, rest = int(m.group(1)), compile_expr(m.group(2).strip())
+        return lambda env: n - rest(env)
+    m = PATH_EXPR_RE.fullmatch(expr)
+    if m:
+        name = m.group(1)
+        steps = [(attr, None) if attr else (None, compile_expr(index)) for attr, index in PATH_STEP_RE.findall(m.group(2))]
+
+        def path(env):
+            if name not in env:
+                raise ValueError(f'이식하지 않은 템플릿 변수: {name}')
+            value = env[name]
+            for attr, index in steps:
+                value = value[attr] if attr else value[index(env)]
+            return value
+        return path
+    raise ValueError(f'이식하지 않은 템플릿 식: {expr}')
+
+
+def evaluate(expr, env):
+    return compile_expr(expr)(env)
+
+
+def scope_of(expr):
+    """식이 읽는 템플릿 변수들의 칸 색인 (SLOT_SCOPES) — 여러 색인에 걸치면 ValueError"""
+    scopes = {SLOT_SCOPES[name] for name in ROOT_RE.findall(expr) if name in SLOT_SCOPES}
+    if len(scopes) != 1:
+        raise ValueError(f'템플릿 식의 칸 색인을 정할 수 없음: {expr} ({", ".join(sorted(scopes)) or "변수 없음"})')
+    return scopes.pop()
+
+
+def render(parts, env):
+    """템플릿 조각 + 값 → 문자열"""
+    out = []
+    for literal, expr in parts:
+        out.append(literal)
+        if expr is not None:
+            out.append(str(evaluate(expr, env)))
+    return ''.join(out)
+
+
+# ── 로케일 렌더러 ────────────────────────────────────────────────────────────
+
+class FortuneRenderer:
+    """번들 1개의 getTodayFortune / genTodayFortune 변형 렌더링"""
+
+    def __init__(self, html):
+        t = load_tables(html, FORTUNE_TABLE_NAMES)
+        self.STEM, self.BRANCH, self.ELEMENT = t['STEM'], t['BRANCH'], t['ELEMENT']
+        self.EL_ORDER, self.TEN_GODS, self.TWELVE_STATES = t['EL_ORDER'], t['TEN_GODS'], t['TWELVE_STATES']
+        functions, _ = bundle_functions(html)
+        today, daily = (FunctionSource(html, functions, name) for name in PORTED_LOGIC)
+        self.stale = [f.name for f in (today, daily) if f.logic not in PORTED_LOGIC[f.name]]
+        self.key = _digest(json.dumps([today.src, daily.src, t], ensure_ascii=False, sort_keys=True).encode('utf-8'))
+        # getTodayFortune: isYong → isHee → isGi → 그 밖 순서의 (등급, 조언)
+        self.ratings = list(zip(today.strings('rating'), today.strings('advice')))
+        if len(self.ratings) != 4:
+            raise ValueError(f'getTodayFortune: 등급·조언 {len(self.ratings)}쌍 (4쌍이어야 함)')
+        self.today_parts = today.template()
+        # genTodayFortune: godMeaning[god.k|c] || 기본값, 용신일·기신일 보너스, 시간 이름
+        self.meanings = daily.literal('godMeaning', '=')
+        self.meaning_field = next(daily.text(k + 4) for k in daily._find('godMeaning', '[', 'god', '.'))
+        self.meaning_default = daily.literal(']', '||')
+        self.bonuses = daily.strings('bonus')[-2:]
+        self.hour_names = daily.literal('hourNames', '=')
+        self.daily_parts = daily.template()
+
+    def day_pillar(self, gz):
+        s, b = self.STEM[gz % 10], self.BRANCH[gz % 12]
+        return {'s': s, 'b': b}, {self.EL_ORDER.index(s['e']), self.EL_ORDER.index(b['e'])}
+
+    def ten_god(self, si, dmi):
+        """getTenGod(STEM[si], STEM[dmi])"""
+        stem, day = self.STEM[si], self.STEM[dmi]
+        diff = (self.EL_ORDER.index(stem['e']) - self.EL_ORDER.index(day['e']) + 5) % 5
+        return self.TEN_GODS[TEN_GOD_KEYS[diff * 2 + (0 if day['y'] == stem['y'] else 1)]]
+
+    def twelve_state(self, dmi, bi):
+        """getTwelveState(STEM[dmi], BRANCH[bi])"""
+        start = TWELVE_STARTS[dmi]
+        return self.TWELVE_STATES[(bi - start + 12) % 12 if self.STEM[dmi]['y'] else (start - bi + 12) % 12]
+
+    def today(self, gz, dmi, cls):
+        """getTodayFortune 변형 → (HTML, 극성 문구)"""
+        dp, _ = self.day_pillar(gz)
+        rating, advice = self.ratings[cls]
+        env = {'dp': dp, 'ELEMENT': self.ELEMENT, 'god': self.ten_god(gz % 10, dmi), 'rating': rating, 'advice': advice}
+        return render(self.today_parts, env), rating + ' ' + advice
+
+    def info(self, god, bonus):
+        """genTodayFortune 십신 풀이 + 용신일·기신일 보너스 → (info, 보너스 문구)"""
+        info = dict(self.meanings.get(god[self.meaning_field]) or self.meaning_default)
+        text = ''
+        if bonus == 0:
+            info['r'] = min(5, info['r'] + 1)
+            text = self.bonuses[0]
+        elif bonus == 1:
+            info['r'] = max(1, info['r'] - 1)
+            text = self.bonuses[1]
+        return info, text
+
+    def hour_lists(self, yong, gi):
+        """genTodayFortune 의 행운·조심 시간 이름 목록"""
+        good = [self.hour_names[i] for i, b in enumerate(self.BRANCH) if self.EL_ORDER.index(b['e']) == yong]
+        bad = [self.hour_names[i] for i, b in enumerate(self.BRANCH)
+               if self.EL_ORDER.index(b['e']) == gi and self.EL_ORDER.index(b['e']) != yong]
+        return good, bad
+
+    def daily(self, day, gz, dmi, bonus, yong, gi):
+        """genTodayFortune 변형 → (HTML, 별점, 극성 문구)"""
+        dp, _ = self.day_pillar(gz)
+        info, text = self.info(self.ten_god(gz % 10, dmi), bonus)
+        good, bad = self.hour_lists(yong, gi)
+        env = {'dp': dp, 'tm': day.month, 'td': day.day, 'info': info, 'bonus': text,
+               'state': self.twelve_state(dmi, gz % 12), 'goodH': good, 'badH': bad}
+        return render(self.daily_parts, env), info['r'], f"{info['l']} {info['d']} {text}"
+
+    def scope_envs(self, scope):
+        """칸 색인 → 색인 순서의 템플릿 변수 env 목록 (모듈 설명의 색인식과 같은 순서)"""
+        if scope == 'pillar':
+            return [{'dp': self.day_pillar(gz)[0], 'ELEMENT': self.ELEMENT} for gz in range(60)]
+        if scope == 'god':
+            return [{'god': self.ten_god(si, dmi)} for si in range(10) for dmi in range(10)]
+        if scope == 'state':
+            return [{'state': self.twelve_state(dmi, bi)} for bi in range(12) for dmi in range(10)]
+        if scope == 'class':
+            return [{'rating': rating, 'advice': advice} for rating, advice in self.ratings]
+        if scope == 'bonus':
+            return [{'bonus': text} for text in (*self.bonuses, '')]  # 용신일 / 기신일 / 보통
+        if scope == 'god_bonus':
+            return [{'info': self.info(self.ten_god(si, dmi), bonus)[0]}
+                    for si in range(10) for dmi in range(10) for bonus in range(3)]
+        if scope == 'hours':
+            return [dict(zip(('goodH', 'badH'), self.hour_lists(yong, gi))) for yong in range(5) for gi in range(5)]
+        raise ValueError(f'알 수 없는 칸 색인: {scope}')
+
+    def template(self):
+        """로케일 템플릿 (template.json) — HTML 조각과 칸별 값 표 (date 칸은 값 없이 식만)"""
+        slots, numbers, envs = [], {}, {}
+
+        def compile_parts(parts):
+            out = []
+            for literal, expr in parts:
+                out.append(literal)
+                if expr is None:
+                    continue
+                if expr not in numbers:
+                    scope = scope_of(expr)
+                    if scope != 'date' and scope not in envs:
+                        envs[scope] = self.scope_envs(scope)
+                    values = None if scope == 'date' else [str(evaluate(expr, env)) for env in envs[scope]]
+                    numbers[expr] = len(slots)
+                    slots.append({'scope': scope, 'expr': expr, 'values': values})
+                out.append(numbers[expr])
+            return out
+        return {'today': compile_parts(self.today_parts), 'daily': compile_parts(self.daily_parts), 'slots': slots}
+
+
+def day_gapja(day):
+    """calcDayPillar(연, 월, 일) 의 60갑자 인덱스"""
+    return (_days_scalar(day.year, day.month, day.day) + UNIX_JDN - BASE_JDN) % 60
+
+
+def classes(els):
+    """그날 일진 오행 집합 → (getTodayFortune 분류 125자, genTodayFortune 보너스 분류 25자)"""
+    today = ''.join(str(0 if y in els else 1 if h in els else 2 if g in els else 3)
+                    for y in range(5) for h in range(5) for g in range(5))
+    bonus = ''.join(str(0 if y in els else 1 if g in els else 2) for y in range(5) for g in range(5))
+    return today, bonus
+
+
+def shard(renderer, template, day, check=False):
+    """하루치 샤드 (JSON 으로 쓸 dict) + 검사용 {(함수, 일간, 분류): (별점, 극성 문구)}
+    + check 면 템플릿 조립 결과가 직접 렌더링과 다른 [(변형, 직접, 조립)]"""
+    gz = day_gapja(day)
+    dp, els = renderer.day_pillar(gz)
+    today_cls, bonus_cls = classes(els)
+    date_env = {'tm': day.month, 'td': day.day}
+    out = {'date': day.isoformat(), 'pillar': dp['s']['c'] + dp['b']['c'], 'gz': gz,
+           'today': {'class': today_cls}, 'daily': {'bonus': bonus_cls},
+           'values': {str(n): str(evaluate(slot['expr'], date_env))
+                      for n, slot in enumerate(template['slots']) if slot['scope'] == 'date'}}
+    facts, mismatched = {}, []
+    for dmi in range(10):
+        for cls in range(4):
+            html, text = renderer.today(gz, dmi, cls)
+            facts[('today', dmi, cls)] = (None, text)
+            if check and variant(template, out, 'today', dmi, cls) != html:
+                mismatched.append((('today', dmi, cls), html, variant(template, out, 'today', dmi, cls)))
+        for bonus in range(3):
+            # 분류만 같으면 시간 목록 말고는 같다 — 대표 (용신, 기신) 으로 조립 검사
+            yong, gi = next((y, g) for y in range(5) for g in range(5) if int(bonus_cls[y * 5 + g]) == bonus) \
+                if str(bonus) in bonus_cls else (0, 0)
+            html, stars, text = renderer.daily(day, gz, dmi, bonus, yong, gi)
+            facts[('daily', dmi, bonus)] = (stars, text)
+            if check and str(bonus) in bonus_cls and variant(template, out, 'daily', dmi, bonus, yong, gi) != html:
+                mismatched.append((('daily', dmi, bonus), html, variant(template, out, 'daily', dmi, bonus, yong, gi)))
+    return out, facts, mismatched
+
+
+def variant(template, shard, kind, dmi, cls, yong=0, gi=0):
+    """템플릿 + 샤드 → 변형 1개의 HTML (kind: today | daily, cls: 그 함수의 분류 번호)"""
+    gz = shard['gz']
+    god = gz % 10 * 10 + dmi
+    index = {'pillar': gz, 'god': god, 'state': gz % 12 * 10 + dmi, 'class': cls, 'bonus': cls,
+             'god_bonus': god * 3 + cls, 'hours': yong * 5 + gi}
+    slots, values = template['slots'], shard['values']
+    return ''.join(part if isinstance(part, str) else
+                   values[str(part)] if slots[part]['scope'] == 'date' else
+                   slots[part]['values'][index[slots[part]['scope']]]
+                   for part in template[kind])
+
+
+def fill(template, shard, dmi, yong, hee, gi):
+    """클라이언트 조립: 일간·용신·희신·기신 (EL_ORDER 번호) → (getTodayFortune HTML, genTodayFortune HTML)"""
+    cls = int(shard['today']['class'][yong * 25 + hee * 5 + gi])
+    bonus = int(shard['daily']['bonus'][yong * 5 + gi])
+    return variant(template, shard, 'today', dmi, cls), variant(template, shard, 'daily', dmi, bonus, yong, gi)
+
+
+# ── 병렬 렌더링 ───────────────────────────────────────────────────────────────
+
+_RENDERERS = None
+
+
+def _init_worker(renderers):
+    global _RENDERERS
+    _RENDERERS = renderers
+
+
+def _render_day(day, check=True):
+    """날짜 1개 → ({로케일: (샤드 바이트, gzip 크기)}, 검사 문제 목록)"""
+    out, facts, problems = {}, {}, []
+    for lang, (renderer, template) in _RENDERERS.items():
+        data, facts[lang], mismatched = shard(renderer, template, day, check)
+        data = json.dumps(data, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+        out[lang] = (data, len(gzip.compress(data, 9, mtime=0)))
+        problems.extend({'date': day.isoformat(), 'variant': key, 'lang': lang, 'kind': '템플릿',
+                         'ref': '렌더링', 'value': '조립', 'texts': [html, filled]} for key, html, filled in mismatched)
+    return out, problems + verify(day, facts, list(facts)) if check else []
+
+
+def _write_if_changed(path, data):
+    """내용이 같으면 쓰지 않음 → 썼으면 True"""
+    try:
+        with open(path, 'rb') as f:
+            if f.read() == data:
+                return False
+    except OSError:
+        pass
+    with open(path, 'wb') as f:
+        f.write(data)
+    return True
+
+
+def verify(day, facts, langs):
+    """같은 날 같은 변형의 로케일 간 별점·극성 비교 → 문제 목록"""
+    problems = []
+    ref = REFERENCE_LOCALE if REFERENCE_LOCALE in langs else langs[0]
+    for key, (stars, text) in facts[ref].items():
+        po_ref = polarity(text, ref)
+        for lang in langs:
+            if lang == ref:
+                continue
+            other_stars, other_text = facts[lang][key]
+            if stars != other_stars:
+                problems.append({'date': day.isoformat(), 'variant': key, 'lang': lang, 'kind': '별점',
+                                 'ref': stars, 'value': other_stars, 'texts': [text, other_text]})
+            po = polarity(other_text, lang)
+            if 'neutral' not in (po_ref, po) and po_ref != po:
+                problems.append({'date': day.isoformat(), 'variant': key, 'lang': lang, 'kind': '극성',
+                                 'ref': po_ref, 'value': po, 'texts': [text, other_text]})
+    return problems
+
+
+def build(paths, out_dir, start, days, jobs=None, check=True):
+    """샤드 빌드 → (매니페스트, 검사 문제 목록). paths: {로케일: 번들 경로}"""
+    htmls = {}
+    for lang, path in paths.items():
+        with open(path, encoding='utf-8') as f:
+            htmls[lang] = f.read()
+    renderers = {lang: FortuneRenderer(html) for lang, html in htmls.items()}
+    templates = {lang: renderer.template() for lang, renderer in renderers.items()}
+    for lang, renderer in renderers.items():
+        if renderer.stale:
+            print(f"⚠️ {lang.upper()} 이식 뒤 로직이 바뀐 JS 함수: {', '.join(renderer.stale)}")
+    base = os.path.join(out_dir, FORTUNE_DIR)
+    for lang in htmls:
+        os.makedirs(os.path.join(base, lang), exist_ok=True)
+    stats = {lang: {'bundle': os.path.basename(paths[lang]), 'source_sha': source_sha(htmls[lang]),
+                    'key': renderers[lang].key, 'files': 0, 'written': 0, 'bytes': 0, 'bytes_gz': 0}
+             for lang in htmls}
+    for lang, template in templates.items():
+        data = json.dumps(template, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+        _write_if_changed(os.path.join(base, lang, TEMPLATE_NAME), data)
+        stats[lang]['template_bytes'] = len(data)
+
+    dates = [start + timedelta(days=i) for i in range(days)]
+    problems = []
+    workers = max(1, min(jobs or os.cpu_count() or 1, len(dates)))
+    work = {lang: (renderers[lang], templates[lang]) for lang in renderers}
+    pool = ProcessPoolExecutor(workers, initializer=_init_worker, initargs=(work,)) if workers > 1 else None
+    if pool is None:
+        _init_worker(work)
+    try:
+        checks = [check] * len(dates)
+        results = pool.map(_render_day, dates, checks, chunksize=max(1, len(dates) // (workers * 4))) if pool \
+            else map(_render_day, dates, checks)
+        for day, (result, found) in zip(dates, results):
+            for lang, (data, size_gz) in result.items():
+                s = stats[lang]
+                s['files'] += 1
+                s['bytes'] += len(data)
+                s['bytes_gz'] += size_gz
+                s['written'] += _write_if_changed(os.path.join(base, lang, f'{day.isoformat()}.json'), data)
+            problems.extend(found)
+    finally:
+        if pool:
+            pool.shutdown()
+    manifest = {'from': start.isoformat(), 'days': days, 'template': TEMPLATE_NAME, 'locales': stats}
+    with open(os.path.join(base, MANIFEST_NAME), 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, ensure_ascii=False, indent=2)
+    return manifest, problems
+
+
+# ── 진입점 ──────────────────────────────────────────────────────────────────
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='K-MUDANG 오늘의 운세 샤드 사전 생성')
+    parser.add_argument('--from', dest='start', default=None, help='첫 날짜 YYYY-MM-DD (기본: 오늘)')
+    parser.add_argument('--days', type=int, default=365, help='날짜 수 (기본: 365)')
+    parser.add_argument('--out', default='dist', help='출력 디렉터리 (기본: dist)')
+    parser.add_argument('--jobs', type=int, default=None, help='렌더링 프로세스 수 (기본: CPU 수)')
+    parser.add_argument('--html', nargs='*', default=HTML_DEFAULT, help='로케일 번들 (파일명 앞부분 = 로케일)')
+    parser.add_argument('--no-verify', action='store_true', help='로케일 간 별점·극성 검사 생략')
+    args = parser.parse_args()
+    try:
+        start = date.fromisoformat(args.start) if args.start else date.today()
+    except ValueError:
+        parser.error(f'--from 형식 오류: {args.start}')
+
+    paths = {os.path.basename(p).split('.')[0]: os.path.join(HERE, p) if not os.path.isabs(p) else p
+             for p in args.html}
+    t0 = time.perf_counter()
+    try:
+        manifest, problems = build(paths, args.out, start, args.days, args.jobs, not args.no_verify)
+    except (OSError, ValueError, KeyError) as e:
+        print(f"❌ {e}")
+        sys.exit(1)
+    elapsed = time.perf_counter() - t0
+    print(f"🔍 {manifest['from']} 부터 {args.days}일 × {len(paths)}로케일 ({elapsed:.1f}s)")
+    for lang, s in manifest['locales'].items():
+        print(f"  {lang.upper()}: 샤드 {s['files']}개 (새로 씀 {s['written']}) · "
+              f"{s['bytes'] / 1024:,.0f}KB (gzip {s['bytes_gz'] / 1024:,.0f}KB) + 템플릿 {s['template_bytes'] / 1024:,.0f}KB")
+    if args.no_verify:
+        sys.exit(0)
+    if problems:
+        seen = {}
+        for p in problems:  # 같은 변형·문구 조합은 한 번만 (날짜 수만 셈)
+            key = (p['kind'], p['lang'], p['variant'][0], tuple(p['texts']))
+            seen.setdefault(key, [p, 0])[1] += 1
+        print(f"❌ 로케일 간 불일치 {len(seen)}종 ({len(problems)}건)")
+        for (kind, lang, func, _), (p, n) in seen.items():
+            print(f"  {kind} {lang.upper()} {func} ({n}건, 예: {p['date']}): "
+                  f"{REFERENCE_LOCALE.upper()}={p['ref']}({p['texts'][0][:30]}) ≠ {p['value']}({p['texts'][1][:30]})")
+        sys.exit(1)
+    print("✅ 로케일 간 별점·극성 일치")
@@ -0,0 +1,310 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+K-MUDANG 이미지 파생본 빌드 v1.0
+사용법: python build_images.py [--out dist] [--jobs N] [--html index.html ko.html ...] [--no-cache]
+
+IMAGE_RULES 의 원본마다 폭별 AVIF/WebP 파생본을 프로세스 풀에서 만들어
+<out>/img/<이름>-<폭>.<해시>.<형식> 으로 저장한다 (원본보다 큰 폭은 만들지 않음).
+파생본은 (원본 내용 해시, 폭, 인코더 설정) 키로 .image_cache/ 에 보관해, 원본이
+그대로면 다시 인코딩하지 않는다. 이전 빌드에서 남은 파생본은 정리한다.
+
+출력: <out>/img/images.json       원본 → 파생본 매핑 (build_precache.py 가 사용)
+      <out>/img/image-report.json 원본·파생본 크기와 페이지별 첫 로드 이미지 용량 추정
+--html 의 페이지는 <out> 에 있으면 그 파일(build_bundles.py 결과)을, 없으면 원본을 읽어
+<img> 를 <picture>(AVIF → WebP → 원본)로, CSS 배경 url() 뒤에 image-set() 을 붙여 <out> 에 쓴다.
+빌드 순서: build_bundles.py → build_images.py → build_precache.py --root dist
+필요 패키지: Pillow (AVIF 는 AVIF 를 지원하는 Pillow 빌드에서만, 없으면 WebP 만)
+"""
+
+import os, re, sys, json, shutil, argparse, hashlib
+from concurrent.futures import ProcessPoolExecutor
+
+try:
+    from PIL import Image, features
+except ImportError:  # 매핑 적용(apply_image_map)만 쓰는 쪽은 Pillow 없이도 import 가능
+    Image = features = None
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+IMG_DIR = 'img'
+MAP_NAME = 'images.json'
+REPORT_NAME = 'image-report.json'
+CACHE_DIR = '.image_cache'
+HTML_DEFAULT = ['index.html', 'ko.html', 'en.html', 'jp.html']
+
+# 원본 → 파생본 규칙. widths: 만들 폭, display: 첫 로드에 쓰일 것으로 보는 폭(CSS px × DPR 2),
+# sizes: <img> 에 인라인 width 가 없을 때의 sizes 속성
+IMAGE_RULES = {
+    'jp-mudang.png':      {'widths': (480, 960, 1340), 'display': 960, 'sizes': '100vw'},  # 워터마크 (높이 100%)
+    'sharethumbnail.png': {'widths': (480, 920), 'display': 920, 'sizes': '100vw'},
+    'mainbg.jpg':         {'widths': (640, 1080, 1560), 'display': 1080, 'sizes': '100vw'},  # index.html 배경
+    'zodiacwheel.png':    {'widths': (280, 560, 840), 'display': 560, 'sizes': '280px'},
+    'taegeuk-icon.png':   {'widths': (40, 128, 260), 'display': 260, 'sizes': '130px'},  # 스플래시 130px, 버튼 16~20px
+}
+# 형식별 인코더 설정 (순서 = <picture> source 우선순위)
+FORMATS = {
+    'avif': {'mime': 'image/avif', 'save': {'quality': 50, 'speed': 6}},
+    'webp': {'mime': 'image/webp', 'save': {'quality': 80, 'method': 6}},
+}
+
+IMG_TAG_RE = re.compile(r'<img\b[^>]*?\bsrc="([^"]+)"[^>]*>', re.I)
+INLINE_WIDTH_RE = re.compile(r'\bwidth\s*:\s*(\d+)px')
+CSS_BG_RE = re.compile(r'''(background(?:-image)?\s*:[^;}]*?url\(\s*(['"]?)([^'")]+)\2\s*\)[^;}]*)(;?)''')
+
+
+# ── 인코딩 ────────────────────────────────────────────────────────────────────
+
+def available_formats():
+    """이 Pillow 빌드로 만들 수 있는 형식 (FORMATS 순서)"""
+    return [fmt for fmt in FORMATS if features.check(fmt)]
+
+
+def file_sha(path):
+    h = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 20), b''):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def settings_digest():
+    """인코더 설정·Pillow 버전 — 바뀌면 캐시 키가 달라져 전부 다시 인코딩"""
+    blob = json.dumps({'formats': {k: v['save'] for k, v in FORMATS.items()}, 'pillow': Image.__version__},
+                      sort_keys=True)
+    return hashlib.sha256(blob.encode('utf-8')).hexdigest()[:8]
+
+
+def cache_key(source_sha, width, fmt, settings):
+    return f'{source_sha[:16]}-{width}-{settings}.{fmt}'
+
+
+def encode(source, width, fmt, dest):
+    """원본 1개 → 폭 width 의 fmt 파생본을 dest 에 저장 (프로세스 풀 작업 단위) → (폭, 높이)"""
+    with Image.open(source) as im:
+        alpha = 'A' in im.getbands() or 'transparency' in im.info
+        im = im.convert('RGBA' if alpha else 'RGB')
+        if width < im.width:
+            im = im.resize((width, round(im.height * width / im.width)), Image.LANCZOS)
+        tmp = f'{dest}.{os.getpid()}.tmp'
+        im.save(tmp, format=fmt.upper(), **FORMATS[fmt]['save'])
+        os.replace(tmp, dest)  # 병렬 워커가 같은 키를 써도 원자적
+        return im.size
+
+
+def plan_widths(rule, source_width):
+    """원본보다 큰 폭은 빼고, 전부 크면 원본 폭 1개"""
+    widths = sorted({w for w in rule['widths'] if w < source_width})
+    return widths or [source_width]
+
+
+# ── 빌드 ──────────────────────────────────────────────────────────────────────
+
+def build(root, out_dir, jobs=None, use_cache=True):
+    """파생본 생성 → (매핑 dict, 새로 인코딩한 수, 캐시 재사용 수)"""
+    formats = available_formats()
+    if not formats:
+        raise RuntimeError('이 Pillow 빌드는 WebP/AVIF 를 지원하지 않음')
+    settings = settings_digest()
+    cache_dir = os.path.join(root, CACHE_DIR)
+    img_dir = os.path.join(out_dir, IMG_DIR)
+    os.makedirs(cache_dir, exist_ok=True)
+    os.makedirs(img_dir, exist_ok=True)
+
+    sources, tasks = {}, []
+    for name, rule in IMAGE_RULES.items():
+        path = os.path.join(root, name)
+        if not os.path.exists(path):
+            raise FileNotFoundError(f'원본 이미지 없음: {name}')
+        with Image.open(path) as im:
+            size = im.size
+        sha = file_sha(path)
+        sources[name] = {'path': path, 'sha': sha, 'size': size, 'bytes': os.path.getsize(path)}
+        for width in plan_widths(rule, size[0]):
+            for fmt in formats:
+                key = cache_key(sha, width, fmt, settings)
+                tasks.append((name, width, fmt, key, use_cache and os.path.exists(os.path.join(cache_dir, key))))
+
+    # 캐시에 없는 것만 풀에 제출 (원본이 그대로면 하나도 제출하지 않음)
+    misses = [t for t in tasks if not t[4]]
+    if misses:
+        with ProcessPoolExecutor(max(1, min(jobs or os.cpu_count() or 1, len(misses)))) as pool:
+            futures = [pool.submit(encode, sources[name]['path'], width, fmt, os.path.join(cache_dir, key))
+                       for name, width, fmt, key, _ in misses]
+            for fut in futures:
+                fut.result()
+
+    mapping, keep = {}, {MAP_NAME, REPORT_NAME}
+    for name, width, fmt, key, _ in tasks:
+        cached = os.path.join(cache_dir, key)
+        digest = file_sha(cached)[:8]
+        stem = os.path.splitext(os.path.basename(name))[0]
+        file_name = f'{stem}-{width}.{digest}.{fmt}'
+        dest = os.path.join(img_dir, file_name)
+        if not os.path.exists(dest):
+            shutil.copyfile(cached, dest)
+        keep.add(file_name)
+        with Image.open(cached) as im:
+            w, h = im.size
+        src = sources[name]
+        entry = mapping.setdefault(name, {
+            'sha': src['sha'][:16], 'width': src['size'][0], 'height': src['size'][1], 'bytes': src['bytes'],
+            'display': IMAGE_RULES[name]['display'], 'sizes': IMAGE_RULES[name]['sizes'], 'derivatives': [],
+        })
+        entry['derivatives'].append({'file': f'{IMG_DIR}/{file_name}', 'format': fmt, 'width': w, 'height': h,
+                                     'bytes': os.path.getsize(dest)})
+    for name in os.listdir(img_dir):  # 이전 빌드의 파생본 정리
+        if name not in keep:
+            os.remove(os.path.join(img_dir, name))
+    # 다른 원본·설정의 캐시 항목 정리 (현재 작업 키만 남김)
+    used = {t[3] for t in tasks}
+    for name in os.listdir(cache_dir):
+        if name not in used and not name.endswith('.tmp'):
+            os.remove(os.path.join(cache_dir, name))
+
+    with open(os.path.join(img_dir, MAP_NAME), 'w', encoding='utf-8') as f:
+        json.dump(mapping, f, ensure_ascii=False, indent=2)
+    return mapping, len(misses), len(tasks) - len(misses)
+
+
+def display_rendition(entry, fmt=None):
+    """첫 로드에 쓰일 것으로 보는 파생본: 표시 폭 이상 중 가장 작은 것 (없으면 가장 큰 것)"""
+    cands = [d for d in entry['derivatives'] if fmt is None or d['format'] == fmt]
+    if fmt is None:  # 브라우저는 <picture> 의 첫 지원 형식을 고름
+        first = next(f for f in FORMATS if any(d['format'] == f for d in cands))
+        cands = [d for d in cands if d['format'] == first]
+    wide = [d for d in cands if d['width'] >= entry['display']]
+    return min(wide, key=lambda d: d['width']) if wide else max(cands, key=lambda d: d['width'])
+
+
+# ── HTML 적용 ───────────────────────────────────────────────────────────────
+
+def _srcset(entry, fmt):
+    return ', '.join(f"{d['file']} {d['width']}w" for d in entry['derivatives'] if d['format'] == fmt)
+
+
+def apply_image_map(html, mapping):
+    """<img src=원본> → <picture>, CSS 배경 url(원본) 뒤에 image-set() 추가 → (새 HTML, 바뀐 원본 목록)
+
+    이미 <picture> 안에 있는 <img> 와 image-set() 이 붙은 배경은 건너뛰어 여러 번 적용해도 같다.
+    """
+    touched = []
+
+    def picture(m):
+        entry = mapping.get(m.group(1).lstrip('./'))
+        if entry is None or re.search(r'<source\b[^>]*>\s*$', html[max(0, m.start() - 2000):m.start()]):
+            return m.group(0)
+        width = INLINE_WIDTH_RE.search(m.group(0))
+        sizes = f'{width.group(1)}px' if width else entry['sizes']
+        sources = ''.join(f'<source type="{FORMATS[fmt]["mime"]}" srcset="{_srcset(entry, fmt)}" sizes="{sizes}">'
+                          for fmt in FORMATS if any(d['format'] == fmt for d in entry['derivatives']))
+        touched.append(m.group(1))
+        # onerror 등에서 부모를 가리키던 핸들러는 <picture> 를 한 단계 건너뛰게
+        img = m.group(0).replace('this.parentElement', 'this.parentElement.parentElement')
+        return f'<picture>{sources}{img}</picture>'
+
+    def background(m):
+        entry = mapping.get(m.group(3).lstrip('./'))
+        if entry is None or html.startswith('background-image:image-set(', m.end()):
+            return m.group(0)
+        options = ', '.join(f"url('{display_rendition(entry, fmt)['file']}') type('{FORMATS[fmt]['mime']}')"
+                            for fmt in FORMATS if any(d['format'] == fmt for d in entry['derivatives']))
+        touched.append(m.group(3))
+        return f"{m.group(1)};background-image:image-set({options}){m.group(4)}"
+
+    html = IMG_TAG_RE.sub(picture, html)
+    html = CSS_BG_RE.sub(background, html)
+    return html, touched
+
+
+# ── 크기 리포트 ──────────────────────────────────────────────────────────────
+
+def page_images(html, mapping):
+    """페이지가 원본 경로로 참조하는 매핑 대상 이미지"""
+    return sorted({name for name in mapping if re.search(rf'''["'(]\.?/?{re.escape(name)}["')]''', html)})
+
+
+def size_report(mapping, pages):
+    """원본별 크기·첫 로드 파생본, 페이지별 첫 로드 이미지 용량 (원본 기준 vs 파생본 기준)"""
+    assets = {}
+    for name, entry in mapping.items():
+        chosen = display_rendition(entry)
+        assets[name] = {
+            'original': entry['bytes'],
+            'first_load': chosen['bytes'], 'first_load_file': chosen['file'],
+            'saved_pct': round(100 * (1 - chosen['bytes'] / entry['bytes']), 1),
+            'derivatives': {os.path.basename(d['file']): d['bytes'] for d in entry['derivatives']},
+        }
+    page_weight = {}
+    for page, names in pages.items():
+        page_weight[page] = {
+            'images': names,
+            'original': sum(assets[n]['original'] for n in names),
+            'first_load': sum(assets[n]['first_load'] for n in names),
+        }
+    return {
+        'assets': assets,
+        'pages': page_weight,
+        'total': {'original': sum(a['original'] for a in assets.values()),
+                  'first_load': sum(a['first_load'] for a in assets.values())},
+    }
+
+
+def _kb(n):
+    return f'{n / 1024:,.1f}KB'
+
+
+# ── 진입점 ──────────────────────────────────────────────────────────────────
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='K-MUDANG 이미지 파생본 빌드')
+    parser.add_argument('--root', default=HERE, help='원본 이미지·페이지가 있는 사이트 루트')
+    parser.add_argument('--out', default='dist', help='출력 디렉터리 (기본: dist)')
+    parser.add_argument('--jobs', type=int, default=None, help='인코딩 프로세스 수 (기본: CPU 수)')
+    parser.add_argument('--html', nargs='*', default=HTML_DEFAULT, help='<picture> 로 바꿀 페이지 (기본: 4개 진입 페이지)')
+    parser.add_argument('--no-cache', action='store_true', help='캐시를 무시하고 전부 다시 인코딩')
+    args = parser.parse_args()
+
+    if Image is None:
+        print("❌ Pillow 필요 (pip install Pillow)")
+        sys.exit(1)
+    if os.path.abspath(args.out) == os.path.abspath(args.root):
+        parser.error('--out 은 사이트 루트와 다른 디렉터리여야 함')
+
+    try:
+        mapping, encoded, reused = build(args.root, args.out, args.jobs, use_cache=not args.no_cache)
+    except (OSError, RuntimeError) as e:
+        print(f"❌ {e}")
+        sys.exit(1)
+    formats = sorted({d['format'] for e in mapping.values() for d in e['derivatives']})
+    skipped = [fmt for fmt in FORMATS if fmt not in formats]
+    print(f"✅ 파생본 {encoded + reused}개 ({'/'.join(formats)}) — 새로 인코딩 {encoded}개, 캐시 재사용 {reused}개")
+    if skipped:
+        print(f"  ℹ️ 이 Pillow 빌드는 {', '.join(skipped)} 미지원 — 건너뜀")
+
+    pages = {}
+    for page in args.html:
+        built = os.path.join(args.out, page)
+        source = built if os.path.exists(built) else os.path.join(args.root, page)
+        if not os.path.exists(source):
+            print(f"  ⚠️ 페이지 없음: {page}")
+            continue
+        with open(source, encoding='utf-8', newline='') as f:
+            html = f.read()
+        pages[page] = page_images(html, mapping)
+        new_html, touched = apply_image_map(html, mapping)
+        if new_html != html or source != built:
+            with open(built, 'w', encoding='utf-8', newline='') as f:
+                f.write(new_html)
+        if touched:
+            print(f"  🖼️ {page}: {', '.join(sorted(set(touched)))}")
+
+    report = size_report(mapping, pages)
+    with open(os.path.join(args.out, IMG_DIR, REPORT_NAME), 'w', encoding='utf-8') as f:
+        json.dump(report, f, ensure_ascii=False, indent=2)
+
+    print(f"\n  {'원본':<22}{'원본 크기':>12}{'첫 로드':>12}{'절감':>8}  파일")
+    for name, asset in report['assets'].items():
+        print(f"  {name:<22}{_kb(asset['original']):>12}{_kb(asset['first_load']):>12}"
+              f"{asset['saved_pct']:>7}%  {asset['first_load_file']}")
+    for page, weight in report['pages'].items():
+        print(f"  📄 {page:<19} 첫 로드 이미지 {_kb(weight['original'])} → {_kb(weight['first_load'])}")
+    print(f"✅ {args.out}/{IMG_DIR}/{MAP_NAME}, {args.out}/{IMG_DIR}/{REPORT_NAME} 저장 완료")
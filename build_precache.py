@@ -0,0 +1,275 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+K-MUDANG 서비스 워커 사전 캐시 매니페스트 생성기 v1.0
+사용법: python build_precache.py [--root .] [--source .] [--sw sw.js] [--check]
+
+PRECACHE_PATTERNS 에 맞는 에셋마다 내용 해시(리비전)를 계산해 sw.js 의
+PRECACHE_MANIFEST 블록을 다시 쓴다. 서비스 워커는 '경로?__rev=리비전' 키로
+캐시하므로, 배포 후 클라이언트는 리비전이 바뀐 파일만 다시 받는다.
+함께 페이지(html·웹 매니페스트·sitemap.xml)의 로컬 참조 경로가 실제로 있는지 검사한다.
+
+--check: 파일을 쓰지 않고, sw.js 가 최신이 아니거나 없는 경로가 있으면 종료 코드 1
+--root dist: build_bundles.py·build_images.py 결과 디렉터리 (engine.*.js, data/*.json, img/ 포함).
+  빌드는 바꾼 파일만 dist 에 쓰므로, 배포본은 --source(기본 현재 디렉터리) 위에 dist 를 덮은 것으로 본다.
+  에셋·문서·참조 대상은 dist 에 없으면 --source 에서 찾고, dist/sw.js 가 없으면 --source 의
+  sw.js 를 바탕으로 dist/sw.js 를 새로 쓴다 (--check 는 dist/sw.js 가 없으면 실패).
+  build_images.py 매핑(img/images.json)이 있으면 매핑된 원본 대신 첫 로드 파생본을 사전 캐시한다.
+"""
+
+import os, re, sys, json, glob, argparse, hashlib
+from urllib.parse import urlsplit, unquote
+
+from build_images import IMG_DIR, MAP_NAME, display_rendition
+
+# 사전 캐시 대상 (root 기준 glob, 등록 순서 = 매니페스트 순서). 와일드카드 없는 항목은 반드시 있어야 함
+PRECACHE_PATTERNS = [
+    'index.html', 'ko.html', 'en.html', 'jp.html',
+    'manifest-index.json', 'manifest.json', 'manifest-en.json', 'manifest-jp.json',
+    'ogimage.png', 'sharethumbnail.png', 'zodiacwheel.png', 'mainbg.jpg',
+    'animals/*.webp',              # preloadAnimalImages(): 'animals/' + 이름 + '.webp'
+    'engine.*.js', 'data/*.json',  # build_bundles.py 결과 (dist 에서만 존재)
+]
+# 로컬 참조를 검사할 문서
+PAGE_PATTERNS = ['*.html', 'archetype-pages/*.html', 'manifest*.json', 'sitemap.xml']
+REVISION_LEN = 10
+
+MANIFEST_BLOCK_RE = re.compile(
+    r'(/\* ─── 사전 캐시 매니페스트 — build_precache\.py 가 생성 \(직접 수정 금지\) ─── \*/\n)'
+    r'(.*?)'
+    r'(/\* ─── 사전 캐시 매니페스트 끝 ─── \*/)', re.S)
+ENTRY_RE = re.compile(r"\{ url: '([^']+)', revision: '([0-9a-f]+)' \}")
+
+# 참조 추출: HTML 속성·srcset 후보·CSS url(), 웹 매니페스트 src/start_url, sitemap loc
+# (태그 속성만 — 앞이 공백이 아닌 img.src = '...' 같은 스크립트 대입은 동적 경로라 제외)
+ATTR_RE = re.compile(r'''(?<=\s)(src|href|content|srcset)\s*=\s*["']([^"']+)["']''', re.I)
+CSS_URL_RE = re.compile(r'''url\(\s*['"]?([^'")\s]+)['"]?\s*\)''')
+JSON_REF_KEYS = ('src', 'start_url')
+LOC_RE = re.compile(r'<loc>\s*([^<\s]+)\s*</loc>')
+ASSET_PATH_RE = re.compile(r'^[^\s]*\.[A-Za-z0-9]{2,5}$|/$')
+
+
+# ── 리비전 ────────────────────────────────────────────────────────────────────
+
+def file_revision(path):
+    """파일 내용 해시 앞 REVISION_LEN 자리 (큰 이미지도 청크 단위로 읽음)"""
+    h = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 20), b''):
+            h.update(chunk)
+    return h.hexdigest()[:REVISION_LEN]
+
+
+def image_substitutes(root):
+    """build_images.py 매핑이 있으면 {원본 상대 경로: 첫 로드 파생본 상대 경로}"""
+    path = os.path.join(root, IMG_DIR, MAP_NAME)
+    if not os.path.exists(path):
+        return {}
+    with open(path, encoding='utf-8') as f:
+        mapping = json.load(f)
+    return {name: display_rendition(entry)['file'] for name, entry in mapping.items()}
+
+
+def _bases(root, source):
+    """찾을 디렉터리 순서 (root 가 source 를 덮음)"""
+    if source is None or os.path.abspath(source) == os.path.abspath(root):
+        return (root,)
+    return (root, source)
+
+
+def overlay_glob(pattern, root, source=None):
+    """root 기준 glob → [(상대 경로, 실제 경로)] — root 에 없는 상대 경로는 source 에서"""
+    found = {}
+    for base in _bases(root, source):
+        for path in glob.glob(os.path.join(base, pattern)):
+            found.setdefault(os.path.relpath(path, base).replace(os.sep, '/'), path)
+    return sorted(found.items())
+
+
+def collect_precache(root, source=None):
+    """PRECACHE_PATTERNS → ([{url, revision, bytes}], 없는 필수 경로 목록)"""
+    entries, missing, seen = [], [], set()
+    substitutes = image_substitutes(root)
+    for pattern in PRECACHE_PATTERNS:
+        if pattern in substitutes:  # 원본(수 MB) 대신 브라우저가 실제로 받을 파생본
+            pattern = substitutes[pattern]
+        matches = overlay_glob(pattern, root, source)
+        if not matches and not glob.has_magic(pattern):
+            missing.append(pattern)
+        for rel, path in matches:
+            if rel in seen or not os.path.isfile(path):
+                continue
+            seen.add(rel)
+            entries.append({'url': '/' + rel, 'revision': file_revision(path), 'bytes': os.path.getsize(path)})
+    return entries, missing
+
+
+# ── 참조 검사 ────────────────────────────────────────────────────────────────
+
+def site_host(root, source=None):
+    """CNAME 의 도메인 (절대 URL 중 이 사이트를 가리키는 것도 로컬 참조로 검사)"""
+    paths = [os.path.join(base, 'CNAME') for base in _bases(root, source)]
+    path = next((p for p in paths if os.path.exists(p)), None)
+    if path is None:
+        return None
+    with open(path, encoding='utf-8') as f:
+        return f.read().strip().lower() or None
+
+
+def page_references(path, text):
+    """문서 1개의 참조 문자열 목록"""
+    if path.endswith('.json'):
+        refs = []
+        def walk(node):
+            if isinstance(node, dict):
+                for key, value in node.items():
+                    if key in JSON_REF_KEYS and isinstance(value, str):
+                        refs.append(value)
+                    walk(value)
+            elif isinstance(node, list):
+                for item in node:
+                    walk(item)
+        walk(json.loads(text))
+        return refs
+    if path.endswith('.xml'):
+        return LOC_RE.findall(text) + [v for k, v in ATTR_RE.findall(text) if k.lower() == 'href']
+    refs = []
+    for attr, value in ATTR_RE.findall(text):
+        if attr.lower() == 'srcset':
+            refs.extend(c.split()[0] for c in value.split(',') if c.strip())
+        else:
+            refs.append(value)
+    return refs + CSS_URL_RE.findall(text)
+
+
+def resolve_reference(ref, page_dir, root, host):
+    """참조 → root 기준 로컬 파일 경로 (외부·동적·비파일 참조는 None)"""
+    ref = ref.strip()
+    if not ref or ref.startswith(('#', 'data:', 'mailto:', 'tel:', 'javascript:', '//')) or '${' in ref:
+        return None
+    parts = urlsplit(ref)
+    if parts.scheme:
+        if parts.scheme not in ('http', 'https') or not host or parts.netloc.lower() != host:
+            return None
+    path = unquote(parts.path)
+    if not path or not ASSET_PATH_RE.search(path):
+        return None  # 본문 텍스트(content="...")나 확장자 없는 라우트
+    if path.endswith('/'):
+        path += 'index.html'
+    base = root if path.startswith('/') else page_dir
+    return os.path.normpath(os.path.join(base, path.lstrip('/')))
+
+
+def check_references(root, source=None):
+    """{문서 상대 경로: [(참조, 없는 로컬 경로)]} — 없는 참조만 (root 에 없으면 source 에서 찾음)"""
+    host = site_host(root, source)
+    bases = _bases(root, source)
+    broken = {}
+    pages = dict(item for pattern in PAGE_PATTERNS for item in overlay_glob(pattern, root, source))
+    for rel_page, page in sorted(pages.items()):
+        with open(page, encoding='utf-8') as f:
+            text = f.read()
+        try:
+            refs = page_references(page, text)
+        except ValueError as e:
+            broken.setdefault(rel_page, []).append(('(JSON 파싱 실패)', str(e)))
+            continue
+        page_dir = os.path.join(root, os.path.dirname(rel_page))
+        for ref in refs:
+            local = resolve_reference(ref, page_dir, root, host)
+            if not local:
+                continue
+            rel = os.path.relpath(local, root)
+            if not any(os.path.exists(os.path.join(base, rel)) for base in bases):
+                broken.setdefault(rel_page, []).append((ref, rel))
+    return broken
+
+
+# ── sw.js 갱신 ──────────────────────────────────────────────────────────────
+
+def render_manifest(entries):
+    lines = [f"  {{ url: '{e['url']}', revision: '{e['revision']}' }}," for e in entries]
+    if lines:
+        lines[-1] = lines[-1].rstrip(',')
+    return 'const PRECACHE_MANIFEST = [\n' + ''.join(line + '\n' for line in lines) + '];\n'
+
+
+def update_service_worker(sw_text, entries):
+    """→ (새 sw.js 내용, 이전 매니페스트 {url: revision})"""
+    m = MANIFEST_BLOCK_RE.search(sw_text)
+    if not m:
+        raise ValueError('sw.js 에 사전 캐시 매니페스트 표식 주석이 없음')
+    previous = dict(ENTRY_RE.findall(m.group(2)))
+    return sw_text[:m.start(2)] + render_manifest(entries) + sw_text[m.end(2):], previous
+
+
+def _kb(n):
+    return f'{n / 1024:,.1f}KB'
+
+
+# ── 진입점 ──────────────────────────────────────────────────────────────────
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='K-MUDANG 서비스 워커 사전 캐시 매니페스트 생성')
+    parser.add_argument('--root', default='.', help='사이트 루트 (기본: 현재 디렉터리)')
+    parser.add_argument('--source', default='.',
+                        help='root 에 없는 파일을 찾을 원본 사이트 루트 (기본: 현재 디렉터리)')
+    parser.add_argument('--sw', default=None, help='서비스 워커 경로 (기본: <root>/sw.js)')
+    parser.add_argument('--check', action='store_true', help='쓰지 않고 최신 여부·참조만 검사')
+    args = parser.parse_args()
+
+    sw_path = args.sw or os.path.join(args.root, 'sw.js')
+    sw_base = sw_path
+    if not os.path.exists(sw_path) and not args.sw:
+        sw_base = os.path.join(args.source, 'sw.js')  # dist 에는 빌드가 sw.js 를 쓰지 않음
+    if not os.path.exists(sw_base):
+        print(f"❌ 파일 없음: {sw_path}")
+        sys.exit(1)
+
+    entries, missing = collect_precache(args.root, args.source)
+    broken = check_references(args.root, args.source)
+    with open(sw_base, encoding='utf-8') as f:
+        sw_text = f.read()
+    seeded = sw_base != sw_path
+    try:
+        new_text, previous = update_service_worker(sw_text, entries)
+    except ValueError as e:
+        print(f"❌ {e}")
+        sys.exit(1)
+
+    changed = [e for e in entries if previous.get(e['url']) != e['revision']]
+    removed = sorted(set(previous) - {e['url'] for e in entries})
+    total = sum(e['bytes'] for e in entries)
+    print(f"🔍 사전 캐시 에셋 {len(entries)}개 ({_kb(total)})")
+    for e in changed:
+        state = '신규' if e['url'] not in previous else f"{previous[e['url']]} → {e['revision']}"
+        print(f"  🔄 {e['url']:<32}{_kb(e['bytes']):>12}  {state}")
+    for url in removed:
+        print(f"  🗑️ {url} (매니페스트에서 제외)")
+    if not changed and not removed:
+        print("  ✅ 리비전 변경 없음")
+    else:
+        print(f"  → 기존 클라이언트 재다운로드: {len(changed)}개 {_kb(sum(e['bytes'] for e in changed))} "
+              f"(전체 {_kb(total)} 중)")
+
+    for pattern in missing:
+        print(f"  ❌ 사전 캐시 대상 없음: {pattern}")
+    for page, refs in broken.items():
+        for ref, local in refs:
+            print(f"  ❌ {page}: '{ref}' → {local} 없음")
+    ok = not missing and not broken
+
+    if args.check:
+        stale = seeded or new_text != sw_text
+        if seeded:
+            print(f"❌ 파일 없음: {sw_path} — python build_precache.py --root {args.root} 실행 필요")
+        elif stale:
+            print(f"❌ {sw_path} 매니페스트가 최신이 아님 — python build_precache.py 실행 필요")
+        sys.exit(0 if ok and not stale else 1)
+
+    if seeded or new_text != sw_text:
+        with open(sw_path, 'w', encoding='utf-8') as f:
+            f.write(new_text)
+        print(f"✅ {sw_path} {'생성 (' + sw_base + ' 기준)' if seeded else '매니페스트 갱신'}")
+    else:
+        print(f"✅ {sw_path} 이미 최신")
+    sys.exit(0 if ok else 1)
@@ -0,0 +1,372 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+K-MUDANG 절기·음력 사전계산 테이블 v1.0
+사용법:
+  python calendar_tables.py build ko.html calendar_tables.bin
+  python calendar_tables.py check ko.html calendar_tables.bin
+
+build: 번들 HTML 의 SOLAR_TERMS / LUNAR_DATA 로 1900~2100 모든 절기 시각과
+       음력 월 경계(월 시작일)를 미리 계산해 고정 레이아웃 바이너리로 저장
+check: 테이블을 JS 함수(getSolarTermTime, getLunarYearDays, getLeapMonth,
+       getLeapMonthDays, getLunarMonthDays, lunarToSolar) 직역 결과와 전수 대조
+
+읽기 쪽(CalendarTables)은 파일을 mmap 해 NumPy 뷰로 바로 쓰므로 시작 시 파싱이 없다.
+절기 조회는 O(1) 인덱스, 시각 → 절기 / 양력 → 음력은 이분 탐색(O(log n)).
+필요 패키지: numpy
+"""
+
+import re, sys, mmap, struct, argparse, hashlib
+from datetime import date
+
+import numpy as np
+
+from saju_engine import MINUTES_PER_DAY, _days_scalar, _js_literal, parse_solar_terms
+
+MAGIC = b'KMCAL01\n'
+VERSION = 1
+TERM_YEARS = range(1900, 2101)
+
+# 헤더: 버전, 절기 첫 연도, 절기 연도 수, 음력 첫 연도, 음력 연도 수, 음력 월 수,
+#       lunarToSolar 허용 마지막 연도, 음력 1900-01-01 의 epoch 일수, 원본 SHA-256
+HEADER = struct.Struct('<IHHHHIHi32s')
+HEADER_SIZE = 64
+ALIGN = 8
+
+# lunarToSolar: baseDate = new Date(1900, 0, 31) (음력 1900-01-01)
+LUNAR_BASE = (1900, 1, 31)
+LEAP_FLAG = 0x80          # lunar_month_code: 윤달 표시
+LONG_LEAP_FLAG = 0x10     # lunar_leap: LUNAR_DATA 0x10000 비트 (윤달 30일)
+EPOCH_ORDINAL = date(1970, 1, 1).toordinal()
+
+
+# ── 번들 데이터 → JS 함수 직역 (테이블 생성·대조 기준) ─────────────────────────
+
+def parse_lunar_data(html):
+    """LUNAR_DATA / LUNAR_START / lunarToSolar 허용 범위 → (첫 연도, 값 목록, 마지막 허용 연도)"""
+    data = [int(v, 16) for v in re.findall(r'0x[0-9a-fA-F]+', _js_literal(html, 'LUNAR_DATA'))]
+    start = int(_js_literal(html, 'LUNAR_START'))
+    m = re.search(r'function lunarToSolar\([^)]*\)\s*\{if \(ly < \d+ \|\| ly > (\d+)\)', html)
+    last = int(m.group(1)) if m else start + len(data) - 1
+    return start, data, last
+
+def source_digest(html):
+    """테이블이 의존하는 JS 리터럴만 해시 (번들의 다른 부분이 바뀌어도 재빌드 불필요)"""
+    h = hashlib.sha256()
+    for name in ('SOLAR_TERMS', 'LUNAR_DATA', 'LUNAR_START'):
+        h.update(_js_literal(html, name).encode('utf-8'))
+    m = re.search(r'function lunarToSolar\([^)]*\)\s*\{[^}]*\}', html)
+    h.update(m.group(0).encode('utf-8') if m else b'')
+    return h.digest()
+
+class JsCalendar:
+    """JS 음력·절기 함수의 한 줄씩 대응 (호출마다 재계산 — 테이블 검증 기준)"""
+
+    def __init__(self, html):
+        self.term_first, self.terms = parse_solar_terms(html)
+        self.lunar_start, self.lunar_data, self.convert_last = parse_lunar_data(html)
+
+    def solar_term_time(self, year, index):
+        row = min(max(year, self.term_first), self.term_first + len(self.terms) - 1) - self.term_first
+        return [int(v) for v in self.terms[row][index]]
+
+    def term_instant(self, year, index):
+        """isBeforeSolarTerm / calcMonthPillar 가 비교하는 절기 시각 (epoch 분). 소한(11)은 다음 해 1월"""
+        tm, td, th, tn = self.solar_term_time(year, index)
+        return _days_scalar(year + (index == 11), tm, td) * MINUTES_PER_DAY + th * 60 + tn
+
+    def _data(self, year):
+        idx = year - self.lunar_start
+        return self.lunar_data[idx] if 0 <= idx < len(self.lunar_data) else None
+
+    def lunar_year_days(self, year):
+        if self._data(year) is None:
+            return 365
+        total = sum(self.lunar_month_days(year, i) for i in range(1, 13))
+        return total + (self.leap_month_days(year) if self.leap_month(year) else 0)
+
+    def leap_month(self, year):
+        data = self._data(year)
+        return 0 if data is None else data & 0xf
+
+    def lunar_month_days(self, year, month):
+        data = self._data(year)
+        return 30 if data is None else (30 if data & (0x10000 >> month) else 29)
+
+    def leap_month_days(self, year):
+        data = self._data(year)
+        return 29 if data is None else (30 if data & 0x10000 else 29)
+
+    def lunar_to_solar(self, ly, lm, ld, is_leap=False):
+        if ly < self.lunar_start or ly > self.convert_last or self._data(ly) is None:
+            return None
+        total = sum(self.lunar_year_days(self.lunar_start + i) for i in range(ly - self.lunar_start))
+        leap = self.leap_month(ly)
+        for i in range(1, lm):
+            total += self.lunar_month_days(ly, i)
+            if leap == i:
+                total += self.leap_month_days(ly)
+        if is_leap and leap == lm:
+            total += self.lunar_month_days(ly, lm)
+        return _civil(_days_scalar(*LUNAR_BASE) + total + ld - 1)
+
+def _civil(day_number):
+    d = date.fromordinal(int(day_number) + EPOCH_ORDINAL)
+    return d.year, d.month, d.day
+
+
+# ── 빌드 ──────────────────────────────────────────────────────────────────────
+
+def _layout(term_years, lunar_years, month_count):
+    """섹션 (이름, dtype, 개수) 와 오프셋 — 헤더 값만으로 결정되므로 오프셋 표를 따로 두지 않음"""
+    sections = [
+        ('term_instants', '<i8', term_years * 12),
+        ('lunar_year_month', '<i4', lunar_years + 1),
+        ('lunar_month_start', '<i4', month_count + 1),
+        ('lunar_month_code', 'u1', month_count),
+        ('lunar_leap', 'u1', lunar_years),
+    ]
+    offsets, pos = {}, len(MAGIC) + HEADER_SIZE
+    for name, dtype, count in sections:
+        offsets[name] = (pos, dtype, count)
+        pos += np.dtype(dtype).itemsize * count
+        pos += -pos % ALIGN
+    return offsets, pos
+
+def lunar_months(js):
+    """음력 월 경계 → (연도별 첫 월 번호, 월 시작 epoch 일수, 월 코드, 연도별 윤달 코드)
+
+    월 시작 목록은 마지막 월의 끝(다음 달 시작)까지 하나 더 들어 있다.
+    """
+    year_month, month_start, month_code, leap_of = [], [], [], []
+    day = _days_scalar(*LUNAR_BASE)
+    for year in range(js.lunar_start, js.lunar_start + len(js.lunar_data)):
+        year_month.append(len(month_code))
+        leap = js.leap_month(year)
+        leap_of.append(leap | (LONG_LEAP_FLAG if js.leap_month_days(year) == 30 else 0))
+        for month in range(1, 13):
+            month_start.append(day)
+            month_code.append(month)
+            day += js.lunar_month_days(year, month)
+            if leap == month:
+                month_start.append(day)
+                month_code.append(month | LEAP_FLAG)
+                day += js.leap_month_days(year)
+    year_month.append(len(month_code))
+    month_start.append(day)
+    return year_month, month_start, month_code, leap_of
+
+def build(html_path, out_path):
+    """테이블 파일 생성 → (절기 수, 음력 월 수)"""
+    with open(html_path, encoding='utf-8') as f:
+        html = f.read()
+    js = JsCalendar(html)
+
+    instants = np.array([[js.term_instant(y, i) for i in range(12)] for y in TERM_YEARS], dtype=np.int64)
+    if np.any(np.diff(instants.ravel()) <= 0):
+        raise ValueError('절기 시각이 단조 증가하지 않음 (SOLAR_TERMS 확인 필요)')
+
+    year_month, month_start, month_code, leap_of = lunar_months(js)
+
+    header = HEADER.pack(VERSION, TERM_YEARS[0], len(TERM_YEARS), js.lunar_start, len(js.lunar_data),
+                         len(month_code), js.convert_last, _days_scalar(*LUNAR_BASE), source_digest(html))
+    arrays = {'term_instants': instants.ravel(), 'lunar_year_month': year_month,
+              'lunar_month_start': month_start, 'lunar_month_code': month_code, 'lunar_leap': leap_of}
+    offsets, size = _layout(len(TERM_YEARS), len(js.lunar_data), len(month_code))
+    buf = bytearray(size)
+    buf[:len(MAGIC)] = MAGIC
+    buf[len(MAGIC):len(MAGIC) + HEADER.size] = header
+    for name, (pos, dtype, count) in offsets.items():
+        raw = np.asarray(arrays[name], dtype=dtype).tobytes()
+        buf[pos:pos + len(raw)] = raw
+    with open(out_path, 'wb') as f:
+        f.write(buf)
+    return instants.size, len(month_code)
+
+
+# ── 읽기 (mmap) ───────────────────────────────────────────────────────────────
+
+class CalendarTables:
+    """calendar_tables.bin 의 mmap 뷰. 일괄 계산·감사 도구가 같은 테이블을 공유한다"""
+
+    def __init__(self, path):
+        with open(path, 'rb') as f:
+            self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            if self._mm[:len(MAGIC)] != MAGIC:
+                raise ValueError(f'절기 테이블 형식이 아님: {path}')
+            (version, self.term_first_year, term_years, self.lunar_first_year, lunar_years,
+             month_count, self.lunar_convert_last, self.lunar_base_day,
+             self.source_sha256) = HEADER.unpack_from(self._mm, len(MAGIC))
+            if version != VERSION:
+                raise ValueError(f'절기 테이블 버전 불일치: {version} (기대 {VERSION})')
+            offsets, size = _layout(term_years, lunar_years, month_count)
+            if len(self._mm) != size:
+                raise ValueError(f'절기 테이블 크기 불일치: {len(self._mm)} (기대 {size})')
+        except ValueError:
+            self._mm.close()
+            raise
+        view = {name: np.frombuffer(self._mm, dtype=dtype, count=count, offset=pos)
+                for name, (pos, dtype, count) in offsets.items()}
+        self.term_flat = view['term_instants']
+        self.term_instants = self.term_flat.reshape(term_years, 12)
+        self.term_last_year = self.term_first_year + term_years - 1
+        self.lunar_last_year = self.lunar_first_year + lunar_years - 1
+        self._year_month = view['lunar_year_month']
+        self._month_start = view['lunar_month_start']
+        self._month_code = view['lunar_month_code']
+        self._leap = view['lunar_leap']
+
+    def close(self):
+        # NumPy 뷰가 버퍼를 잡고 있으면 mmap 을 닫을 수 없으므로 뷰를 먼저 놓는다
+        for name in ('term_flat', 'term_instants', '_year_month', '_month_start', '_month_code', '_leap'):
+            setattr(self, name, None)
+        self._mm.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def matches(self, html):
+        """테이블이 이 번들의 SOLAR_TERMS / LUNAR_DATA 로 만들어졌는지"""
+        return self.source_sha256 == source_digest(html)
+
+    # ── 절기 ──
+
+    def term_instant(self, year, index):
+        """(연도, 절기 인덱스) → epoch 분. 소한(11)은 다음 해 1월 시각"""
+        if not self.term_first_year <= year <= self.term_last_year:
+            raise ValueError(f'절기 테이블 범위 밖 연도: {year}')
+        return int(self.term_instants[year - self.term_first_year, index])
+
+    def term_at(self, minute):
+        """시각(epoch 분) 이 속한 절기 → (연도, 절기 인덱스). 첫 절기 이전이면 None"""
+        k = int(np.searchsorted(self.term_flat, minute, side='right')) - 1
+        if k < 0:
+            return None
+        return self.term_first_year + k // 12, k % 12
+
+    def neighbor_terms(self, minute):
+        """시각 직전·직후 절기 시각 (calcPreciseDaeunStart 의 순행/역행 기준). 범위 끝은 None"""
+        k = int(np.searchsorted(self.term_flat, minute, side='right'))
+        prev = int(self.term_flat[k - 1]) if k > 0 else None
+        nxt = int(self.term_flat[k]) if k < len(self.term_flat) else None
+        return prev, nxt
+
+    # ── 음력 (범위 밖 기본값은 JS 와 동일) ──
+
+    def _year_slot(self, year):
+        idx = year - self.lunar_first_year
+        return idx if 0 <= idx <= self.lunar_last_year - self.lunar_first_year else None
+
+    def _month_slot(self, year, month, is_leap=False):
+        idx = self._year_slot(year)
+        leap = int(self._leap[idx]) & 0xf
+        return int(self._year_month[idx]) + month - 1 + (0 < leap < month) + (is_leap and leap == month)
+
+    def _month_days(self, k):
+        return int(self._month_start[k + 1] - self._month_start[k])
+
+    def lunar_year_days(self, year):
+        idx = self._year_slot(year)
+        if idx is None:
+            return 365
+        lo, hi = int(self._year_month[idx]), int(self._year_month[idx + 1])
+        return int(self._month_start[hi] - self._month_start[lo])
+
+    def leap_month(self, year):
+        idx = self._year_slot(year)
+        return 0 if idx is None else int(self._leap[idx]) & 0xf
+
+    def lunar_month_days(self, year, month):
+        if self._year_slot(year) is None:
+            return 30
+        return self._month_days(self._month_slot(year, month))
+
+    def leap_month_days(self, year):
+        idx = self._year_slot(year)
+        if idx is None:
+            return 29
+        return 30 if int(self._leap[idx]) & LONG_LEAP_FLAG else 29
+
+    def lunar_to_solar(self, ly, lm, ld, is_leap=False):
+        """음력 → 양력 (연, 월, 일). lunarToSolar 와 같은 범위 제한 (밖이면 None)"""
+        if ly > self.lunar_convert_last or self._year_slot(ly) is None:
+            return None
+        return _civil(int(self._month_start[self._month_slot(ly, lm, is_leap)]) + ld - 1)
+
+    def solar_to_lunar(self, y, m, d):
+        """양력 → 음력 (연, 월, 일, 윤달 여부). 테이블 범위 밖이면 None"""
+        day = _days_scalar(y, m, d)
+        k = int(np.searchsorted(self._month_start, day, side='right')) - 1
+        if k < 0 or k >= len(self._month_code):
+            return None
+        year = self.lunar_first_year + int(np.searchsorted(self._year_month, k, side='right')) - 1
+        code = int(self._month_code[k])
+        return year, code & ~LEAP_FLAG, day - int(self._month_start[k]) + 1, bool(code & LEAP_FLAG)
+
+
+# ── 전수 대조 ─────────────────────────────────────────────────────────────────
+
+def check(html_path, table_path):
+    """JS 직역과 테이블 조회 결과 비교 → 불일치 목록"""
+    with open(html_path, encoding='utf-8') as f:
+        html = f.read()
+    js = JsCalendar(html)
+    problems = []
+    with CalendarTables(table_path) as t:
+        if not t.matches(html):
+            problems.append(f'테이블이 {html_path} 의 현재 SOLAR_TERMS/LUNAR_DATA 로 만들어지지 않음 (재빌드 필요)')
+        for y in TERM_YEARS:
+            for i in range(12):
+                if t.term_instant(y, i) != js.term_instant(y, i):
+                    problems.append(f'절기 {y}/{i}: 테이블={t.term_instant(y, i)} JS={js.term_instant(y, i)}')
+                if t.term_at(js.term_instant(y, i)) != (y, i):
+                    problems.append(f'term_at {y}/{i}: {t.term_at(js.term_instant(y, i))}')
+        for y in range(js.lunar_start - 1, js.lunar_start + len(js.lunar_data) + 1):
+            for name in ('lunar_year_days', 'leap_month', 'leap_month_days'):
+                a, b = getattr(t, name)(y), getattr(js, name)(y)
+                if a != b:
+                    problems.append(f'{name}({y}): 테이블={a} JS={b}')
+            for mth in range(1, 13):
+                if t.lunar_month_days(y, mth) != js.lunar_month_days(y, mth):
+                    problems.append(f'lunar_month_days({y},{mth}): 테이블={t.lunar_month_days(y, mth)} '
+                                    f'JS={js.lunar_month_days(y, mth)}')
+                for leap in (False, True):
+                    for ld in (1, 29):
+                        a, b = t.lunar_to_solar(y, mth, ld, leap), js.lunar_to_solar(y, mth, ld, leap)
+                        if a != b:
+                            problems.append(f'lunar_to_solar({y},{mth},{ld},{leap}): 테이블={a} JS={b}')
+                    # 월 첫날의 역변환은 원래 (연, 월, 윤달) 로 돌아와야 함
+                    real_leap = leap and js.leap_month(y) == mth
+                    a = t.lunar_to_solar(y, mth, 1, real_leap)
+                    if a and t.solar_to_lunar(*a) != (y, mth, 1, real_leap):
+                        problems.append(f'solar_to_lunar{a}: {t.solar_to_lunar(*a)} (기대 {(y, mth, 1, real_leap)})')
+    return problems
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='K-MUDANG 절기·음력 사전계산 테이블')
+    parser.add_argument('mode', choices=['build', 'check'])
+    parser.add_argument('html_path')
+    parser.add_argument('table_path')
+    args = parser.parse_args()
+
+    try:
+        if args.mode == 'build':
+            terms, months = build(args.html_path, args.table_path)
+            print(f"✅ 절기 {terms}개 · 음력 월 {months}개 저장 → {args.table_path}")
+            sys.exit(0)
+        print(f"🔍 절기·음력 테이블 대조: {args.html_path} ↔ {args.table_path}")
+        problems = check(args.html_path, args.table_path)
+    except (OSError, ValueError) as e:
+        print(f"❌ {e}")
+        sys.exit(1)
+    for p in problems[:20]:
+        print(f"  ❌ {p}")
+    if len(problems) > 20:
+        print(f"  ... 외 {len(problems) - 20}건")
+    print('✅ 통과' if not problems else f'❌ 실패: 불일치 {len(problems)}건')
+    sys.exit(1 if problems else 0)
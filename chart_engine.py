@@ -0,0 +1,1158 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+K-MUDANG 명식(命式) 계산 엔진 v1.0
+브라우저 JS 의 calcStrength / calcGods / calcFormat / calcInteractions / calcSinsal /
+calcGongmang / calcNapeum 과 보조 함수(analyzeSamhapBureau, analyzeDirectionalHarmony,
+analyzeClimate, getTenGod, countElements, findByungYak, checkSpecialFormat,
+checkYangInGeonRok, isFormatBroken), fullAnalysis 의 용신·희신·기신 판정의 Python 이식판.
+결과 키·문구는 JS 와 같다.
+
+사용법: python chart_engine.py ko.html 1990 5 17 [--siji 6] [--gender f] [--year-now 2026]
+
+STEM·BRANCH·JIJANGGAN·FORMATS_* 등 표는 번들 HTML 의 리터럴을 그대로 읽는다
+(build_bundles.js_literal). 함수 본문 안의 표·문구는 이식 당시 ko.html 기준이라 ko 번들만
+받으며 (K_MUDANG_VERSION.lang 확인), 번들의 해당 함수가 바뀌면 ChartEngine.stale 에
+이름이 남는다 (PORTED_SHA 대조).
+
+단계마다 실제로 의존하는 입력 부분만 키로 하는 LRU 캐시(functools.lru_cache)에
+메모이즈한다. 주(柱)는 60갑자 인덱스 튜플 (년, 월, 일[, 시]) 로 다룬다.
+  주 1개 (60)          napeum          일주 (60)           void (공망)
+  천간 × 일간 (100)    ten_god         천간 조합           interactions_stems, sinsal_stems
+  지지 조합            samhap, directional, interactions_branches
+  일간 × 지지 조합     sinsal_day      천간 + 지지 조합    climate, strength, gods, format, yongsin
+성별(고란살)·올해(삼재)는 캐시 키에 넣지 않고 조립 단계에서 붙인다.
+캐시된 결과는 호출자끼리 공유되므로 수정하지 말 것.
+"""
+
+import sys, json, argparse, functools
+from datetime import date
+from decimal import Decimal, ROUND_HALF_UP
+
+from build_bundles import executable_scripts, tokenize, js_literal, bundle_functions, source_sha
+from gapja import GAPJA
+from saju_engine import _js_round, bundle_lang
+
+# ── 번들 표 ──────────────────────────────────────────────────────────────────
+
+TABLE_NAMES = ('STEM', 'BRANCH', 'ELEMENT', 'EL_ORDER', 'SEASON', 'TEN_GODS', 'JIJANGGAN',
+               'FORMATS_INNER', 'FORMATS_SPECIAL', 'SOUND_ELEMENT', 'CLIMATE_BALANCE',
+               'DIRECTIONAL_HARMONY')
+
+# 함수 본문의 십신·격국 이름 등은 한국어 그대로 비교하므로 다른 언어 번들은 받지 않음
+PORTED_LANG = 'ko'
+
+# 이식 기준 JS 함수 원문 해시 (build_bundles.source_sha, ko.html)
+PORTED_SHA = {
+    'calcStrength': 'ca347645b2474146',
+    'calcGods': '5e767f09a3431f85',
+    'calcFormat': '192db7e8ff54a28e',
+    'calcInteractions': '3d78db97cc7d073f',
+    'calcSinsal': '57407e50242486b9',
+    'calcGongmang': '0ade1b28e9341a9f',
+    'calcNapeum': '920d257331a57050',
+    'analyzeSamhapBureau': 'c166da09feb55373',
+    'analyzeDirectionalHarmony': 'ff1fe5328c651f37',
+    'analyzeClimate': '58d64a195f05ac64',
+    'getTenGod': '957ab1fa33e7d995',
+    'countElements': 'dfb3aae5e3207ba5',
+    'findByungYak': 'f6934d5c299f80bf',
+    'checkSpecialFormat': 'ce10a1c320ea9e9f',
+    'checkYangInGeonRok': '2c4d223170a84b15',
+    'isFormatBroken': 'b4df2737a4a64023',
+    'fullAnalysis': 'ab6d60d52b14355f',
+}
+
+# 단계별 LRU 크기 — 키 공간 전체가 들어가는 단계는 그 크기, 4주 전체 단계는 상한
+# (bench_chart_service.py 의 --charts 기본값은 이 상한보다 작게 맞춘다)
+CACHE_SIZES = {
+    'napeum': 64,
+    'void': 64,
+    'ten_god': 128,
+    'samhap': 1 << 15,
+    'directional': 1 << 15,
+    'climate': 1 << 15,
+    'elements': 1 << 14,
+    'interactions_stems': 1 << 14,
+    'interactions_branches': 1 << 15,
+    'sinsal_stems': 1 << 14,
+    'sinsal_day': 1 << 17,
+    'strength': 1 << 14,  # 명식 1건 약 7KB — 세 단계 합쳐 최대 약 110MB
+    'gods': 1 << 14,
+    'yongsin': 1 << 14,
+    'format': 1 << 14,
+}
+# chart_json 이 JSON 조각을 따로 캐시하는 단계 (캐시 이름 '<단계>:json', 크기는 단계와 같음)
+JSON_STAGES = ('napeum', 'interactions_stems', 'interactions_branches', 'sinsal_day', 'sinsal_stems',
+               'strength', 'gods', 'format')
+
+POSITIONS = ('year', 'month', 'day', 'hour')
+
+
+def _int_keys(node):
+    """JS 객체의 숫자 키('0', '11') → int (SEASON[mbi] 처럼 인덱스로 조회)"""
+    if isinstance(node, dict):
+        return {(int(k) if k.isdigit() else k): _int_keys(v) for k, v in node.items()}
+    if isinstance(node, list):
+        return [_int_keys(v) for v in node]
+    return node
+
+
+def load_tables(html, names=TABLE_NAMES):
+    """번들 스크립트의 최상위 데이터 표 → {이름: 값} (같은 이름은 처음 선언 사용)"""
+    found = {}
+    for body_start, body_end, _ in executable_scripts(html):
+        src = html[body_start:body_end]
+        tokens = tokenize(src)
+        for k in range(len(tokens) - 3):
+            if tokens[k][0] != 'word' or src[tokens[k][1]:tokens[k][2]] not in ('const', 'let', 'var'):
+                continue
+            name = src[tokens[k + 1][1]:tokens[k + 1][2]]
+            if name in names and name not in found and src[tokens[k + 2][1]:tokens[k + 2][2]] == '=':
+                found[name] = _int_keys(js_literal(src, tokens, k + 3)[0])
+    missing = [name for name in names if name not in found]
+    if missing:
+        raise ValueError(f'번들에 표 정의가 없음: {", ".join(missing)}')
+    return found
+
+
+def stale_ports(html, ported=PORTED_SHA):
+    """이식 뒤 번들에서 바뀌었거나 사라진 JS 함수 이름 목록"""
+    functions, _ = bundle_functions(html)
+    return [name for name, sha in ported.items()
+            if name not in functions or source_sha(html[functions[name][0]:functions[name][1]]) != sha]
+
+
+# ── JS 숫자 표기 ─────────────────────────────────────────────────────────────
+
+def _js_num(x):
+    """템플릿 리터럴 숫자 표기 (2.0 → '2')"""
+    return str(int(x)) if float(x).is_integer() else repr(x)
+
+
+def _to_fixed1(x):
+    """Number.prototype.toFixed(1) — 이진 값 그대로 반올림 (동률은 0 에서 먼 쪽)"""
+    return str(Decimal(x).quantize(Decimal('0.1'), rounding=ROUND_HALF_UP))
+
+
+# ── 함수 본문 안의 표 (JS 원문 그대로) ───────────────────────────────────────
+
+# calcStrength
+JIJANGGAN_W = {0: [(8, 0.33), (9, 0.67)],
+               1: [(9, 0.3), (7, 0.1), (5, 0.6)],
+               2: [(4, 0.23), (2, 0.23), (0, 0.54)],
+               3: [(0, 0.33), (1, 0.67)],
+               4: [(1, 0.3), (9, 0.1), (4, 0.6)],
+               5: [(4, 0.23), (6, 0.23), (2, 0.54)],
+               6: [(2, 0.3), (5, 0.33), (3, 0.37)],
+               7: [(3, 0.3), (1, 0.1), (5, 0.6)],
+               8: [(4, 0.23), (8, 0.23), (6, 0.54)],
+               9: [(6, 0.33), (7, 0.67)],
+               10: [(7, 0.3), (3, 0.1), (4, 0.6)],
+               11: [(4, 0.23), (0, 0.23), (8, 0.54)]}
+STEM_COMBINE = {(0, 5), (1, 6), (2, 7), (3, 8), (4, 9), (5, 0), (6, 1), (7, 2), (8, 3), (9, 4)}  # 양방향
+MONTH_SCORE = {2: {'wood': 3, 'fire': 1, 'earth': -2, 'metal': -2, 'water': -1},
+               3: {'wood': 3, 'fire': 2, 'earth': -2, 'metal': -2, 'water': -1},
+               4: {'earth': 2, 'wood': 1, 'fire': -1, 'metal': -2, 'water': -1},
+               5: {'fire': 3, 'earth': 1, 'metal': -2, 'water': -2, 'wood': 0},
+               6: {'fire': 3, 'earth': 2, 'metal': -2, 'water': -2, 'wood': 0},
+               7: {'earth': 2, 'fire': 1, 'wood': -1, 'metal': -1, 'water': -2},
+               8: {'metal': 3, 'water': 1, 'wood': -2, 'fire': -2, 'earth': 0},
+               9: {'metal': 3, 'water': 2, 'wood': -2, 'fire': -2, 'earth': 0},
+               10: {'earth': 2, 'metal': 1, 'fire': -1, 'wood': -2, 'water': -1},
+               11: {'water': 3, 'wood': 1, 'fire': -2, 'earth': -2, 'metal': 0},
+               0: {'water': 3, 'wood': 2, 'fire': -2, 'earth': -2, 'metal': 0},
+               1: {'earth': 2, 'water': 1, 'metal': -1, 'wood': -1, 'fire': -2}}
+TWELVE_STARTS = [11, 6, 2, 9, 2, 9, 5, 0, 8, 3]
+TWELVE_NAMES = ['장생', '목욕', '관대', '건록', '제왕', '쇠', '병', '사', '묘', '절', '태', '양']
+STRENGTH_DIRECTIONAL = [([2, 3, 4], 'wood', '寅卯辰 목국'),
+                        ([5, 6, 7], 'fire', '巳午未 화국'),
+                        ([8, 9, 10], 'metal', '申酉戌 금국'),
+                        ([11, 0, 1], 'water', '亥子丑 수국')]
+STRENGTH_THREE_HARMONY = [([2, 6, 10], 'fire', '寅午戌 화국'),
+                          ([8, 0, 4], 'water', '申子辰 수국'),
+                          ([5, 9, 1], 'metal', '巳酉丑 금국'),
+                          ([11, 3, 7], 'wood', '亥卯未 목국')]
+ALL_CLASH = [(0, 6, '자오충', 3), (3, 9, '묘유충', 3), (1, 7, '축미충', 2),
+             (2, 8, '인신충', 2), (4, 10, '진술충', 2), (5, 11, '사해충', 2)]
+SIX_HARMONY = [(0, 1, 'earth', '자축합토'), (2, 11, 'wood', '인해합목'), (3, 10, 'fire', '묘술합화'),
+               (4, 9, 'metal', '진유합금'), (5, 8, 'water', '사신합수'), (6, 7, 'fire', '오미합화')]
+
+# analyzeSamhapBureau
+SAMHAP_BUREAU = [([2, 6, 10], 'fire', '인오술 화국(寅午戌 火局)'),
+                 ([8, 0, 4], 'water', '신자진 수국(申子辰 水局)'),
+                 ([5, 9, 1], 'metal', '사유축 금국(巳酉丑 金局)'),
+                 ([11, 3, 7], 'wood', '해묘미 목국(亥卯未 木局)')]
+
+# calcFormat
+FORMAT_SAMHAP_SETS = [([2, 6, 10], 'fire', '인오술 화국'),
+                      ([5, 9, 1], 'metal', '사유축 금국'),
+                      ([8, 0, 4], 'water', '신자진 수국'),
+                      ([11, 3, 7], 'wood', '해묘미 목국')]
+OUTER_GODS = ('식신', '상관', '편재', '정재', '편관', '정관', '편인', '정인')
+GEONROK_MAP = {0: 2, 1: 3, 2: 5, 3: 6, 4: 5, 5: 6, 6: 8, 7: 9, 8: 11, 9: 0}
+YANGIN_MAP = {0: 3, 1: 2, 2: 6, 3: 5, 4: 6, 5: 5, 6: 9, 7: 8, 8: 0, 9: 11}
+TEN_GOD_KEYS = ['peer', 'robWealth', 'eatingGod', 'hurtOfficer', 'indirectWealth', 'directWealth',
+                'indirectOfficer', 'directOfficer', 'indirectSeal', 'directSeal']
+
+# calcInteractions
+STEM_POSITIONS = ['년간', '월간', '일간', '시간']
+ST_COMB = [(0, 5, '갑기합토'), (1, 6, '을경합금'), (2, 7, '병신합수'), (3, 8, '정임합목'), (4, 9, '무계합화')]
+ST_CLASH = [(0, 6, '갑경충', '강한 결단력이지만 충돌이 많아요. 리더십과 권위의 갈등!'),
+            (1, 7, '을신충', '내면의 갈등. 유연함과 강함이 부딪혀요.'),
+            (2, 8, '병임충', '열정과 지혜가 충돌. 성급함 조심!'),
+            (3, 9, '정계충', '감성과 이성이 충돌. 감정 기복이 있어요.'),
+            (4, 4, '무무비견', '고집이 세고 자기주장이 강해요.'),
+            (5, 5, '기기비견', '순수하지만 우유부단할 수 있어요.')]
+BR_HAP = [(0, 1, '자축합토'), (2, 11, '인해합목'), (3, 10, '묘술합화'),
+          (4, 9, '진유합금'), (5, 8, '사신합수'), (6, 7, '오미합화')]
+BR_SAMHAP = [(2, 6, 10, '인오술 화국'), (5, 9, 1, '사유축 금국'), (8, 0, 4, '신자진 수국'), (11, 3, 7, '해묘미 목국')]
+WANGJI_CHUNG = [(0, 6), (3, 9)]
+BR_CLASH = [(0, 6, '자오충', '수화상전(水火相戰)! 심혈관/신장 건강과 정신적 갈등에 주의하세요.'),
+            (1, 7, '축미충', '재물 관련 변동이 있어요. 부동산이나 계약 조심!'),
+            (2, 8, '인신충', '활동량 많아지고 바빠져요. 교통사고, 수술 주의!'),
+            (3, 9, '묘유충', '문서, 계약 문제 생길 수 있어요. 간/폐 건강 주의!'),
+            (4, 10, '진술충', '고집 때문에 충돌해요. 소송, 관재 주의!'),
+            (5, 11, '사해충', '계획대로 안 될 수 있어요. 심혈관/비뇨기 건강 주의!')]
+BR_HYUNG = [(2, 5, '인사형(寅巳刑)', '무은지형 부분. 배신, 구설 조심!'),
+            (5, 8, '사신형(巳申刑)', '무은지형 부분. 냉정하고 갈등 많아요.'),
+            (2, 8, '인신형(寅申刑)', '충돌하면서도 끌리는 관계. 교통사고 주의!'),
+            (1, 10, '축술형(丑戌刑)', '무례지형 부분. 고집으로 충돌!'),
+            (10, 7, '술미형(戌未刑)', '무례지형 부분. 토끼리 다툼!'),
+            (1, 7, '축미형(丑未刑)', '무례지형 부분. 재물 다툼!'),
+            (0, 3, '자묘형(子卯刑)', '무례지형. 예의 잃기 쉬워요. 말실수 조심!')]
+SELF_PUNISH = {4: '진진자형(辰辰自刑)', 6: '오오자형(午午自刑)', 9: '유유자형(酉酉自刑)', 11: '해해자형(亥亥自刑)'}
+BR_PA = [(0, 9, '자유파', '관계 깨지기 쉬워요.'), (3, 6, '묘오파', '계획 틀어져요.'),
+         (2, 11, '인해파', '마무리 잘 하세요.'), (4, 1, '진축파', '기반 흔들려요.'),
+         (5, 8, '사신파', '갑작스러운 변동! 계획이 꼬여요.'), (7, 10, '미술파', '숨겨진 갈등이 쌓여요.')]
+BR_HAE = [(0, 7, '자미해', '가까운 사람이 발목 잡아요.'), (1, 6, '축오해', '동업 조심!'),
+          (2, 5, '인사해', '시기받아요. 너무 드러내지 마세요.'), (3, 4, '묘진해', '사소한 일로 큰 싸움 나요.'),
+          (8, 11, '신해해', '음지에서 발목 잡혀요. 뒤통수 조심!'), (9, 10, '유술해', '숨은 갈등으로 손해봐요. 경쟁자 주의!')]
+WON_JIN = [(0, 7, '자미원진'), (1, 6, '축오원진'), (2, 5, '인사원진'),
+           (3, 4, '묘진원진'), (8, 11, '신해원진'), (9, 10, '유술원진')]
+GUI_MEN = [(2, 7, '인미귀문'), (3, 8, '묘신귀문'), (4, 9, '진유귀문'),
+           (5, 10, '사술귀문'), (6, 11, '오해귀문'), (1, 6, '축오귀문')]
+HAP_GUI_MEN = [(4, 9)]
+NO_INTERACTION = {'t': '-', 'c': '없음', 'm': '특별한 합충형파해 없음', 'd': '사주 내 특별한 작용이 없어요. 평온한 사주!'}
+
+# calcSinsal
+GUIREN = {0: [1, 7], 1: [0, 8], 2: [11, 9], 3: [11, 9], 4: [1, 7], 5: [0, 8], 6: [7, 1], 7: [6, 2], 8: [5, 3], 9: [5, 3]}
+TIANDE = [9, 8, 7, 6, 5, 4, 3, 2, 1, 0, 9, 8]
+YUEDE = [2, 6, 2, 6, 4, 8, 4, 8, 0, 6, 0, 6]
+MUNCHANG = {0: 5, 1: 6, 2: 8, 3: 9, 4: 8, 5: 9, 6: 11, 7: 0, 8: 2, 9: 3}
+XUETANG = {0: 11, 1: 6, 2: 2, 3: 9, 4: 2, 5: 9, 6: 5, 7: 0, 8: 8, 9: 3}
+JIANGX = {0: 0, 1: 9, 2: 6, 3: 3, 4: 0, 5: 9, 6: 6, 7: 3, 8: 0, 9: 9, 10: 6, 11: 3}
+JINYU = {0: 4, 1: 5, 2: 7, 3: 8, 4: 7, 5: 8, 6: 10, 7: 11, 8: 1, 9: 2}
+FUXING = {0: 2, 1: 3, 2: 5, 3: 6, 4: 5, 5: 6, 6: 8, 7: 9, 8: 11, 9: 0}
+ANLU = {0: 11, 1: 10, 2: 1, 3: 0, 4: 1, 5: 0, 6: 3, 7: 2, 8: 5, 9: 4}
+JIANLU = {0: 2, 1: 3, 2: 5, 3: 6, 4: 5, 5: 6, 6: 8, 7: 9, 8: 11, 9: 0}
+TIANYI = [11, 0, 1, 2, 3, 4, 5, 6, 7, 8, 9, 10]
+YIMA = {0: 2, 1: 11, 2: 8, 3: 5, 4: 2, 5: 11, 6: 8, 7: 5, 8: 2, 9: 11, 10: 8, 11: 5}
+TAOHUA = {0: 9, 1: 6, 2: 3, 3: 0, 4: 9, 5: 6, 6: 3, 7: 0, 8: 9, 9: 6, 10: 3, 11: 0}
+HUAGAI = {0: 4, 1: 1, 2: 10, 3: 7, 4: 4, 5: 1, 6: 10, 7: 7, 8: 4, 9: 1, 10: 10, 11: 7}
+HONGYAN = {0: 6, 1: 5, 2: 8, 3: 7, 4: 8, 5: 7, 6: 9, 7: 8, 8: 11, 9: 10}
+KUIGANG = [[6, 4], [], [6, 4], [], [6, 10], [], [6, 10], [], [], []]
+YANGREN = {0: 3, 1: 2, 2: 6, 3: 5, 4: 6, 5: 5, 6: 9, 7: 8, 8: 0, 9: 11}
+BAIHU = [6, 7, 8, 9, 10, 11, 0, 1, 2, 3, 4, 5]
+BAIHU_DAESAL = [(0, 4), (1, 7), (2, 10), (3, 1), (4, 4), (5, 7), (6, 10), (7, 1), (8, 4), (9, 7)]
+JIESHA = {0: 5, 1: 2, 2: 11, 3: 8, 4: 5, 5: 2, 6: 11, 7: 8, 8: 5, 9: 2, 10: 11, 11: 8}
+WANGSHEN = {0: 9, 1: 6, 2: 3, 3: 0, 4: 9, 5: 6, 6: 3, 7: 0, 8: 9, 9: 6, 10: 3, 11: 0}
+YUANCHEN = [[7], [6], [5], [4], [3], [2], [1], [0], [11], [10], [9], [8]]
+GUIMEN = [[5, 6], [6, 7], [7, 8], [8, 9], [9, 10], [10, 11], [11, 0], [0, 1], [1, 2], [2, 3], [3, 4], [4, 5]]
+LIUHAI = [[7], [6], [5], [4], [3], [2], [1], [0], [11], [10], [9], [8]]
+GULUAN_M = [[0, 2], [1, 3], [2, 5], [3, 6], [4, 5], [5, 6], [6, 8], [7, 9], [8, 11], [9, 0]]
+GULUAN_F = [[1, 3], [0, 2], [3, 6], [2, 5], [3, 6], [2, 5], [7, 9], [6, 8], [9, 0], [8, 11]]
+SANZAI = {0: [2, 3, 4], 1: [11, 0, 1], 2: [5, 6, 7], 3: [8, 9, 10], 4: [2, 3, 4], 5: [11, 0, 1],
+          6: [5, 6, 7], 7: [8, 9, 10], 8: [2, 3, 4], 9: [11, 0, 1], 10: [5, 6, 7], 11: [8, 9, 10]}
+PANAN = {0: 2, 1: 3, 2: 5, 3: 6, 4: 5, 5: 6, 6: 8, 7: 9, 8: 11, 9: 0}
+TIANCHU = {0: 5, 1: 6, 2: 8, 3: 9, 4: 8, 5: 9, 6: 11, 7: 0, 8: 2, 9: 3}
+TIANSHA = [(2, 0), (3, 1), (5, 2), (6, 3), (8, 4), (9, 5), (11, 6), (0, 7), (2, 8), (3, 9)]
+TANGHUA_PAIRS = [(1, 6), (6, 1), (2, 5), (5, 2)]
+TIANGAN_HAP = [(0, 5), (1, 6), (2, 7), (3, 8), (4, 9)]
+
+SINSAL = {
+    'guiren': {'n': '천을귀인(天乙貴人)', 't': 'good', 'd': '최고의 길신! 위기에 꼭 귀인이 나타나요. 관직운, 시험운이 좋고 위험을 피해가요.', 'i': '👼', 'lv': '최상'},
+    'tiande': {'n': '천덕귀인(天德貴人)', 't': 'good', 'd': '하늘의 덕이 있어요! 착하게 살면 복이 와요. 흉한 일도 길하게 바뀌어요.', 'i': '🌟', 'lv': '상'},
+    'yuede': {'n': '월덕귀인(月德貴人)', 't': 'good', 'd': '달의 덕이 있어요! 인기가 많고 사람들에게 신뢰받아요. 공직에 유리해요.', 'i': '🌙', 'lv': '상'},
+    'munchang': {'n': '문창귀인(文昌貴人)', 't': 'good', 'd': '공부 머리 최고! 시험운, 자격증운, 학위운이 좋아요. 글쓰기도 잘해요.', 'i': '📚', 'lv': '상'},
+    'xuetang': {'n': '학당귀인(學堂貴人)', 't': 'good', 'd': '학자 기질! 연구, 교육 분야에서 성공해요. 교수, 박사, 전문가에 딱!', 'i': '🎓', 'lv': '상'},
+    'jiangx': {'n': '장성(將星)', 't': 'good', 'd': '장군 기질! 리더십이 뛰어나고 사람들이 따라요. 조직의 수장이 될 수 있어요.', 'i': '🎖️', 'lv': '상'},
+    'jinyu': {'n': '금여(金輿)', 't': 'good', 'd': '배우자복 최고! 결혼하면 운이 트이고, 좋은 짝을 만나요.', 'i': '💍', 'lv': '상'},
+    'fuxing': {'n': '복성귀인(福星貴人)', 't': 'good', 'd': '복이 많은 사주! 의식주 걱정 없고 평생 먹고 살 복이 있어요.', 'i': '🍀', 'lv': '상'},
+    'anlu': {'n': '암록(暗祿)', 't': 'good', 'd': '숨은 복이 있어요! 눈에 안 보이는 곳에서 도움을 받아요.', 'i': '🎁', 'lv': '중'},
+    'jianlu': {'n': '건록(建祿)', 't': 'good', 'd': '자수성가형! 스스로 일어서서 성공하는 타입. 직업 안정적이에요.', 'i': '🏠', 'lv': '상'},
+    'tianyi': {'n': '천의성(天醫星)', 't': 'good', 'd': '의료 적성! 의사, 간호사, 약사에 딱 맞아요. 건강 관련 직업 대길!', 'i': '💊', 'lv': '중'},
+    'yima': {'n': '역마살(驛馬殺)', 't': 'neutral', 'd': '움직여야 운이 트여요! 여행, 출장, 이사, 해외 발령... 가만히 있으면 답답해요.', 'i': '🐎', 'lv': '중'},
+    'taohua': {'n': '도화살(桃花殺)', 't': 'neutral', 'd': '매력 폭발! 이성에게 인기 많아요. 연예인 기질! 단, 바람기 조심.', 'i': '🌸', 'lv': '중'},
+    'huagai': {'n': '화개살(華蓋殺)', 't': 'neutral', 'd': '예술가 기질! 음악, 그림, 글쓰기 재능. 종교, 철학에 관심 많아요.', 'i': '🎨', 'lv': '중'},
+    'hongyan': {'n': '홍염살(紅艶殺)', 't': 'neutral', 'd': '섹시한 매력! 이성을 끄는 힘이 있어요. 연예계 적성, 바람기 주의!', 'i': '💋', 'lv': '중'},
+    'kuigang': {'n': '괴강살(魁罡殺)', 't': 'bad', 'd': '성격이 불 같아요! 카리스마 있고 리더 자질, 하지만 독단적일 수 있어요.', 'i': '⚡', 'lv': '상'},
+    'yangren': {'n': '양인살(羊刃殺)', 't': 'bad', 'd': '칼날 같은 기운! 결단력 있지만 날카로워요. 군인, 외과의, 법조인에 적합.', 'i': '🗡️', 'lv': '상'},
+    'baihu': {'n': '백호살(白虎殺)', 't': 'bad', 'd': '사고, 수술 주의! 하지만 의료인, 요리사 등 피 보는 직업은 오히려 좋아요.', 'i': '🐯', 'lv': '중'},
+    'baihuDaeSal': {'n': '백호대살(白虎大殺)', 't': 'bad', 'd': '일주에 백호가 있어요! 겉으로는 온순해 보여도 속에 강한 기운이 있습니다. 배우자궁에 백호가 있으니 배우자의 기가 세거나, 건강 문제가 있을 수 있어요. 의료, 군경, 요리 등 피를 다루는 직업이 오히려 좋아요.', 'i': '🐅', 'lv': '상'},
+    'jiesha': {'n': '겁살(劫殺)', 't': 'bad', 'd': '돈 잃기 쉬워요! 도난, 사기, 투자 실패 주의. 보증 절대 안 돼요!', 'i': '💸', 'lv': '중'},
+    'wangshen': {'n': '망신살(亡神殺)', 't': 'bad', 'd': '망신당하기 쉬워요! SNS 조심, 술자리 실수 주의하세요.', 'i': '😰', 'lv': '중'},
+    'yuanchen': {'n': '원진살(怨嗔殺)', 't': 'bad', 'd': '미워도 떨어질 수 없는 인연이 있어요. 가까운 사람과 갈등 조심.', 'i': '💔', 'lv': '중'},
+    'guimen': {'n': '귀문관살(鬼門關殺)', 't': 'bad', 'd': '정신적 고통이 있을 수 있어요. 우울, 불안 조심. 명상, 종교가 도움 돼요.', 'i': '👻', 'lv': '중'},
+    'xuanzhen': {'n': '현침살(懸針殺)', 't': 'bad', 'd': '바늘처럼 날카로운 기운! 비판적이고 완벽주의. 침술, 봉제에 재능.', 'i': '📍', 'lv': '하'},
+    'liuhai': {'n': '육해살(六害殺)', 't': 'bad', 'd': '가까운 사람에게 해를 입을 수 있어요. 배우자, 형제 관계 주의.', 'i': '⚠️', 'lv': '중'},
+    'tianluodiwang': {'n': '천라지망(天羅地網)', 't': 'bad', 'd': '하늘 그물에 걸린 형상. 구설, 소송 주의. 갇힌 느낌을 받을 수 있어요.', 'i': '🕸️', 'lv': '중'},
+    'guluan': {'n': '고란살(孤鸞殺)', 't': 'bad', 'd': '외로운 기운이 있어요. 결혼이 늦거나 독신 경향. 혼자 있는 시간이 많아요.', 'i': '🦢', 'lv': '하'},
+    'sanzai': {'n': '삼재(三災) 기간', 't': 'bad', 'd': '현재 삼재 기간이에요! 3년간 조심하세요. 무리한 확장, 이사, 수술 피하세요.', 'i': '🔥', 'lv': '중'},
+    'panan': {'n': '반안살(攀鞍殺)', 't': 'good', 'd': '직장운 좋아요! 안정적인 조직에서 승진하는 타입. 공기업, 대기업에 적합.', 'i': '💺', 'lv': '중'},
+    'tianchu': {'n': '천주귀인(天廚貴人)', 't': 'good', 'd': '먹는 복이 있어요! 평생 굶을 일 없어요. 요식업에도 재능!', 'i': '🍽️', 'lv': '중'},
+    'tiansha': {'n': '천사일(天赦日) 출생', 't': 'good', 'd': '하늘이 용서하는 날에 태어났어요! 죄를 지어도 풀리고, 흉이 길로 바뀌어요.', 'i': '🕊️', 'lv': '상'},
+    'tanghua': {'n': '탕화살(湯火殺)', 't': 'bad', 'd': '화상, 열병, 약물 부작용 주의! 화병이나 정신적 스트레스에도 취약해요. 뜨거운 음식, 화기를 다룰 때 조심하세요.', 'i': '🔥', 'lv': '상'},
+    'jaehon': {'n': '정편재 혼잡(財混)', 't': 'bad', 'd': '정재와 편재가 모두 천간에 있어요. 이성 관계가 복잡해지기 쉬워요. 재물의 입출도 빈번합니다. 한 우물을 파는 게 좋아요.', 'i': '💔', 'lv': '중'},
+    'shangGuanHapSal': {'n': '상관합살(傷官合殺)', 't': 'good', 'd': '위기를 기회로 바꾸는 협상가 재능! 상관(언변/기술)이 편관(위험/적)을 합으로 제어해요. 로비스트, 협상가, 중재자, 해결사에 탁월해요.', 'i': '🤝', 'lv': '상'},
+}
+NO_SINSAL = {'n': '특이신살 없음', 't': 'neutral', 'd': '특별한 신살이 없어요. 평온하고 안정적인 사주예요!', 'i': '☯︎', 'lv': '중'}
+
+# calcGongmang
+GONGMANG_MAP = {0: [10, 11], 10: [8, 9], 8: [6, 7], 6: [4, 5], 4: [2, 3], 2: [0, 1]}
+GONGMANG_PILLARS = ['년지', '월지', '일지', '시지']
+
+
+# ── 엔진 ─────────────────────────────────────────────────────────────────────
+
+_dumps = json.JSONEncoder(ensure_ascii=False, separators=(',', ':')).encode
+
+
+def _join_lists(*encoded):
+    """JSON 배열 조각 여러 개 → 하나로 이은 배열 (모두 비면 None)"""
+    items = [e[1:-1] for e in encoded if e != '[]']
+    return '[' + ','.join(items) + ']' if items else None
+
+
+def split_pillars(gz):
+    """(년, 월, 일[, 시]) 60갑자 인덱스 → (천간 튜플, 지지 튜플)"""
+    return tuple(g % 10 for g in gz), tuple(g % 12 for g in gz)
+
+
+class ChartEngine:
+    """번들 표 + 단계별 LRU 캐시. chart() 가 JS 결과 화면과 같은 순서로 단계를 부른다"""
+
+    def __init__(self, html, cache_sizes=None):
+        self.lang = bundle_lang(html)
+        if self.lang != PORTED_LANG:
+            raise ValueError(f'{self.lang} 번들은 지원하지 않음 — 명식 계산은 {PORTED_LANG} 번들 기준 이식')
+        t = load_tables(html)
+        self.STEM, self.BRANCH, self.ELEMENT = t['STEM'], t['BRANCH'], t['ELEMENT']
+        self.EL_ORDER, self.SEASON, self.TEN_GODS = t['EL_ORDER'], t['SEASON'], t['TEN_GODS']
+        self.JIJANGGAN, self.SOUND_ELEMENT = t['JIJANGGAN'], t['SOUND_ELEMENT']
+        self.FORMATS_INNER, self.FORMATS_SPECIAL = t['FORMATS_INNER'], t['FORMATS_SPECIAL']
+        self.CLIMATE_BALANCE, self.DIRECTIONAL_HARMONY = t['CLIMATE_BALANCE'], t['DIRECTIONAL_HARMONY']
+        self.stale = stale_ports(html)
+        sizes = dict(CACHE_SIZES, **(cache_sizes or {}))
+        self.caches = {}
+        for name in CACHE_SIZES:
+            cached = functools.lru_cache(maxsize=sizes[name])(getattr(self, '_' + name))
+            setattr(self, name, cached)
+            self.caches[name] = cached
+        self.fragment = {}
+        for name in JSON_STAGES:
+            cached = functools.lru_cache(maxsize=sizes[name])(functools.partial(self._json, name))
+            self.fragment[name] = self.caches[name + ':json'] = cached
+
+    def _el(self, el, step):
+        return self.EL_ORDER[(self.EL_ORDER.index(el) + step) % 5]
+
+    def cache_stats(self):
+        """단계별 {hits, misses, size, maxsize, hit_rate}"""
+        out = {}
+        for name, cached in self.caches.items():
+            info = cached.cache_info()
+            total = info.hits + info.misses
+            out[name] = {'hits': info.hits, 'misses': info.misses, 'size': info.currsize,
+                         'maxsize': info.maxsize, 'hit_rate': round(info.hits / total, 4) if total else None}
+        return out
+
+    def clear(self):
+        for cached in self.caches.values():
+            cached.cache_clear()
+
+    # ── 1주 · 일주 단위 ──
+
+    def _napeum(self, gz):
+        """calcNapeum"""
+        napeum = self.SOUND_ELEMENT[gz // 2]
+        return {'name': napeum['name'], 'element': napeum['element'],
+                'elementK': self.ELEMENT[napeum['element']]['k'], 'desc': napeum['desc']}
+
+    def _void(self, day_gz):
+        """calcGongmang 의 공망 지지 (일주 순(旬)으로 정해짐)"""
+        gm = GONGMANG_MAP.get((day_gz % 12 - day_gz % 10 + 12) % 12, [10, 11])
+        return gm, [self.BRANCH[gm[0]]['c'], self.BRANCH[gm[1]]['c']]
+
+    def gongmang(self, day_gz, brs):
+        """calcGongmang"""
+        gm, names = self.void(day_gz)
+        return {'gm': gm, 'names': names, 'affected': [GONGMANG_PILLARS[i] for i, b in enumerate(brs) if b in gm]}
+
+    def _ten_god(self, si, dmi):
+        """getTenGod(STEM[si], STEM[dmi])"""
+        stem, day = self.STEM[si], self.STEM[dmi]
+        diff = (self.EL_ORDER.index(stem['e']) - self.EL_ORDER.index(day['e']) + 5) % 5
+        return self.TEN_GODS[TEN_GOD_KEYS[diff * 2 + (0 if day['y'] == stem['y'] else 1)]]
+
+    # ── 지지 조합 단위 ──
+
+    def _samhap(self, brs):
+        """analyzeSamhapBureau"""
+        result = {'complete': False, 'partial': False, 'element': None, 'name': None, 'count': 0}
+        for branches, element, name in SAMHAP_BUREAU:
+            present = [b for b in branches if b in brs]
+            if len(present) == 3:
+                result = {'complete': True, 'partial': False, 'element': element, 'name': name, 'count': 3}
+                break
+            elif len(present) == 2 and branches[1] in brs:
+                if not result['complete']:
+                    chars = ''.join(self.BRANCH[b]['c'] for b in present)
+                    result = {'complete': False, 'partial': True, 'element': element,
+                              'name': chars + ' 반합(' + name.split('(')[0] + ')', 'count': 2,
+                              'presentBranches': present}
+        return result
+
+    def _directional(self, brs):
+        """analyzeDirectionalHarmony"""
+        results = []
+        for bh in self.DIRECTIONAL_HARMONY:
+            has = [b in brs for b in bh['branches']]
+            count = sum(has)
+            element_k = self.ELEMENT[bh['element']]['k']
+            if count == 3:
+                results.append({'type': 'complete', 'name': bh['name'], 'dir': bh['dir'],
+                                'element': bh['element'], 'elementK': element_k,
+                                'branches': ''.join(self.BRANCH[b]['c'] for b in bh['branches']),
+                                'power': '강력',
+                                'desc': f"{bh['dir']} 완성! {element_k} 기운이 매우 강해집니다."})
+            elif count == 2:
+                missing = self.BRANCH[next(b for b, h in zip(bh['branches'], has) if not h)]['c']
+                results.append({'type': 'partial', 'name': bh['name'] + ' 미완', 'dir': bh['dir'],
+                                'element': bh['element'], 'elementK': element_k,
+                                'branches': ''.join(self.BRANCH[b]['c'] for b, h in zip(bh['branches'], has) if h),
+                                'missing': missing, 'power': '중간',
+                                'desc': f"{missing}가 오면 {bh['dir']}이 완성됩니다."})
+        return results
+
+    def _interactions_branches(self, brs):
+        """calcInteractions 의 지지 부분 (육합·삼합·충·형·자형·파·해·원진·귀문·방합)"""
+        B = self.BRANCH
+        res = []
+        for a, b, n in BR_HAP:
+            if a in brs and b in brs:
+                res.append({'t': '六合', 'c': f"{B[a]['c']}+{B[b]['c']}", 'm': n, 'd': '지지가 합하여 화합하는 기운! 좋은 인연!'})
+        for a, b, c, n in BR_SAMHAP:
+            has = [a in brs, b in brs, c in brs]
+            if sum(has) == 3:
+                res.append({'t': '三合', 'c': f"{B[a]['c']}{B[b]['c']}{B[c]['c']}", 'm': n, 'd': '완전한 삼합! 강력한 기운이 형성돼요!'})
+            elif sum(has) == 2 and has[1]:
+                chars = f"{B[a]['c']}{B[b]['c']}" if has[0] else f"{B[b]['c']}{B[c]['c']}" if has[2] else ''
+                res.append({'t': '半合', 'c': chars, 'm': n.split(' ')[0] + ' 반합', 'd': '반쪽 삼합. 부분적으로 기운이 형성돼요.'})
+        for a, b, n, desc in BR_CLASH:
+            if a in brs and b in brs:
+                dist = abs(brs.index(a) - brs.index(b))
+                is_wangji = any((a == wa and b == wb) or (a == wb and b == wa) for wa, wb in WANGJI_CHUNG)
+                strength = '⚡왕지 충돌' if is_wangji else '⚡강한 충' if dist == 1 else '보통 충' if dist == 2 else '약한 충'
+                res.append({'t': '沖', 'c': f"{B[a]['c']}↔{B[b]['c']}", 'm': f'{n} ({strength})', 'd': desc})
+        inyeon = 2 in brs and 5 in brs and 8 in brs
+        chuksul = 1 in brs and 10 in brs and 7 in brs
+        if inyeon:
+            res.append({'t': '三刑', 'c': '寅巳申', 'm': '무은지형(無恩之刑)', 'd': '은혜를 모르는 형! 배은망덕 조심. 큰 사고, 관재 주의!'})
+        if chuksul:
+            res.append({'t': '三刑', 'c': '丑戌未', 'm': '무례지형(無禮之刑)', 'd': '예의 없는 형! 고집 세고 불화. 대인관계 조심!'})
+        for a, b, n, desc in BR_HYUNG:
+            if a in brs and b in brs:
+                if not (inyeon and a in (2, 5, 8) and b in (2, 5, 8)) and not (chuksul and a in (1, 10, 7) and b in (1, 10, 7)):
+                    res.append({'t': '刑', 'c': f"{B[a]['c']}↔{B[b]['c']}", 'm': n, 'd': desc})
+        for bi in sorted(set(brs) & SELF_PUNISH.keys()):  # Object.entries: 정수 키 오름차순
+            cnt = brs.count(bi)
+            if cnt >= 2:
+                triple = cnt >= 3
+                bn = B[bi]['c']
+                res.append({'t': '自刑', 'c': bn + '+' + (bn + '+' + bn if triple else bn),
+                            'm': SELF_PUNISH[bi] + (' (三重)' if triple else ''),
+                            'd': '자기 자신을 해치는 형. 자책, 우울 조심! 스스로를 사랑하세요.'})
+        for t, table in (('破', BR_PA), ('害', BR_HAE)):
+            for a, b, n, desc in table:
+                if a in brs and b in brs:
+                    res.append({'t': t, 'c': f"{B[a]['c']}↔{B[b]['c']}", 'm': n, 'd': desc})
+        for a, b, n in WON_JIN:
+            if a in brs and b in brs:
+                res.append({'t': '怨嗔', 'c': f"{B[a]['c']}↔{B[b]['c']}", 'm': n, 'd': '미워도 떨어질 수 없는 악연. 부부 사이면 갈등이 깊어요.'})
+        for a, b, n in GUI_MEN:
+            if a in brs and b in brs:
+                if any((a == ha and b == hb) or (a == hb and b == ha) for ha, hb in HAP_GUI_MEN):
+                    res.append({'t': '鬼門', 'c': f"{B[a]['c']}↔{B[b]['c']}", 'm': n + '(합귀문)',
+                                'd': '합이면서 귀문! 겉으로는 좋아 보이지만 속으로 병드는 관계. 직장/조직에서 스트레스 누적 주의.'})
+                else:
+                    res.append({'t': '鬼門', 'c': f"{B[a]['c']}↔{B[b]['c']}", 'm': n, 'd': '귀신의 문. 정신적 불안, 우울증 주의. 명상과 휴식이 필요해요.'})
+        for d in self.directional(brs):
+            if d['type'] == 'complete':
+                res.append({'t': '方合', 'c': d['branches'], 'm': d['name'], 'd': '방합 완성! ' + d['dir'] + ' 강력한 방향성 기운.'})
+            elif d['type'] == 'partial':
+                res.append({'t': '方合半', 'c': d['branches'], 'm': d['name'], 'd': d.get('desc') or '방합 잠재. ' + d['missing'] + ' 오면 완성.'})
+        return res
+
+    # ── 천간 조합 단위 ──
+
+    def _interactions_stems(self, stems):
+        """calcInteractions 의 천간 부분 (천간합·기반·천간충)"""
+        S = self.STEM
+        res = []
+        added = set()
+        n_st = len(stems)
+        for a, b, n in ST_COMB:
+            for i in range(n_st):
+                for j in range(i + 1, n_st):
+                    if (stems[i] == a and stems[j] == b) or (stems[i] == b and stems[j] == a):
+                        key = f'天合:{min(a, b)}-{max(a, b)}'
+                        if key not in added:
+                            added.add(key)
+                            if j - i == 1:
+                                res.append({'t': '天合', 'c': f"{S[a]['c']}+{S[b]['c']}", 'm': n,
+                                            'd': f'{STEM_POSITIONS[i]}-{STEM_POSITIONS[j]} 인접합. 새로운 기운을 만들어요!'})
+                            else:
+                                res.append({'t': '氣絆', 'c': f"{S[a]['c']}~{S[b]['c']}", 'm': f'{n}(기반)',
+                                            'd': f'{STEM_POSITIONS[i]}-{STEM_POSITIONS[j]} 원거리. 뜻은 있으나 합력이 약해요.'})
+        for a, b, n, desc in ST_CLASH:
+            for i in range(n_st):
+                for j in range(i + 1, n_st):
+                    if (stems[i] == a and stems[j] == b) or (stems[i] == b and stems[j] == a):
+                        res.append({'t': '天沖', 'c': f"{S[a]['c']}↔{S[b]['c']}", 'm': n, 'd': desc})
+        return res
+
+    def interactions(self, stems, brs):
+        """calcInteractions"""
+        return (self.interactions_stems(stems) + self.interactions_branches(brs)) or [NO_INTERACTION]
+
+    def _sinsal_stems(self, stems):
+        """calcSinsal 의 천간 십신 부분 (정편재 혼잡·상관합살)"""
+        gods = [self.ten_god(s, stems[2])['k'] for s in stems]
+        ss = []
+        if '정재' in gods and '편재' in gods:
+            ss.append(SINSAL['jaehon'])
+        hap_sal = False
+        for i in range(len(stems)):
+            for j in range(i + 1, len(stems)):
+                is_hap = any((stems[i] == a and stems[j] == b) or (stems[i] == b and stems[j] == a) for a, b in TIANGAN_HAP)
+                if is_hap and {gods[i], gods[j]} == {'상관', '편관'}:
+                    hap_sal = True
+        if hap_sal:
+            ss.append(SINSAL['shangGuanHapSal'])
+        return ss
+
+    # ── 일간 × 지지 조합 단위 ──
+
+    def _sinsal_day(self, dmi, brs):
+        """calcSinsal 의 일간·지지 부분 → (고란살 앞, 삼재 뒤) 두 묶음"""
+        ybi, mbi, dbi = brs[0], brs[1], brs[2]
+        has = brs.__contains__
+        ss = []
+        if any(b in GUIREN[dmi] for b in brs):
+            ss.append(SINSAL['guiren'])
+        if dmi == TIANDE[mbi] or has(TIANDE[mbi]):
+            ss.append(SINSAL['tiande'])
+        if dmi == YUEDE[mbi]:
+            ss.append(SINSAL['yuede'])
+        for key, table, idx in (('munchang', MUNCHANG, dmi), ('xuetang', XUETANG, dmi), ('jiangx', JIANGX, ybi),
+                                ('jinyu', JINYU, dmi), ('fuxing', FUXING, dmi), ('anlu', ANLU, dmi),
+                                ('jianlu', JIANLU, dmi)):
+            if has(table[idx]):
+                ss.append(SINSAL[key])
+        if has(TIANYI[mbi]):
+            ss.append(SINSAL['tianyi'])
+        for key, table, idx in (('yima', YIMA, ybi), ('taohua', TAOHUA, ybi), ('huagai', HUAGAI, ybi),
+                                ('hongyan', HONGYAN, dmi)):
+            if has(table[idx]):
+                ss.append(SINSAL[key])
+        if dbi in KUIGANG[dmi]:
+            ss.append(SINSAL['kuigang'])
+        if dbi == YANGREN[dmi]:
+            ss.append(SINSAL['yangren'])
+        if has(BAIHU[mbi]):
+            ss.append(SINSAL['baihu'])
+        if (dmi, dbi) in BAIHU_DAESAL:
+            ss.append(SINSAL['baihuDaeSal'])
+        if has(JIESHA[ybi]):
+            ss.append(SINSAL['jiesha'])
+        if has(WANGSHEN[ybi]) and WANGSHEN[ybi] != TAOHUA[ybi]:
+            ss.append(SINSAL['wangshen'])
+        if any(b in YUANCHEN[ybi] for b in brs):
+            ss.append(SINSAL['yuanchen'])
+        if any(b in GUIMEN[ybi] for b in brs):
+            ss.append(SINSAL['guimen'])
+        if dmi in (0, 7):
+            ss.append(SINSAL['xuanzhen'])
+        if any(b in LIUHAI[dbi] and b != dbi for b in brs):
+            ss.append(SINSAL['liuhai'])
+        if (dbi == 10 and mbi in (5, 6)) or (dbi == 11 and mbi in (9, 10)):
+            ss.append(SINSAL['tianluodiwang'])
+        tail = []
+        if has(PANAN[dmi]):
+            tail.append(SINSAL['panan'])
+        if has(TIANCHU[dmi]):
+            tail.append(SINSAL['tianchu'])
+        if any(dbi == b and dmi == s for b, s in TIANSHA):
+            tail.append(SINSAL['tiansha'])
+        for i in range(len(brs)):
+            for j in range(i + 1, len(brs)):
+                if (brs[i], brs[j]) in TANGHUA_PAIRS:
+                    tail.append(SINSAL['tanghua'])
+                    break
+        return ss, tail
+
+    @staticmethod
+    def _sinsal_personal(stems, brs, gender, year):
+        """calcSinsal 의 고란살(GENDER)·삼재(올해) — 캐시 키에 넣지 않는 부분"""
+        ss = []
+        if (GULUAN_M if gender == 'm' else GULUAN_F)[stems[2]][1] == brs[2]:
+            ss.append(SINSAL['guluan'])
+        if ((year or date.today().year) - 4) % 12 in SANZAI[brs[0]]:
+            ss.append(SINSAL['sanzai'])
+        return ss
+
+    def sinsal(self, stems, brs, gender='m', year=None):
+        """calcSinsal (gender = JS GENDER, year = 삼재 기준 올해 — 기본 오늘)"""
+        head, tail = self.sinsal_day(stems[2], brs)
+        ss = head + self._sinsal_personal(stems, brs, gender, year) + tail + self.sinsal_stems(stems)
+        return ss or [NO_SINSAL]
+
+    def _climate(self, stems, brs):
+        """analyzeClimate"""
+        mbi = brs[1]
+        season = self.SEASON[mbi]
+        cold = sum(1 for b in brs if b in (0, 1, 11))
+        hot = sum(1 for b in brs if b in (5, 6, 7))
+        water = sum(1 for s in stems if self.STEM[s]['e'] == 'water')
+        fire = sum(1 for s in stems if self.STEM[s]['e'] == 'fire')
+        total_cold, total_hot = cold + water, hot + fire
+        if total_cold >= 4:
+            if mbi in (0, 1, 11):
+                kind, desc = '극한(極寒)', '한겨울 얼어붙은 사주입니다. 火 기운이 절실히 필요합니다.'
+            elif mbi in (2, 3, 4):
+                kind, desc = '한습(寒濕)', '봄이지만 水 기운이 과다하여 습하고 냉합니다. 火로 온기를 더해야 합니다.'
+            elif mbi in (8, 9, 10):
+                kind, desc = '냉습(冷濕)', '가을에 水가 과다하여 습하고 서늘합니다. 火 기운이 필요합니다.'
+            else:
+                kind, desc = '수과다(水過多)', '여름이지만 水가 넘쳐납니다. 균형이 필요합니다.'
+            needs = ['fire', 'wood']
+        elif total_cold >= 3 or (cold >= 2 and season != 'summer'):
+            kind, desc, needs = '한(寒)', '차가운 사주입니다. 따뜻한 火 기운이 필요합니다.', ['fire', 'wood']
+        elif total_hot >= 4:
+            kind, desc, needs = '극조(極燥)', '불바다 사주입니다. 水 기운이 절실히 필요합니다.', ['water', 'metal']
+        elif total_hot >= 3 or (hot >= 2 and season != 'winter'):
+            kind, desc, needs = '조(燥)', '뜨겁고 건조한 사주입니다. 시원한 水 기운이 필요합니다.', ['water', 'metal']
+        elif season == 'winter':
+            kind, desc, needs = '한(寒)', '겨울 사주입니다. 따뜻한 火 기운이 필요합니다.', ['fire', 'wood']
+        elif season == 'summer':
+            kind, desc, needs = '조(燥)', '여름 사주입니다. 시원한 水 기운이 필요합니다.', ['water', 'metal']
+        else:
+            kind, desc, needs = '중화(中和)', '기후가 비교적 균형 잡힌 사주입니다.', []
+        return {'type': kind, 'desc': desc, 'needs': needs}
+
+    # ── 4주 전체 ──
+
+    def _elements(self, stems, brs):
+        """countElements (지장간은 일수 비례 0.5 가중)"""
+        ec = {'wood': 0, 'fire': 0, 'earth': 0, 'metal': 0, 'water': 0}
+        for s in stems:
+            ec[self.STEM[s]['e']] += 1
+        for b in brs:
+            ec[self.BRANCH[b]['e']] += 1
+            for j in self.JIJANGGAN.get(b, []):
+                ec[self.STEM[j['stem']]['e']] += j['days'] / 30 * 0.5
+        return ec
+
+    def _strength(self, gz):
+        """calcStrength"""
+        stems, brs = split_pillars(gz)
+        S = self.STEM
+        dmi = stems[2]
+        dme = S[dmi]['e']
+        mbi = brs[1]
+        score = 0
+        factors = []
+        peer_el, seal_el, expr_el = dme, self._el(dme, 4), self._el(dme, 1)
+        wealth_el, officer_el = self._el(dme, 2), self._el(dme, 3)
+        all_stems = [stems[0], stems[1]] + list(stems[3:])
+        disabled_seals, disabled_peers = [], []
+        pairs = [('year', 'month', stems[0], stems[1]), ('month', 'day', stems[1], stems[2]),
+                 ('day', 'hour', stems[2], stems[3] if len(stems) > 3 else None)]
+        for pos1, pos2, i1, i2 in pairs:
+            if i2 is None:
+                continue
+            if (i1, i2) in STEM_COMBINE:
+                for pos, i in ((pos1, i1), (pos2, i2)):
+                    if pos != 'day':
+                        if S[i]['e'] == seal_el:
+                            disabled_seals.append(i)
+                        if S[i]['e'] == peer_el:
+                            disabled_peers.append(i)
+                factors.append({'l': '🔗 천간합', 'v': f"{S[i1]['c']}{S[i2]['c']}合 ({pos1}-{pos2}) → 무력화", 'p': False})
+
+        ms = MONTH_SCORE[mbi][dme]
+        deuk_ryung = ms >= 2
+        score += ms * 6
+        factors.append({'l': '월령득령', 'v': f"{self.BRANCH[mbi]['c']}월 {'✓당령' if deuk_ryung else '✗실령'} ({'+' if ms >= 0 else ''}{ms * 6})",
+                        'p': deuk_ryung})
+
+        real_root = 0
+        has_root = {'day': False, 'hour': False}
+        is_yang = dmi % 2 == 0
+        for idx, bi in enumerate(brs):
+            position = POSITIONS[idx]
+            weight = 1.5 if position == 'day' else 1.3 if position == 'hour' else 1.2 if position == 'month' else 1.0
+            tw = bi - TWELVE_STARTS[dmi]
+            tw = TWELVE_NAMES[(tw if is_yang else -tw) % 12]
+            bonus = 0
+            if tw in ('건록', '제왕'):
+                bonus = 4 * weight
+            elif tw in ('관대', '장생'):
+                bonus = 2 * weight
+            if bonus and position in has_root:
+                has_root[position] = True
+            real_root += bonus
+            for hs, hw in JIJANGGAN_W[bi]:
+                if S[hs]['e'] in (peer_el, seal_el):
+                    real_root += hw * weight * 2
+                    if position in has_root:
+                        has_root[position] = True
+        score += min(real_root, 15)
+        root_strong = real_root >= 4
+        factors.append({'l': '통근(실제뿌리)', 'v': f'✓ {_to_fixed1(real_root)}점' if root_strong else f'✗ 약근 ({_to_fixed1(real_root)})',
+                        'p': root_strong})
+
+        help_count = attack_count = expr_stems = 0
+        for si in all_stems:
+            if si in disabled_seals or si in disabled_peers:
+                factors.append({'l': '⚠️ 합거', 'v': f"{S[si]['c']} 무력화됨", 'p': False})
+                continue
+            e = S[si]['e']
+            if e == peer_el:
+                help_count += 1
+                score += 2.5
+            if e == seal_el:
+                help_count += 1
+                score += 2
+            if e == officer_el:
+                attack_count += 1
+                score -= 2
+            if e == wealth_el:
+                attack_count += 1
+                score -= 1
+            if e == expr_el:
+                expr_stems += 1
+                score -= 2
+        if help_count > 0:
+            factors.append({'l': '천간 비겁/인성', 'v': f'{help_count}개 투출', 'p': True})
+        if attack_count > 0:
+            factors.append({'l': '천간 관/재 압박', 'v': f'{attack_count}개', 'p': False})
+        expr_total = expr_stems + sum(1 for b in brs if self.BRANCH[b]['e'] == expr_el)
+        if expr_total >= 3:
+            score -= 4
+            factors.append({'l': '⚠️ 식상태과', 'v': f'{expr_total}개 → 설기과다 (−4)', 'p': False})
+        elif expr_stems >= 2:
+            score -= 2
+            factors.append({'l': '⚠️ 식상 투출', 'v': f'{expr_stems}天干 (−2)', 'p': False})
+        officer_total = (sum(1 for s in all_stems if S[s]['e'] == officer_el)
+                         + sum(1 for b in brs if self.BRANCH[b]['e'] == officer_el))
+        if officer_total >= 2:
+            score -= 2
+            factors.append({'l': '관살압박', 'v': f'{officer_total}개 (−2)', 'p': False})
+
+        directional_formed = None
+        for branches, element, name in STRENGTH_DIRECTIONAL:
+            if all(b in brs for b in branches):
+                directional_formed = name
+                if element == peer_el:
+                    score += 8
+                    factors.append({'l': '🔥 방합', 'v': f'{name} → 비겁 (+8)', 'p': True})
+                elif element == seal_el:
+                    score += 6
+                    factors.append({'l': '🔥 방합', 'v': f'{name} → 인성 (+6)', 'p': True})
+                elif element == expr_el:
+                    score -= 5
+                    factors.append({'l': '⚠️ 방합', 'v': f'{name} → 설기 (−5)', 'p': False})
+                elif element == officer_el:
+                    score -= 6
+                    factors.append({'l': '⚠️ 방합', 'v': f'{name} → 압박 (−6)', 'p': False})
+        if not directional_formed:
+            for branches, element, name in STRENGTH_THREE_HARMONY:
+                has_count = sum(1 for b in branches if b in brs)
+                if has_count >= 2 and branches[1] in brs:
+                    full = has_count == 3
+                    if element == peer_el:
+                        bonus = 7 if full else 4
+                        score += bonus
+                        factors.append({'l': '🔥 삼합', 'v': f'{name} → 비겁 (+{bonus})', 'p': True})
+                    elif element == seal_el:
+                        bonus = 5 if full else 3
+                        score += bonus
+                        factors.append({'l': '🔥 삼합', 'v': f'{name} → 인성 (+{bonus})', 'p': True})
+                    elif element == expr_el:
+                        penalty = 4 if full else 2
+                        score -= penalty
+                        factors.append({'l': '⚠️ 삼합', 'v': f'{name} → 설기 (−{penalty})', 'p': False})
+                    elif element == officer_el:
+                        penalty = 5 if full else 3
+                        score -= penalty
+                        factors.append({'l': '⚠️ 삼합', 'v': f'{name} → 압박 (−{penalty})', 'p': False})
+
+        clash_set = set()
+        for a, b, name, penalty in ALL_CLASH:
+            if a in brs and b in brs:
+                score -= penalty
+                factors.append({'l': '⚡ 왕지충' if penalty == 3 else '⚡ 충', 'v': f'{name} (−{penalty})', 'p': False})
+                clash_set.add((min(a, b), max(a, b)))
+        for ha, hb, res_el, hname in SIX_HARMONY:
+            for pi in range(min(3, len(brs) - 1)):
+                bi, bj = brs[pi], brs[pi + 1]
+                if (bi == ha and bj == hb) or (bi == hb and bj == ha):
+                    if (min(ha, hb), max(ha, hb)) in clash_set:
+                        continue
+                    hap = 2 if res_el == peer_el else 1.5 if res_el == seal_el else -2 if res_el == officer_el else -1
+                    score += hap
+                    factors.append({'l': '🤝 육합', 'v': f"{hname} → {self.ELEMENT[res_el]['k']} ({'+' if hap > 0 else ''}{_js_num(hap)})",
+                                    'p': hap > 0})
+
+        kind, extreme = 'balanced', None
+        if score >= 15:
+            kind, extreme = 'strong', '극신강'
+        elif score >= 8:
+            kind = 'strong'
+        elif score >= 3:
+            kind = 'balanced'
+        elif score <= -5:
+            kind, extreme = 'weak', '극신약'
+        elif score <= 2:
+            kind = 'weak'
+        if (has_root['day'] or has_root['hour']) and extreme == '극신약':
+            kind, extreme = 'weak', None
+            factors.append({'l': '⚡ 뿌리보정', 'v': '극신약→신약', 'p': True})
+        pct = max(5, min(95, _js_round((score + 15) / 40 * 100)))
+        if has_root['hour'] and pct < 15:
+            pct = 15
+        if has_root['day'] and pct < 20:
+            pct = 20
+        return {'type': kind, 'score': _js_round(score * 10) / 10, 'pct': pct, 'factors': factors,
+                'extreme': extreme, 'hourRoot': has_root['hour'], 'dayRoot': has_root['day'],
+                'disabledSeals': disabled_seals, 'disabledPeers': disabled_peers}
+
+    def find_byung_yak(self, stems, brs):
+        """findByungYak"""
+        dm_el = self.STEM[stems[2]]['e']
+        ec = self.elements(stems, brs)
+        byung = yak = None
+        max_el, max_count = None, 0
+        for e in self.EL_ORDER:
+            if ec[e] > max_count and e != dm_el:
+                max_el, max_count = e, ec[e]
+        if max_count >= 3:
+            byung, yak = max_el, self._el(max_el, 3)
+        return {'byung': byung, 'yak': yak,
+                'desc': f"{self.ELEMENT[byung]['k']}이 과다하니 {self.ELEMENT[yak]['k']}으로 제어" if byung else None}
+
+    def _gods(self, gz):
+        """calcGods (samhapResult = analyzeSamhapBureau — fullAnalysis 가 넘기는 값)"""
+        stems, brs = split_pillars(gz)
+        st = self.strength(gz)
+        samhap = self.samhap(brs)
+        dmi, mbi = stems[2], brs[1]
+        climate = self.climate(stems, brs)
+        is_han = '한' in climate['type'] or '寒' in climate['type']
+        is_jo = '조' in climate['type'] or '燥' in climate['type']
+        johu_data = self.CLIMATE_BALANCE.get(dmi, {}).get(mbi)
+        johu, johu_desc = (johu_data['yong'], johu_data['desc']) if johu_data else (None, '')
+        dm_el = self.STEM[dmi]['e']
+        seal_el, peer_el, expr_el = self._el(dm_el, 4), dm_el, self._el(dm_el, 1)
+        wealth_el, officer_el = self._el(dm_el, 2), self._el(dm_el, 3)
+        el_count = {'wood': 0, 'fire': 0, 'earth': 0, 'metal': 0, 'water': 0}
+        for s, b in zip(stems, brs):
+            el_count[self.STEM[s]['e']] += 1
+            el_count[self.BRANCH[b]['e']] += 1
+        yong = hee = gi = None
+        is_follower, follower_type = False, None
+        if st['pct'] < 10 and not st['dayRoot'] and not st['hourRoot']:
+            max_el, max_count = None, 0
+            for el, cnt in el_count.items():
+                if el != dm_el and cnt > max_count:
+                    max_el, max_count = el, cnt
+            if max_count >= 4:
+                is_follower = True
+                if max_el == wealth_el:
+                    follower_type, yong, hee, gi = '종재격', max_el, self._el(max_el, 1), seal_el
+                elif max_el == officer_el:
+                    follower_type, yong, hee, gi = '종살격', max_el, self._el(max_el, 4), dm_el
+                elif max_el == expr_el:
+                    follower_type, yong, hee, gi = '종아격', max_el, self._el(max_el, 1), seal_el
+                else:
+                    follower_type, yong, hee, gi = '종강격', max_el, self._el(max_el, 4), self._el(max_el, 3)
+                johu_desc = f'{follower_type}: 극신약으로 {max_el}을 따름'
+        if not is_follower and st['type'] == 'strong':
+            yong, hee, gi = expr_el, wealth_el, seal_el
+        elif not is_follower and st['type'] == 'weak':
+            yong, hee, gi = seal_el, peer_el, officer_el
+        elif not is_follower:
+            yong, hee, gi = expr_el, wealth_el, officer_el
+        ec = self.elements(stems, brs)
+        is_officer_strong = ec.get(officer_el, 0) >= 2 or samhap['element'] == officer_el
+        if st['type'] == 'weak' and is_officer_strong:
+            yong, hee, gi = seal_el, peer_el, wealth_el
+            johu_desc = (johu_desc or '') + ' (통관용신: 관살태왕 제어)'
+        elif is_han and (johu == 'fire' or yong == 'fire'):
+            yong, hee, gi = 'fire', 'wood', 'water'
+            johu_desc = (johu_desc or '') + ' (조후 우선: 한습 사주)'
+        if is_jo and (johu == 'water' or yong == 'water'):
+            yong, hee, gi = 'water', 'metal', 'fire'
+            johu_desc = (johu_desc or '') + ' (조후 우선: 조열 사주)'
+        if samhap['complete']:
+            samhap_el = samhap['element']
+            if (samhap_el, dm_el) in (('metal', 'wood'), ('fire', 'metal'), ('water', 'fire'), ('wood', 'earth'), ('earth', 'water')):
+                yong, hee = expr_el, 'fire'
+                johu_desc = (johu_desc or '') + f" ({samhap['name']} 제살)"
+            if (samhap_el, dm_el) in (('water', 'wood'), ('wood', 'fire'), ('fire', 'earth'), ('earth', 'metal'), ('metal', 'water')):
+                yong = expr_el
+                johu_desc = (johu_desc or '') + f" ({samhap['name']} 설기)"
+        return {'yong': yong, 'hee': hee, 'gi': gi, 'type': st['type'], 'johu': johu, 'johuDesc': johu_desc,
+                'climate': climate, 'byungYak': self.find_byung_yak(stems, brs),
+                'sub': (johu_data or {}).get('sub') or None, 'isFollower': is_follower, 'followerType': follower_type}
+
+    def _yongsin(self, gz):
+        """fullAnalysis 의 (용신, 희신, 기신) 오행 — 택일·궁합 점수가 쓰는 부분만"""
+        stems, brs = split_pillars(gz)
+        st = self.strength(gz)
+        samhap = self.samhap(brs)
+        climate = self.climate(stems, brs)['type']
+        el_count = dict(self.elements(stems, brs))
+        if samhap['complete']:
+            el_count[samhap['element']] += 2
+        elif samhap['partial']:
+            el_count[samhap['element']] += 1
+        dm_el = self.STEM[stems[2]]['e']
+        peer_el, expr_el, wealth_el = dm_el, self._el(dm_el, 1), self._el(dm_el, 2)
+        officer_el, seal_el = self._el(dm_el, 3), self._el(dm_el, 4)
+        is_weak, is_strong = st['type'] == 'weak', st['type'] == 'strong'
+        officer_power = el_count[officer_el] + ((3 if samhap['complete'] else 1) if samhap['element'] == officer_el else 0)
+        is_officer_strong = officer_power >= 2
+        is_wealth_strong = el_count[wealth_el] >= 3
+        picked = None
+        if st['pct'] >= 90 and el_count[peer_el] >= 6:
+            picked = (peer_el, seal_el, officer_el)  # 종격
+        if not picked and st['pct'] <= 10 and not st['dayRoot'] and not st['hourRoot']:
+            dom_el, dom_cnt = None, 0
+            for el in self.EL_ORDER:
+                if el != dm_el and el_count[el] > dom_cnt:
+                    dom_el, dom_cnt = el, el_count[el]
+            if dom_cnt >= 4:
+                picked = {wealth_el: (wealth_el, expr_el, seal_el),      # 종재격
+                          officer_el: (officer_el, wealth_el, peer_el),  # 종살격
+                          expr_el: (expr_el, wealth_el, seal_el)}.get(dom_el)  # 종아격
+        if picked:
+            yong, hee, gi = picked
+        elif '극한' in climate or '한' in climate:
+            yong, hee, gi = ('fire', seal_el, officer_el) if is_officer_strong and seal_el == 'water' else ('fire', 'wood', 'water')
+        elif '극조' in climate or '조' in climate:
+            yong, hee, gi = 'water', 'metal', 'fire'
+        elif is_weak and is_officer_strong:
+            yong, hee, gi = seal_el, peer_el, wealth_el
+        elif is_wealth_strong and is_weak:
+            yong, hee, gi = (seal_el, peer_el, wealth_el) if el_count[peer_el] <= 1 else (peer_el, seal_el, wealth_el)
+        elif is_strong:
+            yong, hee, gi = expr_el, wealth_el, seal_el
+        elif is_weak:
+            yong, hee, gi = seal_el, peer_el, officer_el
+        else:
+            yong, hee, gi = expr_el, wealth_el, officer_el
+        if samhap['complete'] and samhap['element'] == officer_el and yong != seal_el:
+            yong = expr_el  # 식신제살
+        return yong, hee, gi
+
+    def check_special_format(self, stems, brs, st):
+        """checkSpecialFormat"""
+        if not st['extreme']:
+            return None
+        dmi = stems[2]
+        ec = self.elements(stems, brs)
+        counts = {'bigeop': 0, 'sikSang': 0, 'jae': 0, 'gwan': 0, 'in': 0}
+        groups = {'비견': 'bigeop', '겁재': 'bigeop', '식신': 'sikSang', '상관': 'sikSang', '편재': 'jae',
+                  '정재': 'jae', '편관': 'gwan', '정관': 'gwan', '편인': 'in', '정인': 'in'}
+        for s in stems:
+            counts[groups[self.ten_god(s, dmi)['k']]] += 1
+        sik_sang_root = self.ten_god(stems[0], dmi)['k'] in ('상관', '식신') and brs[0] in (5, 6)
+        special = self.FORMATS_SPECIAL
+        if st['extreme'] == '극신강' and not sik_sang_root:
+            if counts['bigeop'] >= 3:
+                return special['jongwang']
+            if counts['in'] >= 2 and counts['bigeop'] >= 2:
+                return special['jonggang']
+        if st['extreme'] == '극신약':
+            if counts['sikSang'] >= 3:
+                return special['jonga']
+            if counts['jae'] >= 3:
+                return special['jongjae']
+            if counts['gwan'] >= 3:
+                return special['jongsal']
+            if not st['hourRoot'] and not st['dayRoot']:
+                dm_el = self.STEM[dmi]['e']
+                if counts['sikSang'] >= 2 and ec[self._el(dm_el, 1)] >= 4:
+                    return special['jonga']
+                if counts['jae'] >= 2 and ec[self._el(dm_el, 2)] >= 4:
+                    return special['jongjae']
+                if counts['gwan'] >= 2 and ec[self._el(dm_el, 3)] >= 4:
+                    return special['jongsal']
+        return None
+
+    def check_yangin_geonrok(self, stems, brs):
+        """checkYangInGeonRok"""
+        dsi = stems[2]
+        if brs[1] == GEONROK_MAP[dsi]:
+            return self.FORMATS_SPECIAL['geonrok']
+        if brs[2] == YANGIN_MAP[dsi]:
+            return {**self.FORMATS_SPECIAL['yangin'], 'hasYangIn': True}
+        return None
+
+    def is_format_broken(self, stems, format_god):
+        """isFormatBroken"""
+        gods = [self.ten_god(s, stems[2])['k'] for s in stems]
+        reasons = []
+        if format_god == '정관':
+            reasons += ['상관견관(傷官見官): 상관이 정관을 극하여 파격'] * gods.count('상관')
+        if format_god == '식신':
+            reasons += ['효신탈식(梟神奪食): 편인이 식신을 극하여 파격'] * gods.count('편인')
+        if format_god in ('정재', '편재'):
+            if gods.count('비견') + gods.count('겁재') >= 2:
+                reasons.append('군겁쟁재(群劫爭財): 비겁이 많아 재를 빼앗김')
+        return reasons
+
+    def _format(self, gz, samhap=True):
+        """calcFormat — samhap=False 는 samhapResult 없이 부른 경우 (삼합 변격 판정 생략)"""
+        stems, brs = split_pillars(gz)
+        st = self.strength(gz)
+        special = self.check_special_format(stems, brs, st)
+        if special:
+            return {**special, 'type': 'special', 'god': '특수'}
+        yangin_geonrok = self.check_yangin_geonrok(stems, brs)
+        if yangin_geonrok and '양인' in yangin_geonrok['n']:
+            return {**yangin_geonrok, 'type': 'special', 'god': '양인'}
+        dmi, mbi = stems[2], brs[1]
+        dm_el = self.STEM[dmi]['e']
+        bureau = self.samhap(brs) if samhap else None
+        if bureau and bureau['complete'] and (self.EL_ORDER.index(bureau['element']) - self.EL_ORDER.index(dm_el) + 5) % 5 == 3:
+            name = bureau['name']
+            return {'n': f'편관격({name} 변격)',
+                    'd': f'{name}이 완성되어 관살이 태왕합니다. 식신제살이 필요하며, 제살이 되면 권력과 성공을 얻습니다. 칼을 쥔 장군의 기질이 있습니다.',
+                    'b': '군경, 검찰, 의료, 감사, 법조계',
+                    'formatReason': f'{name} 완전 성립으로 관살 지배',
+                    'god': '편관', 'type': 'samhap_variation', 'samhapBureau': name}
+        jj = self.JIJANGGAN[mbi]
+        main_jj = next((j for j in jj if j['days'] >= 16), jj[-1])
+        god = self.ten_god(main_jj['stem'], dmi)
+        month_god = self.ten_god(stems[1], dmi)
+        final_god = god['k']
+        reason = '월지 정기'
+        if month_god['k'] in OUTER_GODS:
+            msi = stems[1]
+            if any(j['stem'] == msi for j in jj):
+                final_god = month_god['k']
+                reason = '월간 투출+월지 통근'
+            month_stem_el = self.STEM[msi]['e']
+            for branches, result, name in FORMAT_SAMHAP_SETS:
+                has_count = sum(1 for b in branches if b in brs)
+                if has_count >= 2 and branches[1] in brs and month_stem_el == result:
+                    final_god = month_god['k']
+                    reason = f'월간 투출+{name} 완성' if has_count == 3 else f'월간 투출+{name} 반합(왕지 포함)'
+                    break
+            if final_god != month_god['k']:
+                for br_idx in [brs[0], brs[2]] + list(brs[3:]):
+                    if any(j['stem'] == msi for j in self.JIJANGGAN[br_idx]):
+                        for branches, result, name in FORMAT_SAMHAP_SETS:
+                            has_count = sum(1 for b in branches if b in brs)
+                            if has_count >= 2 and branches[1] in brs and br_idx in branches:
+                                final_god = month_god['k']
+                                reason = f"월간 투출+{self.BRANCH[br_idx]['c']}지 통근+{name.split(' ')[0]} 반합"
+                                break
+                        if final_god == month_god['k']:
+                            break
+        wealth_el = self._el(dm_el, 2)
+        if self.elements(stems, brs).get(wealth_el, 0) >= 3 and final_god in ('식신', '상관'):
+            if st['type'] == 'weak':
+                final_god = '편재' if self.EL_ORDER.index(dm_el) % 2 == 0 else '정재'
+                reason = f"지지 재성({self.ELEMENT[wealth_el]['k']}) 태왕 - 재다신약"
+        if yangin_geonrok and '건록' in yangin_geonrok['n']:
+            return {**yangin_geonrok, 'type': 'inner', 'god': '건록'}
+        reasons = self.is_format_broken(stems, final_god)
+        f = self.FORMATS_INNER.get(final_god) or self.FORMATS_INNER['정관']
+        return {**f, 'god': final_god, 'type': 'inner', 'broken': len(reasons) > 0, 'breakReasons': reasons,
+                'tougan': month_god['k'] if month_god['k'] != god['k'] else None, 'formatReason': reason}
+
+    # ── 명식 ──
+
+    def _json(self, stage, *key):
+        """단계 결과의 JSON 조각 (튜플 결과는 원소별 조각 튜플)"""
+        value = getattr(self, stage)(*key)
+        return tuple(_dumps(v) for v in value) if isinstance(value, tuple) else _dumps(value)
+
+    @staticmethod
+    def _pillars(gz):
+        gz = tuple(int(g) for g in gz)
+        return gz[:3] if gz[3] < 0 else gz
+
+    def chart(self, gz, gender='m', year=None):
+        """(년, 월, 일, 시) 60갑자 인덱스 (시 모름 = -1) → 명식 dict"""
+        gz = self._pillars(gz)
+        stems, brs = split_pillars(gz)
+        return {
+            'pillars': {pos: GAPJA[gz[i]] if i < len(gz) else None for i, pos in enumerate(POSITIONS)},
+            'strength': self.strength(gz),
+            'gods': self.gods(gz),
+            'format': self.format(gz),
+            'interactions': self.interactions(stems, brs),
+            'sinsal': self.sinsal(stems, brs, gender, year),
+            'gongmang': self.gongmang(gz[2], brs),
+            'napeum': {pos: self.napeum(g) for pos, g in zip(POSITIONS, gz)},
+        }
+
+    def chart_json(self, gz, gender='m', year=None):
+        """chart() 와 같은 내용의 JSON 문자열 — 단계별로 캐시된 조각을 이어 붙인다"""
+        gz = self._pillars(gz)
+        stems, brs = split_pillars(gz)
+        frag = self.fragment
+        head, tail = frag['sinsal_day'](stems[2], brs)
+        personal = _dumps(self._sinsal_personal(stems, brs, gender, year))
+        sinsal = _join_lists(head, personal, tail, frag['sinsal_stems'](stems)) or _dumps([NO_SINSAL])
+        interactions = (_join_lists(frag['interactions_stems'](stems), frag['interactions_branches'](brs))
+                        or _dumps([NO_INTERACTION]))
+        pillars = {pos: GAPJA[gz[i]] if i < len(gz) else None for i, pos in enumerate(POSITIONS)}
+        napeum = ','.join(f'"{pos}":' + frag['napeum'](g) for pos, g in zip(POSITIONS, gz))
+        return (f'{{"pillars":{_dumps(pillars)},"strength":{frag["strength"](gz)},"gods":{frag["gods"](gz)},'
+                f'"format":{frag["format"](gz)},"interactions":{interactions},"sinsal":{sinsal},'
+                f'"gongmang":{_dumps(self.gongmang(gz[2], brs))},"napeum":{{{napeum}}}}}')
+
+
+# ── 진입점 ──────────────────────────────────────────────────────────────────
+if __name__ == '__main__':
+    from saju_engine import PillarEngine, load_profile
+
+    parser = argparse.ArgumentParser(description='K-MUDANG 명식 1건 계산')
+    parser.add_argument('html_path', help='표를 읽을 번들 (ko.html)')
+    parser.add_argument('year', type=int)
+    parser.add_argument('month', type=int)
+    parser.add_argument('day', type=int)
+    parser.add_argument('--siji', type=int, default=-1, help='시지 인덱스 0~11 (모름 = -1)')
+    parser.add_argument('--gender', default='m', choices=['m', 'f'])
+    parser.add_argument('--year-now', type=int, default=None, help='삼재 기준 연도 (기본 올해)')
+    args = parser.parse_args()
+
+    with open(args.html_path, encoding='utf-8') as f:
+        html = f.read()
+    try:
+        engine = ChartEngine(html)
+    except ValueError as e:
+        print(f"❌ {args.html_path}: {e}")
+        sys.exit(1)
+    if engine.stale:
+        print(f"⚠️ 이식 뒤 번들에서 바뀐 JS 함수: {', '.join(engine.stale)}", file=sys.stderr)
+    out = PillarEngine(load_profile(args.html_path, engine.lang)).compute([args.year], [args.month], [args.day], [args.siji])
+    gz = (out['year'][0], out['month'][0], out['day'][0], out['hour'][0])
+    print(json.dumps(engine.chart(gz, args.gender, args.year_now), ensure_ascii=False, indent=2))
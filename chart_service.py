@@ -0,0 +1,234 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+K-MUDANG 로컬 명식 일괄 계산 서비스 v1.0
+사용법: python chart_service.py [--html ko.html] [--host 127.0.0.1] [--port 8765]
+                                [--chart-cache 16384]
+
+asyncio 단일 프로세스 HTTP/1.1(keep-alive) JSON 서비스. 외부 의존성 없이 로컬에서만 쓴다.
+  POST /charts   {"births": [{"year", "month", "day", "siji"?, "gender"?}, ...], "year"?: 삼재 기준 연도}
+                 → {"count": n, "charts": [chart_engine.ChartEngine.chart() 와 같은 구조, ...]}
+  GET  /chart?year=1990&month=5&day=17[&siji=6][&gender=f]   → 명식 1건
+  GET  /stats    요청·명식 수와 단계별 LRU 캐시 적중/미스 (ChartEngine.cache_stats)
+  GET  /health   상태와 이식 뒤 번들에서 바뀐 JS 함수 목록(stale)
+
+4주는 saju_engine.PillarEngine 으로 묶음 단위 벡터 계산하고, 나머지 단계는
+ChartEngine 의 단계별 캐시를 거쳐 JSON 조각을 이어 붙인다 (chart_json).
+묶음 사이에 이벤트 루프를 양보하므로 큰 요청이 다른 연결을 오래 막지 않는다.
+siji 는 시지 인덱스 0~11 (모름 = -1, 기본), gender 는 'm'(기본)/'f'.
+"""
+
+import sys, json, time, asyncio, argparse, calendar
+from urllib.parse import urlsplit, parse_qsl
+
+from chart_engine import ChartEngine
+from saju_engine import PillarEngine, load_profile
+
+MAX_HEADER = 16 << 10
+MAX_BODY = 8 << 20
+MAX_BIRTHS = 50000
+CHUNK = 256          # 4주 벡터 계산·이벤트 루프 양보 단위
+YEAR_RANGE = (1900, 2100)
+REASONS = {200: 'OK', 400: 'Bad Request', 404: 'Not Found', 405: 'Method Not Allowed',
+           413: 'Payload Too Large', 500: 'Internal Server Error'}
+
+
+class RequestError(Exception):
+    """클라이언트 오류 — (HTTP 상태, 메시지)"""
+
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+
+
+# ── 입력 검증 ────────────────────────────────────────────────────────────────
+
+def _int_field(birth, key, lo, hi, default=None):
+    value = birth.get(key, default)
+    if isinstance(value, str) and value.lstrip('-').isdigit():
+        value = int(value)
+    if not isinstance(value, int) or isinstance(value, bool) or not lo <= value <= hi:
+        raise RequestError(400, f"'{key}' 는 {lo}~{hi} 정수여야 함 (받은 값: {value!r})")
+    return value
+
+
+def parse_birth(birth):
+    """{"year", "month", "day", "siji"?, "gender"?} → (y, m, d, siji, gender)"""
+    if not isinstance(birth, dict):
+        raise RequestError(400, '출생 정보는 객체여야 함')
+    y = _int_field(birth, 'year', *YEAR_RANGE)
+    m = _int_field(birth, 'month', 1, 12)
+    d = _int_field(birth, 'day', 1, calendar.monthrange(y, m)[1])
+    siji = _int_field(birth, 'siji', -1, 11, default=-1)
+    gender = birth.get('gender', 'm')
+    if gender not in ('m', 'f'):
+        raise RequestError(400, f"'gender' 는 'm' 또는 'f' (받은 값: {gender!r})")
+    return y, m, d, siji, gender
+
+
+# ── 서비스 ──────────────────────────────────────────────────────────────────
+
+class ChartService:
+    """번들 1개의 PillarEngine + ChartEngine 과 요청 카운터"""
+
+    def __init__(self, html_path, cache_sizes=None):
+        with open(html_path, encoding='utf-8') as f:
+            self.engine = ChartEngine(f.read(), cache_sizes)
+        self.pillars = PillarEngine(load_profile(html_path, self.engine.lang))
+        self.started = time.time()
+        self.requests = 0
+        self.errors = 0
+        self.charts = 0
+
+    async def charts_json(self, births, year=None):
+        """검증된 출생 목록 → 명식 JSON 문자열 목록 (CHUNK 건마다 루프 양보)"""
+        out = []
+        chart_json = self.engine.chart_json
+        for at in range(0, len(births), CHUNK):
+            chunk = births[at:at + CHUNK]
+            cols = list(zip(*chunk))
+            gz = self.pillars.compute(cols[0], cols[1], cols[2], cols[3])
+            rows = zip(gz['year'].tolist(), gz['month'].tolist(), gz['day'].tolist(), gz['hour'].tolist())
+            out.extend(chart_json(row, birth[4], year) for row, birth in zip(rows, chunk))
+            if at + CHUNK < len(births):
+                await asyncio.sleep(0)
+        self.charts += len(out)
+        return out
+
+    async def handle(self, method, target, body):
+        """→ (상태, JSON 문자열)"""
+        url = urlsplit(target)
+        if url.path == '/charts':
+            if method != 'POST':
+                raise RequestError(405, 'POST 만 지원')
+            try:
+                payload = json.loads(body or b'null')
+            except ValueError as e:
+                raise RequestError(400, f'JSON 파싱 실패: {e}')
+            if not isinstance(payload, dict) or not isinstance(payload.get('births'), list):
+                raise RequestError(400, "본문은 {\"births\": [...]} 형식이어야 함")
+            if len(payload['births']) > MAX_BIRTHS:
+                raise RequestError(413, f'한 요청에 최대 {MAX_BIRTHS}건')
+            year = None if payload.get('year') is None else _int_field(payload, 'year', *YEAR_RANGE)
+            births = [parse_birth(b) for b in payload['births']]
+            charts = await self.charts_json(births, year)
+            return 200, f'{{"count":{len(charts)},"charts":[{",".join(charts)}]}}'
+        if method != 'GET':
+            raise RequestError(405, 'GET 만 지원')
+        if url.path == '/chart':
+            query = dict(parse_qsl(url.query))
+            year = None if 'year_now' not in query else _int_field(query, 'year_now', *YEAR_RANGE)
+            return 200, (await self.charts_json([parse_birth(query)], year))[0]
+        if url.path == '/stats':
+            return 200, json.dumps({
+                'uptime_s': round(time.time() - self.started, 1), 'requests': self.requests,
+                'errors': self.errors, 'charts': self.charts, 'caches': self.engine.cache_stats(),
+            }, ensure_ascii=False)
+        if url.path == '/health':
+            return 200, json.dumps({'ok': True, 'stale': self.engine.stale}, ensure_ascii=False)
+        raise RequestError(404, f'없는 경로: {url.path}')
+
+    # ── HTTP/1.1 ──
+
+    async def serve_connection(self, reader, writer):
+        try:
+            while True:
+                try:
+                    head = await reader.readuntil(b'\r\n\r\n')
+                except asyncio.IncompleteReadError:
+                    break  # 클라이언트가 연결 종료
+                except asyncio.LimitOverrunError:
+                    await self._respond(writer, 413, _error_body('헤더가 너무 큼'), False)
+                    break
+                keep_alive, status, body = await self._dispatch(head, reader)
+                await self._respond(writer, status, body, keep_alive)
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+    async def _dispatch(self, head, reader):
+        """요청 헤더(+본문 읽기) → (keep-alive 여부, 상태, JSON 문자열)"""
+        self.requests += 1
+        lines = head.decode('latin-1').split('\r\n')
+        parts = lines[0].split()
+        if len(parts) != 3 or not parts[2].startswith('HTTP/1.'):
+            self.errors += 1
+            return False, 400, _error_body('잘못된 요청 줄')
+        method, target, version = parts
+        headers = {}
+        for line in lines[1:]:
+            name, sep, value = line.partition(':')
+            if sep:
+                headers[name.strip().lower()] = value.strip()
+        connection = headers.get('connection', '').lower()
+        keep_alive = connection != 'close' if version == 'HTTP/1.1' else connection == 'keep-alive'
+        try:
+            length = int(headers.get('content-length', '0'))
+        except ValueError:
+            self.errors += 1
+            return False, 400, _error_body('잘못된 Content-Length')
+        if length > MAX_BODY:
+            self.errors += 1
+            return False, 413, _error_body(f'본문은 최대 {MAX_BODY} 바이트')
+        body = await reader.readexactly(length) if length else b''
+        try:
+            status, text = await self.handle(method, target, body)
+        except RequestError as e:
+            self.errors += 1
+            return keep_alive, e.status, _error_body(str(e))
+        except Exception as e:  # 한 요청의 오류로 서비스가 죽지 않게
+            self.errors += 1
+            print(f"❌ {method} {target}: {e!r}", file=sys.stderr)
+            return keep_alive, 500, _error_body('내부 오류')
+        return keep_alive, status, text
+
+    @staticmethod
+    async def _respond(writer, status, text, keep_alive):
+        data = text.encode('utf-8')
+        writer.write(f'HTTP/1.1 {status} {REASONS[status]}\r\n'
+                     f'Content-Type: application/json; charset=utf-8\r\n'
+                     f'Content-Length: {len(data)}\r\n'
+                     f'Connection: {"keep-alive" if keep_alive else "close"}\r\n\r\n'.encode('latin-1') + data)
+        await writer.drain()
+
+
+def _error_body(message):
+    return json.dumps({'error': message}, ensure_ascii=False)
+
+
+async def serve(service, host, port):
+    server = await asyncio.start_server(service.serve_connection, host, port, limit=MAX_HEADER)
+    addr = server.sockets[0].getsockname()
+    print(f"✅ 명식 서비스 대기 중: http://{addr[0]}:{addr[1]}  (POST /charts, GET /chart·/stats·/health)",
+          flush=True)
+    async with server:
+        await server.serve_forever()
+
+
+# ── 진입점 ──────────────────────────────────────────────────────────────────
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='K-MUDANG 로컬 명식 일괄 계산 서비스')
+    parser.add_argument('--html', default='ko.html', help='표·절기를 읽을 번들 (기본: ko.html)')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--chart-cache', type=int, default=None,
+                        help='4주 전체 키 단계(strength·gods·format) LRU 크기 (기본: chart_engine.CACHE_SIZES)')
+    args = parser.parse_args()
+
+    sizes = None
+    if args.chart_cache is not None:
+        sizes = {name: args.chart_cache for name in ('strength', 'gods', 'format')}
+    try:
+        service = ChartService(args.html, sizes)
+    except ValueError as e:
+        print(f"❌ {args.html}: {e}")
+        sys.exit(1)
+    if service.engine.stale:
+        print(f"⚠️ 이식 뒤 번들에서 바뀐 JS 함수: {', '.join(service.engine.stale)}", file=sys.stderr)
+    try:
+        asyncio.run(serve(service, args.host, args.port))
+    except KeyboardInterrupt:
+        print("🛑 종료")
@@ -0,0 +1,21 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+K-MUDANG 60갑자 이름표 (numpy·번들 파서 불필요)
+천간·지지·60갑자 순서와 아키타입 페이지 파일명 규칙. saju_engine.py(4주 계산),
+verify_consistency.py(감사), build_archetype_pages.py(페이지 생성)가 같은 정의를 쓴다.
+"""
+
+STEMS = '甲乙丙丁戊己庚辛壬癸'
+BRANCHES = '子丑寅卯辰巳午未申酉戌亥'
+GAPJA = [STEMS[i % 10] + BRANCHES[i % 12] for i in range(60)]
+
+# 아키타입 페이지 파일명: 천간 색 + 지지 동물 (예: 甲子 → blue-rat.html)
+STEM_SLUGS = dict(zip(STEMS, ['blue', 'blue', 'red', 'red', 'golden', 'golden',
+                              'white', 'white', 'black', 'black']))
+BRANCH_SLUGS = dict(zip(BRANCHES, ['rat', 'ox', 'tiger', 'rabbit', 'dragon', 'snake', 'horse',
+                                   'sheep', 'monkey', 'rooster', 'dog', 'pig']))
+
+
+def expected_page_file(gapja):
+    return f'{STEM_SLUGS[gapja[0]]}-{BRANCH_SLUGS[gapja[1]]}.html'
@@ -0,0 +1,233 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+K-MUDANG 4주 엔진 Golden Master 생성/검증기 v1.0
+사용법:
+  python golden_master.py generate ko.html golden_master.gm [--lang ko|jp] [--engine reference|vector]
+  python golden_master.py verify   ko.html golden_master.gm [--engine vector|reference]
+  (공통) --tables calendar_tables.bin : 절기 시각을 사전계산 테이블에서 조회
+         (기본: 번들 옆 calendar_tables.bin 이 그 번들로 만든 것이면 사용, --no-tables 로 끔)
+
+generate: 결정적 입력 세트(60일주 × 13시지 × 연도, 절기 경계 전후일, 월말/연말
+          早子時 경계, 서머타임 경계일)의 4주 결과를 열 단위 바이너리 파일로 저장.
+          기본은 스칼라 참조 구현으로 만들고, 만든 엔진을 헤더(engine)에 남긴다
+verify  : 파일을 청크 단위로 스트리밍하며 엔진으로 재계산해 필드별 불일치 보고.
+          기본 엔진은 파일을 만든 엔진의 반대편이며, 같은 엔진으로는 검증하지 않는다.
+          이식한 4주 JS 함수가 번들에서 바뀌었으면(saju_engine.stale_ports) 결과와 무관하게 실패
+필요 패키지: numpy
+"""
+
+import sys, json, struct, argparse, hashlib
+from datetime import date, timedelta
+
+import numpy as np
+
+from gapja import GAPJA
+from saju_engine import (AUTO_TABLES, PillarEngine, load_profile, reference_pillars, days_from_civil, days_in_month,
+                         stale_ports)
+
+MAGIC = b'KMGOLD1\n'
+CHUNK_ROWS = 65536
+YEARS = range(1900, 2101)
+SIJI_VALUES = range(-1, 12)
+
+# 열 정의: 입력 4열 + 출력 5열 (리틀엔디언 고정 폭)
+INPUT_COLUMNS = [('year', '<i2'), ('month', 'i1'), ('day', 'i1'), ('siji', 'i1')]
+OUTPUT_COLUMNS = [('year_gz', 'i1'), ('month_gz', 'i1'), ('day_gz', 'i1'), ('hour_gz', 'i1'), ('solar_month', 'i1')]
+COLUMNS = INPUT_COLUMNS + OUTPUT_COLUMNS
+ENGINE_FIELDS = {'year_gz': 'year', 'month_gz': 'month', 'day_gz': 'day',
+                 'hour_gz': 'hour', 'solar_month': 'solar_month'}
+ENGINES = ('vector', 'reference')
+OTHER_ENGINE = {'vector': 'reference', 'reference': 'vector'}
+LEGACY_ENGINE = 'vector'  # 헤더에 engine 이 없는 이전 파일은 벡터 엔진으로 생성됨
+
+
+# ── 입력 세트 ─────────────────────────────────────────────────────────────────
+
+def _civil(day_numbers):
+    """epoch 일수 배열 → (연, 월, 일) 배열"""
+    base = date(1970, 1, 1)
+    ds = [base + timedelta(days=int(n)) for n in day_numbers]
+    return (np.array([d.year for d in ds]), np.array([d.month for d in ds]), np.array([d.day for d in ds]))
+
+def build_cases(profile):
+    """결정적 입력 세트 → (year, month, day, siji) int64 배열 (중복 제거, 정렬)"""
+    days = []
+    # 1) 매년 60일 연속 구간 (60일주 전부) — 연도마다 시작일을 옮겨 월 분포도 섞음
+    for y in YEARS:
+        start = int(days_from_civil(np.int64(y), np.int64(1), np.int64(1))) + (y * 7) % 300
+        days.extend(range(start, start + 60))
+    # 2) 절기 경계일 ±1 (JS 와 같은 표 조회: 1940 이전 연도는 1940 표)
+    first, terms = profile['term_first_year'], profile['terms']
+    for y in YEARS:
+        row = terms[min(max(y, first), first + len(terms) - 1) - first]
+        for i, (tm, td, _, _) in enumerate(row):
+            n = int(days_from_civil(np.int64(y + (i == 11)), np.int64(tm), np.int64(td)))
+            days.extend((n - 1, n, n + 1))
+    # 3) 월말/연초 (경도 보정·早子時 날짜 이월 경계)
+    for y in YEARS:
+        for m in range(1, 13):
+            n = int(days_from_civil(np.int64(y), np.int64(m), days_in_month(np.int64(y), np.int64(m))))
+            days.extend((n, n + 1))
+    # 4) 서머타임·표준시 변경 경계일
+    for start, end in profile['summer_periods']:
+        for n in (start // 1440, end // 1440):
+            days.extend((n - 1, n, n + 1))
+    days = np.unique(np.array(days, dtype=np.int64))
+    y, m, d = _civil(days)
+    ys = np.repeat(y, len(SIJI_VALUES))
+    ms = np.repeat(m, len(SIJI_VALUES))
+    ds = np.repeat(d, len(SIJI_VALUES))
+    hs = np.tile(np.array(SIJI_VALUES, dtype=np.int64), len(days))
+    return ys, ms, ds, hs
+
+
+# ── 파일 포맷 ─────────────────────────────────────────────────────────────────
+# MAGIC | u32 헤더 길이 | JSON 헤더 | 청크 0 (열 0 바이트, 열 1 바이트, ...) | 청크 1 | ...
+
+def write_golden(path, columns, header):
+    rows = len(next(iter(columns.values())))
+    header = dict(header, rows=rows, chunk_rows=CHUNK_ROWS, columns=COLUMNS)
+    raw = json.dumps(header, ensure_ascii=False).encode('utf-8')
+    with open(path, 'wb') as f:
+        f.write(MAGIC)
+        f.write(struct.pack('<I', len(raw)))
+        f.write(raw)
+        for lo in range(0, rows, CHUNK_ROWS):
+            for name, dtype in COLUMNS:
+                f.write(np.ascontiguousarray(columns[name][lo:lo + CHUNK_ROWS], dtype=dtype).tobytes())
+    return rows
+
+def read_header(f):
+    if f.read(len(MAGIC)) != MAGIC:
+        raise ValueError('Golden Master 파일 형식이 아님')
+    (size,) = struct.unpack('<I', f.read(4))
+    return json.loads(f.read(size).decode('utf-8'))
+
+def iter_chunks(path):
+    """(헤더, 청크 dict) 를 청크 단위로 생성 — 파일 전체를 메모리에 올리지 않음"""
+    with open(path, 'rb') as f:
+        header = read_header(f)
+        rows, chunk = header['rows'], header['chunk_rows']
+        for lo in range(0, rows, chunk):
+            n = min(chunk, rows - lo)
+            cols = {}
+            for name, dtype in header['columns']:
+                dt = np.dtype(dtype)
+                cols[name] = np.frombuffer(f.read(n * dt.itemsize), dtype=dt).astype(np.int64)
+            yield header, lo, cols
+
+
+# ── 생성 / 검증 ───────────────────────────────────────────────────────────────
+
+def _source_digest(html_path):
+    with open(html_path, 'rb') as f:
+        return hashlib.sha256(f.read()).hexdigest()[:16]
+
+def generate(html_path, out_path, lang='ko', tables=AUTO_TABLES, engine='reference'):
+    profile = load_profile(html_path, lang, tables=tables)
+    y, m, d, h = build_cases(profile)
+    out = _compute(engine, profile, y, m, d, h)
+    columns = {'year': y, 'month': m, 'day': d, 'siji': h}
+    columns.update({name: out[field] for name, field in ENGINE_FIELDS.items()})
+    return write_golden(out_path, columns, {'lang': lang, 'engine': engine, 'source': html_path,
+                                            'source_sha256': _source_digest(html_path)})
+
+def _reference_compute(profile, y, m, d, h):
+    rows = [reference_pillars(profile, *map(int, r)) for r in zip(y, m, d, h)]
+    arr = np.array(rows, dtype=np.int64).reshape(-1, 4)
+    vec = PillarEngine(profile).compute(y, m, d, h)  # solar_month 은 참조 구현이 반환하지 않음
+    return {'year': arr[:, 0], 'month': arr[:, 1], 'day': arr[:, 2], 'hour': arr[:, 3],
+            'solar_month': vec['solar_month']}
+
+def _compute(engine, profile, y, m, d, h):
+    if engine == 'vector':
+        return PillarEngine(profile).compute(y, m, d, h)
+    return _reference_compute(profile, y, m, d, h)
+
+def verify_engine(gm_path, engine=None):
+    """검증에 쓸 엔진 — 기본은 파일을 만든 엔진의 반대편, 같은 엔진이면 ValueError"""
+    with open(gm_path, 'rb') as f:
+        generated_by = read_header(f).get('engine', LEGACY_ENGINE)
+    engine = engine or OTHER_ENGINE[generated_by]
+    if engine == generated_by:
+        raise ValueError(f'{gm_path} 는 {engine} 엔진으로 생성됨 — 같은 엔진 재계산은 검증이 아님 '
+                         f'(--engine {OTHER_ENGINE[engine]})')
+    return engine
+
+def verify(html_path, gm_path, engine=None, show=10, tables=AUTO_TABLES):
+    """(검증 건수, 필드별 불일치 건수 dict, 이식 뒤 바뀐 JS 함수 목록) 반환. 처음 show 건은 상세 출력"""
+    engine = verify_engine(gm_path, engine)
+    header = None
+    mismatches = {name: 0 for name in ENGINE_FIELDS}
+    rows = 0
+    shown = 0
+    for header, lo, cols in iter_chunks(gm_path):
+        if rows == 0:
+            profile = load_profile(html_path, header.get('lang', 'ko'), tables=tables)
+            vector = PillarEngine(profile)
+        args = (cols['year'], cols['month'], cols['day'], cols['siji'])
+        out = vector.compute(*args) if engine == 'vector' else _reference_compute(profile, *args)
+        bad_any = np.zeros(len(cols['year']), dtype=bool)
+        for name, field in ENGINE_FIELDS.items():
+            bad = out[field] != cols[name]
+            mismatches[name] += int(bad.sum())
+            bad_any |= bad
+        for i in np.flatnonzero(bad_any)[:max(0, show - shown)]:
+            shown += 1
+            inp = f"{cols['year'][i]}-{cols['month'][i]:02d}-{cols['day'][i]:02d} 시지={cols['siji'][i]}"
+            diffs = ', '.join(f"{name}: 기대={_fmt(name, cols[name][i])} 실제={_fmt(name, out[field][i])}"
+                              for name, field in ENGINE_FIELDS.items() if out[field][i] != cols[name][i])
+            print(f"  ❌ [{lo + i}] {inp} → {diffs}")
+        rows += len(cols['year'])
+    if header and header.get('source_sha256') != _source_digest(html_path):
+        print(f"  ℹ️ 기준 파일 생성 이후 {html_path} 가 변경됨 (생성 당시: {header.get('source')})")
+    with open(html_path, encoding='utf-8') as f:
+        stale = stale_ports(f.read(), header.get('lang', 'ko') if header else 'ko')
+    return rows, mismatches, stale
+
+def _fmt(name, value):
+    if name == 'solar_month' or value < 0:
+        return str(int(value))
+    return GAPJA[int(value)]
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='K-MUDANG 4주 엔진 Golden Master')
+    parser.add_argument('mode', choices=['generate', 'verify'])
+    parser.add_argument('html_path')
+    parser.add_argument('gm_path')
+    parser.add_argument('--lang', default='ko', choices=['ko', 'jp'], help='generate 시 보정 프로필')
+    parser.add_argument('--engine', default=None, choices=ENGINES,
+                        help='생성·재계산 엔진 (reference = 스칼라 참조 구현). '
+                             '기본: generate 는 reference, verify 는 파일을 만든 엔진의 반대편')
+    parser.add_argument('--tables', default=None,
+                        help='calendar_tables.py 로 만든 절기 테이블 (기본: 번들 옆 calendar_tables.bin 이 있으면 사용)')
+    parser.add_argument('--no-tables', action='store_true', help='절기 테이블 없이 직접 계산')
+    args = parser.parse_args()
+
+    try:
+        tables = None if args.no_tables else AUTO_TABLES
+        if args.tables:
+            from calendar_tables import CalendarTables
+            tables = CalendarTables(args.tables)
+        if args.mode == 'generate':
+            engine = args.engine or 'reference'
+            n = generate(args.html_path, args.gm_path, args.lang, tables, engine)
+            print(f"✅ Golden Master {n}건 저장 ({engine}) → {args.gm_path}")
+            sys.exit(0)
+
+        engine = verify_engine(args.gm_path, args.engine)
+        print(f"🔍 Golden Master 검증: {args.html_path} ↔ {args.gm_path} ({engine})")
+        rows, mismatches, stale = verify(args.html_path, args.gm_path, engine, tables=tables)
+    except (OSError, ValueError) as e:
+        print(f"❌ {e}")
+        sys.exit(1)
+    total = sum(mismatches.values())
+    for name, count in mismatches.items():
+        print(f"  {'✅' if count == 0 else '❌'} {name}: 불일치 {count}건")
+    if stale:
+        print(f"  ❌ 이식 뒤 번들에서 바뀐 JS 함수: {', '.join(stale)} (saju_engine.py 재이식 후 PORTED_SHA 갱신)")
+    ok = total == 0 and not stale
+    print(f"{'✅ 통과' if ok else '❌ 실패'}: {rows}건 검증")
+    sys.exit(0 if ok else 1)
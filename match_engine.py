@@ -0,0 +1,543 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+K-MUDANG 궁합 행렬 엔진 v1.0
+브라우저 analyzeMatchCore 의 궁합 점수(항목별 점수·총점) Python 이식판 (문구·화면은 옮기지 않음).
+용신·기신은 chart_engine.ChartEngine.yongsin (fullAnalysis) 을 쓴다.
+
+사용법:
+  python match_engine.py build ko.html [--out match_tables.npz]
+  python match_engine.py index ko.html candidates.csv [--out candidates.npz]
+  python match_engine.py top ko.html 1990 5 17 --candidates candidates.npz
+                         [--siji 6] [--gender f] [--rel romance] [--k 10] [--tables match_tables.npz]
+
+총점 = 40 + 16개 항목 합 (0~100 으로 자름). 항목을 실제로 의존하는 입력 범위로 나눈다.
+  일주 × 일주 (60×60)   일간·일지·방합·납음·암합·귀인·원진귀문·육친(내 성별)·12운성·공망
+  년주 × 년주 (60×60)   띠, 년지 원진 — 참이면 원진귀문 값을 덮어씀 (wonjin_delta 로 보정)
+  명식 단위 특징         삼합(양쪽 지지 집합)·용신·신강약·조후·신살
+앞 둘은 관계(RELATIONS)·내 성별마다 미리 계산해 .npz 로 저장하고(build), 후보는 명식 단위
+특징을 한 번 계산해 배열로 저장한다(index — saju_engine.py 배치 출력 CSV 가 입력).
+질의(top)는 내 명식으로 작은 조회표를 만든 뒤 후보 전체를 벡터 조회 몇 번으로 채점한다.
+상대 4주는 주어진 그대로 쓴다 (페이지는 상대 4주를 시간 보정 없이 계산한다).
+"""
+
+import os, sys, csv, json, time, argparse, hashlib
+
+import numpy as np
+
+from build_bundles import bundle_functions, source_sha
+from chart_engine import ChartEngine, TABLE_NAMES, load_tables, stale_ports, split_pillars
+from chart_engine import PORTED_SHA as CHART_PORTED_SHA
+
+MATCH_TABLE_NAMES = ('HIDDEN_HARMONY', 'TWELVE_STATES')
+
+# 이식 기준 JS 함수 원문 해시 (build_bundles.source_sha, ko.html)
+PORTED_SHA = {
+    'analyzeMatchCore': '5b56c37975253bdf',
+    'getTwelveState': 'd5fc5489b4cb5561',
+}
+
+RELATIONS = ('romance', 'business', 'family')   # #relationship-type 선택지
+GENDERS = ('m', 'f')
+STRENGTH_TYPES = ('strong', 'balanced', 'weak')
+CLIMATE_TYPES = ('극한(極寒)', '한습(寒濕)', '냉습(冷濕)', '수과다(水過多)', '한(寒)', '극조(極燥)', '조(燥)', '중화(中和)')
+SINSAL_FLAGS = ('도화', '역마', '화개')           # 신살 이름에 들어 있으면 비트 1·2·4
+CATEGORIES = ('ilgan', 'ilji', 'oheng', 'napeum', 'yongsin', 'jijanggan', 'samhap', 'ddi', 'ilju',
+              'wonJinGuiMun', 'yukChin', 'twelveState', 'strength', 'johu', 'sinsal', 'gongmang')
+BASE_SCORE = 40
+TABLES_FILE = 'match_tables.npz'
+
+# ── analyzeMatchCore 본문 안의 표 (JS 원문 그대로) ─────────────────────────────
+
+GAN_HAP = [(0, 5), (1, 6), (2, 7), (3, 8), (4, 9)]
+JI_HAP = [(0, 1), (2, 11), (3, 10), (4, 9), (5, 8), (6, 7)]
+JI_CHUNG = [(0, 6), (1, 7), (2, 8), (3, 9), (4, 10), (5, 11)]
+SAMHAP_SETS = [(2, 6, 10), (5, 9, 1), (8, 0, 4), (11, 3, 7)]
+WONJIN_DAY = [(0, 7), (2, 9), (1, 6), (4, 11), (5, 10), (3, 8)]      # 첫 원진 검사 (일지만)
+WONJIN_PAIRS = [(0, 7), (1, 6), (2, 5), (3, 4), (4, 3), (5, 2), (6, 1), (7, 0),
+                (8, 11), (9, 10), (10, 9), (11, 8)]                  # 둘째 원진 검사 (일지 또는 년지)
+GUIMUN_PAIRS = [(2, 7), (3, 8), (4, 9), (5, 10), (6, 11), (1, 6)]
+HYUNG_PAIRS = [(2, 5), (5, 8), (2, 8), (1, 10), (10, 7), (1, 7), (0, 3)]
+GUIIN = {0: [1, 7], 1: [0, 8], 2: [11, 9], 3: [11, 9], 4: [1, 7],
+         5: [3, 5], 6: [2, 6], 7: [5, 11], 8: [3, 5], 9: [3, 5]}
+NAPEUM_CLASH = {(0, 2), (2, 0), (1, 3), (3, 1), (2, 4), (4, 2), (3, 0), (0, 3), (4, 1), (1, 4)}
+HIGH_ENERGY = ('건록', '제왕', '관대', '장생')
+LOW_ENERGY = ('사', '묘', '절', '태')
+YUKCHIN = {'비견': 2, '겁재': -3, '식신': 3, '상관': 0, '정인': 4, '편인': 1}
+STRENGTH_PAIR = {('strong', 'weak'): 5, ('weak', 'strong'): 5, ('strong', 'strong'): -2, ('weak', 'weak'): -2}
+YONG_COUNT_SCORE = (-3, 2, 5, 10, 10, 10, 10)                      # 상대 3주에 내 용신 0~6개
+
+
+def _either(pairs, a, b):
+    return any((a == x and b == y) or (a == y and b == x) for x, y in pairs)
+
+
+def bundle_key(html):
+    """표·이식 함수 원문이 같으면 같은 값 — 저장된 행렬·후보 색인의 유효성 확인용"""
+    functions, _ = bundle_functions(html)
+    tables = load_tables(html, TABLE_NAMES + MATCH_TABLE_NAMES)
+    sources = {name: source_sha(html[functions[name][0]:functions[name][1]]) if name in functions else None
+               for name in sorted({**CHART_PORTED_SHA, **PORTED_SHA})}
+    blob = json.dumps([sources, tables], ensure_ascii=False, sort_keys=True)
+    return hashlib.sha256(blob.encode('utf-8')).hexdigest()[:16]
+
+
+# ── 엔진 ─────────────────────────────────────────────────────────────────────
+
+class MatchEngine:
+    """항목별 점수 함수(스칼라 참조) + 60×60 행렬 생성 + 후보 벡터 채점"""
+
+    def __init__(self, html, chart=None):
+        self.chart = chart or ChartEngine(html)
+        t = load_tables(html, MATCH_TABLE_NAMES)
+        self.HIDDEN_HARMONY = [(h['a'], h['b']) for h in t['HIDDEN_HARMONY']]
+        self.TWELVE_STATES = [s['k'] for s in t['TWELVE_STATES']]
+        self.stale = stale_ports(html, PORTED_SHA) + self.chart.stale
+        self.key = bundle_key(html)
+        c = self.chart
+        self.stem_el = [c.EL_ORDER.index(s['e']) for s in c.STEM]
+        self.branch_el = [c.EL_ORDER.index(b['e']) for b in c.BRANCH]
+
+    # ── 일주·년주 쌍 항목 ──
+
+    def ilgan(self, ms, ps):
+        if _either(GAN_HAP, ms, ps):
+            return 25
+        me, pe = self.stem_el[ms], self.stem_el[ps]
+        if me == pe:
+            return 10
+        if (me + 1) % 5 == pe or (pe + 1) % 5 == me:
+            return 8
+        return -5  # 나머지는 서로 극하는 관계
+
+    @staticmethod
+    def ilji(mb, pb):
+        score = 0
+        if _either(JI_HAP, mb, pb):
+            score = 20
+        if _either(JI_CHUNG, mb, pb):
+            score = -15
+        if mb == pb:
+            score = 5
+        return score
+
+    def directional(self, mb, pb):
+        """samhap 항목 중 방합 가산 (일지끼리)"""
+        for bh in self.chart.DIRECTIONAL_HARMONY:
+            if mb in bh['branches'] and pb in bh['branches'] and mb != pb:
+                return 5
+        return 0
+
+    def napeum(self, mgz, pgz):
+        mine, theirs = self.chart.napeum(mgz), self.chart.napeum(pgz)
+        if mine['name'] == theirs['name']:
+            return 10
+        if mine['element'] == theirs['element']:
+            return 5
+        EL = self.chart.EL_ORDER
+        me, pe = EL.index(mine['element']), EL.index(theirs['element'])
+        if (me + 1) % 5 == pe or (pe + 1) % 5 == me:
+            return 5
+        return -4 if (me, pe) in NAPEUM_CLASH else 0
+
+    def jijanggan(self, mb, pb):
+        return 10 if _either(self.HIDDEN_HARMONY, mb, pb) else 0
+
+    @staticmethod
+    def ilju(ms, mb, ps, pb):
+        return (7 if pb in GUIIN[ms] else 0) + (5 if mb in GUIIN[ps] else 0)
+
+    @staticmethod
+    def year_wonjin(myb, pyb):
+        """둘째 원진 검사의 년지 조건 — 참이면 원진귀문이 -12 로 덮어써짐"""
+        return (myb, pyb) in WONJIN_PAIRS
+
+    @staticmethod
+    def wonjin(mb, pb, rel, year_hit=False):
+        score = 0
+        if _either(WONJIN_DAY, mb, pb):
+            score = -12 if rel == 'romance' else -8
+        if (mb, pb) in WONJIN_PAIRS or year_hit:
+            score = -12
+        if _either(GUIMUN_PAIRS, mb, pb):
+            score -= 8
+        if _either(HYUNG_PAIRS, mb, pb):
+            score -= 6
+        return score
+
+    def yukchin(self, ms, ps, gender):
+        god = self.chart.ten_god(ps, ms)['k']
+        if god in ('정재', '편재'):
+            return 8 if gender == 'm' else 3
+        if god in ('정관', '편관'):
+            return 8 if gender == 'f' else 2
+        return YUKCHIN.get(god, 0)
+
+    def twelve_state(self, gz):
+        """getTwelveState(일간, 일지)"""
+        ds, db = gz % 10, gz % 12
+        start = (11, 6, 2, 9, 2, 9, 5, 0, 8, 3)[ds]
+        idx = (db - start + 12) % 12 if self.chart.STEM[ds]['y'] else (start - db + 12) % 12
+        return self.TWELVE_STATES[idx]
+
+    def twelve(self, mgz, pgz):
+        mine, theirs = self.twelve_state(mgz), self.twelve_state(pgz)
+        my_high, p_high = mine in HIGH_ENERGY, theirs in HIGH_ENERGY
+        my_low, p_low = mine in LOW_ENERGY, theirs in LOW_ENERGY
+        if my_high and p_high:
+            return 5
+        if (my_high and p_low) or (my_low and p_high):
+            return 3
+        return -2 if my_low and p_low else 0
+
+    def gongmang(self, mgz, pgz):
+        mine, theirs = self.chart.void(mgz)[0], self.chart.void(pgz)[0]
+        score = -8 if pgz % 12 in mine else 0
+        if mgz % 12 in theirs:
+            score -= 6
+        if set(mine) & set(theirs):
+            score += 5
+        return score
+
+    @staticmethod
+    def ddi(myb, pyb):
+        score = 0
+        for branches in SAMHAP_SETS:
+            if myb in branches and pyb in branches and myb != pyb:
+                score = 8
+                break
+        if _either(JI_CHUNG, myb, pyb):
+            score = -5
+        return score
+
+    def day_pair(self, mgz, pgz, rel, gender):
+        """일주 × 일주 항목 합 (년지 원진이 없을 때)"""
+        ms, mb, ps, pb = mgz % 10, mgz % 12, pgz % 10, pgz % 12
+        return (self.ilgan(ms, ps) + self.ilji(mb, pb) + self.directional(mb, pb) + self.napeum(mgz, pgz)
+                + self.jijanggan(mb, pb) + self.ilju(ms, mb, ps, pb) + self.wonjin(mb, pb, rel)
+                + self.yukchin(ms, ps, gender) + self.twelve(mgz, pgz) + self.gongmang(mgz, pgz))
+
+    # ── 명식 단위 항목 ──
+
+    def profile(self, gz):
+        """명식 단위 특징 (후보 색인 한 행과 같은 값)"""
+        c = self.chart
+        gz = tuple(g for g in gz if g >= 0)
+        stems, brs = split_pillars(gz)
+        el3 = [0] * 5
+        for g in gz[:3]:
+            el3[self.stem_el[g % 10]] += 1
+            el3[self.branch_el[g % 12]] += 1
+        el4 = list(el3)
+        if len(gz) > 3:
+            el4[self.stem_el[gz[3] % 10]] += 1
+            el4[self.branch_el[gz[3] % 12]] += 1
+        yong, _, gi = c.yongsin(gz)
+        names = [s['n'] for s in c.sinsal(stems, brs)]
+        return {
+            'day': gz[2], 'year': gz[0], 'month_branch': brs[1],
+            'mask': sum(1 << b for b in set(brs)), 'el3': el3, 'el4': el4,
+            'strength': STRENGTH_TYPES.index(c.strength(gz)['type']),
+            'yong': c.EL_ORDER.index(yong), 'gi': c.EL_ORDER.index(gi),
+            'climate': CLIMATE_TYPES.index(c.climate(stems, brs)['type']),
+            'sinsal': sum(1 << i for i, flag in enumerate(SINSAL_FLAGS) if any(flag in n for n in names)),
+        }
+
+    @staticmethod
+    def samhap(my_mask, my_db, p_mask, p_db):
+        """samhap 항목 중 삼합 (양쪽 지지 합집합에 세 글자, 일지 한쪽 이상 포함)"""
+        union = my_mask | p_mask
+        for branches in SAMHAP_SETS:
+            if (my_db in branches or p_db in branches) and all(union >> b & 1 for b in branches):
+                return 8
+        return 0
+
+    @staticmethod
+    def yongsin(me, p, rel):
+        score = YONG_COUNT_SCORE[p['el3'][me['yong']]]
+        if me['el4'][p['yong']] >= 2:
+            score += 5
+        if p['el3'][me['gi']] >= 2:
+            score += 5 if rel == 'business' else -8
+        return score
+
+    @staticmethod
+    def strength(me, p):
+        return STRENGTH_PAIR.get((STRENGTH_TYPES[me['strength']], STRENGTH_TYPES[p['strength']]), 3)
+
+    @staticmethod
+    def climate_pair(mine, theirs):
+        """조후 비교 (특수 조후에 해당하지 않을 때)"""
+        mine, theirs = CLIMATE_TYPES[mine], CLIMATE_TYPES[theirs]
+        complementary = (('한' in mine and '조' in theirs) or ('조' in mine and '한' in theirs)
+                         or ('습' in mine and '조' in theirs) or ('조' in mine and '습' in theirs))
+        if complementary:
+            return 15 if '극' in mine and '극' in theirs else 12
+        if mine == theirs or ('한' in mine and '한' in theirs) or ('조' in mine and '조' in theirs):
+            return -3
+        return 0
+
+    def johu_case(self, me):
+        """내 일간 오행·월지 → 특수 조후 종류 (None = 조후 비교만)"""
+        dm_el = self.chart.EL_ORDER[self.stem_el[me['day'] % 10]]
+        winter, summer = me['month_branch'] in (0, 1, 11), me['month_branch'] in (5, 6, 7)
+        if dm_el == 'earth' and winter:
+            return 'earth_winter'
+        if dm_el == 'earth' and summer:
+            return 'earth_summer'
+        if dm_el in ('metal', 'water') and winter:
+            return 'cold'
+        return None
+
+    def johu(self, me, p):
+        case = self.johu_case(me)
+        fire, wood, water = (p['el3'][self.chart.EL_ORDER.index(e)] for e in ('fire', 'wood', 'water'))
+        if case == 'earth_winter':
+            return 15 if fire >= 1 else 8 if wood >= 1 else 0
+        if case == 'earth_summer' and water >= 1:
+            return 15
+        if case == 'cold' and fire >= 1:
+            return 15
+        return self.climate_pair(me['climate'], p['climate'])
+
+    @staticmethod
+    def sinsal_pair(mine, theirs):
+        score = 0
+        if mine & 1 and theirs & 1:
+            score = 5
+        if mine & 2 and theirs & 2:
+            score += 4
+        elif (mine | theirs) & 2:
+            score -= 1
+        if mine & 4 and theirs & 4:
+            score += 5
+        return score
+
+    # ── 스칼라 참조 (JS 한 쌍 채점과 대응, 벡터 채점 교차 검증용) ──
+
+    def analysis(self, me_gz, p_gz, gender='m', rel='romance'):
+        """(총점, {항목: 점수}) — me_gz·p_gz 는 (년, 월, 일, 시) 60갑자 인덱스 (시 모름 = -1)"""
+        me, p = self.profile(me_gz), self.profile(p_gz)
+        mgz, pgz = me['day'], p['day']
+        ms, mb, ps, pb = mgz % 10, mgz % 12, pgz % 10, pgz % 12
+        myb, pyb = me['year'] % 12, p['year'] % 12
+        scores = dict.fromkeys(CATEGORIES, 0)
+        scores.update(
+            ilgan=self.ilgan(ms, ps), ilji=self.ilji(mb, pb), napeum=self.napeum(mgz, pgz),
+            yongsin=self.yongsin(me, p, rel), jijanggan=self.jijanggan(mb, pb),
+            samhap=self.samhap(me['mask'], mb, p['mask'], pb) + self.directional(mb, pb),
+            ddi=self.ddi(myb, pyb), ilju=self.ilju(ms, mb, ps, pb),
+            wonJinGuiMun=self.wonjin(mb, pb, rel, self.year_wonjin(myb, pyb)),
+            yukChin=self.yukchin(ms, ps, gender), twelveState=self.twelve(mgz, pgz),
+            strength=self.strength(me, p), johu=self.johu(me, p),
+            sinsal=self.sinsal_pair(me['sinsal'], p['sinsal']), gongmang=self.gongmang(mgz, pgz))
+        return max(0, min(100, BASE_SCORE + sum(scores.values()))), scores
+
+    # ── 60×60 행렬 ──
+
+    def build_tables(self):
+        """쌍 항목 행렬 dict (np.savez 로 그대로 저장)"""
+        n = len(RELATIONS)
+        day = np.zeros((n, len(GENDERS), 60, 60), dtype=np.int16)
+        wonjin_delta = np.zeros((n, 60, 60), dtype=np.int16)
+        year = np.zeros((60, 60), dtype=np.int16)
+        year_wonjin = np.zeros((60, 60), dtype=bool)
+        for mgz in range(60):
+            for pgz in range(60):
+                mb, pb = mgz % 12, pgz % 12
+                for r, rel in enumerate(RELATIONS):
+                    for g, gender in enumerate(GENDERS):
+                        day[r, g, mgz, pgz] = self.day_pair(mgz, pgz, rel, gender)
+                    wonjin_delta[r, mgz, pgz] = self.wonjin(mb, pb, rel, True) - self.wonjin(mb, pb, rel)
+                year[mgz, pgz] = self.ddi(mb, pb)
+                year_wonjin[mgz, pgz] = self.year_wonjin(mb, pb)
+        return {'key': np.array(self.key), 'day': day, 'wonjin_delta': wonjin_delta,
+                'year': year, 'year_wonjin': year_wonjin}
+
+    def load_tables(self, path):
+        """저장된 행렬 (없거나 번들이 바뀌었으면 새로 만들어 저장) → dict"""
+        if os.path.exists(path):
+            with np.load(path) as data:
+                if str(data['key']) == self.key:
+                    return {name: data[name] for name in data.files}
+        tables = self.build_tables()
+        np.savez_compressed(path, **tables)
+        return tables
+
+    # ── 후보 색인 ──
+
+    def index(self, gz, progress=None):
+        """후보 4주 (N, 4) 배열 (시 모름 = -1) → 명식 단위 특징 배열 dict
+
+        같은 4주 조합은 한 번만 계산한다 (실제 출생 분포에서는 후보 수보다 훨씬 적음).
+        """
+        gz = np.asarray(gz, dtype=np.int8)
+        uniq, inverse = np.unique(gz, axis=0, return_inverse=True)
+        rows = {key: [] for key in ('mask', 'el3', 'strength', 'yong', 'climate', 'sinsal')}
+        for i, row in enumerate(uniq.tolist()):
+            p = self.profile(row)
+            for key in rows:
+                rows[key].append(p[key])
+            if progress and (i + 1) % 50000 == 0:
+                progress(i + 1, len(uniq))
+        inverse = inverse.reshape(-1)
+        day = gz[:, 2].astype(np.int8)
+        mask = np.array(rows['mask'], dtype=np.int32)[inverse]
+        return {
+            'key': np.array(self.key), 'gz': gz, 'day': day, 'year': gz[:, 0].astype(np.int8),
+            'branch_key': mask * 12 + day % 12,
+            'el3': np.array(rows['el3'], dtype=np.int8)[inverse],
+            'strength': np.array(rows['strength'], dtype=np.int8)[inverse],
+            'yong': np.array(rows['yong'], dtype=np.int8)[inverse],
+            'climate': np.array(rows['climate'], dtype=np.int8)[inverse],
+            'sinsal': np.array(rows['sinsal'], dtype=np.int8)[inverse],
+        }
+
+    # ── 벡터 채점 ──
+
+    def score(self, me_gz, tables, cand, gender='m', rel='romance'):
+        """내 4주 × 후보 색인 전체 → 총점 int16 배열 (analysis() 총점과 같음)"""
+        me = self.profile(me_gz)
+        r, g = RELATIONS.index(rel), GENDERS.index(gender)
+        mgz, my = me['day'], me['year']
+        day, year = cand['day'], cand['year']
+        s = tables['day'][r, g, mgz][day]
+        s = s + tables['year'][my][year]
+        s += np.where(tables['year_wonjin'][my][year], tables['wonjin_delta'][r, mgz][day], 0).astype(np.int16)
+
+        # 삼합: (후보 지지 집합, 후보 일지) 4096×12 조회표
+        masks = np.arange(4096)[:, None]
+        dbs = np.arange(12)[None, :]
+        samhap = np.zeros((4096, 12), dtype=bool)
+        for branches in SAMHAP_SETS:
+            union = masks | me['mask']
+            full = np.ones((4096, 1), dtype=bool)
+            for b in branches:
+                full &= (union >> b & 1).astype(bool)
+            samhap |= full & ((me['day'] % 12 in branches) | np.isin(dbs, branches))
+        s += np.where(samhap.reshape(-1), 8, 0).astype(np.int16)[cand['branch_key']]
+
+        # 용신·신강약·조후·신살: 후보 특징값별 작은 조회표
+        el3 = cand['el3']
+        s += np.array(YONG_COUNT_SCORE, dtype=np.int16)[el3[:, me['yong']]]
+        s += np.array([5 if me['el4'][e] >= 2 else 0 for e in range(5)], dtype=np.int16)[cand['yong']]
+        s += np.where(el3[:, me['gi']] >= 2, 5 if rel == 'business' else -8, 0).astype(np.int16)
+        s += np.array([self.strength(me, {'strength': k}) for k in range(len(STRENGTH_TYPES))],
+                      dtype=np.int16)[cand['strength']]
+        s += self._johu_vector(me, cand)
+        s += np.array([self.sinsal_pair(me['sinsal'], k) for k in range(8)], dtype=np.int16)[cand['sinsal']]
+        return np.clip(s + BASE_SCORE, 0, 100).astype(np.int16)
+
+    def _johu_vector(self, me, cand):
+        EL = self.chart.EL_ORDER
+        fallback = np.array([self.climate_pair(me['climate'], k) for k in range(len(CLIMATE_TYPES))],
+                            dtype=np.int16)[cand['climate']]
+        fire, wood, water = (cand['el3'][:, EL.index(e)] >= 1 for e in ('fire', 'wood', 'water'))
+        case = self.johu_case(me)
+        if case == 'earth_winter':
+            return np.where(fire, 15, np.where(wood, 8, 0)).astype(np.int16)
+        if case == 'earth_summer':
+            return np.where(water, 15, fallback).astype(np.int16)
+        if case == 'cold':
+            return np.where(fire, 15, fallback).astype(np.int16)
+        return fallback
+
+
+def top_k(scores, k):
+    """점수 내림차순 상위 k 개 후보 위치 (동점은 앞선 후보 먼저)"""
+    k = min(k, len(scores))
+    if k <= 0:
+        return np.zeros(0, dtype=np.int64)
+    part = np.argpartition(-scores.astype(np.int32), k - 1)[:k]
+    cut = scores[part].min()
+    part = np.flatnonzero(scores >= cut)  # 경계 동점을 모두 모은 뒤 순서대로 자름
+    order = np.lexsort((part, -scores[part].astype(np.int32)))
+    return part[order][:k]
+
+
+def read_candidates(path):
+    """saju_engine.py 배치 출력 CSV (year_gz, month_gz, day_gz, hour_gz 열) → (N, 4) int8"""
+    with open(path, newline='', encoding='utf-8') as f:
+        reader = csv.DictReader(f)
+        cols = ('year_gz', 'month_gz', 'day_gz', 'hour_gz')
+        missing = [c for c in cols if c not in (reader.fieldnames or [])]
+        if missing:
+            raise ValueError(f'{path}: 열 없음 — {", ".join(missing)}')
+        return np.array([[int(row[c]) for c in cols] for row in reader], dtype=np.int8).reshape(-1, 4)
+
+
+def _load_npz(path):
+    with np.load(path) as data:
+        return {name: data[name] for name in data.files}
+
+
+# ── 진입점 ──────────────────────────────────────────────────────────────────
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='K-MUDANG 궁합 행렬 엔진')
+    sub = parser.add_subparsers(dest='command', required=True)
+    p_build = sub.add_parser('build', help='60×60 쌍 항목 행렬 저장')
+    p_build.add_argument('html_path')
+    p_build.add_argument('--out', default=TABLES_FILE)
+    p_index = sub.add_parser('index', help='후보 CSV → 명식 단위 특징 색인 (.npz)')
+    p_index.add_argument('html_path')
+    p_index.add_argument('csv_path', help='saju_engine.py 배치 출력 CSV')
+    p_index.add_argument('--out', default='candidates.npz')
+    p_top = sub.add_parser('top', help='내 명식과 후보 전체 채점 → 상위 k')
+    p_top.add_argument('html_path')
+    p_top.add_argument('year', type=int)
+    p_top.add_argument('month', type=int)
+    p_top.add_argument('day', type=int)
+    p_top.add_argument('--siji', type=int, default=-1, help='시지 인덱스 0~11 (모름 = -1)')
+    p_top.add_argument('--gender', default='m', choices=GENDERS)
+    p_top.add_argument('--rel', default='romance', choices=RELATIONS)
+    p_top.add_argument('--candidates', required=True, help='index 결과 .npz')
+    p_top.add_argument('--tables', default=TABLES_FILE, help='행렬 .npz (없거나 낡으면 새로 만듦)')
+    p_top.add_argument('--k', type=int, default=10)
+    args = parser.parse_args()
+
+    with open(args.html_path, encoding='utf-8') as f:
+        html = f.read()
+    try:
+        engine = MatchEngine(html)
+    except ValueError as e:
+        print(f"❌ {args.html_path}: {e}")
+        sys.exit(1)
+    if engine.stale:
+        print(f"⚠️ 이식 뒤 번들에서 바뀐 JS 함수: {', '.join(engine.stale)}", file=sys.stderr)
+
+    if args.command == 'build':
+        t0 = time.perf_counter()
+        tables = engine.build_tables()
+        np.savez_compressed(args.out, **tables)
+        print(f"✅ {args.out} 저장 ({time.perf_counter() - t0:.1f}s, {os.path.getsize(args.out) / 1024:,.1f}KB)")
+        sys.exit(0)
+
+    if args.command == 'index':
+        try:
+            gz = read_candidates(args.csv_path)
+        except (OSError, ValueError) as e:
+            print(f"❌ {e}")
+            sys.exit(1)
+        t0 = time.perf_counter()
+        cand = engine.index(gz, progress=lambda i, n: print(f"  … {i:,}/{n:,} 조합"))
+        np.savez(args.out, **cand)
+        print(f"✅ 후보 {len(gz):,}명 색인 → {args.out} ({time.perf_counter() - t0:.1f}s)")
+        sys.exit(0)
+
+    from saju_engine import PillarEngine, load_profile
+    cand = _load_npz(args.candidates)
+    if str(cand['key']) != engine.key:
+        print(f"❌ {args.candidates} 는 다른 번들로 만든 색인 — index 다시 실행 필요")
+        sys.exit(1)
+    tables = engine.load_tables(args.tables)
+    out = PillarEngine(load_profile(args.html_path, engine.chart.lang)).compute([args.year], [args.month], [args.day], [args.siji])
+    me = tuple(int(out[pos][0]) for pos in ('year', 'month', 'day', 'hour'))
+    t0 = time.perf_counter()
+    scores = engine.score(me, tables, cand, args.gender, args.rel)
+    best = top_k(scores, args.k)
+    elapsed = time.perf_counter() - t0
+    print(f"🔍 후보 {len(scores):,}명 채점 + 상위 {len(best)} ({elapsed * 1000:,.1f}ms)")
+    for rank, i in enumerate(best, 1):
+        total, parts = engine.analysis(me, tuple(int(g) for g in cand['gz'][i]), args.gender, args.rel)
+        detail = ' '.join(f'{k} {v:+d}' for k, v in parts.items() if v)
+        print(f"  {rank:>3}. #{i:<9} {total:>3}점  {detail}")
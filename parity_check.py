@@ -0,0 +1,334 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+K-MUDANG JS ↔ Python 이식 대조 v1.0
+사용법: python parity_check.py ko.html [--only chart,match,year_luck,taekil,fortune]
+                               [--cases 2000] [--seed 1] [--show 5]
+
+번들에서 대상 JS 함수와 그 함수가 부르는 최상위 함수·데이터 상수를 모아 node 로 실행할
+하니스를 만들고, 같은 무작위 입력을 Python 이식판(chart_engine / match_engine /
+year_luck_engine / taekil_engine / build_fortune_shards)에 넣어 결과를 전수 대조한다.
+이식 커밋이 적어 둔 대조 결과는 이 스크립트로 다시 낼 수 있다 (같은 --seed 면 같은 입력).
+번들을 지원하지 않는 엔진(명식 계산은 ko 번들 기준 이식)은 건너뛴다.
+필요: node, numpy
+"""
+
+import os, re, sys, json, random, shutil, argparse, tempfile, subprocess
+from datetime import date, timedelta
+
+from build_bundles import bundle_functions, executable_scripts, tokenize, js_literal
+from saju_engine import _days_scalar, _js_literal
+
+# 하니스가 전역으로 채우는 이름 (번들 쪽 선언은 가져오지 않음)
+HARNESS_GLOBALS = ('GODS', 'SAJU')
+# 데이터 리터럴 파서(js_literal)가 못 읽는 16진수 표 — 정규식 추출로 보충
+RAW_LITERALS = ('LUNAR_DATA', 'LUNAR_START')
+IDENT_RE = re.compile(r'[A-Za-z_$][\w$]*')
+
+
+# ── JS 하니스 ─────────────────────────────────────────────────────────────────
+
+def top_level_data(html):
+    """번들 최상위 const/let/var 중 순수 데이터 리터럴 → {이름: 'var 이름 = 리터럴;'} (처음 선언 우선)"""
+    decls = {}
+    for start, end, _ in executable_scripts(html):
+        src = html[start:end]
+        tokens = tokenize(src)
+        depth = 0
+        for k, (kind, a, b) in enumerate(tokens):
+            text = src[a:b]
+            if kind == 'punct':
+                depth += text in ('{', '(', '[')
+                depth -= text in ('}', ')', ']')
+            if depth or kind != 'word' or text not in ('const', 'let', 'var') or k + 3 >= len(tokens):
+                continue
+            name = src[tokens[k + 1][1]:tokens[k + 1][2]]
+            if name in decls or src[tokens[k + 2][1]:tokens[k + 2][2]] != '=':
+                continue
+            try:
+                _, stop = js_literal(src, tokens, k + 3)
+            except ValueError:
+                continue  # 식·DOM 참조 — 하니스에서 실행하지 않음
+            decls[name] = f'var {name} = {src[tokens[k + 3][1]:tokens[stop - 1][2]]};'
+    for name in RAW_LITERALS:
+        if name not in decls and re.search(rf'const {name}\s*=', html):
+            decls[name] = f'var {name} = {_js_literal(html, name)};'
+    return decls
+
+def js_closure(html, roots):
+    """roots 함수에서 닿는 최상위 함수·데이터 상수 → JS 원문 (상수 먼저, 모두 var 선언)"""
+    functions, _ = bundle_functions(html)
+    data = top_level_data(html)
+    seen, order, stack = set(), [], list(roots)
+    while stack:
+        name = stack.pop()
+        if name in seen:
+            continue
+        if name not in functions and name not in data:
+            raise ValueError(f'{name}: 번들에 최상위 함수·데이터 상수로 없음')
+        seen.add(name)
+        order.append(name)
+        body = html[functions[name][0]:functions[name][1]] if name in functions else data[name]
+        stack.extend(ident for ident in set(IDENT_RE.findall(body))
+                     if ident not in seen and ident not in HARNESS_GLOBALS and (ident in functions or ident in data))
+    return '\n'.join([data[name] for name in order if name not in functions] +
+                     [html[functions[name][0]:functions[name][1]] for name in order if name in functions])
+
+def run_node(source, cases):
+    """하니스 실행 — 입력은 한 줄에 JSON 1건, 출력도 한 줄에 JSON 1건"""
+    with tempfile.NamedTemporaryFile('w', suffix='.js', encoding='utf-8', delete=False) as f:
+        f.write(source)
+    try:
+        out = subprocess.run(['node', f.name], input='\n'.join(json.dumps(c) for c in cases),
+                             capture_output=True, text=True, encoding='utf-8')
+    finally:
+        os.unlink(f.name)
+    if out.returncode:
+        raise RuntimeError(f'node 실행 실패:\n{out.stderr[-2000:]}')
+    lines = out.stdout.splitlines()
+    if len(lines) != len(cases):
+        raise RuntimeError(f'node 출력 {len(lines)}줄 (입력 {len(cases)}건)')
+    return [json.loads(line) for line in lines]
+
+def patch(source, old, new):
+    """하니스가 중간값을 꺼내려고 번들 코드 한 곳을 바꿈 (찾지 못하면 번들이 바뀐 것)"""
+    if source.count(old) != 1:
+        raise ValueError(f'하니스 삽입 지점을 찾을 수 없음: {old!r} — 번들 변경 후 parity_check.py 갱신 필요')
+    return source.replace(old, new)
+
+# 연·성별을 고정하는 공통 머리 (new Date().getFullYear() / GENDER 를 쓰는 함수용)
+FIXED_YEAR_PRELUDE = r'''var GENDER = "m", GODS = null, SAJU = null;
+const _RealDate = Date; let _YEAR = 2026;
+Date = class extends _RealDate { getFullYear() { return _YEAR; } };
+'''
+PILLARS_JS = r'''
+const P = g => ({s: STEM[g % 10], b: BRANCH[g % 12]});
+const mk = gz => { const s = {year: P(gz[0]), month: P(gz[1]), day: P(gz[2]), hour: null}; if (gz[3] >= 0) s.hour = P(gz[3]); return s; };
+const lines = require('fs').readFileSync(0, 'utf8').trim().split('\n');
+const out = [];
+'''
+
+
+# ── 대조 항목 ─────────────────────────────────────────────────────────────────
+# 각 항목: (html, 난수, 건수) → [(입력, 기대(JS), 실제(Python))] — 다르면 불일치
+
+def random_gz(rng):
+    """4주 GAPJA 인덱스 (시주 모름 = -1 을 약 15%)"""
+    return [rng.randrange(60) for _ in range(3)] + [-1 if rng.random() < .15 else rng.randrange(60)]
+
+def check_chart(html, rng, n):
+    """calcStrength / calcGods / calcFormat / calcInteractions / calcSinsal / calcGongmang / calcNapeum
+    + fullAnalysis 용신 ↔ ChartEngine.chart / chart_json / yongsin"""
+    from chart_engine import ChartEngine, PORTED_SHA
+    engine = ChartEngine(html)
+    source = FIXED_YEAR_PRELUDE + js_closure(html, list(PORTED_SHA) + ['fullAnalysis']) + PILLARS_JS + r'''
+for (const line of lines) {
+  const [gz, gender, year] = JSON.parse(line);
+  GENDER = gender; _YEAR = year;
+  const saju = mk(gz); if (!saju.hour) delete saju.hour;
+  const str = calcStrength(saju);
+  const samhap = analyzeSamhapBureau(saju);
+  const nap = {}; ['year', 'month', 'day', 'hour'].forEach(p => { if (saju[p]) nap[p] = calcNapeum(saju[p].s, saju[p].b); });
+  const g = fullAnalysis(saju, calcStrength(saju));
+  out.push(JSON.stringify({strength: str, gods: calcGods(saju, str, samhap), format: calcFormat(saju, str, samhap),
+    interactions: calcInteractions(saju), sinsal: calcSinsal(saju), gongmang: calcGongmang(saju), napeum: nap,
+    yongsin: [g.yong, g.hee, g.gi]}));
+}
+process.stdout.write(out.join('\n') + '\n');
+'''
+    cases = [(random_gz(rng), rng.choice('mf'), rng.randrange(1990, 2040)) for _ in range(n)]
+    rows = []
+    for case, js in zip(cases, run_node(source, cases)):
+        gz, gender, year = case
+        chart = json.loads(json.dumps(engine.chart(gz, gender, year), ensure_ascii=False))
+        if json.loads(engine.chart_json(gz, gender, year)) != chart:
+            rows.append((case, 'chart()', 'chart_json()'))
+        del chart['pillars']
+        chart['yongsin'] = list(engine.yongsin(tuple(g for g in gz if g >= 0)))
+        rows.append((case, js, chart))
+    return rows
+
+def check_match(html, rng, n):
+    """analyzeMatchCore 점수 구간 ↔ MatchEngine.analysis, 벡터 점수 ↔ 스칼라 점수"""
+    import numpy as np
+    from match_engine import MatchEngine, RELATIONS, PORTED_SHA
+    engine = MatchEngine(html)
+    functions, _ = bundle_functions(html)
+    start, end, _ = functions['analyzeMatchCore']
+    body = html[start:end]
+    lo, hi = 'const pStr = calcStrength(pSaju);', 'totalScore = Math.max(0, Math.min(100, totalScore));'
+    if lo not in body or hi not in body:
+        raise ValueError('analyzeMatchCore 점수 구간 표시를 찾을 수 없음 — 번들 변경 후 parity_check.py 갱신 필요')
+    scoring = body[body.index(lo):body.index(hi)]
+    source = FIXED_YEAR_PRELUDE + js_closure(html, list(PORTED_SHA) + ['fullAnalysis', 'getTwelveState']) + r'''
+function scoreMatch(SAJU, GODS, pSaju, pGender, relType) {''' + scoring + r''' totalScore = Math.max(0, Math.min(100, totalScore));
+  const sc = {}; for (const k in analysis) sc[k] = analysis[k].score; return [totalScore, sc]; }
+''' + PILLARS_JS + r'''
+for (const line of lines) {
+  const [me, p, gender, rel] = JSON.parse(line);
+  GENDER = gender;
+  const SAJU = mk(me);
+  out.push(JSON.stringify(scoreMatch(SAJU, fullAnalysis(SAJU, calcStrength(SAJU)), mk(p), 'm', rel)));
+}
+process.stdout.write(out.join('\n') + '\n');
+'''
+    cases = [(random_gz(rng), random_gz(rng), rng.choice('mf'), rng.choice(RELATIONS)) for _ in range(n)]
+    rows = [(case, js, list(engine.analysis(tuple(case[0]), tuple(case[1]), case[2], case[3])))
+            for case, js in zip(cases, run_node(source, cases))]
+    tables = engine.build_tables()
+    cand = engine.index(np.array([case[1] for case in cases], dtype=np.int8))
+    for me, _, gender, rel in cases[:20]:
+        scores = engine.score(tuple(me), tables, cand, gender, rel)
+        for j in range(0, n, max(1, n // 200)):
+            total, _ = engine.analysis(tuple(me), tuple(cases[j][1]), gender, rel)
+            rows.append(((me, cases[j][1], gender, rel, 'vector'), total, int(scores[j])))
+    return rows
+
+def check_year_luck(html, rng, n):
+    """calcYearLuck 등급·점수·규칙별 발동 ↔ year_luck_engine.evaluate (table() 과도 대조)"""
+    from year_luck_engine import YearLuckEngine, Frame, evaluate, year_columns, RULE_KEYS, RATING_KEYS
+    engine = YearLuckEngine(html)
+    code = patch(js_closure(html, ['calcYearLuck', 'fullAnalysis', 'calcStrength']),
+                 'const rating = ylDetermineRating(r, score);',
+                 'const rating = ylDetermineRating(r, score); globalThis.__r = r; globalThis.__s = score;')
+    source = 'var GODS = null, SAJU = null;\n' + code + PILLARS_JS + r'''
+for (const line of lines) {
+  const [gz, years] = JSON.parse(line); const s = mk(gz);
+  const g = fullAnalysis(s, calcStrength(s));
+  const row = [];
+  for (const y of years) { const yl = calcYearLuck(y, s, g); const r = globalThis.__r;
+    row.push([yl.rating, globalThis.__s, Object.keys(r).map(k => [k, !!r[k].active || (r[k].active === undefined && !!r[k].score), r[k].score || 0])]); }
+  out.push(JSON.stringify(row));
+}
+process.stdout.write(out.join('\n') + '\n');
+'''
+    cases = [(random_gz(rng), [rng.randrange(1900, 2100) for _ in range(5)]) for _ in range(n)]
+    res = evaluate(Frame(engine, [engine.profile(gz) for gz, _ in cases]))
+    table = engine.table([gz for gz, _ in cases])
+    rows = [('table()', table['rating'].tolist(), res['rating'].tolist()),
+            ('table()', table['total'].tolist(), res['total'].tolist())]
+    for i, (case, js) in enumerate(zip(cases, run_node(source, cases))):
+        for year, col, expected in zip(case[1], year_columns(case[1]), js):
+            mine = [RATING_KEYS[res['rating'][i, col]], int(res['total'][i, col]),
+                    [[key, bool(res['active'][j, i, col]), int(res['score'][j, i, col])] for j, key in enumerate(RULE_KEYS)]]
+            rows.append(((case[0], year), expected, mine))
+    return rows
+
+def check_taekil(html, rng, n):
+    """calcAuspiciousScore ↔ TaekilEngine.score / 인덱스 분류 점수"""
+    from taekil_engine import TaekilEngine, PURPOSES, DAY_RANGE, UNIX_JDN
+    from saju_engine import BASE_JDN
+    engine = TaekilEngine(html)
+    index = engine.build()
+    source = 'var GODS = null, SAJU = null;\n' + js_closure(html, ['calcAuspiciousScore']) + r'''
+const lines = require('fs').readFileSync(0, 'utf8').trim().split('\n');
+const out = [];
+for (const line of lines) {
+  const [y, m, d, p, g, my] = JSON.parse(line);
+  GODS = {yong: EL_ORDER[g[0]], hee: EL_ORDER[g[1]], gi: EL_ORDER[g[2]]};
+  SAJU = {day: {s: STEM[my % 10], b: BRANCH[my % 12]}};
+  out.push(JSON.stringify(calcAuspiciousScore(y, m, d, p).score));
+}
+process.stdout.write(out.join('\n') + '\n');
+'''
+    first, last = _days_scalar(*DAY_RANGE[0]), _days_scalar(*DAY_RANGE[1])
+    cases = []
+    for _ in range(n):
+        d = date(1970, 1, 1) + timedelta(days=rng.randint(first, last))
+        cases.append((d.year, d.month, d.day, rng.choice(PURPOSES), [rng.randrange(5) for _ in range(3)], rng.randrange(60)))
+    rows = []
+    for case, js in zip(cases, run_node(source, cases)):
+        y, m, d, purpose, gods, my = case
+        day_gz = (_days_scalar(y, m, d) + UNIX_JDN - BASE_JDN) % 60
+        sohn = engine.sohn(y, m, d)
+        score = engine.score(purpose, tuple(gods), my, day_gz, sohn)
+        rows.append((case, [js, js], [score, int(engine.class_scores(index, purpose, tuple(gods), my)[day_gz * 2 + sohn])]))
+    return rows
+
+def check_fortune(html, rng, n):
+    """getTodayFortune / genTodayFortune HTML ↔ 운세 샤드 + 로케일 템플릿 조립 (build_fortune_shards.fill)"""
+    from build_fortune_shards import FortuneRenderer, fill, shard
+    renderer = FortuneRenderer(html)
+    template = renderer.template()
+    source = 'var GODS = null, SAJU = null;\n' + js_closure(html, ['getTodayFortune', 'genTodayFortune']) + r'''
+const RealDate = Date; let FIX = null;
+Date = class extends RealDate { constructor(...a) { if (a.length) super(...a); else super(FIX); } };
+const lines = require('fs').readFileSync(0, 'utf8').trim().split('\n');
+const out = [];
+for (const line of lines) {
+  const [ds, dmi, y, h, g] = JSON.parse(line); FIX = ds + 'T12:00:00';
+  SAJU = {day: {s: STEM[dmi]}}; GODS = {yong: EL_ORDER[y], hee: EL_ORDER[h], gi: EL_ORDER[g]};
+  out.push(JSON.stringify([getTodayFortune(), genTodayFortune(SAJU, GODS)]));
+}
+process.stdout.write(out.join('\n') + '\n');
+'''
+    cases = [((date(2020, 1, 1) + timedelta(days=rng.randrange(5000))).isoformat(),
+              rng.randrange(10), rng.randrange(5), rng.randrange(5), rng.randrange(5)) for _ in range(n)]
+    shards = {}
+    rows = []
+    for case, js in zip(cases, run_node(source, cases)):
+        day = date.fromisoformat(case[0])
+        if day not in shards:
+            shards[day] = json.loads(json.dumps(shard(renderer, template, day)[0], ensure_ascii=False))
+        rows.append((case, js, list(fill(template, shards[day], *case[1:]))))
+    return rows
+
+CHECKS = {
+    'chart': check_chart,
+    'match': check_match,
+    'year_luck': check_year_luck,
+    'taekil': check_taekil,
+    'fortune': check_fortune,
+}
+
+
+def _short(value, limit=300):
+    text = json.dumps(value, ensure_ascii=False)
+    return text if len(text) <= limit else text[:limit] + '…'
+
+def run_checks(html, names, cases=2000, seed=1, show=5):
+    """{항목: (대조 건수, 불일치 건수)} — 지원하지 않는 번들이면 None"""
+    results = {}
+    for name in names:
+        try:
+            rows = CHECKS[name](html, random.Random(seed), cases)
+        except ValueError as e:
+            print(f"  ⚠️ {name}: {e} — 건너뜀")
+            results[name] = None
+            continue
+        bad = [(case, js, py) for case, js, py in rows if js != py]
+        print(f"  {'✅' if not bad else '❌'} {name}: {len(rows)}건 중 불일치 {len(bad)}건")
+        for case, js, py in bad[:show]:
+            print(f"      입력 {_short(case, 120)}\n        JS {_short(js)}\n        PY {_short(py)}")
+        results[name] = (len(rows), len(bad))
+    return results
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='K-MUDANG JS ↔ Python 이식 대조 (node 필요)')
+    parser.add_argument('html_path')
+    parser.add_argument('--only', default=','.join(CHECKS), help=f'대조 항목 (쉼표 구분, 기본 전부: {", ".join(CHECKS)})')
+    parser.add_argument('--cases', type=int, default=2000, help='항목별 무작위 입력 건수')
+    parser.add_argument('--seed', type=int, default=1)
+    parser.add_argument('--show', type=int, default=5, help='항목별 불일치 상세 출력 건수')
+    args = parser.parse_args()
+
+    names = [name.strip() for name in args.only.split(',') if name.strip()]
+    unknown = [name for name in names if name not in CHECKS]
+    if unknown:
+        parser.error(f"알 수 없는 항목: {', '.join(unknown)} (가능: {', '.join(CHECKS)})")
+    if not shutil.which('node'):
+        print("❌ node 를 찾을 수 없음 — JS 하니스 실행에 필요")
+        sys.exit(1)
+    with open(args.html_path, encoding='utf-8') as f:
+        html = f.read()
+    print(f"🔍 JS ↔ Python 이식 대조: {args.html_path} (항목별 {args.cases}건, seed {args.seed})")
+    try:
+        results = run_checks(html, names, args.cases, args.seed, args.show)
+    except RuntimeError as e:
+        print(f"❌ {e}")
+        sys.exit(1)
+    ran = {name: r for name, r in results.items() if r is not None}
+    ok = bool(ran) and all(bad == 0 for _, bad in ran.values())
+    print(f"{'✅ 통과' if ok else '❌ 실패'}: {len(ran)}개 항목 대조")
+    sys.exit(0 if ok else 1)
@@ -0,0 +1,483 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+K-MUDANG 사주 4주(四柱) 벡터화 계산 엔진 v1.0
+브라우저 JS 엔진(calcYearPillar / calcMonthPillar / calcDayPillar / calcHourPillar,
+getSolarTermTime, correctTimeToSolarTime, getStandardTimeOffset, adjustTime)의
+Python 이식판. 생년월일시 배열 전체를 NumPy 로 한 번에 계산한다 (행 단위 루프 없음).
+
+사용법: python saju_engine.py ko.html input.csv output.csv [--lang ko|jp] [--city 東京]
+                              [--tables calendar_tables.bin | --no-tables]
+  input.csv  : year,month,day,siji 열 (siji = 시지 인덱스 0~11, 모름 = -1)
+  output.csv : 입력 열 + year_gz,month_gz,day_gz,hour_gz (GAPJA 인덱스, 시주 모름 = -1)
+
+절기·서머타임 표는 번들 HTML 의 SOLAR_TERMS / SUMMER_TIME_PERIODS 를 그대로 읽어
+JS 와 같은 데이터를 쓴다. 번들 옆에 calendar_tables.py 가 만든 calendar_tables.bin 이 있으면
+(또는 --tables 로 주면) 절기 시각을 매번 계산하지 않고 mmap 테이블에서 바로 읽는다.
+--no-tables 는 테이블 없이 직접 계산.
+EN 번들의 위치(location) 기반 보정은 이식하지 않았다.
+번들의 해당 함수가 이식 뒤 바뀌면 stale_ports() 에 이름이 남는다 (PORTED_SHA 대조).
+필요 패키지: numpy
+"""
+
+import os, re, csv, json, math, argparse
+
+import numpy as np
+
+from build_bundles import bundle_functions, source_sha
+
+# 이식 기준 JS 함수 원문 해시 (build_bundles.source_sha, ko.html)
+PORTED_SHA = {
+    'calcYearPillar': 'e75d86bc604811f3',
+    'calcMonthPillar': '5d9435955412a485',
+    'calcDayPillar': 'e51290b75ae8b9a3',
+    'calcHourPillar': 'b22bebcc7286fcce',
+    'getSolarTermTime': '16d3cf0188d0c85f',
+    'correctTimeToSolarTime': 'd5d9b06e92139dc8',
+    'getStandardTimeOffset': '5c25bff1d77863ca',
+    'adjustTime': '369f851a19f315e0',
+}
+# jp.html 은 경도·표준시 보정이 자체 구현 (프로필 'jp')
+PORTED_SHA_JP = {
+    **PORTED_SHA,
+    'correctTimeToSolarTime': '93cc35bbc31ea889',
+    'getStandardTimeOffset': 'aebea8238899b3af',
+}
+PROFILE_PORTED_SHA = {'ko': PORTED_SHA, 'jp': PORTED_SHA_JP}
+
+# ── 기준 상수 (60갑자 이름표는 gapja.py) ─────────────────────────────────────
+# calcDayPillar 기준 JDN (1984-02-02 = 甲子일)
+BASE_JDN = 2445731
+
+# adjustTime: 시지 인덱스 → 대표 시각 (각 시진 시작 + 30분)
+SIJI_BASE_MINUTES = [h * 120 + 30 for h in range(12)]
+
+# getStandardTimeOffset: 1954-03-21 ~ 1961-08-09 UTC+8:30 시기 (+30분), KO 전용
+KST_830_START = (1954, 3, 21)
+KST_830_END = (1961, 8, 9)
+KST_830_MINUTES = 30
+
+MINUTES_PER_DAY = 24 * 60
+
+
+# ── 번들 데이터 로드 ──────────────────────────────────────────────────────────
+
+def _js_literal(html, name):
+    m = re.search(rf'const {name}\s*=\s*(.*?);', html, re.S)
+    if not m:
+        raise ValueError(f'{name} 정의를 찾을 수 없음')
+    return m.group(1)
+
+def parse_solar_terms(html):
+    """SOLAR_TERMS → (첫 연도, int16 배열 [연도, 절기 12, (월,일,시,분)])"""
+    data = json.loads(re.sub(r'(\d{4})\s*:', r'"\1":', _js_literal(html, 'SOLAR_TERMS')))
+    years = sorted(int(y) for y in data)
+    if years != list(range(years[0], years[-1] + 1)):
+        raise ValueError('SOLAR_TERMS 연도가 연속적이지 않음')
+    table = np.array([data[str(y)] for y in years], dtype=np.int16)
+    return years[0], table
+
+def parse_summer_periods(html):
+    """SUMMER_TIME_PERIODS → [(시작 분, 끝 분), ...] (Date 생성자 인자 그대로 해석)"""
+    periods = []
+    for start, end in re.findall(r'start:\s*new Date\(([^)]*)\)\s*,\s*end:\s*new Date\(([^)]*)\)',
+                                 _js_literal(html, 'SUMMER_TIME_PERIODS')):
+        periods.append(tuple(_date_args_to_minutes([int(x) for x in args.split(',')])
+                             for args in (start, end)))
+    return periods
+
+def _date_args_to_minutes(args):
+    """JS new Date(y, monthIndex, d=1, h=0, n=0) → epoch 분"""
+    y, mi = args[0], args[1]
+    d, h, n = (list(args[2:]) + [1, 0, 0][len(args) - 2:])[:3]
+    return _days_scalar(y, mi + 1, d) * MINUTES_PER_DAY + h * 60 + n
+
+# 번들 옆에 두면 load_profile 이 기본으로 쓰는 사전계산 절기 테이블 (calendar_tables.py build)
+TABLES_FILE = 'calendar_tables.bin'
+AUTO_TABLES = 'auto'
+
+def _js_round(x):
+    """Math.round (.5 는 +∞ 방향)"""
+    return math.floor(x + 0.5)
+
+def default_tables_path(html_path):
+    """번들과 같은 디렉터리의 사전계산 절기 테이블 경로"""
+    return os.path.join(os.path.dirname(os.path.abspath(html_path)), TABLES_FILE)
+
+def load_profile(html_path='ko.html', lang='ko', city=None, tables=AUTO_TABLES):
+    """언어별 시간 보정 프로필 (번들 HTML 에서 표 데이터를 읽음)
+
+    tables: calendar_tables.CalendarTables — 절기 시각을 테이블에서 조회 (번들과 다르면 ValueError)
+            AUTO_TABLES(기본)면 번들 옆 calendar_tables.bin 이 있고 이 번들로 만든 것일 때만 사용,
+            None 이면 테이블 없이 직접 계산
+    """
+    with open(html_path, encoding='utf-8') as f:
+        html = f.read()
+    if tables is AUTO_TABLES:
+        tables = None
+        path = default_tables_path(html_path)
+        if os.path.exists(path):
+            from calendar_tables import CalendarTables  # calendar_tables 가 이 모듈을 불러오므로 지연
+            found = CalendarTables(path)
+            if found.matches(html):
+                tables = found
+            else:
+                found.close()  # 다른 번들(또는 옛 데이터)로 만든 테이블 — 결과는 같으니 직접 계산
+    first_year, terms = parse_solar_terms(html)
+    profile = {
+        'lang': lang,
+        'term_first_year': first_year,
+        'terms': terms,
+        'summer_periods': parse_summer_periods(html),
+        'tables': None,
+    }
+    if tables is not None:
+        if not tables.matches(html):
+            raise ValueError(f'절기 테이블이 {html_path} 의 SOLAR_TERMS/LUNAR_DATA 와 다름 (calendar_tables.py build 로 재생성)')
+        profile['tables'] = tables
+    if lang == 'ko':
+        profile['std_offset'] = (_days_scalar(*KST_830_START), _days_scalar(*KST_830_END), KST_830_MINUTES)
+        profile['longitude_correction'] = int(_js_literal(html, 'LONGITUDE_CORRECTION'))
+    elif lang == 'jp':
+        cities = dict((k, float(v)) for k, v in
+                      re.findall(r"'([^']+)'\s*:\s*([\d.]+)", _js_literal(html, 'JP_CITIES')))
+        lng = cities.get(city or '東京', 139.69)
+        profile['std_offset'] = None
+        profile['longitude_correction'] = _js_round((135 - lng) * 4)
+    else:
+        raise ValueError(f'지원하지 않는 프로필: {lang} (EN 은 위치별 보정이라 미지원)')
+    return profile
+
+BUNDLE_LANGS = {'ko': 'ko', 'ja': 'jp', 'en': 'en'}  # K_MUDANG_VERSION.lang → 프로필 코드
+
+def bundle_lang(html):
+    """번들의 K_MUDANG_VERSION.lang → 프로필 언어 코드 (ko / jp / en)"""
+    m = re.search(r'K_MUDANG_VERSION\s*=\s*\{[^}]*?\blang:\s*["\']([\w-]+)["\']', html)
+    if not m:
+        raise ValueError('K_MUDANG_VERSION.lang 을 찾을 수 없음')
+    return BUNDLE_LANGS.get(m.group(1), m.group(1))
+
+def stale_ports(html, lang='ko'):
+    """이식 뒤 번들에서 바뀌었거나 사라진 4주 계산 JS 함수 이름 목록 (lang 프로필 기준)"""
+    functions, _ = bundle_functions(html)
+    return [name for name, sha in PROFILE_PORTED_SHA[lang].items()
+            if name not in functions or source_sha(html[functions[name][0]:functions[name][1]]) != sha]
+
+
+# ── 날짜 산술 (Howard Hinnant civil ↔ days, 일(d) 초과값은 JS Date 처럼 선형 정규화) ──
+
+def _days_scalar(y, m, d):
+    y -= m <= 2
+    era = y // 400
+    yoe = y - era * 400
+    doy = (153 * ((m + 9) % 12) + 2) // 5 + d - 1
+    return era * 146097 + yoe * 365 + yoe // 4 - yoe // 100 + doy - 719468
+
+def days_from_civil(y, m, d):
+    y = y - (m <= 2)
+    era = np.floor_divide(y, 400)
+    yoe = y - era * 400
+    doy = (153 * ((m + 9) % 12) + 2) // 5 + d - 1
+    return era * 146097 + yoe * 365 + yoe // 4 - yoe // 100 + doy - 719468
+
+def days_in_month(y, m):
+    """new Date(y, m, 0).getDate()"""
+    nm = m % 12 + 1
+    ny = y + (m == 12)
+    return days_from_civil(ny, nm, 1) - days_from_civil(y, m, 1)
+
+def _step_back(y, m, d, mask):
+    """correctTimeToSolarTime 의 하루 전 이동 (월·연 경계 처리 포함)"""
+    d2 = d - 1
+    wrap = mask & (d2 < 1)
+    pm = np.where(m == 1, 12, m - 1)
+    py = np.where(m == 1, y - 1, y)
+    y = np.where(wrap, py, y)
+    m = np.where(wrap, pm, m)
+    d = np.where(mask, np.where(wrap, days_in_month(py, pm), d2), d)
+    return y, m, d
+
+def _step_forward(y, m, d, mask):
+    """하루 뒤 이동 (말일 초과 시 다음 달 1일)"""
+    d2 = d + 1
+    wrap = mask & (d2 > days_in_month(y, m))
+    ny = np.where(m == 12, y + 1, y)
+    nm = np.where(m == 12, 1, m + 1)
+    y = np.where(wrap, ny, y)
+    m = np.where(wrap, nm, m)
+    d = np.where(mask, np.where(wrap, 1, d2), d)
+    return y, m, d
+
+def gapja_index(stem, branch):
+    """(천간, 지지) 인덱스 → 60갑자 인덱스"""
+    return (6 * stem - 5 * branch) % 60
+
+def siji_of(hour, minute):
+    """hourToSiji: 시각 → 시지 인덱스 (23:30~01:29 = 子)"""
+    total = np.asarray(hour, dtype=np.int64) * 60 + np.asarray(minute, dtype=np.int64)
+    siji = (total - 90) // 120 + 1
+    return np.where((total >= 23 * 60 + 30) | (total < 90), 0, siji)
+
+
+# ── 벡터화 엔진 ───────────────────────────────────────────────────────────────
+
+class PillarEngine:
+    """4주 배열 계산기 — JS analyzeSajuCore 의 보정·계산 순서를 그대로 따른다"""
+
+    def __init__(self, profile, use_summer_time=True, use_longitude=True, use_yajasi=False):
+        self.profile = profile
+        self.use_summer_time = use_summer_time
+        self.use_longitude = use_longitude
+        self.use_yajasi = use_yajasi
+        periods = profile['summer_periods']
+        self._dst_start = np.array([p[0] for p in periods], dtype=np.int64)
+        self._dst_end = np.array([p[1] for p in periods], dtype=np.int64)
+
+    # getSolarTermTime: 표에 없는 연도는 가장 가까운 이전 연도(없으면 첫 연도) 데이터
+    def _term(self, year, index):
+        first = self.profile['term_first_year']
+        terms = self.profile['terms']
+        row = np.clip(year, first, first + len(terms) - 1) - first
+        t = terms[row, index].astype(np.int64)
+        return t[..., 0], t[..., 1], t[..., 2], t[..., 3]
+
+    def _term_stamp(self, year, index, stamp_year):
+        tables = self.profile['tables']
+        # 테이블 시각은 stamp_year == year (+1, 소한) 인 경우 — 엔진의 모든 호출이 이 형태
+        if tables is not None and np.all((year >= tables.term_first_year) & (year <= tables.term_last_year)):
+            return tables.term_instants[year - tables.term_first_year, index]
+        tm, td, th, tn = self._term(year, index)
+        return days_from_civil(stamp_year, tm, td) * MINUTES_PER_DAY + th * 60 + tn
+
+    def _in_summer_time(self, y, m, d, hour, minute):
+        """isInSummerTime (hour 가 0 이면 JS 의 `hour || 12` 때문에 12시로 판정)"""
+        stamp = (days_from_civil(y, m, d) * MINUTES_PER_DAY
+                 + np.where(hour == 0, 12, hour) * 60 + minute)
+        if not len(self._dst_start):
+            return np.zeros(stamp.shape, dtype=bool)
+        s = stamp[..., None]
+        return ((s >= self._dst_start) & (s <= self._dst_end)).any(axis=-1)
+
+    def adjust_time(self, y, m, d, siji):
+        """adjustTime → (y, m, d, 시지, 연주용 시각(분), 월주용 시각(분))"""
+        known = siji >= 0
+        base = np.array(SIJI_BASE_MINUTES, dtype=np.int64)[np.where(known, siji, 0)]
+        base_hour = base // 60
+        total = base.copy()
+        if self.use_summer_time:
+            total -= 60 * self._in_summer_time(y, m, d, base_hour, base % 60)
+        offset = self.profile['std_offset']
+        if offset:
+            day0 = days_from_civil(y, m, d)
+            total += np.where((day0 >= offset[0]) & (day0 <= offset[1]), offset[2], 0)
+        if self.use_longitude:
+            total -= self.profile['longitude_correction']
+
+        back = total < 0
+        fwd = total >= MINUTES_PER_DAY
+        total = total + MINUTES_PER_DAY * back - MINUTES_PER_DAY * fwd
+        cy, cm, cd = _step_back(y, m, d, back)
+        cy, cm, cd = _step_forward(cy, cm, cd, fwd)
+        hour, minute = total // 60, total % 60
+        new_siji = siji_of(hour, minute)
+
+        # 早子時: 23:30 이후 子시는 다음 날로 (JS 는 이 경우 hour/minute 없이 반환)
+        early = known & (new_siji == 0) & (hour >= 23) & (minute >= 30)
+        if self.use_yajasi:
+            early = np.zeros_like(known)
+        cy, cm, cd = _step_forward(cy, cm, cd, early)
+
+        ay = np.where(known, cy, y)
+        am = np.where(known, cm, m)
+        ad = np.where(known, cd, d)
+        year_time = np.where(known & ~early, total, np.where(known, 0, 12 * 60))
+        month_time = np.where(known & ~early, total, 12 * 60)
+        return ay, am, ad, np.where(known, new_siji, -1), year_time, month_time
+
+    def year_pillar(self, y, m, d, time):
+        cur = days_from_civil(y, m, d) * MINUTES_PER_DAY + time
+        adj_y = y - (cur < self._term_stamp(y, 0, y))
+        return (adj_y - 4) % 60
+
+    def month_pillar(self, y, m, d, time):
+        cur = days_from_civil(y, m, d) * MINUTES_PER_DAY + time
+        jan = m == 1
+        idx = np.where(jan, 11, m - 2)
+        term = self._term_stamp(np.where(jan, y - 1, y), idx, y)
+        before = cur < term
+        solar_month = np.where(jan, np.where(before, 11, 12),
+                               np.where(m == 2, np.where(before, 12, 1),
+                                        np.where(before, m - 2, m - 1)))
+        lichun = cur < self._term_stamp(y, 0, y)
+        ysi = ((y - lichun - 4) % 60) % 10
+        msi = (((ysi % 5) * 2 + 2) % 10 + solar_month - 1) % 10
+        return gapja_index(msi, (solar_month + 1) % 12), solar_month
+
+    @staticmethod
+    def day_pillar(y, m, d):
+        a = (14 - m) // 12
+        adj_y = y + 4800 - a
+        adj_m = m + 12 * a - 3
+        jdn = d + (153 * adj_m + 2) // 5 + 365 * adj_y + adj_y // 4 - adj_y // 100 + adj_y // 400 - 32045
+        return (jdn - BASE_JDN) % 60
+
+    @staticmethod
+    def hour_pillar(day_gz, siji):
+        hsi = (((day_gz % 10) % 5) * 2 + siji) % 10
+        return np.where(siji >= 0, gapja_index(hsi, siji), -1)
+
+    def compute(self, year, month, day, siji):
+        """생년월일 + 시지 인덱스 배열 → GAPJA 인덱스 배열 dict"""
+        y = np.asarray(year, dtype=np.int64)
+        m = np.asarray(month, dtype=np.int64)
+        d = np.asarray(day, dtype=np.int64)
+        h = np.asarray(siji, dtype=np.int64)
+        ay, am, ad, adj_siji, year_time, month_time = self.adjust_time(y, m, d, h)
+        month_gz, solar_month = self.month_pillar(ay, am, ad, month_time)
+        day_gz = self.day_pillar(ay, am, ad)
+        return {
+            'year': self.year_pillar(ay, am, ad, year_time).astype(np.int8),
+            'month': month_gz.astype(np.int8),
+            'day': day_gz.astype(np.int8),
+            'hour': self.hour_pillar(day_gz, adj_siji).astype(np.int8),
+            'solar_month': solar_month.astype(np.int8),
+        }
+
+
+# ── 스칼라 참조 구현 (JS 한 줄씩 대응, 벡터 엔진 교차 검증용) ─────────────────
+
+def reference_pillars(profile, y, m, d, h, use_summer_time=True, use_longitude=True, use_yajasi=False):
+    """단건 4주 계산 → (연, 월, 일, 시) GAPJA 인덱스 (시주 모름 = -1)"""
+    first, terms = profile['term_first_year'], profile['terms']
+
+    def stamp(yy, mm, dd, hh, nn):
+        return _days_scalar(yy, mm, dd) * MINUTES_PER_DAY + hh * 60 + nn
+
+    def term(year, index):
+        row = min(max(year, first), first + len(terms) - 1) - first
+        return [int(v) for v in terms[row][index]]
+
+    def before_term(year, mm, dd, hh, nn, index):
+        tm, td, th, tn = term(year, index)
+        return stamp(year, mm, dd, hh, nn) < stamp(year, tm, td, th, tn)
+
+    def last_day(yy, mm):
+        return _days_scalar(yy + (mm == 12), mm % 12 + 1, 1) - _days_scalar(yy, mm, 1)
+
+    # adjustTime
+    if h < 0:
+        adj = {'y': y, 'm': m, 'd': d, 'h': h, 'hour': 12, 'minute': 0}
+    else:
+        base_hour, base_minute = divmod(SIJI_BASE_MINUTES[h], 60)
+        total = base_hour * 60 + base_minute
+        dst_stamp = stamp(y, m, d, base_hour or 12, base_minute)
+        if use_summer_time and any(s <= dst_stamp <= e for s, e in profile['summer_periods']):
+            total -= 60
+        offset = profile['std_offset']
+        if offset and offset[0] <= _days_scalar(y, m, d) <= offset[1]:
+            total += offset[2]
+        if use_longitude:
+            total -= profile['longitude_correction']
+        cy, cm, cd = y, m, d
+        if total < 0:
+            total += MINUTES_PER_DAY
+            cd -= 1
+            if cd < 1:
+                cm -= 1
+                if cm < 1:
+                    cm, cy = 12, cy - 1
+                cd = last_day(cy, cm)
+        elif total >= MINUTES_PER_DAY:
+            total -= MINUTES_PER_DAY
+            cd += 1
+            if cd > last_day(cy, cm):
+                cd, cm = 1, cm + 1
+                if cm > 12:
+                    cm, cy = 1, cy + 1
+        hour, minute = divmod(total, 60)
+        new_siji = int(siji_of(hour, minute))
+        adj = {'y': cy, 'm': cm, 'd': cd, 'h': new_siji, 'hour': hour, 'minute': minute}
+        if new_siji == 0 and not use_yajasi and hour >= 23 and minute >= 30:
+            nd, nm, ny = cd + 1, cm, cy
+            if nd > last_day(ny, nm):
+                nd, nm = 1, nm + 1
+                if nm > 12:
+                    nm, ny = 1, ny + 1
+            adj = {'y': ny, 'm': nm, 'd': nd, 'h': new_siji}
+
+    ay, am, ad = adj['y'], adj['m'], adj['d']
+    # calcYearPillar(adj.y, adj.m, adj.d, adj.hour, adj.minute)
+    yh, yn = adj.get('hour') or 0, adj.get('minute') or 0
+    adj_y = ay - before_term(ay, am, ad, yh, yn, 0)
+    year_gz = (adj_y - 4) % 60
+    # calcMonthPillar(..., adj.hour !== undefined ? adj.hour : 12, adj.minute || 0)
+    mh = adj['hour'] if 'hour' in adj else 12
+    mn = adj.get('minute') or 0
+    if am == 1:
+        tm, td, th, tn = term(ay - 1, 11)
+        before = stamp(ay, am, ad, mh, mn) < stamp(ay, tm, td, th, tn)
+        solar_month = 11 if before else 12
+    else:
+        before = before_term(ay, am, ad, mh, mn, am - 2)
+        if am == 2:
+            solar_month = 12 if before else 1
+        else:
+            solar_month = am - 2 if before else am - 1
+    year_for_stem = ay - 1 if before_term(ay, am, ad, mh, mn, 0) else ay
+    ysi = ((year_for_stem - 4) % 60) % 10
+    msi = (((ysi % 5) * 2 + 2) % 10 + solar_month - 1) % 10
+    month_gz = (6 * msi - 5 * ((solar_month + 1) % 12)) % 60
+    # calcDayPillar / calcHourPillar
+    day_gz = int(PillarEngine.day_pillar(ay, am, ad))
+    hour_gz = -1
+    if 0 <= adj['h'] <= 11:
+        hsi = (((day_gz % 10) % 5) * 2 + adj['h']) % 10
+        hour_gz = (6 * hsi - 5 * adj['h']) % 60
+    return year_gz, month_gz, day_gz, hour_gz
+
+
+# ── CSV 일괄 처리 ─────────────────────────────────────────────────────────────
+
+def run_csv(engine, in_path, out_path, chunk_rows=1_000_000):
+    """CSV 를 청크 단위로 읽어 4주 열을 붙여 저장. 처리 행 수 반환"""
+    rows = 0
+    with open(in_path, newline='', encoding='utf-8') as fin, \
+         open(out_path, 'w', newline='', encoding='utf-8') as fout:
+        reader = csv.DictReader(fin)
+        fields = list(reader.fieldnames) + ['year_gz', 'month_gz', 'day_gz', 'hour_gz']
+        writer = csv.DictWriter(fout, fieldnames=fields)
+        writer.writeheader()
+        while True:
+            chunk = [r for _, r in zip(range(chunk_rows), reader)]
+            if not chunk:
+                break
+            cols = {k: np.array([int(r[k]) for r in chunk], dtype=np.int64)
+                    for k in ('year', 'month', 'day', 'siji')}
+            out = engine.compute(cols['year'], cols['month'], cols['day'], cols['siji'])
+            for i, r in enumerate(chunk):
+                r.update(year_gz=out['year'][i], month_gz=out['month'][i],
+                         day_gz=out['day'][i], hour_gz=out['hour'][i])
+            writer.writerows(chunk)
+            rows += len(chunk)
+    return rows
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='K-MUDANG 4주 일괄 계산')
+    parser.add_argument('html_path', help='절기 표를 읽을 번들 (ko.html / jp.html)')
+    parser.add_argument('in_path')
+    parser.add_argument('out_path')
+    parser.add_argument('--lang', default='ko', choices=['ko', 'jp'])
+    parser.add_argument('--city', default=None, help='JP 경도 보정 도시 (기본 東京)')
+    parser.add_argument('--tables', default=None,
+                        help=f'calendar_tables.py 로 만든 절기 테이블 (기본: 번들 옆 {TABLES_FILE} 가 있으면 사용)')
+    parser.add_argument('--no-tables', action='store_true', help='절기 테이블 없이 직접 계산')
+    args = parser.parse_args()
+
+    tables = None if args.no_tables else AUTO_TABLES
+    if args.tables:
+        from calendar_tables import CalendarTables
+        tables = CalendarTables(args.tables)
+    engine = PillarEngine(load_profile(args.html_path, args.lang, args.city, tables))
+    n = run_csv(engine, args.in_path, args.out_path)
+    print(f"✅ {n}건 계산 완료 → {args.out_path}")
@@ -1,58 +1,77 @@
-/* K-MUDANG Service Worker v1.2 */
-const CACHE_VERSION = 'kmudang-v1.2';
-const STATIC_CACHE = 'kmudang-static-v1.2';
+/* K-MUDANG Service Worker v1.3 */
+const PRECACHE = 'kmudang-precache';
+const RUNTIME_CACHE = 'kmudang-runtime-v1.3';
 
-/* 핵심 정적 에셋 — 설치 시 즉시 캐시 */
-const PRECACHE_ASSETS = [
-  '/ko.html',
-  '/en.html',
-  '/jp.html',
-  '/manifest.json',
-  '/manifest-en.json',
-  '/manifest-jp.json',
-  '/ogimage.png',
-  '/sharethumbnail.png',
-  '/zodiacwheel.png',
-  '/mainbg.jpg',
-  '/rat.webp',
-  '/ox.webp',
-  '/tiger.webp',
-  '/rabbit.webp',
-  '/dragon.webp',
-  '/snake.webp',
-  '/horse.webp',
-  '/sheep.webp',
-  '/monkey.webp',
-  '/rooster.webp',
-  '/dog.webp',
-  '/pig.webp'
+/* ─── 사전 캐시 매니페스트 — build_precache.py 가 생성 (직접 수정 금지) ─── */
+const PRECACHE_MANIFEST = [
+  { url: '/index.html', revision: 'e3e7215340' },
+  { url: '/ko.html', revision: '7ee684b5a7' },
+  { url: '/en.html', revision: '088eb555af' },
+  { url: '/jp.html', revision: '4b3b80a8c0' },
+  { url: '/manifest-index.json', revision: '3d35a232f2' },
+  { url: '/manifest.json', revision: '6be6a86d04' },
+  { url: '/manifest-en.json', revision: '31bf695069' },
+  { url: '/manifest-jp.json', revision: '5f30dd123d' },
+  { url: '/ogimage.png', revision: 'a546963093' },
+  { url: '/sharethumbnail.png', revision: '173f2a909c' },
+  { url: '/zodiacwheel.png', revision: '73b2590a81' },
+  { url: '/mainbg.jpg', revision: '34707197ac' },
+  { url: '/animals/dog.webp', revision: '36d95d9459' },
+  { url: '/animals/dragon.webp', revision: 'eb1e6719e2' },
+  { url: '/animals/horse.webp', revision: '3254fcc014' },
+  { url: '/animals/monkey.webp', revision: '141f7c9cb4' },
+  { url: '/animals/ox.webp', revision: 'f01abf3802' },
+  { url: '/animals/pig.webp', revision: 'fdc2f096ed' },
+  { url: '/animals/rabbit.webp', revision: '022fc8c0f7' },
+  { url: '/animals/rat.webp', revision: '8fb2270f81' },
+  { url: '/animals/rooster.webp', revision: 'f1c3d114c1' },
+  { url: '/animals/sheep.webp', revision: 'a8b738f3be' },
+  { url: '/animals/snake.webp', revision: '2fe232b22d' },
+  { url: '/animals/tiger.webp', revision: '5176eb43be' }
 ];
+/* ─── 사전 캐시 매니페스트 끝 ─── */
 
-/* ─── Install: 핵심 에셋 사전 캐시 ─── */
+/* 파일별 리비전을 쿼리로 붙인 키로 캐시 — 리비전이 그대로인 파일은 다시 받지 않음 */
+const revisionKey = entry => `${entry.url}?__rev=${entry.revision}`;
+const PRECACHE_KEYS = new Map(PRECACHE_MANIFEST.map(entry => [entry.url, revisionKey(entry)]));
+
+/* ─── Install: 바뀐 리비전만 사전 캐시 ─── */
 self.addEventListener('install', event => {
   event.waitUntil(
-    caches.open(STATIC_CACHE)
+    caches.open(PRECACHE)
       .then(cache => {
         /* 실패해도 SW 설치는 계속 — 개별 파일 오류 무시 */
         return Promise.allSettled(
-          PRECACHE_ASSETS.map(url =>
-            cache.add(url).catch(() => { /* 404 무시 */ })
-          )
+          PRECACHE_MANIFEST.map(entry => {
+            const key = revisionKey(entry);
+            return cache.match(key).then(hit => hit || fetch(key, { cache: 'no-cache' }).then(response => {
+              if (response.ok) return cache.put(key, response);
+            }));
+          })
         );
       })
       .then(() => self.skipWaiting())
   );
 });
 
-/* ─── Activate: 구 버전 캐시 삭제 ─── */
+/* ─── Activate: 구 버전 캐시와 매니페스트에서 빠진 리비전 삭제 ─── */
 self.addEventListener('activate', event => {
   event.waitUntil(
     caches.keys().then(keys =>
       Promise.all(
         keys
-          .filter(key => key !== STATIC_CACHE)
+          .filter(key => key !== PRECACHE && key !== RUNTIME_CACHE)
           .map(key => caches.delete(key))
       )
+    ).then(() => caches.open(PRECACHE)).then(cache =>
+      cache.keys().then(requests => {
+        const valid = new Set([...PRECACHE_KEYS.values()].map(key => new URL(key, self.location).href));
+        return Promise.all(
+          requests
+            .filter(request => !valid.has(request.url))
+            .map(request => cache.delete(request))
+        );
+      })
     ).then(() => self.clients.claim())
   );
 });
@@ -66,21 +85,29 @@ self.addEventListener('fetch', event => {
     return;
   }
 
-  /* HTML 파일 — Network First (최신 버전 우선, 실패 시 캐시) */
+  const precached = PRECACHE_KEYS.get(url.pathname === '/' ? '/index.html' : url.pathname);
+
+  /* HTML 파일 — Network First (최신 버전 우선, 실패 시 캐시 → 사전 캐시) */
   if (url.pathname.endsWith('.html') || url.pathname === '/') {
     event.respondWith(
       fetch(event.request)
         .then(response => {
           const clone = response.clone();
-          caches.open(STATIC_CACHE).then(cache => cache.put(event.request, clone));
+          caches.open(RUNTIME_CACHE).then(cache => cache.put(event.request, clone));
           return response;
         })
-        .catch(() => caches.match(event.request))
+        .catch(() => caches.match(event.request).then(cached => cached || (precached && caches.match(precached))))
     );
     return;
   }
 
-  /* 정적 에셋(이미지/webp/json/css) — Cache First (캐시 미스 시 네트워크) */
+  /* 사전 캐시 에셋 — 현재 리비전 사본 (없으면 네트워크) */
+  if (precached) {
+    event.respondWith(caches.match(precached).then(cached => cached || fetch(event.request)));
+    return;
+  }
+
+  /* 그 밖의 정적 에셋(이미지/webp/json/css) — Cache First (캐시 미스 시 네트워크) */
   event.respondWith(
     caches.match(event.request).then(cached => {
       if (cached) return cached;
@@ -88,7 +115,7 @@ self.addEventListener('fetch', event => {
         /* 성공한 응답만 캐시 */
         if (response && response.status === 200) {
           const clone = response.clone();
-          caches.open(STATIC_CACHE).then(cache => cache.put(event.request, clone));
+          caches.open(RUNTIME_CACHE).then(cache => cache.put(event.request, clone));
         }
         return response;
       }).catch(() => {
@@ -0,0 +1,319 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+K-MUDANG 택일(擇日) 범위 스캐너 v1.0
+브라우저 calcAuspiciousScore 의 날짜 점수 Python 이식판 (문구·달력 화면은 옮기지 않음).
+페이지는 renderTaekilCalendar 가 한 달씩, 고른 목적(selectTaekilPurpose) 하나만 채점한다.
+
+사용법:
+  python taekil_engine.py build ko.html [--out taekil_index.npz] [--force]
+  python taekil_engine.py top ko.html 1990 5 17 [--siji 6] [--purpose wedding]
+                          [--partner 1992 3 8] [--partner-siji 4]
+                          [--from 2026-10-18] [--months 18] [--k 20] [--index taekil_index.npz] [--force]
+ko 번들만 받으며, 이식 뒤 번들에서 바뀐 JS 함수가 있으면 --force 없이는 색인·순위를 내지 않는다.
+
+날짜 점수가 날짜에서 쓰는 것은 일진(60갑자)과 손없는날 여부뿐이다 → 날짜 분류 120개.
+명식에서 쓰는 것은 용신·희신·기신 오행과 일주뿐이다. 그래서 색인(build)은
+  점수 입방체  [목적 4, 용신 5, 희신 5, 기신 5, 내 일주 60, 날짜 분류 120]  int8
+  날짜 목록    1900-01-01 ~ 2100-12-31 의 epoch 일수를 (분류, 날짜) 순으로 정렬 + 분류별 시작 위치
+로 저장한다. 질의(top)는 내 명식의 분류 점수 120개를 읽고 점수 높은 분류부터 각 분류의 날짜
+목록에서 기간을 이분 탐색으로 잘라 모으므로, 기간 안 날짜 수와 무관하게 상위 k 개만 본다.
+두 사람(--partner)이면 두 점수의 합으로 줄 세우고, 둘 다 'good'(1점) 이상인 날만 고른다.
+"""
+
+import os, sys, json, time, argparse, calendar, hashlib
+from datetime import date
+
+import numpy as np
+
+from build_bundles import bundle_functions, source_sha
+from calendar_tables import JsCalendar, LEAP_FLAG, lunar_months, source_digest
+from chart_engine import ChartEngine, load_tables, stale_ports
+from saju_engine import BASE_JDN, _days_scalar
+
+TAEKIL_TABLE_NAMES = ('STEM', 'BRANCH', 'EL_ORDER', 'TEN_GODS', 'TWELVE_STATES')
+
+# 이식 기준 JS 함수 원문 해시 (build_bundles.source_sha, ko.html)
+PORTED_SHA = {
+    'calcAuspiciousScore': '5c8c6331061fe931',
+    'getTwelveState': 'd5fc5489b4cb5561',
+}
+# 손없는날 판정에 쓰는 함수 — ko.html 에는 없고, 없으면 JS 가 예외를 삼켜 가산점이 붙지 않는다
+LUNAR_FUNCTION = 'solarToLunar'
+
+PURPOSES = ('wedding', 'move', 'open', 'exam')       # selectTaekilPurpose 선택지
+DAY_RANGE = ((1900, 1, 1), (2100, 12, 31))
+UNIX_JDN = 2440588                                   # 1970-01-01 의 율리우스 일수
+CLASSES = 120                                        # 일진 60 × 손없는날 여부 2
+GOOD = 1                                             # grade 'good' 하한
+WORST = -99
+INDEX_FILE = 'taekil_index.npz'
+
+# ── calcAuspiciousScore 본문 안의 표 (JS 원문 그대로) ──────────────────────────
+
+SHIPAK = ('甲辰', '乙巳', '壬申', '庚辰', '戊戌', '癸亥', '甲申', '壬子', '庚午', '丁亥')   # 십악대패일
+SOHN_DAYS = (9, 10, 19, 20, 29, 30)                  # 손없는날 (음력 일)
+HAP_PAIRS = [(8, 0), (0, 4), (8, 4), (5, 9), (9, 1), (5, 1), (2, 6), (6, 10), (2, 10), (11, 3), (3, 7), (11, 7)]
+YUKHAP = [(0, 1), (2, 11), (3, 10), (4, 9), (5, 8), (6, 7)]
+OPEN_STATES = ('건록', '제왕')
+EXAM_STATES = ('장생', '관대', '건록', '제왕')
+EXAM_GODS = ('indirectSeal', 'directSeal')          # god.k 와 비교 (번들의 k 는 이름이라 맞는 일이 없음)
+TWELVE_STARTS = (11, 6, 2, 9, 2, 9, 5, 0, 8, 3)
+
+
+def _hap(pairs, a, b):
+    return a >= 0 and b >= 0 and a != b and any((x == a and y == b) or (y == a and x == b) for x, y in pairs)
+
+
+def grade(score):
+    return ('worst' if score == WORST else 'best' if score >= 3 else 'good' if score >= GOOD
+            else 'neutral' if score == 0 else 'bad')
+
+
+def bundle_key(html):
+    """날짜 점수가 의존하는 표·함수 원문·음력 데이터가 같으면 같은 값 — 저장된 색인의 유효성 확인용"""
+    functions, _ = bundle_functions(html)
+    sources = {name: source_sha(html[functions[name][0]:functions[name][1]]) if name in functions else None
+               for name in sorted({*PORTED_SHA, LUNAR_FUNCTION, 'calcDayPillar', 'getTenGod'})}
+    tables = load_tables(html, TAEKIL_TABLE_NAMES)
+    blob = json.dumps([sources, tables, source_digest(html).hex()], ensure_ascii=False, sort_keys=True)
+    return hashlib.sha256(blob.encode('utf-8')).hexdigest()[:16]
+
+
+def day_number(d):
+    return _days_scalar(d.year, d.month, d.day)
+
+
+def add_months(d, months):
+    y, m = divmod(d.month - 1 + months, 12)
+    y, m = d.year + y, m + 1
+    return date(y, m, min(d.day, calendar.monthrange(y, m)[1]))
+
+
+# ── 엔진 ─────────────────────────────────────────────────────────────────────
+
+class TaekilEngine:
+    """날짜 점수 함수(스칼라 참조) + 전 기간 색인 생성 + 기간 상위 k 질의"""
+
+    def __init__(self, html, chart=None):
+        self.chart = chart or ChartEngine(html)
+        t = load_tables(html, ('TWELVE_STATES',))
+        self.TWELVE_STATES = [s['k'] for s in t['TWELVE_STATES']]
+        functions, _ = bundle_functions(html)
+        self.has_lunar = LUNAR_FUNCTION in functions
+        self.calendar = JsCalendar(html)
+        self.stale = stale_ports(html, PORTED_SHA) + self.chart.stale
+        self.key = bundle_key(html)
+        c = self.chart
+        self.stem_el = [c.EL_ORDER.index(s['e']) for s in c.STEM]
+        self.branch_el = [c.EL_ORDER.index(b['e']) for b in c.BRANCH]
+        self.shipak = {g for g in range(60) if c.STEM[g % 10]['c'] + c.BRANCH[g % 12]['c'] in SHIPAK}
+
+    # ── 스칼라 (JS 한 줄씩 대응) ──
+
+    def gods(self, gz):
+        """4주 (시 모름 = -1) → fullAnalysis 의 (용신, 희신, 기신) 오행 인덱스"""
+        c = self.chart
+        return tuple(c.EL_ORDER.index(el) for el in c.yongsin(tuple(g for g in gz if g >= 0)))
+
+    def twelve_state(self, ds, db):
+        """getTwelveState(STEM[ds], BRANCH[db]).k"""
+        start = TWELVE_STARTS[ds]
+        idx = (db - start + 12) % 12 if self.chart.STEM[ds]['y'] else (start - db + 12) % 12
+        return self.TWELVE_STATES[idx]
+
+    def bonus(self, purpose, my_gz, date_gz, sohn):
+        """목적별 가산점 (Layer 3)"""
+        if purpose == 'wedding':
+            bi, day_bi = date_gz % 12, my_gz % 12
+            return _hap(HAP_PAIRS, bi, day_bi) + _hap(YUKHAP, bi, day_bi)
+        if purpose == 'move':
+            return 2 if sohn else 0
+        if purpose == 'open':
+            return 1 if self.twelve_state(my_gz % 10, date_gz % 12) in OPEN_STATES else 0
+        if purpose == 'exam':
+            god = self.chart._ten_god(date_gz % 10, my_gz % 10)
+            return ((1 if god and god['k'] in EXAM_GODS else 0)
+                    + (1 if self.twelve_state(my_gz % 10, date_gz % 12) in EXAM_STATES else 0))
+        return 0
+
+    def score(self, purpose, gods, my_gz, date_gz, sohn):
+        """calcAuspiciousScore 의 score (gods = (용신, 희신, 기신) 오행 인덱스)"""
+        yong, hee, gi = gods
+        els = (self.stem_el[date_gz % 10], self.branch_el[date_gz % 12])
+        score = 2 * (yong in els) + (hee in els) - 2 * (gi in els)
+        if date_gz in self.shipak:
+            score = WORST
+        return score + self.bonus(purpose, my_gz, date_gz, sohn)
+
+    def sohn(self, y, m, d):
+        """solarToLunar(y, m, d)?.day 가 손없는날인지 (윤달·변환 범위 밖은 null → 아님)"""
+        days = np.array([_days_scalar(y, m, d)])
+        return bool(self._sohn_days(days)[0])
+
+    # ── 전 기간 색인 ──
+
+    def _sohn_days(self, days):
+        """epoch 일수 배열 → 손없는날 bool 배열
+
+        solarToLunar 는 평달(1~12월)만 lunarToSolar 로 되짚으므로 윤달 날짜는 null 이다.
+        """
+        if not self.has_lunar:
+            return np.zeros(len(days), dtype=bool)
+        js = self.calendar
+        year_month, month_start, month_code, _ = lunar_months(js)
+        month_start = np.array(month_start, dtype=np.int64)
+        k = np.searchsorted(month_start, days, side='right') - 1
+        inside = (k >= 0) & (k < len(month_code))
+        k = np.clip(k, 0, len(month_code) - 1)
+        year = js.lunar_start + np.searchsorted(np.array(year_month), k, side='right') - 1
+        leap = (np.array(month_code, dtype=np.uint8)[k] & LEAP_FLAG) != 0
+        lunar_day = days - month_start[k] + 1
+        return inside & ~leap & (year <= js.convert_last) & np.isin(lunar_day, SOHN_DAYS)
+
+    def build(self):
+        """전 기간 색인 dict (np.savez 로 그대로 저장)"""
+        first, last = (_days_scalar(*d) for d in DAY_RANGE)
+        days = np.arange(first, last + 1, dtype=np.int64)
+        day_gz = (days + UNIX_JDN - BASE_JDN) % 60          # calcDayPillar 와 같은 기준일
+        cls = day_gz * 2 + self._sohn_days(days)
+        order = np.argsort(cls, kind='stable')               # 분류 안에서는 날짜 오름차순
+        starts = np.searchsorted(cls[order], np.arange(CLASSES + 1))
+
+        # 용신·희신·기신 × 날짜 일진 (Layer 1·2) + 목적 × 내 일주 × 날짜 분류 (Layer 3)
+        els = np.arange(5)
+        stem_el, branch_el = np.array(self.stem_el), np.array(self.branch_el)
+        gz = np.arange(60)
+        has = (stem_el[gz % 10] == els[:, None]) | (branch_el[gz % 12] == els[:, None])    # [오행, 일진]
+        base = 2 * has[:, None, None, :] + has[None, :, None, :] - 2 * has[None, None, :, :]
+        base = np.where(np.isin(gz, sorted(self.shipak)), WORST, base)
+        bonus = np.array([[[self.bonus(p, my, c // 2, c % 2) for c in range(CLASSES)] for my in range(60)]
+                          for p in PURPOSES])
+        cube = base[None, :, :, :, None, np.arange(CLASSES) // 2] + bonus[:, None, None, None, :, :]
+        return {'key': np.array(self.key), 'first': np.array(first), 'cube': cube.astype(np.int8),
+                'dates': days[order].astype(np.int32), 'starts': starts.astype(np.int32)}
+
+    def load(self, path):
+        """저장된 색인 (없거나 번들이 바뀌었으면 새로 만들어 저장) → dict"""
+        if os.path.exists(path):
+            with np.load(path) as data:
+                if str(data['key']) == self.key:
+                    return {name: data[name] for name in data.files}
+        index = self.build()
+        np.savez_compressed(path, **index)
+        return index
+
+    # ── 질의 ──
+
+    @staticmethod
+    def class_scores(index, purpose, gods, my_gz):
+        """색인에서 명식 하나의 날짜 분류별 점수 120개"""
+        yong, hee, gi = gods
+        return index['cube'][PURPOSES.index(purpose), yong, hee, gi, my_gz].astype(np.int16)
+
+    def top(self, index, purpose, charts, start, end, k=20):
+        """기간 [start, end) epoch 일수 안에서 점수 상위 k 일 → [(epoch 일수, 합계, (명식별 점수, ...)), ...]
+
+        charts = [(용신·희신·기신, 일주), ...] — 둘 이상이면 합계로 줄 세우고 모두 GOOD 이상인 날만.
+        동점은 이른 날짜 먼저.
+        """
+        per = np.stack([self.class_scores(index, purpose, gods, my_gz) for gods, my_gz in charts])
+        total = per.sum(axis=0)
+        ok = (per >= GOOD).all(axis=0)
+        dates, starts = index['dates'], index['starts']
+        out = []
+        for level in np.unique(total[ok])[::-1]:
+            found, cls = [], []
+            for c in np.flatnonzero(ok & (total == level)):
+                seg = dates[starts[c]:starts[c + 1]]
+                lo, hi = np.searchsorted(seg, (start, end))
+                found.append(seg[lo:hi])
+                cls.append(np.full(hi - lo, c))
+            found, cls = np.concatenate(found), np.concatenate(cls)
+            for i in np.argsort(found, kind='stable')[:k - len(out)]:
+                out.append((int(found[i]), int(level), tuple(per[:, cls[i]].tolist())))
+            if len(out) >= k:
+                break
+        return out
+
+
+def _civil(day):
+    return date.fromordinal(day + date(1970, 1, 1).toordinal())
+
+
+# ── 진입점 ──────────────────────────────────────────────────────────────────
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='K-MUDANG 택일 범위 스캐너')
+    sub = parser.add_subparsers(dest='command', required=True)
+    p_build = sub.add_parser('build', help='1900~2100 전 기간 날짜 점수 색인 저장')
+    p_build.add_argument('html_path')
+    p_build.add_argument('--out', default=INDEX_FILE)
+    p_build.add_argument('--force', action='store_true', help='이식 뒤 바뀐 JS 함수가 있어도 실행')
+    p_top = sub.add_parser('top', help='내 명식(+상대)으로 기간 안 상위 k 일')
+    p_top.add_argument('html_path')
+    p_top.add_argument('year', type=int)
+    p_top.add_argument('month', type=int)
+    p_top.add_argument('day', type=int)
+    p_top.add_argument('--siji', type=int, default=-1, help='시지 인덱스 0~11 (모름 = -1)')
+    p_top.add_argument('--partner', type=int, nargs=3, metavar=('Y', 'M', 'D'), default=None)
+    p_top.add_argument('--partner-siji', type=int, default=-1)
+    p_top.add_argument('--purpose', default='wedding', choices=PURPOSES)
+    p_top.add_argument('--from', dest='start', default=None, help='시작일 YYYY-MM-DD (기본: 오늘)')
+    p_top.add_argument('--months', type=int, default=18)
+    p_top.add_argument('--k', type=int, default=20)
+    p_top.add_argument('--index', default=INDEX_FILE, help='색인 .npz (없거나 낡으면 새로 만듦)')
+    p_top.add_argument('--force', action='store_true', help='이식 뒤 바뀐 JS 함수가 있어도 실행')
+    args = parser.parse_args()
+
+    with open(args.html_path, encoding='utf-8') as f:
+        html = f.read()
+    try:
+        engine = TaekilEngine(html)
+    except ValueError as e:
+        print(f"❌ {args.html_path}: {e}")
+        sys.exit(1)
+    if engine.stale and not args.force:
+        print(f"❌ 이식 뒤 번들에서 바뀐 JS 함수: {', '.join(engine.stale)} — 이식을 갱신하거나 --force")
+        sys.exit(1)
+    if engine.stale:
+        print(f"⚠️ 이식 뒤 번들에서 바뀐 JS 함수: {', '.join(engine.stale)}", file=sys.stderr)
+    if not engine.has_lunar:
+        print(f"ℹ️ {args.html_path} 에 {LUNAR_FUNCTION} 없음 — 손없는날 가산점 없음 (페이지와 같음)")
+
+    if args.command == 'build':
+        t0 = time.perf_counter()
+        index = engine.build()
+        np.savez_compressed(args.out, **index)
+        print(f"✅ {args.out} 저장 — 날짜 {len(index['dates']):,}일 ({time.perf_counter() - t0:.1f}s, "
+              f"{os.path.getsize(args.out) / 1024:,.1f}KB)")
+        sys.exit(0)
+
+    try:
+        start = date.fromisoformat(args.start) if args.start else date.today()
+    except ValueError as e:
+        print(f"❌ --from: {e}")
+        sys.exit(1)
+    end = add_months(start, args.months)
+    if start < date(*DAY_RANGE[0]) or end > date(*DAY_RANGE[1]):
+        print(f"❌ 기간은 {date(*DAY_RANGE[0])} ~ {date(*DAY_RANGE[1])} 안이어야 함")
+        sys.exit(1)
+
+    from saju_engine import PillarEngine, load_profile
+    births = [(args.year, args.month, args.day, args.siji)]
+    if args.partner:
+        births.append((*args.partner, args.partner_siji))
+    out = PillarEngine(load_profile(args.html_path, engine.chart.lang)).compute(*map(list, zip(*births)))
+    charts = []
+    for i in range(len(births)):
+        gz = tuple(int(out[pos][i]) for pos in ('year', 'month', 'day', 'hour'))
+        charts.append((engine.gods(gz), gz[2]))
+    index = engine.load(args.index)
+    t0 = time.perf_counter()
+    best = engine.top(index, args.purpose, charts, day_number(start), day_number(end), args.k)
+    elapsed = time.perf_counter() - t0
+    c = engine.chart
+    print(f"🔍 {args.purpose} · {start} ~ {end} (미포함) · 상위 {len(best)}일 ({elapsed * 1000:,.2f}ms)")
+    for rank, (day, total, scores) in enumerate(best, 1):
+        gz = (day + UNIX_JDN - BASE_JDN) % 60
+        detail = ' + '.join(f'{s}({grade(s)})' for s in scores) if len(scores) > 1 else grade(total)
+        print(f"  {rank:>3}. {_civil(day)} {c.STEM[gz % 10]['c']}{c.BRANCH[gz % 12]['c']}일  {total:>3}점  {detail}")
@@ -2,22 +2,38 @@
 # -*- coding: utf-8 -*-
 """
 K-MUDANG 3언어 일관성 자동 검증 시스템 v1.0
-사용법: python verify_consistency.py ko.html en.html jp.html
+사용법: python verify_consistency.py ko.html en.html jp.html [--locale 코드=파일 ...] [--pages DIR]
 출력: audit_report.json, fix_patches.py
+로케일은 LOCALES 레지스트리(register_locale)로 늘릴 수 있고, archetype-pages/ 의
+정적 아키타입 페이지는 모든 로케일의 일주 DB 와 교차 검증한다.
+--watch: 인덱스를 메모리에 둔 채 저장마다 영향받은 검사만 재실행해 변경분 출력
+--profile: 추출 단계·검사별 시간/패턴 스캔 횟수를 리포트 timings 섹션에 기록 (--profile-memory: 메모리도)
+JS 엔진 동등성은 최상위 함수별 해시로 비교한다 (build_bundles.py 의 공용 엔진 매니페스트 포함).
+build_bundles.py 데이터 팩(dist/data)이 번들과 같은 빌드면 일주 표를 스크립트 대신 팩에서 읽는다.
+번들은 mmap 한 UTF-8 바이트를 바이트 패턴으로 스캔하고, 보고할 짧은 구간과 스크립트 구간만 디코딩한다.
 """
 
-import re, sys, json, os
+import re, sys, json, os, io, time, mmap, struct, select, argparse, hashlib, shutil, tempfile, html as htmllib
+import ctypes
+import tracemalloc
+import multiprocessing as mp
+from bisect import bisect_left
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
+from contextlib import redirect_stdout, contextmanager, nullcontext
 from datetime import datetime
 
-# ── 60갑자 정의 ─────────────────────────────────────────────────────────────
-GAPJA = [
-    '甲子','乙丑','丙寅','丁卯','戊辰','己巳','庚午','辛未','壬申','癸酉',
-    '甲戌','乙亥','丙子','丁丑','戊寅','己卯','庚辰','辛巳','壬午','癸未',
-    '甲申','乙酉','丙戌','丁亥','戊子','己丑','庚寅','辛卯','壬辰','癸巳',
-    '甲午','乙未','丙申','丁酉','戊戌','己亥','庚子','辛丑','壬寅','癸卯',
-    '甲辰','乙巳','丙午','丁未','戊申','己酉','庚戌','辛亥','壬子','癸丑',
-    '甲寅','乙卯','丙辰','丁巳','戊午','己未','庚申','辛酉','壬戌','癸亥'
-]
+import build_bundles
+from build_bundles import tokenize, top_level_functions, logic_digest, source_sha, _function_spans
+from year_luck_rules import RATING_RULES
+from gapja import GAPJA, expected_page_file
+
+# ── 로케일 레지스트리 ─────────────────────────────────────────────────────────
+# 감사 대상 로케일 코드 → 표시명 (등록 순서 = 출력 순서). 아래 언어별 표들은
+# 이 코드를 키로 쓰며, 표에 항목이 없는 로케일은 해당 검사에서 건너뛴다.
+# DB 완전성·아키타입 페이지 교차 검증은 등록된 모든 로케일이 대상.
+LOCALES = {'ko': 'KO', 'en': 'EN', 'jp': 'JP'}
+REFERENCE_LOCALE = 'ko'   # CHECK 2 극성 비교 기준
+SPOUSE_ARBITER = 'en'     # CHECK 2 기준과 일치하면 대상 로케일을 버그로 판정
 
 # ── 배우자운 극성 판단 단어 목록 ─────────────────────────────────────────────
 SPOUSE_NEG = {
@@ -57,82 +73,1254 @@ RATING_SECTIONS = {
     'jp': ['歳運評価', '突破', '好転', 'ブレイクスルー'],
 }
 
+# 세운 등급 → 결과 화면 레이블: ylDetermineRating 의 반환 등급마다 yearLuck.rating 비교 체인에 레이블이 있어야 함
+# (체인 마지막 else 문자열은 나머지 등급 = 'neutral' 의 레이블로 본다)
+RATING_FUNCTION = 'ylDetermineRating'
+RATING_DEFAULT = 'neutral'
+
+# ── 추출 패턴 (모듈 로드 시 1회 컴파일) ─────────────────────────────────────
+SCRIPT_BLOCK_RE = re.compile(r'<script\b[^>]*>(.*?)</script>', re.S | re.I)
+PROMPT_DB_RE = re.compile(r"'([甲乙丙丁戊己庚辛壬癸][子丑寅卯辰巳午未申酉戌亥])'\s*:\s*\{t:'([^']*)',d:'([^']*)',s:'([^']*)'\}")
+UI_DB_RE = re.compile(r"'([甲乙丙丁戊己庚辛壬癸][子丑寅卯辰巳午未申酉戌亥])'\s*:\s*\{[^}]*?name\s*:\s*'([^']+)'")
+ILJU_UI_RE = re.compile(r"'([甲乙丙丁戊己庚辛壬癸][子丑寅卯辰巳午未申酉戌亥])'\s*:\s*\{\s*name:\s*'([^']*)'[^}]*?desc:\s*'([^']*)'")
+ARCHETYPE_DB_RE = re.compile(r"'([甲乙丙丁戊己庚辛壬癸][子丑寅卯辰巳午未申酉戌亥])'\s*:\s*\{\s*ko:\s*'([^']*)',\s*en:\s*'([^']*)',"
+                             r"\s*color:\s*'([^']*)',\s*pko:\s*'([^']*)',\s*pen:\s*'([^']*)'\s*\}")
+ARCHETYPE_FIELDS = ('ko', 'en', 'color', 'pko', 'pen')
+RATING_RETURN_RE = re.compile(r"return\s*'(\w+)'")
+RATING_FUNCTION_BRE = re.compile(rb'\bfunction\s+' + RATING_FUNCTION.encode('ascii') + rb'\s*\(')
+FUNCTION_WINDOW = 4096   # 함수 1개 원문을 찾을 때 처음 토큰화하는 바이트 수 (모자라면 4배씩)
+RATING_LABEL_RE = re.compile(r"yearLuck\.rating\s*===\s*'(\w+)'\s*\?\s*'([^']*)'(?:\s*:\s*'([^']*)')?")
+QUANTIFIERS = '*+?{'
+
+def _utf8_re(regex):
+    """str 정규식 → 같은 뜻의 UTF-8 바이트 정규식 (비 ASCII 부정·범위 클래스는 미지원)"""
+    src, out, i = regex.pattern, [], 0
+    while i < len(src):
+        ch = src[i]
+        if ch == '\\':
+            out.append(src[i:i + 2])
+            i += 2
+        elif ch == '[':
+            j = i + 1 + (src[i + 1] == '^')
+            j += src[j] == ']'
+            while src[j] != ']':
+                j += 2 if src[j] == '\\' else 1
+            body = src[i + 1:j]
+            wide = [c for c in body if ord(c) > 127]
+            if not wide:
+                out.append(src[i:j + 1])
+            elif body.startswith('^') or '-' in body:
+                raise ValueError(f'바이트 패턴으로 바꿀 수 없는 문자 클래스: [{body}]')
+            else:
+                narrow = ''.join(c for c in body if ord(c) <= 127)
+                out.append('(?:' + '|'.join([re.escape(c) for c in wide] + ([f'[{narrow}]'] if narrow else [])) + ')')
+            i = j + 1
+        else:
+            quantified = ord(ch) > 127 and i + 1 < len(src) and src[i + 1] in QUANTIFIERS
+            out.append(f'(?:{ch})' if quantified else ch)
+            i += 1
+    return re.compile(''.join(out).encode('utf-8'), regex.flags & ~re.UNICODE)
+
+# mmap 한 번들을 디코딩 없이 훑는 바이트판 — 캡처 그룹은 ASCII 따옴표 사이라 UTF-8 글자가 잘리지 않고,
+# 일치한 그룹만 디코딩한다 (str 판은 데이터 팩·페이지 등 이미 문자열인 입력용)
+SCRIPT_BLOCK_BRE = _utf8_re(SCRIPT_BLOCK_RE)
+PROMPT_DB_BRE = _utf8_re(PROMPT_DB_RE)
+UI_DB_BRE = _utf8_re(UI_DB_RE)
+ILJU_UI_BRE = _utf8_re(ILJU_UI_RE)
+ARCHETYPE_DB_BRE = _utf8_re(ARCHETYPE_DB_RE)
+RATING_LABEL_BRE = _utf8_re(RATING_LABEL_RE)
+
+def _texts(m, whole=False):
+    """바이트 일치 → 그룹 문자열 목록 (텍스트 모드로 읽던 때처럼 CRLF → LF, whole 이면 전체 일치도 끝에)"""
+    groups = m.groups() + ((m.group(0),) if whole else ())
+    return [g.decode('utf-8').replace('\r\n', '\n') if g is not None else None for g in groups]
+
+# 신살 현지화 명칭 (KO 키 → 언어별 표기)
+SINSSAL_NAMES = {
+    'en': {
+        '귀문관살': 'Spirit Gate',
+        '화개살': 'Canopy Star',
+        '학당귀인': 'Academy Noble',
+        '천의성': 'Heavenly Doctor',
+    },
+    'jp': {
+        '귀문관살': '鬼門関殺',
+        '화개살': '華蓋殺',
+        '학당귀인': '学堂貴人',
+        '천의성': '天醫星',
+    },
+}
+
+# 신살명 뒤 라벨 패턴 (그룹 1 = 라벨). 표에 없는 로케일은 '(라벨)' 형식으로 간주
+SINSSAL_LABEL_TAIL = {
+    'ko': r'\(([흉중길])\)',
+    'en': r'[^)]*\(([^)]+)\)',
+    'jp': r'\(([吉中凶])\)',
+}
+
+# CHECK 3 귀문관살 라벨 패치 (찾을 문자열, 바꿀 문자열). EN 은 라벨 형식이 달라 대상 아님
+GWIMUN_LABEL_PATCH = {
+    'ko': ('귀문관살(흉)', '귀문관살(중)'),
+    'jp': ('鬼門関殺(凶)', '鬼門関殺(中)'),
+}
+
+def _sinssal_label_re(lang):
+    """언어별 신살 라벨 통합 바이트 패턴 — 전방탐색(lookahead)으로 겹치는 후보도 모두 검사"""
+    names = list(SINSSAL_CORRECT) if lang == 'ko' else list(SINSSAL_NAMES.get(lang, {}).values())
+    if not names:
+        return None
+    tail = SINSSAL_LABEL_TAIL.get(lang, r'\(([^)]+)\)')
+    alt = '|'.join(re.escape(n) for n in names)
+    return _utf8_re(re.compile(rf'(?=({alt}){tail})'))
+
+SINSSAL_LABEL_RE = {lang: _sinssal_label_re(lang) for lang in LOCALES}
+
+# ── 키워드 규칙 레지스트리 ────────────────────────────────────────────────────
+# 근접 규칙 = 키워드 시퀀스. 각 키워드가 앞 키워드 뒤에서 같은 줄 안에,
+# PROXIMITY_WINDOW 글자 이내로 이어지면 충족 (대소문자 무시).
+# 기존 정규식 'A.*B' + re.IGNORECASE 와 같은 의미이며 None 이면 줄 끝까지 허용.
+PROXIMITY_WINDOW = None
+
+PROXIMITY_RULES = {
+    # CHECK 6: 양인-공망 특수 해석
+    'void_yanggin': {
+        'ko': [('양인', '공망'), ('공망', '양인'), ('양인이 공망',)],
+        'en': [('Sheep Blade', 'void'), ('void', 'Sword Edge'), ('sword edge', 'void')],
+        'jp': [('羊刃', '空亡'), ('空亡', '羊刃')],
+    },
+    # CHECK 7: 쿼드러플 자형
+    'quadruple': {
+        'ko': [('4개', '같은', '지지'), ('지지', '4개'), ('쿼드러플',)],
+        'en': [('quadruple',), ('four', 'same', 'branch'), ('4', 'identical', 'branch')],
+        'jp': [('四重',), ('4つの同じ',), ('同じ地支', '4')],
+    },
+    # CHECK 8: 납음=일간 동일 케이스
+    'naeum_same': {
+        'ko': [('납음', '같은'), ('일간', '납음', '동일'), ('보이는 것이 전부',)],
+        'en': [('same', 'naeum'), ('naeum', 'same', 'day master'), ('transparent',)],
+        'jp': [('納音', '同じ'), ('日干', '納音', '同一')],
+    },
+}
+
+# CHECK 9: 자시 방식 (대소문자 무시 부분 문자열)
+EARLY_MIDNIGHT_KEYWORDS = {
+    'ko': ['조자시', '早子時'],
+    'en': ['Early.*Midnight', 'early-midnight', 'Early Midnight', '早子時'],
+    'jp': ['早子時', '조자시', 'アーリー'],
+}
+
+# CHECK 5: EN BUREAU 필터 (대소문자 구분)
+BUREAU_FILTER_OLD = "filter(i => i.t && i.t.includes('合'))"
+BUREAU_FILTER_FIXED = ["i.t !== '天合'", 'i.t != "天合"']
+
+
+def _fold(kw):
+    return kw.lower()
+
+def _width(kw):
+    """접은 키워드의 UTF-8 바이트 길이 (바이트 위치에서 적중 끝 계산용)"""
+    return len(_fold(kw).encode('utf-8'))
+
+
+class KeywordAutomaton:
+    """전 언어 키워드를 바이트 트라이 정규식 하나로 묶은 다중 패턴 스캐너 (위치는 바이트 오프셋)"""
+
+    def __init__(self, keywords):
+        self.keywords = sorted({_fold(k) for k in keywords if k})
+        trie = {}
+        for kw in self.keywords:
+            node = trie
+            for unit in self._units(kw):
+                node = node.setdefault(unit, {})
+            node[None] = True
+        body = self._render(trie, top=True)
+        # 세그먼트 캐시 키에 포함 — 로케일 등록으로 키워드가 바뀌면 이전 스캔 결과를 쓰지 않음
+        self.digest = hashlib.sha256(body).hexdigest()[:16]
+        self.regex = re.compile(body)
+        kwset = set(self.keywords)
+        # 키워드 → 자신의 접두어이면서 등록된 다른 키워드들
+        self.prefixes = {kw: [kw[:i] for i in range(1, len(kw)) if kw[:i] in kwset]
+                         for kw in self.keywords}
+
+    @staticmethod
+    def _units(kw):
+        """접은 키워드 → 트라이 칸: 바이트 1개(int) 또는 대소문자 변형 바이트열 묶음(tuple)"""
+        for ch in kw:
+            upper = ch.upper()
+            if len(upper) == 1 and upper != ch and upper.lower() == ch:
+                yield tuple(sorted((ch.encode('utf-8'), upper.encode('utf-8'))))
+            else:
+                yield from ch.encode('utf-8')
+
+    @staticmethod
+    def _unit_pattern(unit):
+        if isinstance(unit, int):
+            return re.escape(bytes([unit]))
+        if all(len(form) == 1 for form in unit):
+            return b'[' + b''.join(re.escape(form) for form in unit) + b']'
+        return b'(?:' + b'|'.join(re.escape(form) for form in unit) + b')'
+
+    @classmethod
+    def _render(cls, node, top=False):
+        """트라이 → 패턴 (맨 앞 칸은 대소문자 변형도 리터럴 분기로 펼쳐 re 가 첫 바이트로 건너뛰게)"""
+        alts = []
+        for unit, child in sorted(node.items(), key=lambda item: repr(item[0])):
+            if unit is None:
+                continue
+            rest = cls._render(child)
+            if top and isinstance(unit, tuple):
+                alts.extend(re.escape(form) + rest for form in unit)
+            else:
+                alts.append(cls._unit_pattern(unit) + rest)
+        if not alts:
+            return b''
+        body = alts[0] if len(alts) == 1 else b'(?:' + b'|'.join(alts) + b')'
+        if None in node:
+            return b'(?:' + body + b')?'
+        return body
+
+    def scan(self, data, start=0, end=None):
+        """data[start:end] 1회 선형 스캔 → {fold 키워드: [바이트 위치, ...]} (절대 위치, 오름차순)"""
+        end = len(data) if end is None else end
+        search = self.regex.search
+        hits = {kw: [] for kw in self.keywords}
+        prefixes = self.prefixes
+        m = search(data, start, end)
+        while m:
+            pos = m.start()
+            kw = _fold(m.group().decode('utf-8'))
+            if kw in hits:
+                hits[kw].append(pos)
+                for pre in prefixes[kw]:
+                    hits[pre].append(pos)
+            m = search(data, pos + 1, end)  # 겹치는 출현도 놓치지 않도록 다음 위치부터
+        return hits
+
+
+def _registry_keywords():
+    kws = ['\n', BUREAU_FILTER_OLD, *BUREAU_FILTER_FIXED]
+    for table in (REQUIRED_SECTIONS, RATING_SECTIONS, EARLY_MIDNIGHT_KEYWORDS):
+        for words in table.values():
+            kws.extend(words)
+    for rules in PROXIMITY_RULES.values():
+        for seqs in rules.values():
+            for seq in seqs:
+                kws.extend(seq)
+    for names in SINSSAL_NAMES.values():
+        kws.extend(names.values())
+    kws.extend(SINSSAL_CORRECT)
+    return kws
+
+KEYWORD_AUTOMATON = KeywordAutomaton(_registry_keywords())
+
+
+def register_locale(code, label=None, *, spouse_neg=None, spouse_pos=None, sinssal_names=None,
+                    sinssal_tail=None, required_sections=None, rating_sections=None,
+                    early_midnight=None, proximity=None):
+    """감사 대상 로케일 추가 — 언어별 표(proximity 는 PROXIMITY_RULES 형식)를 등록하고 오토마톤 재생성"""
+    global KEYWORD_AUTOMATON
+    LOCALES[code] = label or code.upper()
+    for table, value in ((SPOUSE_NEG, spouse_neg), (SPOUSE_POS, spouse_pos),
+                         (SINSSAL_NAMES, sinssal_names), (SINSSAL_LABEL_TAIL, sinssal_tail),
+                         (REQUIRED_SECTIONS, required_sections), (RATING_SECTIONS, rating_sections),
+                         (EARLY_MIDNIGHT_KEYWORDS, early_midnight)):
+        if value is not None:
+            table[code] = value
+    for rule, seqs in (proximity or {}).items():
+        PROXIMITY_RULES[rule][code] = seqs
+    SINSSAL_LABEL_RE[code] = _sinssal_label_re(code)
+    KEYWORD_AUTOMATON = KeywordAutomaton(_registry_keywords())
+
+
+# ── 증분 감사 캐시 ────────────────────────────────────────────────────────────
+def _digest(data):
+    if isinstance(data, str):
+        data = data.encode('utf-8')
+    return hashlib.sha256(data).hexdigest()
+
+def _json_digest(obj):
+    return _digest(json.dumps(obj, ensure_ascii=False, sort_keys=True, separators=(',', ':')))
+
+def _source_sha(data, chunk=1 << 20):
+    """build_bundles.source_sha 와 같은 번들 해시를 바이트(mmap)에서 조각씩 계산 (CRLF → LF, 전체 사본 없음)"""
+    h = hashlib.sha256()
+    carry = b''
+    for i in range(0, len(data), chunk):
+        block = carry + data[i:i + chunk]
+        carry = b'\r' if block.endswith(b'\r') else b''
+        h.update(block[:len(block) - len(carry)].replace(b'\r\n', b'\n'))
+    h.update(carry)
+    return h.hexdigest()[:16]
+
+def _map_file(path):
+    """번들 파일 → 읽기 전용 mmap (빈 파일은 mmap 이 안 되므로 b'')"""
+    with open(path, 'rb') as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            return b''
+        return mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+with open(__file__, 'rb') as _src, open(build_bundles.__file__, 'rb') as _js:
+    # 검사 규칙·키워드·JS 토크나이저가 바뀌면 캐시 전체를 무효화
+    CODE_VERSION = _digest(_src.read() + _js.read())[:16]
+
+
+class AuditCache:
+    """콘텐츠 해시 키 디스크 캐시 (<root>/audit-v1/<코드 버전>/<종류>/<해시>.json)"""
+    SUBDIR = 'audit-v1'
+    RUN_MARK = '.run'  # 실행 시작 표시 — 항목과 같은 파일 시스템 시각으로 sweep 기준을 잡음
+    VERSION_RE = re.compile(r'[0-9a-f]{16}')
+
+    def __init__(self, root='.audit_cache'):
+        self.root = os.path.join(root, self.SUBDIR)
+        self.dir = os.path.join(self.root, CODE_VERSION)
+        if os.path.isdir(self.root):  # 이전 코드 버전 정리 — 버전 모양 디렉터리만 지움
+            for name in os.listdir(self.root):
+                path = os.path.join(self.root, name)
+                if name != CODE_VERSION and self.VERSION_RE.fullmatch(name) and os.path.isdir(path):
+                    shutil.rmtree(path, ignore_errors=True)
+        self.started = None
+        try:
+            os.makedirs(self.dir, exist_ok=True)
+            mark = os.path.join(self.dir, self.RUN_MARK)
+            with open(mark, 'w'):
+                pass
+            self.started = os.stat(mark).st_mtime
+        except OSError:
+            pass
+        self.hits = 0
+        self.misses = 0
+
+    def _path(self, kind, key):
+        return os.path.join(self.dir, kind, key + '.json')
+
+    def get(self, kind, key):
+        path = self._path(kind, key)
+        try:
+            with open(path, encoding='utf-8') as f:
+                value = json.load(f)
+            os.utime(path)  # 사용 표시 — 워커 프로세스의 적중도 sweep() 이 보도록 파일에 남김
+        except (OSError, ValueError):
+            self.misses += 1
+            return None
+        self.hits += 1
+        return value
+
+    def sweep(self):
+        """이번 실행(캐시 생성 이후)에서 읽거나 쓰지 않은 항목 삭제 → 지운 파일 수"""
+        removed = 0
+        cutoff = self.started
+        if cutoff is None or not os.path.isdir(self.dir):
+            return 0
+        for kind in os.listdir(self.dir):
+            folder = os.path.join(self.dir, kind)
+            if not os.path.isdir(folder):
+                continue
+            for entry in os.scandir(folder):
+                try:
+                    if entry.name.endswith('.json') and entry.stat().st_mtime < cutoff:
+                        os.remove(entry.path)
+                        removed += 1
+                except OSError:
+                    pass
+        return removed
+
+    def put(self, kind, key, value):
+        path = self._path(kind, key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=os.path.dirname(path), suffix='.tmp')  # rename 으로 원자적 — 워커 동시 쓰기 안전
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            json.dump(value, f, ensure_ascii=False, separators=(',', ':'))
+        os.replace(tmp, path)
+
+
+class MemoryCache:
+    """프로세스 내 캐시 (--watch 용) — AuditCache 와 같은 get/put. backing 이 있으면 디스크도 읽고 씀"""
+
+    def __init__(self, backing=None):
+        self.backing = backing
+        self.store = {}
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, kind, key):
+        value = self.store.get((kind, key))
+        if value is None and self.backing:
+            value = self.backing.get(kind, key)
+            if value is not None:
+                self.store[(kind, key)] = value
+        if value is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return value
+
+    def put(self, kind, key, value):
+        self.store[(kind, key)] = value
+        if self.backing:
+            self.backing.put(kind, key, value)
+
+
+# ── 프로파일러 (--profile) ───────────────────────────────────────────────────
+PROFILER = None  # 활성화 시 Profiler 인스턴스. None 이면 계측 지점은 빈 컨텍스트
+
+
+class _ScanTimer:
+    __slots__ = ('profiler', 'pattern', 'size', 'calls', 'start')
+
+    def __init__(self, profiler, pattern, size, calls):
+        self.profiler, self.pattern, self.size, self.calls = profiler, pattern, size, calls
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.profiler.count(self.pattern, self.size, time.perf_counter() - self.start, self.calls)
+
+
+class Profiler:
+    """단계·검사별 벽시계/CPU 시간, 패턴별 스캔 횟수·입력 크기, memory 면 최대 할당 수집 (순차 실행 전제)"""
+
+    def __init__(self, memory=False):
+        self.steps = []
+        self.current = None
+        self.peak = 0
+        self.memory = memory
+        if memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+        self.wall0, self.cpu0 = time.perf_counter(), time.process_time()
+
+    @contextmanager
+    def step(self, name):
+        record = {'step': name, 'scans': {}}
+        self.current = record
+        if self.memory:
+            base = tracemalloc.get_traced_memory()[0]
+            tracemalloc.reset_peak()
+        wall, cpu = time.perf_counter(), time.process_time()
+        try:
+            yield record
+        finally:
+            record['wall_ms'] = round((time.perf_counter() - wall) * 1000, 3)
+            record['cpu_ms'] = round((time.process_time() - cpu) * 1000, 3)
+            record['peak_kb'] = None
+            if self.memory:
+                peak = tracemalloc.get_traced_memory()[1]
+                record['peak_kb'] = max(0, peak - base) // 1024
+                self.peak = max(self.peak, peak)
+            self.current = None
+            self.steps.append(record)
+
+    def scan(self, pattern, size, calls=1):
+        return _ScanTimer(self, pattern, size, calls)
+
+    def count(self, pattern, size, seconds, calls=1):
+        if self.current is None:
+            return
+        entry = self.current['scans'].setdefault(pattern, {'calls': 0, 'size': 0, 'ms': 0.0})
+        entry['calls'] += calls
+        entry['size'] += size
+        entry['ms'] += seconds * 1000
+
+    def report(self):
+        """리포트 timings 섹션"""
+        try:
+            import resource
+            max_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        except ImportError:
+            max_rss = None
+        steps = []
+        for record in self.steps:
+            scans = {p: dict(e, ms=round(e['ms'], 3)) for p, e in sorted(record['scans'].items())}
+            steps.append({'step': record['step'], 'wall_ms': record['wall_ms'], 'cpu_ms': record['cpu_ms'],
+                          'peak_kb': record['peak_kb'], 'scans': scans})
+        return {
+            'total': {'wall_ms': round((time.perf_counter() - self.wall0) * 1000, 3),
+                      'cpu_ms': round((time.process_time() - self.cpu0) * 1000, 3),
+                      'peak_kb': max(self.peak, tracemalloc.get_traced_memory()[1]) // 1024 if self.memory else None,
+                      'max_rss_kb': max_rss},
+            'steps': steps,
+        }
+
+    def print_summary(self, timings):
+        print("\n⏱️ 프로파일 (벽시계 / CPU / 단계 최대 메모리 · 비용 큰 패턴)")
+        for record in timings['steps']:
+            top = sorted(record['scans'].items(), key=lambda kv: -kv[1]['ms'])[:3]
+            scans = ', '.join(f"{p}×{e['calls']}" for p, e in top)
+            peak = f"{record['peak_kb']:>8}KB" if record['peak_kb'] is not None else f"{'-':>10}"
+            print(f"  {record['step']:<36} {record['wall_ms']:>9.1f}ms {record['cpu_ms']:>9.1f}ms "
+                  f"{peak}  {scans}".rstrip())
+        total = timings['total']
+        rss = f" · 최대 RSS {total['max_rss_kb']}KB" if total['max_rss_kb'] else ''
+        print(f"  합계: {total['wall_ms']:.1f}ms (CPU {total['cpu_ms']:.1f}ms){rss}")
+
+_NO_PROFILE = nullcontext()
+
+def _step(name):
+    """추출 단계·검사 구간 (프로파일 중이 아니면 빈 컨텍스트)"""
+    return PROFILER.step(name) if PROFILER else _NO_PROFILE
+
+def _scan(pattern, size, calls=1):
+    """패턴 스캔 구간 — 프로파일 중이면 패턴별 횟수·크기·시간 누적"""
+    return PROFILER.scan(pattern, size, calls) if PROFILER else _NO_PROFILE
+
+
+# ── JS 함수 표 (CHECK 11) ───────────────────────────────────────────────────
+# 스크립트 구간 1개 = 최상위 함수와 그 사이 틈의 레코드 목록 (위치는 구간 시작 기준 바이트 오프셋)
+#   ['f', 이름, 시작, 끝, 원문 바이트 해시, 선언 머리, sha, logic]
+#   ['g', 시작, 끝, 원문 바이트 해시, 바로 뒤에 함수 선언이 와도 따로 토큰화한 결과가 같은지]
+FUNCTION_LEAD = 32  # 저장 뒤 같은 함수를 찾을 때 쓰는 선언 머리 글자 수
+SKIP_TAIL_RE = re.compile(r'(?:\s+|//[^\n]*\n|/\*.*?\*/)*', re.S)
+
+def _byte_offsets(text, offsets):
+    """오름차순 글자 오프셋 → UTF-8 바이트 오프셋"""
+    out, prev, pos = [], 0, 0
+    for c in offsets:
+        pos += len(text[prev:c].encode('utf-8'))
+        prev = c
+        out.append(pos)
+    return out
+
+def _gap_ok(text, tokens, a, b):
+    """틈 text[a:b] 가 최상위 문장 경계에서 괄호·템플릿이 닫힌 채 끝나고 끝나지 않은 함수 선언이 없는지"""
+    depth = tmpl = 0
+    stmt = True
+    for kind, s, e in tokens:
+        if kind == 'punct' and e - s == 1:  # 괄호·문장 끝은 한 글자 punct 만
+            t = text[s]
+            if t in '([{':
+                depth += 1
+            elif t in ')]}':
+                depth -= 1
+                if depth < 0:
+                    return False
+            stmt = depth == 0 and t in ';}'
+            continue
+        if stmt and kind == 'word' and text[s:e] in ('function', 'async'):
+            return False  # 조각 안에서 안 닫힌 선언 — 전체 문맥에서는 뒤 함수까지 이어질 수 있음
+        if kind == 'tmpl':
+            tmpl += text.endswith('${', s, e) - text.startswith('}', s)
+            if tmpl < 0:
+                return False
+        stmt = False
+    if tokens and (tokens[-1][0] != 'punct' or text[tokens[-1][1]:tokens[-1][2]] not in (';', '}')):
+        return False
+    tail = tokens[-1][2] if tokens else a
+    return depth == 0 and tmpl == 0 and SKIP_TAIL_RE.fullmatch(text, tail, b) is not None
+
+def _script_items(text, base=0):
+    """디코딩한 스크립트 조각 → 함수·틈 레코드 (조각 전체 토큰화, 위치에 base 를 더함)"""
+    tokens = tokenize(text)
+    spans = _function_spans(text, tokens)
+    bounds = _byte_offsets(text, [x for _, a, b, _, _ in spans for x in (a, b)] + [len(text)])
+    items, pos, byte_pos, k = [], 0, 0, 0
+    for (name, a, b, lo, hi), byte_a, byte_b in zip(spans, bounds[0::2], bounds[1::2]):
+        items.append(['g', base + byte_pos, base + byte_a, _digest(text[pos:a]), _gap_ok(text, tokens[k:lo], pos, a)])
+        items.append(['f', name, base + byte_a, base + byte_b, _digest(text[a:b]), text[a:a + FUNCTION_LEAD],
+                      source_sha(text[a:b]), logic_digest(text, tokens[lo:hi])])
+        pos, byte_pos, k = b, byte_b, hi
+    items.append(['g', base + byte_pos, base + bounds[-1], _digest(text[pos:]),
+                  _gap_ok(text, tokens[k:], pos, len(text))])
+    return items
+
+def _update_items(previous, data, start, end):
+    """이전 레코드로 바뀐 구간만 다시 토큰화 → 새 레코드 (경계가 맞지 않으면 None = 전체 토큰화)"""
+    gaps = {item[3]: item[4] for item in previous if item[0] == 'g'}
+    anchors, cursor = [], start
+    for item in previous:
+        if item[0] != 'f':
+            continue
+        length, lead = item[3] - item[2], item[5].encode('utf-8')
+        p = data.find(lead, cursor, end)
+        while p != -1 and p + length <= end and _digest(data[p:p + length]) != item[4]:
+            p = data.find(lead, p + 1, end)
+        if p != -1 and p + length <= end:
+            anchors.append((p - start, item))
+            cursor = p + length
+    items, pos = [], 0
+    for rel, fn in anchors + [(end - start, None)]:
+        piece = data[start + pos:start + rel]
+        key = _digest(piece)
+        if key in gaps and (gaps[key] or fn is None):
+            items.append(['g', pos, rel, key, gaps[key]])
+        else:
+            with _scan('js_functions', len(piece)):
+                found = _script_items(piece.decode('utf-8'), pos)
+            if fn is not None and not found[-1][4]:
+                return None
+            items.extend(found)
+        if fn is not None:
+            items.append(['f', fn[1], rel, rel + fn[3] - fn[2], *fn[4:]])
+            pos = rel + fn[3] - fn[2]
+    return items
+
+
+# ── 감시 모드 증분 스캔 ─────────────────────────────────────────────────────
+def _common_prefix(a, b, block=1 << 16):
+    """두 바이트열의 공통 접두어 길이 (큰 블록부터 반씩 줄여 비교)"""
+    n, i = min(len(a), len(b)), 0
+    while block:
+        while i + block <= n and a[i:i + block] == b[i:i + block]:
+            i += block
+        block //= 2
+    return i
+
+def _common_suffix(a, b, limit, block=1 << 16):
+    """두 바이트열의 공통 접미어 길이 (limit 이하)"""
+    la, lb, i = len(a), len(b), 0
+    while block:
+        while i + block <= limit and a[la - i - block:la - i] == b[lb - i - block:lb - i]:
+            i += block
+        block //= 2
+    return i
+
+
+# ────────────────────────────────────────────────────────────────────────────
+class BundleIndex:
+    """HTML 번들 1회 파싱 구조 인덱스 — 모든 check_* 가 이 인덱스만 조회 (위치는 바이트 오프셋)"""
+
+    def __init__(self, lang, data, automaton=None, cache=None, pack=None, path=None, previous=None):
+        self.lang = lang
+        self.path = path
+        self._cache = cache
+        # 감시 모드: 이전 인덱스의 함수 레코드 — 저장 뒤 바뀐 함수·틈만 다시 토큰화
+        self._previous_scripts = previous._scripts if previous is not None else None
+        self._data = data.encode('utf-8') if isinstance(data, str) else data
+        self.size = len(self._data)
+        self.automaton = automaton or KEYWORD_AUTOMATON
+        # 팩은 원본 또는 빌드 결과 번들 해시가 맞을 때만 사용 (번들을 고친 뒤 재빌드 전이면 스크립트에서 추출)
+        self.pack = pack if pack and _source_sha(self._data) in pack['sha'] else None
+        self.pack_stale = bool(pack) and self.pack is None
+        self._raw_scanned = self.pack is None
+        with _scan('SCRIPT_BLOCK_RE', self.size):
+            self.script_spans = [m.span(1) for m in SCRIPT_BLOCK_BRE.finditer(self._data)]
+        self.prompt_db = {}
+        self.ui_db = {}
+        self.ui_entries = {}
+        self.archetype_db = {}
+        self.archetype_raw = {}
+        self._functions = None  # function_table() — CHECK 11 이 처음 부를 때 채움
+        self._scripts = None  # 스크립트 구간별 함수·틈 레코드 (function_table 이 채움)
+        self.ratings = []  # ylDetermineRating 이 돌려줄 수 있는 세운 등급 (문서 순서)
+        self.rating_labels = {}  # 세운 등급 → 결과 화면 레이블 (마지막 출현)
+        self.hits = {kw: [] for kw in self.automaton.keywords}
+        self.segment_digests = []
+        # 감시 모드: 이전 번들과 바뀐 줄 범위 밖의 키워드 위치는 다시 스캔하지 않고 옮겨 쓴다
+        self._edit = self._edit_window(previous) if previous is not None else None
+        for start, end, is_script in self._segments():
+            with memoryview(self._data)[start:end] as seg:
+                key = _digest(seg)
+            self.segment_digests.append(key)
+            cache_key = _digest(self.automaton.digest + key + ('+pack' if self.pack else ''))
+            found = cache.get('segments', cache_key) if cache else None
+            if found is None:
+                found = self._scan_segment(start, end, is_script, tables=self.pack is None)
+                if cache:
+                    cache.put('segments', cache_key, found)
+            for kw, rel in found['hits'].items():
+                self.hits[kw].extend(start + p for p in rel)
+            # 같은 간지·등급이 다시 나오면 JS 객체 리터럴·원본 추출처럼 뒤가 우선
+            for g, t, d, sp in found['prompt']:
+                self.prompt_db[g] = {'t': t, 'd': d, 's': sp}
+            for g, name in found['ui']:
+                self.ui_db[g] = name
+            for g, name, desc in found['ilju_ui']:
+                self.ui_entries[g] = {'name': name, 'desc': desc}
+            for g, *fields, raw in found['archetype']:
+                self.archetype_db[g] = dict(zip(ARCHETYPE_FIELDS, fields))
+                self.archetype_raw[g] = raw
+            if found['ratings']:
+                self.ratings = found['ratings']
+            for rating, label in found['rating_labels']:
+                self.rating_labels[rating] = label
+        self._edit = None
+        if self.pack:
+            self._load_pack(self.pack['tables'])
+        self._keyword_pos = {}
+        self.newlines = self.hits['\n']
+        self.sinssal_hits = self._scan_sinssal_labels()
+
+    @property
+    def data(self):
+        """번들 UTF-8 바이트 (피클로 넘어온 인덱스는 처음 쓸 때 다시 매핑)"""
+        if self._data is None:
+            self._data = _map_file(self.path)
+        return self._data
+
+    def close(self):
+        """파일 매핑 해제 (감시 모드에서 인덱스를 갈아끼울 때)"""
+        if isinstance(self._data, mmap.mmap):
+            self._data.close()
+        if self.path:
+            self._data = None
+
+    def __getstate__(self):
+        state = dict(self.__dict__)
+        state['_cache'] = state['_previous_scripts'] = None
+        if self.path:
+            state['_data'] = None
+        return state
+
+    def _segments(self):
+        """(시작, 끝, 스크립트 여부) — 문서 전체를 빈틈없이 덮는 구간 목록"""
+        pos = 0
+        for start, end in self.script_spans:
+            if start > pos:
+                yield pos, start, False
+            yield start, end, True
+            pos = end
+        if pos < self.size:
+            yield pos, self.size, False
+
+    def _edit_window(self, previous):
+        """이전 인덱스 대비 (이전 키워드 위치, 바뀐 줄 시작, 끝, 길이 차) — 재사용할 수 없으면 None"""
+        if previous._data is None or previous.automaton.digest != self.automaton.digest:
+            return None
+        old, new = previous._data, self._data
+        delta = len(new) - len(old)
+        head = _common_prefix(old, new)
+        tail = _common_suffix(old, new, min(len(old), len(new)) - head)
+        # 키워드는 줄바꿈을 넘지 않으므로 ('\n' 자신 제외) 바뀐 바이트를 줄 단위로 넓히면 밖의 적중은 그대로
+        lo = new.rfind(b'\n', 0, head) + 1
+        hi = new.find(b'\n', len(new) - tail)
+        hi = len(new) if hi == -1 else hi + 1
+        bounds = {x for seg in self._segments() for x in seg[:2]}
+        old_bounds = {x for seg in previous._segments() for x in seg[:2]}
+        if ({x for x in bounds if x <= lo} != {x for x in old_bounds if x <= lo}
+                or {x - delta for x in bounds if x >= hi} != {x for x in old_bounds if x >= hi - delta}):
+            return None
+        return previous.hits, lo, hi, delta
+
+    def _keyword_hits(self, start, end):
+        """구간 키워드 적중 (절대 위치) — 감시 모드에서는 바뀐 줄 범위만 스캔"""
+        if self._edit is None:
+            with _scan('keyword_automaton', end - start):
+                return self.automaton.scan(self._data, start, end)
+        old_hits, lo, hi, delta = self._edit
+        a, b = min(max(lo, start), end), min(max(hi, start), end)
+        with _scan('keyword_automaton', b - a):
+            hits = self.automaton.scan(self._data, a, b)
+        for kw, pos in hits.items():
+            old = old_hits[kw]
+            if old:
+                moved = old[bisect_left(old, b - delta):bisect_left(old, end - delta)]
+                hits[kw] = old[bisect_left(old, start):bisect_left(old, a)] + pos + [p + delta for p in moved]
+        return hits
+
+    def _scan_segment(self, start, end, is_script, tables=True):
+        hits = self._keyword_hits(start, end)
+        found = {'hits': {kw: [p - start for p in pos] for kw, pos in hits.items() if pos},
+                 'prompt': [], 'ui': [], 'ilju_ui': [], 'archetype': [],
+                 'ratings': [], 'rating_labels': []}
+        if not is_script:
+            return found
+        # 표·레이블도 mmap 위에서 바이트 패턴으로 — 구간을 디코딩하지 않고 일치한 그룹만 디코딩
+        data, size = self._data, end - start
+        if tables:
+            with _scan('PROMPT_DB_RE', size):
+                found['prompt'] = [_texts(m) for m in PROMPT_DB_BRE.finditer(data, start, end)]
+            with _scan('UI_DB_RE', size):
+                found['ui'] = [_texts(m) for m in UI_DB_BRE.finditer(data, start, end)]
+            with _scan('ILJU_UI_RE', size):
+                found['ilju_ui'] = [_texts(m) for m in ILJU_UI_BRE.finditer(data, start, end)]
+            with _scan('ARCHETYPE_DB_RE', size):
+                found['archetype'] = [_texts(m, whole=True) for m in ARCHETYPE_DB_BRE.finditer(data, start, end)]
+        # 세운 등급은 ylDetermineRating 본문에서만 — 구간 전체가 아니라 선언부터 짧은 창만 토큰화
+        with _scan('RATING_FUNCTION', size):
+            for m in RATING_FUNCTION_BRE.finditer(data, start, end):
+                body = self._function_source(m.start(), end)
+                if body is not None:  # 같은 이름 재선언은 JS 처럼 뒤가 우선
+                    found['ratings'] = list(dict.fromkeys(RATING_RETURN_RE.findall(body)))
+        with _scan('RATING_LABEL_RE', size):
+            for m in RATING_LABEL_BRE.finditer(data, start, end):
+                rating, label, default = _texts(m)
+                found['rating_labels'].append([rating, label])
+                if default is not None:
+                    found['rating_labels'].append([RATING_DEFAULT, default])
+        return found
+
+    def _function_source(self, pos, end):
+        """pos 에서 시작하는 함수 선언 원문 — 창을 넓혀 가며 그 부분만 토큰화 (end 전에 안 끝나면 None)"""
+        width = FUNCTION_WINDOW
+        while True:
+            stop = min(end, pos + width)
+            text = self.data[pos:stop].decode('utf-8', 'ignore')
+            spans = top_level_functions(text)
+            if spans and spans[0][1] == 0:
+                return text[:spans[0][2]]
+            if stop == end:
+                return None
+            width *= 4
+
+    def function_table(self):
+        """최상위 JS 함수명 → {'sha': 원문 해시, 'logic': 문구를 가린 로직 해시} (CHECK 11 입력·캐시 키)"""
+        if self._functions is None:
+            scripts, table = [], {}
+            previous = self._previous_scripts or []
+            segments = [(s, e, key) for (s, e, is_script), key in zip(self._segments(), self.segment_digests)
+                        if is_script]
+            for n, (start, end, key) in enumerate(segments):
+                items = self._cache.get('functions', key) if self._cache else None
+                if items is None:
+                    data = self.data
+                    items = _update_items(previous[n], data, start, end) if n < len(previous) else None
+                    if items is None:
+                        with _scan('js_functions', end - start):
+                            items = _script_items(data[start:end].decode('utf-8'))
+                    if self._cache:
+                        self._cache.put('functions', key, items)
+                scripts.append(items)
+                for item in items:
+                    if item[0] == 'f':  # 같은 이름 재선언은 JS 처럼 뒤가 우선
+                        table[item[1]] = {'sha': item[6], 'logic': item[7]}
+            self._scripts, self._functions, self._previous_scripts = scripts, table, None
+        return self._functions
+
+    def _load_pack(self, tables):
+        """데이터 팩 표 → 스크립트 추출과 같은 모양의 DB (정규식이 요구하는 필드가 다 있는 간지 항목만)"""
+        with _scan('data_pack', sum(len(t) for t in tables.values())):
+            for g, e in tables.get('prompt', {}).items():
+                if g in GAPJA and {'t', 'd', 's'} <= e.keys():
+                    self.prompt_db[g] = {'t': e['t'], 'd': e['d'], 's': e['s']}
+            for g, e in tables.get('ui', {}).items():
+                if g in GAPJA and e.get('name'):
+                    self.ui_db[g] = e['name']
+                if g in GAPJA and 'name' in e and 'desc' in e:
+                    self.ui_entries[g] = {'name': e['name'], 'desc': e['desc']}
+            for g, e in tables.get('archetype', {}).items():
+                if g in GAPJA and all(f in e for f in ARCHETYPE_FIELDS):
+                    self.archetype_db[g] = {f: e[f] for f in ARCHETYPE_FIELDS}
+
+    def archetype_source(self, gapja):
+        """ARCHETYPE_60 항목 원문 (패치 find 용) — 팩에서 읽었으면 필요할 때 번들에서 찾음. 없으면 None"""
+        if not self._raw_scanned:
+            self._raw_scanned = True
+            with _scan('ARCHETYPE_DB_RE', self.size):
+                for m in ARCHETYPE_DB_BRE.finditer(self.data):
+                    self.archetype_raw[m.group(1).decode('utf-8')] = m.group(0).decode('utf-8')
+        return self.archetype_raw.get(gapja)
+
+    def _scan_sinssal_labels(self):
+        """신살명 → [(위치, 라벨), ...] (문서 순서) — 키워드 적중 위치에서만 라벨 패턴 검사"""
+        hits = {}
+        pattern = SINSSAL_LABEL_RE.get(self.lang)
+        if pattern is None:
+            return hits
+        names = list(SINSSAL_CORRECT) if self.lang == 'ko' else SINSSAL_NAMES[self.lang].values()
+        data = self.data
+        for name in names:
+            candidates = self.positions(name)
+            with _scan('SINSSAL_LABEL_RE', len(candidates), len(candidates)):
+                for pos in candidates:
+                    m = pattern.match(data, pos)
+                    if m:
+                        hits.setdefault(name, []).append((pos, m.group(2).decode('utf-8')))
+        return hits
+
+    def sinssal_labels(self):
+        """KO 신살 키 → 첫 출현 라벨"""
+        names = SINSSAL_NAMES.get(self.lang)
+        results = {}
+        for sinssal_ko in SINSSAL_CORRECT:
+            name = sinssal_ko if self.lang == 'ko' else (names or {}).get(sinssal_ko)
+            if name and name in self.sinssal_hits:
+                label = self.sinssal_hits[name][0][1]
+                results[sinssal_ko] = label.strip() if self.lang == 'en' else label
+        return results
+
+    def folded_positions(self, kw):
+        """대소문자 무시 출현 바이트 위치 (레지스트리 키워드는 스캔 결과 그대로)"""
+        key = _fold(kw)
+        pos = self.hits.get(key)
+        if pos is None:
+            with _scan('text_find', self.size):
+                pos = KeywordAutomaton([key]).scan(self.data)[key]
+            self.hits[key] = pos
+        elif PROFILER:
+            PROFILER.count('keyword_index', len(pos), 0)
+        return pos
+
+    def positions(self, kw):
+        """대소문자 구분 출현 바이트 위치"""
+        pos = self._keyword_pos.get(kw)
+        if pos is None:
+            data, raw = self.data, kw.encode('utf-8')
+            folded = self.folded_positions(kw)
+            with _scan('case_filter', len(folded)):
+                pos = self._keyword_pos[kw] = [p for p in folded if data[p:p + len(raw)] == raw]
+        return pos
+
+    def contains(self, kw):
+        return bool(self.positions(kw))
+
+    def contains_any(self, keywords):
+        return any(self.contains(kw) for kw in keywords)
+
+    def contains_folded(self, kw):
+        return bool(self.folded_positions(kw))
+
+    def follows(self, seq, window=PROXIMITY_WINDOW):
+        """키워드 시퀀스가 같은 줄에서 순서대로 (간격 window 글자 이내) 출현하는지"""
+        ends = [p + _width(seq[0]) for p in self.folded_positions(seq[0])]
+        for kw in seq[1:]:
+            nxt = self.folded_positions(kw)
+            if PROFILER:
+                PROFILER.count('proximity', len(ends), 0)
+            advanced = []
+            for lo in ends:
+                k = bisect_left(nxt, lo)
+                if k == len(nxt) or nxt[k] >= self._line_end(lo):
+                    continue
+                if window is not None and len(self.data[lo:nxt[k]].decode('utf-8', 'replace')) > window:
+                    continue
+                advanced.append(nxt[k] + _width(kw))
+            if not advanced:
+                return False
+            ends = advanced
+        return bool(ends)
+
+    def _line_end(self, pos):
+        k = bisect_left(self.newlines, pos)
+        return self.newlines[k] if k < len(self.newlines) else self.size
+
+    def matches_rule(self, seqs, window=PROXIMITY_WINDOW):
+        return any(self.follows(seq, window) for seq in seqs)
+
+    # ── 캐시 키용 입력 요약 ─────────────────────────────────────────────────
+
+    def entry_digests(self):
+        """간지별 프롬프트 DB 레코드 해시"""
+        return {g: _json_digest(e) for g, e in sorted(self.prompt_db.items())}
+
+    def presence(self, keywords, folded=False):
+        test = self.contains_folded if folded else self.contains
+        return [kw for kw in keywords if test(kw)]
+
+    def rule_lines(self, rule):
+        """근접 규칙 키워드가 나오는 줄들의 내용 해시 (줄이 같으면 판정도 같음)"""
+        starts = set()
+        for seq in PROXIMITY_RULES[rule].get(self.lang, ()):
+            for kw in seq:
+                for p in self.folded_positions(kw):
+                    k = bisect_left(self.newlines, p)
+                    starts.add(self.newlines[k - 1] + 1 if k else 0)
+        data = self.data
+        return sorted(_digest(data[a:self._line_end(a)]) for a in starts)
+
+
+def load_bundle_index(lang, path, cache=None, pack=None, previous=None, functions=False):
+    """번들 파일 매핑 + 인덱스 생성 (프로세스 풀 작업 단위 — functions 면 CHECK 11 함수 표까지 작업자에서)"""
+    with _step(f'index:{lang}'):
+        idx = BundleIndex(lang, _map_file(path), cache=cache, pack=pack, path=path, previous=previous)
+        if functions:
+            idx.function_table()
+        return idx
+
+def load_data_packs(manifest_path, langs):
+    """build_bundles.py 데이터 팩 매니페스트 → {로케일: {'file', 'tables', 'sha': 허용 번들 해시}}"""
+    with open(manifest_path, encoding='utf-8') as f:
+        manifest = json.load(f)
+    packs = {}
+    for lang in langs:
+        entry = manifest.get(lang)
+        if not entry:
+            continue
+        with open(os.path.join(os.path.dirname(manifest_path), entry['file']), encoding='utf-8') as f:
+            packs[lang] = {'file': entry['file'], 'tables': json.load(f),
+                           'sha': [entry['source_sha'], entry['output_sha']]}
+    return packs
+
+
+# ── 아키타입 페이지 ──────────────────────────────────────────────────────────
+# archetype-pages/<색>-<동물>.html 의 제목·히어로 블록 (모든 페이지가 같은 템플릿)
+PAGE_TITLE_RE = re.compile(r'<title>(.+?) \(([甲乙丙丁戊己庚辛壬癸][子丑寅卯辰巳午未申酉戌亥])\) — (.+?) \|')
+PAGE_HERO_RE = re.compile(
+    r'<div class="hero-gapja">([甲乙丙丁戊己庚辛壬癸][子丑寅卯辰巳午未申酉戌亥]) · ([^·<]+?) · ([^<]+)</div>\s*'
+    r'<h1>([^<]+)</h1>\s*<div class="hero-subtitle">([^<]+)</div>\s*'
+    r'<p class="hero-desc">"([^"]+)" — ([^<]+)</p>')
+# 페이지 파일명 규칙(<천간 색>-<지지 동물>.html)은 gapja.expected_page_file
+
+# 페이지 슬롯 ↔ 번들 DB 필드: (슬롯, DB 속성, 필드, 대상 로케일 — None 이면 등록된 전 로케일)
+ARCHETYPE_PAGE_RULES = [
+    ('name', 'archetype_db', 'en', None),
+    ('persona', 'archetype_db', 'pen', None),
+    ('native', 'archetype_db', 'ko', ('ko',)),
+    ('ui_name', 'ui_entries', 'name', ('en',)),
+    ('ui_desc', 'ui_entries', 'desc', ('en',)),
+]
+
+def load_archetype_page(path):
+    """아키타입 페이지 1개 파싱 → 레코드 dict (히어로 블록 없는 페이지는 None, 프로세스 풀 작업 단위)"""
+    with open(path, encoding='utf-8') as f:
+        html = f.read()
+    if 'class="hero-gapja"' not in html:
+        return None
+    page = {'file': os.path.basename(path)}
+    with _scan('PAGE_HERO_RE', len(html)):
+        hero = PAGE_HERO_RE.search(html)
+    with _scan('PAGE_TITLE_RE', len(html)):
+        title = PAGE_TITLE_RE.search(html)
+    if hero:
+        values = [htmllib.unescape(v).strip() for v in hero.groups()]
+        page.update(zip(('gapja', 'kind', 'native', 'name', 'persona', 'ui_name', 'ui_desc'), values))
+    if title:
+        page.update(zip(('title_name', 'title_gapja', 'title_persona'),
+                        [htmllib.unescape(v).strip() for v in title.groups()]))
+    return page
+
+
+# 검사별 캐시 키 입력: 검사가 실제로 읽는 인덱스 사실만 요약 (선행 검사 결과는 별도로 키에 포함)
+CHECK_INPUTS = {
+    'check_1_ilju_db_completeness': lambda idx: idx.entry_digests(),
+    'check_2_spouse_polarity': lambda idx: None,
+    'check_3_sinssal_labels': lambda idx: idx.sinssal_labels(),
+    'check_4_required_sections': lambda idx: [idx.presence(REQUIRED_SECTIONS.get(idx.lang, []) +
+                                                           RATING_SECTIONS.get(idx.lang, [])),
+                                              idx.ratings, idx.rating_labels, rating_rules()],
+    'check_5_dinjim_combine_en': lambda idx: idx.presence([BUREAU_FILTER_OLD, *BUREAU_FILTER_FIXED]),
+    'check_6_void_yanggin': lambda idx: idx.rule_lines('void_yanggin'),
+    'check_7_quadruple_self_punishment': lambda idx: idx.rule_lines('quadruple'),
+    'check_8_naeum_consistency': lambda idx: idx.rule_lines('naeum_same'),
+    'check_9_early_midnight_system': lambda idx: idx.presence(EARLY_MIDNIGHT_KEYWORDS.get(idx.lang, []), folded=True),
+    'check_10_archetype_pages': lambda idx: {'archetype': idx.archetype_db, 'ui': idx.ui_entries,
+                                             'prompt': sorted(idx.prompt_db)},
+    'check_11_engine_parity': lambda idx: idx.function_table(),
+}
+def rating_rules():
+    """세운 등급 → 등급을 정하는 규칙 키 (year_luck_rules.RATING_RULES — 엔진·numpy 를 불러오지 않음)"""
+    return {key: list(rules) for key, rules in RATING_RULES}
+
+# 번들 외에 아키타입 페이지 인덱스 / 공용 엔진 매니페스트도 입력으로 읽는 검사
+PAGE_CHECKS = {'check_10_archetype_pages'}
+MANIFEST_CHECKS = {'check_11_engine_parity'}
+
+
+# ── 감시 모드 파일 감시기 ────────────────────────────────────────────────────
+# wait() 는 변경된 파일의 절대 경로 집합을 돌려줄 때까지 블록한다.
+# 번들은 상위 디렉터리를 감시한다 — 편집기가 임시 파일 → rename 으로 저장하면
+# 파일 자체에 건 감시는 사라지기 때문.
+
+class InotifyWatcher:
+    """Linux inotify (libc 를 ctypes 로 직접 호출, 외부 패키지 불필요)"""
+    kind = 'inotify'
+    IN_CLOSE_WRITE, IN_MOVED_FROM, IN_MOVED_TO, IN_CREATE, IN_DELETE = 0x8, 0x40, 0x80, 0x100, 0x200
+    EVENT = struct.Struct('iIII')
+
+    def __init__(self, files, dirs, settle=0.03):
+        self.settle = settle  # 저장 1회가 여러 이벤트로 나뉘므로 이 시간만큼 더 모음
+        self.files = {os.path.abspath(f) for f in files}
+        self.dirs = {os.path.abspath(d) for d in dirs if os.path.isdir(d)}
+        libc = ctypes.CDLL(None, use_errno=True)
+        self.fd = libc.inotify_init1(os.O_CLOEXEC | os.O_NONBLOCK)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), 'inotify_init1 실패')
+        mask = self.IN_CLOSE_WRITE | self.IN_MOVED_FROM | self.IN_MOVED_TO | self.IN_CREATE | self.IN_DELETE
+        self.wd = {}
+        for d in {os.path.dirname(f) for f in self.files} | self.dirs:
+            wd = libc.inotify_add_watch(self.fd, os.fsencode(d), mask)
+            if wd < 0:
+                err = ctypes.get_errno()
+                os.close(self.fd)
+                raise OSError(err, f'inotify_add_watch 실패: {d}')
+            self.wd[wd] = d
+
+    def _read(self):
+        changed = set()
+        try:
+            data = os.read(self.fd, 65536)
+        except BlockingIOError:
+            return changed
+        pos = 0
+        while pos < len(data):
+            wd, _, _, length = self.EVENT.unpack_from(data, pos)
+            name = os.fsdecode(data[pos + self.EVENT.size:pos + self.EVENT.size + length].rstrip(b'\0'))
+            pos += self.EVENT.size + length
+            path = os.path.join(self.wd.get(wd, ''), name)
+            if path in self.files or (os.path.dirname(path) in self.dirs and path.endswith('.html')):
+                changed.add(path)
+        return changed
+
+    def wait(self):
+        while True:
+            select.select([self.fd], [], [])
+            changed = self._read()
+            while select.select([self.fd], [], [], self.settle)[0]:
+                changed |= self._read()
+            if changed:
+                return changed
+
+    def close(self):
+        os.close(self.fd)
+
+
+class PollingWatcher:
+    """inotify 를 쓸 수 없을 때의 대체 감시기 — (mtime, 크기) 스냅숏 비교"""
+    kind = '폴링'
+
+    def __init__(self, files, dirs, interval=0.1):
+        self.interval = interval
+        self.files = [os.path.abspath(f) for f in files]
+        self.dirs = [os.path.abspath(d) for d in dirs if os.path.isdir(d)]
+        self.state = self._snapshot()
+
+    def _snapshot(self):
+        paths = list(self.files)
+        for d in self.dirs:
+            paths.extend(os.path.join(d, name) for name in os.listdir(d) if name.endswith('.html'))
+        snap = {}
+        for path in paths:
+            try:
+                st = os.stat(path)
+            except OSError:
+                continue
+            snap[path] = (st.st_mtime_ns, st.st_size)
+        return snap
+
+    def wait(self):
+        while True:
+            time.sleep(self.interval)
+            snap = self._snapshot()
+            changed = {p for p in snap.keys() | self.state.keys() if snap.get(p) != self.state.get(p)}
+            self.state = snap
+            if changed:
+                return changed
+
+    def close(self):
+        pass
+
+
+def make_watcher(files, dirs, polling=False):
+    """가능하면 inotify, 아니면 폴링 감시기"""
+    if not polling and sys.platform.startswith('linux'):
+        try:
+            return InotifyWatcher(files, dirs)
+        except (OSError, AttributeError):
+            pass
+    return PollingWatcher(files, dirs)
+
+
+# ── 병렬 스케줄러 ────────────────────────────────────────────────────────────
+# fork 된 워커는 부모의 감사기(인덱스 포함)를 그대로 물려받으므로
+# 검사마다 번들을 다시 직렬화해 보내지 않는다.
+_WORKER_AUDITOR = None
+
+def _fork_context():
+    """fork 시작 방식을 쓸 수 있으면 그 컨텍스트, 아니면 None (순차 실행)"""
+    if 'fork' in mp.get_all_start_methods():
+        return mp.get_context('fork')
+    return None
+
+def _run_check_in_worker(name, args):
+    return _WORKER_AUDITOR.run_check(name, args)
+
+
 # ────────────────────────────────────────────────────────────────────────────
 class ConsistencyAuditor:
-    def __init__(self, ko_path, en_path, jp_path):
-        self.files = {'ko': ko_path, 'en': en_path, 'jp': jp_path}
-        self.html = {}
+    # 검사 선언: (메서드명, 입력으로 받는 선행 검사 결과들). 리포트 순서 = 선언 순서
+    CHECKS = [
+        ('check_1_ilju_db_completeness', ()),
+        ('check_2_spouse_polarity', ('check_1_ilju_db_completeness',)),
+        ('check_3_sinssal_labels', ()),
+        ('check_4_required_sections', ()),
+        ('check_5_dinjim_combine_en', ()),
+        ('check_6_void_yanggin', ()),
+        ('check_7_quadruple_self_punishment', ()),
+        ('check_8_naeum_consistency', ()),
+        ('check_9_early_midnight_system', ()),
+        ('check_10_archetype_pages', ()),
+        ('check_11_engine_parity', ()),
+    ]
+
+    def __init__(self, files, jobs=None, cache=None, pages_dir=None, engine_manifest=None, data_manifest=None):
+        """files: {로케일 코드: 번들 경로}, engine_manifest·data_manifest: build_bundles.py 매니페스트 (없으면 생략)"""
+        self.files = dict(files)
+        self.packs = load_data_packs(data_manifest, self.files) if data_manifest else {}
+        self.jobs = jobs if jobs is not None else (os.cpu_count() or 1)
+        self.cache = cache
+        self.pages_dir = pages_dir
         self.issues = []
         self.patches = []
-        
-        for lang, path in self.files.items():
-            with open(path, encoding='utf-8') as f:
-                self.html[lang] = f.read()
-        print(f"✅ 파일 로드 완료: KO({len(self.html['ko'])//1024}KB) EN({len(self.html['en'])//1024}KB) JP({len(self.html['jp'])//1024}KB)")
+        page_paths = []
+        if pages_dir and os.path.isdir(pages_dir):
+            page_paths = [os.path.join(os.path.abspath(pages_dir), name) for name in sorted(os.listdir(pages_dir))
+                          if name.endswith('.html')]
+
+        # 번들 인덱스와 페이지 스캔을 같은 풀에 함께 제출 — 로케일·페이지가 늘면 코어 수만큼 나눠 처리
+        # (프로파일 중에는 단계별로 재도록 순차 실행)
+        ctx = _fork_context() if self.jobs > 1 and PROFILER is None else None
+        if ctx is not None:
+            with ProcessPoolExecutor(min(self.jobs, len(self.files) + len(page_paths)), mp_context=ctx) as pool:
+                futures = {lang: pool.submit(load_bundle_index, lang, path, cache, self.packs.get(lang),
+                                           functions=True)
+                           for lang, path in self.files.items()}
+                page_futures = [pool.submit(load_archetype_page, path) for path in page_paths]
+                self.index = {lang: fut.result() for lang, fut in futures.items()}
+                pages = [fut.result() for fut in page_futures]
+            for idx in self.index.values():
+                idx._cache = cache  # 피클에서 빠진 캐시를 다시 연결 (CHECK 11 함수 표가 씀)
+        else:
+            self.index = {lang: load_bundle_index(lang, path, cache, self.packs.get(lang))
+                          for lang, path in self.files.items()}
+            with _step('index:pages') if page_paths else _NO_PROFILE:
+                pages = [load_archetype_page(path) for path in page_paths]
+        # 아키타입 페이지 인덱스: 파싱 결과를 한 번 만들어 모든 로케일 비교가 공유 (디렉터리 없으면 None)
+        self.page_records = dict(zip(page_paths, pages))
+        self.pages = [page for page in pages if page] if page_paths else None
+        self.executed = []
+        sizes = ' '.join(f"{LOCALES[lang]}({idx.size//1024}KB)" for lang, idx in self.index.items())
+        print(f"✅ 파일 로드 완료: {sizes}")
+        if self.pages is not None:
+            print(f"✅ 아키타입 페이지 인덱스: {len(self.pages)}개 ({pages_dir})")
+        self._print_pack_state()
+        self.engine_manifest = None
+        if engine_manifest:
+            with open(engine_manifest, encoding='utf-8') as f:
+                self.engine_manifest = json.load(f)
+            print(f"✅ 공용 엔진 매니페스트: {self.engine_manifest['script']} "
+                  f"함수 {len(self.engine_manifest['functions'])}개 ({engine_manifest})")
+
+    def _print_pack_state(self):
+        used = [f"{LOCALES[lang]}({idx.pack['file']})" for lang, idx in self.index.items() if idx.pack]
+        if used:
+            print(f"✅ 데이터 팩: {' '.join(used)}")
+        for lang, idx in self.index.items():
+            if idx.pack_stale:
+                print(f"  ℹ️ {LOCALES[lang]}: 데이터 팩이 현재 번들과 다른 빌드 - 스크립트에서 추출 (build_bundles.py 재빌드 필요)")
 
     # ── 데이터 추출 ──────────────────────────────────────────────────────────
 
     def extract_prompt_ilju_db(self, html):
         """프롬프트 주입용 일주론 DB 추출 (t, d, s 필드)"""
-        pattern = r"'([甲乙丙丁戊己庚辛壬癸][子丑寅卯辰巳午未申酉戌亥])'\s*:\s*\{t:'([^']*)',d:'([^']*)',s:'([^']*)'\}"
-        return {m[0]: {'t': m[1], 'd': m[2], 's': m[3]} for m in re.findall(pattern, html)}
+        return {m[0]: {'t': m[1], 'd': m[2], 's': m[3]} for m in PROMPT_DB_RE.findall(html)}
 
     def extract_ui_ilju_db(self, html):
         """UI 표시용 일주 DB 추출 (name, desc 필드)"""
-        pattern = r"'([甲乙丙丁戊己庚辛壬癸][子丑寅卯辰巳午未申酉戌亥])'\s*:\s*\{[^}]*?name\s*:\s*'([^']+)'"
-        return dict(re.findall(pattern, html))
+        return dict(UI_DB_RE.findall(html))
 
     def get_spouse_polarity(self, text, lang):
         """텍스트의 배우자운 극성 반환: 'pos' | 'neg' | 'neutral'"""
-        neg_count = sum(1 for w in SPOUSE_NEG[lang] if w in text)
-        pos_count = sum(1 for w in SPOUSE_POS[lang] if w in text)
+        words = len(SPOUSE_NEG[lang]) + len(SPOUSE_POS[lang])
+        with _scan('spouse_words', len(text) * words, words):
+            neg_count = sum(1 for w in SPOUSE_NEG[lang] if w in text)
+            pos_count = sum(1 for w in SPOUSE_POS[lang] if w in text)
         if neg_count > pos_count: return 'neg'
         if pos_count > neg_count: return 'pos'
         return 'neutral'
 
     def detect_sinssal_label(self, html, lang):
         """신살 라벨 추출"""
-        results = {}
-        # 귀문관살 라벨 패턴
-        for sinssal_ko, correct in SINSSAL_CORRECT.items():
-            # KO
-            if lang == 'ko':
-                m = re.search(rf'{sinssal_ko}\(([흉중길])\)', html)
-                if m:
-                    results[sinssal_ko] = m.group(1)
-            elif lang == 'en':
-                # Spirit Gate, Canopy Star 등 영어명 매핑
-                en_map = {
-                    '귀문관살': 'Spirit Gate',
-                    '화개살': 'Canopy Star',
-                    '학당귀인': 'Academy Noble',
-                    '천의성': 'Heavenly Doctor',
-                }
-                en_name = en_map.get(sinssal_ko)
-                if en_name:
-                    m = re.search(rf'{re.escape(en_name)}[^)]*\(([^)]+)\)', html)
-                    if m:
-                        results[sinssal_ko] = m.group(1).strip()
-            elif lang == 'jp':
-                jp_map = {
-                    '귀문관살': '鬼門関殺',
-                    '화개살': '華蓋殺',
-                    '학당귀인': '学堂貴人',
-                    '천의성': '天醫星',
-                }
-                jp_name = jp_map.get(sinssal_ko)
-                if jp_name:
-                    m = re.search(rf'{jp_name}\(([吉中凶])\)', html)
-                    if m:
-                        results[sinssal_ko] = m.group(1)
-        return results
+        return BundleIndex(lang, html).sinssal_labels()
+
+    def _rule_locales(self, rule):
+        """근접 규칙이 정의된 로케일의 (코드, 인덱스)"""
+        return [(lang, idx) for lang, idx in self.index.items() if lang in PROXIMITY_RULES[rule]]
 
     # ── 검증 로직 ────────────────────────────────────────────────────────────
 
     def check_1_ilju_db_completeness(self):
         """CHECK 1: 60갑자 DB 완전성 검증"""
-        print("\n[CHECK 1] 일주론 DB 완전성 (60갑자 × 3언어)")
-        dbs = {lang: self.extract_prompt_ilju_db(self.html[lang]) for lang in ['ko','en','jp']}
+        print(f"\n[CHECK 1] 일주론 DB 완전성 (60갑자 × {len(self.index)}언어)")
+        dbs = {lang: idx.prompt_db for lang, idx in self.index.items()}
         
         for lang, db in dbs.items():
             missing = [g for g in GAPJA if g not in db]
@@ -151,18 +1339,26 @@ class ConsistencyAuditor:
 
     def check_2_spouse_polarity(self, dbs):
         """CHECK 2: 배우자운 극성 불일치 탐지"""
-        print("\n[CHECK 2] 배우자운(s필드) 극성 3언어 일치성")
+        langs = [lang for lang in dbs if lang in SPOUSE_NEG and lang in SPOUSE_POS]
+        print(f"\n[CHECK 2] 배우자운(s필드) 극성 {len(langs)}언어 일치성")
+        ref, arb = REFERENCE_LOCALE, SPOUSE_ARBITER
+        if ref not in langs:
+            print(f"  ℹ️ 기준 로케일({LOCALES.get(ref, ref)}) 없음 - 건너뜀")
+            return
+        targets = [lang for lang in langs if lang not in (ref, arb)]
         found = 0
         for g in GAPJA:
             po = {}
             texts = {}
-            for lang in ['ko','en','jp']:
+            for lang in langs:
                 s = dbs[lang].get(g, {}).get('s', '')
                 po[lang] = self.get_spouse_polarity(s, lang)
                 texts[lang] = s
             
-            # KO와 JP 극성이 다르면 이슈
-            if po['ko'] != 'neutral' and po['jp'] != 'neutral' and po['ko'] != po['jp']:
+            # 기준(KO)과 대상 로케일 극성이 다르면 이슈
+            for lang in targets:
+                if po[ref] == 'neutral' or po[lang] == 'neutral' or po[ref] == po[lang]:
+                    continue
                 found += 1
                 issue = {
                     'severity': 'HIGH',
@@ -172,18 +1368,18 @@ class ConsistencyAuditor:
                     'texts': texts
                 }
                 self.issues.append(issue)
-                print(f"  ❌ {g}: KO={po['ko']}({texts['ko'][:30]}) ≠ JP={po['jp']}({texts['jp'][:30]})")
+                print(f"  ❌ {g}: {LOCALES[ref]}={po[ref]}({texts[ref][:30]}) ≠ {LOCALES[lang]}={po[lang]}({texts[lang][:30]})")
                 
-                # 패치 생성 (JP가 KO/EN 기준으로 수정 필요)
-                if po['ko'] == po['en']:  # KO/EN 일치 → JP가 버그
+                # 패치 생성 (대상 로케일을 KO/EN 기준으로 수정 필요)
+                if arb in po and po[ref] == po[arb]:  # KO/EN 일치 → 대상 로케일이 버그
                     self.patches.append({
                         'type': 'ilju_s_field',
                         'gapja': g,
-                        'lang': 'jp',
-                        'current': texts['jp'],
-                        'reference_ko': texts['ko'],
-                        'reference_en': texts['en'],
-                        'action': 'JP 배우자운을 KO/EN 기준으로 검토 후 수정 필요'
+                        'lang': lang,
+                        'current': texts[lang],
+                        'reference_ko': texts[ref],
+                        'reference_en': texts[arb],
+                        'action': f'{LOCALES[lang]} 배우자운을 {LOCALES[ref]}/{LOCALES[arb]} 기준으로 검토 후 수정 필요'
                     })
         
         if found == 0:
@@ -194,13 +1390,13 @@ class ConsistencyAuditor:
     def check_3_sinssal_labels(self):
         """CHECK 3: 신살 라벨(길/중/흉) 일관성"""
         print("\n[CHECK 3] 신살 라벨(길/중/흉) 언어 간 일관성")
-        labels = {lang: self.detect_sinssal_label(self.html[lang], lang) for lang in ['ko','en','jp']}
+        labels = {lang: idx.sinssal_labels() for lang, idx in self.index.items()}
         
         # 귀문관살 특별 검사 (Rule 66에서 Neutral로 명시)
         target = '귀문관살'
-        correct = {'ko': '중', 'en': 'Neutral', 'jp': '中'}
+        correct = SINSSAL_CORRECT[target]
         
-        for lang in ['ko','jp']:  # EN은 이미 Neutral
+        for lang in [lang for lang in labels if lang in GWIMUN_LABEL_PATCH]:  # EN은 이미 Neutral
             actual = labels[lang].get(target)
             if actual and actual != correct[lang]:
                 self.issues.append({
@@ -215,27 +1411,18 @@ class ConsistencyAuditor:
                 print(f"  ❌ {lang.upper()} {target}: 현재={actual} → 예상={correct[lang]}")
                 
                 # 패치 생성
-                if lang == 'ko':
-                    self.patches.append({
-                        'type': 'sinssal_label',
-                        'lang': 'ko',
-                        'sinssal': target,
-                        'find': f'{target}(흉)',
-                        'replace': f'{target}(중)',
-                        'scope': '신살 라벨 생성 함수'
-                    })
-                elif lang == 'jp':
-                    self.patches.append({
-                        'type': 'sinssal_label',
-                        'lang': 'jp',
-                        'sinssal': target,
-                        'find': '鬼門関殺(凶)',
-                        'replace': '鬼門関殺(中)',
-                        'scope': '신살 라벨 생성 함수'
-                    })
+                find, replace = GWIMUN_LABEL_PATCH[lang]
+                self.patches.append({
+                    'type': 'sinssal_label',
+                    'lang': lang,
+                    'sinssal': target,
+                    'find': find,
+                    'replace': replace,
+                    'scope': '신살 라벨 생성 함수'
+                })
                     
         # 나머지 신살 확인
-        for lang in ['ko','en','jp']:
+        for lang in labels:
             print(f"  {lang.upper()} 신살 라벨: {labels[lang]}")
 
     def check_4_required_sections(self):
@@ -244,8 +1431,8 @@ class ConsistencyAuditor:
         
         # 공망 전실
         print("  [공망 전실]")
-        for lang in ['ko','en','jp']:
-            found = any(kw in self.html[lang] for kw in REQUIRED_SECTIONS[lang])
+        for lang in [lang for lang in self.index if lang in REQUIRED_SECTIONS]:
+            found = self.index[lang].contains_any(REQUIRED_SECTIONS[lang])
             if lang == 'en':  # EN은 있어야 함
                 status = "✅ 있음" if found else "❌ 없음"
             else:  # KO, JP는 없으면 개선 필요
@@ -261,20 +1448,44 @@ class ConsistencyAuditor:
         
         # 세운 Rating
         print("  [세운 Rating 레이블]")
-        for lang in ['ko','en','jp']:
-            found = any(kw in self.html[lang] for kw in RATING_SECTIONS[lang])
+        for lang in [lang for lang in self.index if lang in RATING_SECTIONS]:
+            found = self.index[lang].contains_any(RATING_SECTIONS[lang])
             status = "✅ 있음" if found else "⚠️ 없음"
             print(f"    {lang.upper()}: {status}")
 
+        # 세운 등급별 레이블: ylDetermineRating 이 내는 등급이 결과 화면에서 이름 없이 나가지 않는지
+        print("  [세운 등급별 레이블]")
+        rules = rating_rules()
+        for lang, idx in self.index.items():
+            if not idx.ratings:
+                print(f"    {lang.upper()}: ℹ️ {RATING_FUNCTION} 없음 - 건너뜀")
+                continue
+            missing = [r for r in idx.ratings if r not in idx.rating_labels]
+            if not missing:
+                print(f"    {lang.upper()}: ✅ 등급 {len(idx.ratings)}개 모두 레이블 있음")
+                continue
+            names = ', '.join(f"{r}({'+'.join(rules[r])})" if rules.get(r) else r for r in missing)
+            print(f"    {lang.upper()}: ⚠️ 레이블 없는 등급 {len(missing)}/{len(idx.ratings)}개 - {names}")
+            self.issues.append({
+                'severity': 'LOW',
+                'check': '세운 등급 레이블 누락',
+                'lang': lang,
+                'ratings': missing,
+                'desc': f'{lang.upper()} 세운 등급 {len(missing)}개가 결과 화면 레이블 없음: {names}'
+            })
+
     def check_5_dinjim_combine_en(self):
         """CHECK 5: EN 丁壬合 BUREAU 오표기"""
         print("\n[CHECK 5] EN 丁壬合 합화(合化) 표기 검증")
         
-        en_html = self.html['en']
+        en = self.index.get('en')
+        if en is None:
+            print("  ℹ️ EN 번들 없음 - 건너뜀")
+            return
         
         # 수정 여부 확인: 天合 제외 필터가 적용됐는지
-        fix_applied = "i.t !== '天合'" in en_html or 'i.t != "天合"' in en_html
-        old_bug = "filter(i => i.t && i.t.includes('合'))" in en_html and "i.t !== '天合'" not in en_html
+        fix_applied = en.contains_any(BUREAU_FILTER_FIXED)
+        old_bug = en.contains(BUREAU_FILTER_OLD) and not en.contains(BUREAU_FILTER_FIXED[0])
         
         if old_bug:
             print(f"  ❌ EN BUREAU 필터에 天合 미제외: 천간합이 합국으로 오분류됨")
@@ -302,13 +1513,8 @@ class ConsistencyAuditor:
         print("\n[CHECK 6] 壬水 양인(子) = 공망 특수 케이스 해석")
         
         # 壬水 사주에서 양인 子가 공망일 때의 특별 해석이 있는지 확인
-        for lang, html in self.html.items():
-            patterns = {
-                'ko': ['양인.*공망', '공망.*양인', '양인이 공망'],
-                'en': ['Sheep Blade.*void', 'void.*Sword Edge', 'sword edge.*void'],
-                'jp': ['羊刃.*空亡', '空亡.*羊刃']
-            }
-            found = any(re.search(p, html, re.IGNORECASE) for p in patterns[lang])
+        for lang, idx in self._rule_locales('void_yanggin'):
+            found = idx.matches_rule(PROXIMITY_RULES['void_yanggin'][lang])
             status = "✅ 있음" if found else "⚠️ 없음 (추가 권장)"
             print(f"  {lang.upper()}: 양인-공망 특수 해석 {status}")
 
@@ -316,13 +1522,8 @@ class ConsistencyAuditor:
         """CHECK 7: 동일 지지 4개 쿼드러플 룰 공백"""
         print("\n[CHECK 7] 동일 지지 4개(쿼드러플 자형) 룰 커버리지")
         
-        for lang, html in self.html.items():
-            patterns = {
-                'ko': ['4개.*같은.*지지', '지지.*4개', '쿼드러플'],
-                'en': ['quadruple', 'four.*same.*branch', '4.*identical.*branch'],
-                'jp': ['四重', '4つの同じ', '同じ地支.*4']
-            }
-            found = any(re.search(p, html, re.IGNORECASE) for p in patterns[lang])
+        for lang, idx in self._rule_locales('quadruple'):
+            found = idx.matches_rule(PROXIMITY_RULES['quadruple'][lang])
             status = "✅ 있음" if found else "⚠️ 없음 (Rule 53 상위 케이스 미정의)"
             print(f"  {lang.upper()}: {status}")
         
@@ -339,26 +1540,16 @@ class ConsistencyAuditor:
         print("\n[CHECK 8] 납음오행 특수 케이스 (일간=납음 동일 시)")
         
         # 壬戌 = 大海水(水) = 壬水와 동일 → Rule 87에서 "다른 경우"만 정의
-        for lang, html in self.html.items():
-            patterns = {
-                'ko': ['납음.*같은', '일간.*납음.*동일', '보이는 것이 전부'],
-                'en': ['same.*naeum', 'naeum.*same.*day master', 'transparent'],
-                'jp': ['納音.*同じ', '日干.*納音.*同一']
-            }
-            found = any(re.search(p, html, re.IGNORECASE) for p in patterns[lang])
+        for lang, idx in self._rule_locales('naeum_same'):
+            found = idx.matches_rule(PROXIMITY_RULES['naeum_same'][lang])
             print(f"  {lang.upper()}: 납음=일간 동일 케이스 해석 {'✅' if found else '⚠️ 없음'}")
 
     def check_9_early_midnight_system(self):
         """CHECK 9: 조자시/早子時 방식 명시 여부"""
         print("\n[CHECK 9] 자시(子時) 방식 명시 여부")
         
-        checks = {
-            'ko': ['조자시', '早子時'],
-            'en': ['Early.*Midnight', 'early-midnight', 'Early Midnight', '早子時'],
-            'jp': ['早子時', '조자시', 'アーリー']
-        }
-        for lang in ['ko','en','jp']:
-            found = any(kw.lower() in self.html[lang].lower() for kw in checks[lang])
+        for lang in [lang for lang in self.index if lang in EARLY_MIDNIGHT_KEYWORDS]:
+            found = any(self.index[lang].contains_folded(kw) for kw in EARLY_MIDNIGHT_KEYWORDS[lang])
             if lang == 'en' and not found:
                 status = "❌ 없음 (KO/JP에는 명시됨)"
                 self.issues.append({
@@ -372,8 +1563,162 @@ class ConsistencyAuditor:
                 status = "✅ 있음" if found else "ℹ️ 없음"
             print(f"  {lang.upper()}: {status}")
 
+    def check_10_archetype_pages(self):
+        """CHECK 10: 아키타입 정적 페이지 ↔ 로케일별 일주 DB 교차 검증"""
+        if self.pages is None:
+            print("\n[CHECK 10] 아키타입 페이지 ↔ 일주 DB 교차 검증")
+            print("  ℹ️ 아키타입 페이지 디렉터리 없음 - 건너뜀")
+            return
+        print(f"\n[CHECK 10] 아키타입 페이지 {len(self.pages)}개 ↔ {len(self.index)}언어 일주 DB 교차 검증")
+        found = 0
+
+        def report(severity, lang, page, desc, **extra):
+            nonlocal found
+            found += 1
+            self.issues.append({'severity': severity, 'check': '아키타입 페이지 불일치', 'lang': lang,
+                                'gapja': page.get('gapja', ''), 'page': page['file'], **extra, 'desc': desc})
+            print(f"  ❌ {page['file']} [{lang.upper()}] {desc}")
+
+        seen = {}
+        for page in self.pages:
+            g = page.get('gapja')
+            if not g or 'title_gapja' not in page:
+                report('MEDIUM', 'page', page, '제목/히어로 블록 구조를 읽을 수 없음')
+                continue
+            if g in seen:
+                report('MEDIUM', 'page', page, f'{g} 페이지 중복 ({seen[g]})')
+            seen.setdefault(g, page['file'])
+
+            # 페이지 내부 일관성: 제목 ↔ 히어로, 파일명 ↔ 간지
+            for slot, expected in [('title_gapja', g), ('title_name', page['name']),
+                                   ('title_persona', page['persona']), ('file', expected_page_file(g))]:
+                if page[slot] != expected:
+                    report('MEDIUM', 'page', page, f'{slot}: {page[slot]!r} ≠ {expected!r}', field=slot)
+
+            # 로케일 DB 대조
+            for lang, idx in self.index.items():
+                for db in ('prompt_db', 'archetype_db', 'ui_entries'):
+                    if g not in getattr(idx, db):
+                        report('MEDIUM', lang, page, f'{db} 에 {g} 항목 없음', field=db)
+                for slot, db, field, langs in ARCHETYPE_PAGE_RULES:
+                    entry = getattr(idx, db).get(g)
+                    if entry is None or (langs and lang not in langs) or entry[field] == page[slot]:
+                        continue
+                    desc = f"{field}: 페이지={page[slot]!r} ≠ DB={entry[field]!r}"
+                    report('LOW' if not entry[field] else 'MEDIUM', lang, page, desc,
+                           field=field, page_value=page[slot], db_value=entry[field])
+                    # 페이지 값이 다른 로케일 DB 와 일치하면 이 로케일 DB 가 어긋난 것 → 패치
+                    others = [getattr(o, db).get(g, {}).get(field) for l, o in self.index.items() if l != lang]
+                    if db == 'archetype_db' and page[slot] in others:
+                        raw = idx.archetype_source(g)
+                        if raw is None:  # 빌드 결과 번들 — 표가 팩으로 빠져 고칠 원문이 없음
+                            continue
+                        fixed = re.sub(rf"(\b{field}:\s*)'[^']*'", lambda m: f"{m.group(1)}'{page[slot]}'", raw, count=1)
+                        self.patches.append({
+                            'type': 'archetype_field',
+                            'lang': lang,
+                            'gapja': g,
+                            'field': field,
+                            'find': raw,
+                            'replace': fixed,
+                            'scope': f'ARCHETYPE_60 ({page["file"]} 기준)'
+                        })
+
+        missing = [g for g in GAPJA if g not in seen]
+        if missing:
+            found += 1
+            self.issues.append({'severity': 'MEDIUM', 'check': '아키타입 페이지 누락', 'lang': 'page',
+                                'desc': f'{len(missing)}개 간지 페이지 없음: {missing}'})
+            print(f"  ❌ 페이지 없는 간지 {len(missing)}개: {missing}")
+        if found == 0:
+            print(f"  ✅ 전체 {len(self.pages)}개 페이지 DB 일치")
+        else:
+            print(f"  → 총 {found}개 불일치 감지")
+
+    def check_11_engine_parity(self):
+        """CHECK 11: JS 엔진 함수 해시 동등성 (로케일 간 + 공용 엔진 매니페스트)"""
+        tables = {lang: idx.function_table() for lang, idx in self.index.items()}
+        common = sorted(set.intersection(*map(set, tables.values()))) if tables else []
+        print(f"\n[CHECK 11] JS 엔진 함수 해시 동등성 (공통 함수 {len(common)}개 × {len(tables)}언어)")
+        same = [n for n in common if len({t[n]['sha'] for t in tables.values()}) == 1]
+        text_only = [n for n in common if n not in same and len({t[n]['logic'] for t in tables.values()}) == 1]
+        print(f"  ✅ 원문 동일 {len(same)}개 · 문구만 다름 {len(text_only)}개")
+
+        # 로직 해시(문자열 리터럴을 가린 토큰열)가 기준 로케일과 다른 함수 = 엔진 분기
+        ref = REFERENCE_LOCALE if REFERENCE_LOCALE in tables else next(iter(tables), None)
+        for lang, table in tables.items():
+            if lang == ref:
+                continue
+            diverged = [n for n in common if table[n]['logic'] != tables[ref][n]['logic']]
+            if not diverged:
+                print(f"  ✅ {lang.upper()}: 공통 함수 로직 {LOCALES[ref]} 와 일치")
+                continue
+            names = ', '.join(diverged[:8]) + (' …' if len(diverged) > 8 else '')
+            self.issues.append({
+                'severity': 'LOW',
+                'check': '엔진 로직 분기',
+                'lang': lang,
+                'functions': diverged,
+                'desc': f'{lang.upper()} 엔진 함수 {len(diverged)}개 로직이 {LOCALES[ref]} 와 다름: {names}'
+            })
+            print(f"  ⚠️ {lang.upper()}: 로직 분기 {len(diverged)}개 ({LOCALES[ref]} 기준) - {names}")
+
+        # 공용 엔진으로 분리된 함수는 모든 번들에서 매니페스트 해시와 같아야 함
+        manifest = self.engine_manifest
+        if manifest is None:
+            print("  ℹ️ 공용 엔진 매니페스트 없음 - 로케일 간 비교만 수행")
+            return
+        drift = 0
+        for name, expected in sorted(manifest['functions'].items()):
+            for lang, table in tables.items():
+                actual = table.get(name)
+                if actual is not None and actual['sha'] == expected['sha']:
+                    continue
+                drift += 1
+                state = '없음' if actual is None else '문구 변경' if actual['logic'] == expected['logic'] else '로직 변경'
+                self.issues.append({
+                    'severity': 'MEDIUM',
+                    'check': '공용 엔진 이탈',
+                    'lang': lang,
+                    'function': name,
+                    'desc': f"{lang.upper()} {name}: 공용 엔진({manifest['script']}) 해시와 다름 ({state}) - "
+                            f"build_bundles.py 재빌드 또는 다른 번들에도 같은 수정 필요"
+                })
+                print(f"  ❌ {lang.upper()} {name}: {state} (공용 엔진 {manifest['script']})")
+        if drift == 0:
+            print(f"  ✅ 공용 엔진 {manifest['script']} 함수 {len(manifest['functions'])}개 해시 일치")
+
     # ── 리포트 생성 ──────────────────────────────────────────────────────────
 
+    @staticmethod
+    def diff_issues(previous, current):
+        """이전 리포트 대비 (신규 이슈, 해소된 이슈)"""
+        prev_keys = {_json_digest(i) for i in previous}
+        cur_keys = {_json_digest(i) for i in current}
+        new = [i for i in current if _json_digest(i) not in prev_keys]
+        resolved = [i for i in previous if _json_digest(i) not in cur_keys]
+        return new, resolved
+
+    def print_since(self, base_path, new, resolved):
+        print("\n" + "="*70)
+        print(f"🔁 변경분 리포트 (기준: {base_path})")
+        print("="*70)
+        self.print_issue_diff(new, resolved)
+
+    @staticmethod
+    def print_issue_diff(new, resolved):
+        for mark, title, items in [('+', '🆕 신규 이슈', new), ('-', '✔️ 해소된 이슈', resolved)]:
+            print(f"{title}: {len(items)}건")
+            for item in items:
+                where = item.get('lang', '').upper() or item.get('gapja', '')
+                detail = item.get('desc') or item.get('gapja', '')
+                print(f"  {mark} [{item.get('severity')}] [{where}] {item.get('check')}: {detail[:100]}")
+
+    def source_mtime(self):
+        """입력 번들 중 가장 최근 수정 시각 — 입력이 같으면 리포트도 바이트 단위로 같게"""
+        latest = max(os.path.getmtime(path) for path in self.files.values())
+        return datetime.fromtimestamp(latest).isoformat()
+
     def generate_report(self):
         """감사 리포트 및 패치 파일 생성"""
         
@@ -402,7 +1747,7 @@ class ConsistencyAuditor:
         
         # JSON 리포트 저장
         report = {
-            'generated': datetime.now().isoformat(),
+            'source_mtime': self.source_mtime(),  # 생성 시각이 아니라 입력 번들 수정 시각
             'summary': {
                 'critical': len(critical),
                 'high': len(high),
@@ -413,6 +1758,9 @@ class ConsistencyAuditor:
             'issues': self.issues,
             'patches': self.patches
         }
+        if PROFILER:
+            report['timings'] = PROFILER.report()
+            PROFILER.print_summary(report['timings'])
         
         with open('audit_report.json', 'w', encoding='utf-8') as f:
             json.dump(report, f, ensure_ascii=False, indent=2)
@@ -426,55 +1774,149 @@ class ConsistencyAuditor:
     def generate_patch_script(self):
         """fix_patches.py 자동 생성"""
         
-        patch_code = '''#!/usr/bin/env python3
+        patch_code = r'''#!/usr/bin/env python3
 # -*- coding: utf-8 -*-
 """
 K-MUDANG 자동 패치 스크립트 - audit_report.json 기반 자동 생성
 실행: python fix_patches.py [--dry-run]
+
+패치는 대상 파일별로 모아 파일당 1회 읽기 → 1회 다중 치환 → 1회 쓰기로 적용한다.
+모든 파일의 치환 계획을 먼저 세우고, 찾을 문자열끼리 겹치거나 같은 문자열에
+다른 치환이 지정되면 어떤 파일도 건드리지 않고 중단한다 (찾을 문자열은 모두
+원본 기준으로 찾으므로 앞 패치의 결과가 뒤 패치에 다시 걸리지 않는다).
+쓰기는 파일당 백업 1개 + 임시 파일 → rename 이라 중간에 죽어도 반쯤 고쳐진
+번들이 남지 않는다. --dry-run 은 변경분을 fix_patches.diff (unified diff) 로 저장한다.
 """
-import sys, shutil, re
+import os, sys, shutil, difflib, tempfile
 from datetime import datetime
 
 DRY_RUN = '--dry-run' in sys.argv
+DIFF_PATH = 'fix_patches.diff'
+PREVIEW = 40  # 미리보기 앞뒤 글자 수
+PATCHES = []
 
 def patch_file(path, find, replace, description):
-    with open(path, encoding='utf-8') as f:
+    """패치 등록 — 실제 적용은 apply_patches() 에서 파일별로 한 번에"""
+    PATCHES.append((path, find, replace, description))
+
+def _locate(content, find):
+    """겹치지 않는 출현 구간 목록 (str.replace 와 같은 왼쪽부터 매칭)"""
+    spans = []
+    i = content.find(find)
+    while i != -1:
+        spans.append((i, i + len(find)))
+        i = content.find(find, i + len(find))
+    return spans
+
+def _preview(content, start, end, replace):
+    line = content.count('\n', 0, start) + 1
+    before = content[max(0, start - PREVIEW):start].replace('\n', '⏎')
+    after = content[end:end + PREVIEW].replace('\n', '⏎')
+    print(f"     @@ {line}행")
+    print(f"     - …{before}{content[start:end]}{after}…")
+    print(f"     + …{before}{replace}{after}…")
+
+def plan_file(path, patches):
+    """파일 1개 치환 계획 → (원본, 결과, 치환 위치 수, 충돌 목록)"""
+    with open(path, encoding='utf-8', newline='') as f:
         content = f.read()
-    
-    if find not in content:
-        print(f"  ⚠️ 패턴 미발견 (이미 수정됐거나 위치 변경): {description}")
-        print(f"     찾는 패턴: {repr(find[:60])}")
-        return False
-    
-    count = content.count(find)
-    new_content = content.replace(find, replace)
-    
-    if not DRY_RUN:
-        # 백업
-        backup = path + f'.bak.{datetime.now().strftime(\"%Y%m%d_%H%M%S\")}'
+    sites, conflicts, seen = [], [], {}
+    for find, replace, description in patches:
+        if find in seen:
+            if seen[find] != replace:
+                conflicts.append(f"같은 찾을 문자열에 다른 치환: {description} ({repr(find[:60])})")
+            continue
+        seen[find] = replace
+        spans = _locate(content, find)
+        if not spans:
+            print(f"  ⚠️ 패턴 미발견 (이미 수정됐거나 위치 변경): {description}")
+            print(f"     찾는 패턴: {repr(find[:60])}")
+            continue
+        print(f"  {'[DRY-RUN] ' if DRY_RUN else ''}[{len(spans)}개 위치] {description}")
+        if DRY_RUN:
+            _preview(content, spans[0][0], spans[0][1], replace)
+        sites.extend((start, end, replace, description) for start, end in spans)
+    sites.sort()
+    for a, b in zip(sites, sites[1:]):
+        if b[0] < a[1]:
+            conflicts.append(f"찾을 문자열 겹침 ({a[0]}~{a[1]} ↔ {b[0]}~{b[1]}): {a[3]} ↔ {b[3]}")
+    parts, pos = [], 0
+    for start, end, replace, _ in sites:
+        parts += [content[pos:start], replace]
+        pos = end
+    parts.append(content[pos:])
+    return content, ''.join(parts), len(sites), conflicts
+
+def write_atomic(path, text):
+    """같은 디렉터리 임시 파일에 쓰고 fsync 후 rename — 원본은 항상 완전한 이전/이후 상태"""
+    fd, tmp = tempfile.mkstemp(dir=os.path.dirname(os.path.abspath(path)),
+                               prefix='.' + os.path.basename(path) + '.', suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'w', encoding='utf-8', newline='') as f:
+            f.write(text)
+            f.flush()
+            os.fsync(f.fileno())
+        shutil.copymode(path, tmp)
+        os.replace(tmp, path)
+    except BaseException:
+        if os.path.exists(tmp):
+            os.unlink(tmp)
+        raise
+
+def write_diff(plans):
+    with open(DIFF_PATH, 'w', encoding='utf-8', newline='') as f:
+        for path, (old, new, _) in plans.items():
+            for line in difflib.unified_diff(old.splitlines(True), new.splitlines(True),
+                                             'a/' + path, 'b/' + path):
+                f.write(line if line.endswith('\n') else line + '\n\\ No newline at end of file\n')
+
+def apply_patches():
+    """전 파일 계획 → 충돌 없으면 파일별 1회 원자적 쓰기. 종료 코드 반환"""
+    groups = {}
+    for path, find, replace, description in PATCHES:
+        groups.setdefault(path, []).append((find, replace, description))
+    plans, conflicts = {}, []
+    for path, patches in groups.items():
+        print(f"\n📄 {path}: 패치 {len(patches)}건")
+        if not os.path.exists(path):
+            print(f"  ⚠️ 파일 없음: {path}")
+            continue
+        old, new, count, bad = plan_file(path, patches)
+        conflicts.extend(f"{path}: {c}" for c in bad)
+        if new != old:
+            plans[path] = (old, new, count)
+
+    if conflicts:
+        print("\n❌ 패치 충돌 - 어떤 파일도 수정하지 않음:")
+        for c in conflicts:
+            print(f"  - {c}")
+        return 1
+    if DRY_RUN:
+        write_diff(plans)
+        print(f"\n[DRY-RUN] {len(plans)}개 파일 변경 예정 → {DIFF_PATH}")
+        return 0
+
+    stamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    for path, (old, new, count) in plans.items():
+        backup = f"{path}.bak.{stamp}"
         shutil.copy2(path, backup)
-        with open(path, 'w', encoding='utf-8') as f:
-            f.write(new_content)
-        print(f"  ✅ [{count}개 위치] 수정 완료: {description}")
-        print(f"     백업: {backup}")
-    else:
-        print(f"  [DRY-RUN] {count}개 위치에서 수정 예정: {description}")
-    return True
+        write_atomic(path, new)
+        print(f"  ✅ {path}: {count}개 위치 수정 완료 (백업: {backup})")
+    return 0
 
 print("K-MUDANG 패치 스크립트 실행")
 print("="*60)
 
 '''
         
+        file_map = {lang: os.path.basename(path) for lang, path in self.files.items()}
         for p in self.patches:
             ptype = p.get('type', '')
             lang = p.get('lang', '')
             
             if ptype == 'sinssal_label':
-                file_map = {'ko': 'ko.html', 'en': 'en.html', 'jp': 'jp.html'}
                 patch_code += f"""
 # PATCH: {p.get('lang','').upper()} {p.get('sinssal','')} 라벨 수정
-print("\\n[PATCH] {p.get('lang','').upper()} {p.get('sinssal','')} 라벨: {p.get('find','')} → {p.get('replace','')}")
 patch_file(
     '{file_map.get(lang, lang+".html")}',
     {repr(p.get('find',''))},
@@ -485,7 +1927,6 @@ patch_file(
             elif ptype == 'bureau_label':
                 patch_code += f"""
 # PATCH: EN 丁壬合 BUREAU 표기 수정
-print("\\n[PATCH] EN 丁壬合 합화 오표기 수정")
 patch_file(
     'en.html',
     {repr(p.get('find',''))},
@@ -494,22 +1935,40 @@ patch_file(
 )
 """
             elif ptype == 'ilju_s_field':
+                label = lang.upper()
                 patch_code += f"""
 # PATCH: {p.get('lang','').upper()} {p.get('gapja','')} 배우자운 - 수동 검토 필요
-# 현재 JP: {repr(p.get('current','')[:60])}
+# 현재 {label}: {repr(p.get('current','')[:60])}
 # 참조 KO: {repr(p.get('reference_ko','')[:60])}
 # 참조 EN: {repr(p.get('reference_en','')[:60])}
 # → 자동 패치 불가: 번역 검토 후 수동 수정 권장
-print("\\n[MANUAL] {p.get('gapja','')} JP 배우자운 수동 검토 필요")
-print("  현재 JP: {p.get('current','')[:60]}")
+print("\\n[MANUAL] {p.get('gapja','')} {label} 배우자운 수동 검토 필요")
+print("  현재 {label}: {p.get('current','')[:60]}")
 print("  참조 KO: {p.get('reference_ko','')[:60]}")
+"""
+            elif ptype == 'archetype_field':
+                patch_code += f"""
+# PATCH: {lang.upper()} {p.get('gapja','')} 아키타입 {p.get('field','')} 필드 (페이지 기준)
+patch_file(
+    '{file_map.get(lang, lang+".html")}',
+    {repr(p.get('find',''))},
+    {repr(p.get('replace',''))},
+    '{p.get("gapja","")} {p.get("field","")} 아키타입 페이지와 일치 ({lang.upper()})'
+)
 """
 
         patch_code += """
+rc = apply_patches()
 print("\\n" + "="*60)
-print("패치 완료. 반드시 Golden Master 테스트 실행:")
-print("  node saju_golden_test.js verify ko.html golden_master.json")
-print("  node saju_golden_test.js verify en.html golden_master_match_en.json")
+if rc:
+    print("❌ 패치 중단: 충돌 해결 후 다시 실행")
+elif DRY_RUN:
+    print(f"[DRY-RUN] 번들은 바뀌지 않음. 변경분 검토: {DIFF_PATH} (적용은 --dry-run 없이 다시 실행)")
+else:
+    print("패치 완료. 반드시 Golden Master 테스트 실행:")
+    print("  python golden_master.py verify ko.html golden_master.gm")
+    print("  python golden_master.py verify jp.html golden_master_jp.gm")
+sys.exit(rc)
 """
         
         with open('fix_patches.py', 'w', encoding='utf-8') as f:
@@ -518,38 +1977,258 @@ print("  node saju_golden_test.js verify en.html golden_master_match_en.json")
 
     # ── 메인 실행 ────────────────────────────────────────────────────────────
 
+    def run_check(self, name, args=()):
+        """검사 1개 실행 → (콘솔 출력, 이슈, 패치, 반환값). 감사기 상태는 건드리지 않음"""
+        buf = io.StringIO()
+        saved = self.issues, self.patches
+        self.issues, self.patches = [], []
+        try:
+            with redirect_stdout(buf), _step(name):
+                result = getattr(self, name)(*args)
+            return buf.getvalue(), self.issues, self.patches, result
+        finally:
+            self.issues, self.patches = saved
+
+    def check_key(self, name, dep_results):
+        """검사 캐시 키 = 검사명 + 검사 입력 요약 + 선행 검사 결과의 해시"""
+        inputs = {lang: CHECK_INPUTS[name](idx) for lang, idx in self.index.items()}
+        if name in PAGE_CHECKS:
+            inputs['__pages__'] = self.pages
+        if name in MANIFEST_CHECKS:
+            inputs['__engine__'] = self.engine_manifest and self.engine_manifest['functions']
+        return _json_digest({'check': name, 'inputs': inputs, 'deps': dep_results})
+
+    def run_checks(self):
+        """CHECKS 의존 관계대로 실행(독립 검사는 풀에 동시 제출)하고 선언 순서대로 결과 병합"""
+        global _WORKER_AUDITOR
+        order = [name for name, _ in self.CHECKS]
+        deps = dict(self.CHECKS)
+        done = {}
+        keys = {}
+        self.executed = []  # 캐시를 못 쓰고 실제로 실행한 검사
+
+        def ready(name):
+            """캐시 적중이면 결과를 채우고 None, 실행이 필요하면 인자 튜플"""
+            args = tuple(done[d][3] for d in deps[name])
+            if self.cache:
+                keys[name] = self.check_key(name, list(args))
+                cached = self.cache.get('checks', keys[name])
+                if cached is not None:
+                    done[name] = tuple(cached)
+                    return None
+            return args
+
+        def finish(name, outcome):
+            done[name] = outcome
+            self.executed.append(name)
+            if self.cache:
+                self.cache.put('checks', keys[name], list(outcome))
+
+        ctx = _fork_context() if self.jobs > 1 and PROFILER is None else None
+        if ctx is None:
+            for name in order:
+                args = ready(name)
+                if args is not None:
+                    finish(name, self.run_check(name, args))
+                self._merge_check(done[name])
+            return
+
+        _WORKER_AUDITOR = self
+        try:
+            with ProcessPoolExecutor(min(self.jobs, len(order)), mp_context=ctx) as pool:
+                running = {}
+                emitted = 0
+                while emitted < len(order):
+                    for name in order:
+                        if name not in done and name not in running.values() and all(d in done for d in deps[name]):
+                            args = ready(name)
+                            if args is not None:
+                                running[pool.submit(_run_check_in_worker, name, args)] = name
+                    if running:
+                        finished, _ = wait(running, return_when=FIRST_COMPLETED)
+                        for fut in finished:
+                            finish(running.pop(fut), fut.result())
+                    while emitted < len(order) and order[emitted] in done:
+                        self._merge_check(done[order[emitted]])
+                        emitted += 1
+        finally:
+            _WORKER_AUDITOR = None
+
+    def _merge_check(self, outcome):
+        output, issues, patches, _ = outcome
+        sys.stdout.write(output)
+        self.issues.extend(issues)
+        self.patches.extend(patches)
+
+    # ── 감시 모드 ────────────────────────────────────────────────────────────
+
+    def reload(self, changed):
+        """변경된 번들·페이지만 다시 읽어 인덱스 갱신 → 갱신한 대상 이름 목록"""
+        updated = []
+        for lang, path in self.files.items():
+            if os.path.abspath(path) in changed and os.path.exists(path):
+                old = self.index[lang]
+                self.index[lang] = load_bundle_index(lang, path, self.cache, self.packs.get(lang), previous=old)
+                old.close()
+                updated.append(LOCALES[lang])
+        if self.pages is not None:
+            pages_dir = os.path.abspath(self.pages_dir)
+            for path in sorted(changed):
+                if os.path.dirname(path) != pages_dir or not path.endswith('.html'):
+                    continue
+                if os.path.exists(path):
+                    self.page_records[path] = load_archetype_page(path)
+                else:
+                    self.page_records.pop(path, None)
+                updated.append(os.path.basename(path))
+            self.pages = [page for _, page in sorted(self.page_records.items()) if page]
+        return updated
+
+    def watch(self, watcher):
+        """저장마다 바뀐 파일만 다시 인덱싱하고 입력 요약이 바뀐 검사만 재실행해 신규/해소 이슈 출력 (Ctrl+C 종료)"""
+        self.run_all()
+        previous = self.issues
+        targets = len(self.files) + (len(self.page_records) if self.pages is not None else 0)
+        print(f"\n👀 감시 시작 ({watcher.kind}, 파일 {targets}개) - Ctrl+C 로 종료")
+        try:
+            while True:
+                changed = watcher.wait()
+                start = time.perf_counter()
+                updated = self.reload(changed)
+                if not updated:
+                    continue
+                self.issues, self.patches = [], []
+                with redirect_stdout(io.StringIO()):
+                    self.run_checks()
+                    self.generate_report()
+                new, resolved = self.diff_issues(previous, self.issues)
+                elapsed = (time.perf_counter() - start) * 1000
+                rerun = ', '.join(name.split('_')[1] for name in self.executed) or '없음'
+                print(f"\n🔄 [{datetime.now().strftime('%H:%M:%S')}] 변경: {', '.join(updated)} → "
+                      f"재실행 검사 {len(self.executed)}/{len(self.CHECKS)}개 (CHECK {rerun}) · {elapsed:.0f}ms")
+                if new or resolved:
+                    self.print_issue_diff(new, resolved)
+                else:
+                    print("  결과 변화 없음")
+                previous = self.issues
+        except KeyboardInterrupt:
+            print("\n👋 감시 종료")
+        finally:
+            watcher.close()
+
     def run_all(self):
-        print("🔍 K-MUDANG 3언어 일관성 감사 시작")
+        print(f"🔍 K-MUDANG {len(self.index)}언어 일관성 감사 시작")
         print("="*70)
         
-        dbs = self.check_1_ilju_db_completeness()
-        self.check_2_spouse_polarity(dbs)
-        self.check_3_sinssal_labels()
-        self.check_4_required_sections()
-        self.check_5_dinjim_combine_en()
-        self.check_6_void_yanggin()
-        self.check_7_quadruple_self_punishment()
-        self.check_8_naeum_consistency()
-        self.check_9_early_midnight_system()
+        self.run_checks()
         
         return self.generate_report()
 
 
 # ── 진입점 ──────────────────────────────────────────────────────────────────
 if __name__ == '__main__':
-    if len(sys.argv) != 4:
-        print("사용법: python verify_consistency.py ko.html en.html jp.html")
-        sys.exit(1)
+    parser = argparse.ArgumentParser(
+        description='K-MUDANG 3언어 일관성 자동 검증',
+        usage='python verify_consistency.py ko.html en.html jp.html [--locale CODE=PATH ...] [--pages DIR] '
+              '[--engine-manifest PATH] [--data-manifest PATH] [--jobs N] [--since REPORT] [--watch [--poll]] '
+              '[--profile [--profile-memory]]')
+    parser.add_argument('ko_path')
+    parser.add_argument('en_path')
+    parser.add_argument('jp_path')
+    parser.add_argument('--locale', action='append', default=[], metavar='CODE=PATH',
+                        help='추가 로케일 번들 (반복 가능). 미등록 코드는 공통 검사만 적용')
+    parser.add_argument('--pages', default=None,
+                        help='아키타입 페이지 디렉터리 (기본: ko 번들 옆 archetype-pages)')
+    parser.add_argument('--no-pages', action='store_true', help='아키타입 페이지 교차 검증 안 함')
+    parser.add_argument('--engine-manifest', default=None,
+                        help='build_bundles.py 공용 엔진 매니페스트 (기본: ko 번들 옆 dist/engine-manifest.json 이 있으면 사용)')
+    parser.add_argument('--data-manifest', default=None,
+                        help='build_bundles.py 데이터 팩 매니페스트 (기본: ko 번들 옆 dist/data/manifest.json 이 있으면 사용)')
+    parser.add_argument('--jobs', type=int, default=None,
+                        help='병렬 프로세스 수 (기본: CPU 코어 수, 1 = 순차 실행)')
+    parser.add_argument('--since', metavar='REPORT',
+                        help='이전 audit_report.json 대비 신규/해소 이슈만 출력 (전체 리포트는 콘솔에 내지 않음)')
+    parser.add_argument('--new-only-exit', action='store_true',
+                        help='--since 에서 종료 코드를 신규 CRITICAL/HIGH 이슈로만 판정 (기본: 전체 이슈 기준)')
+    parser.add_argument('--cache-dir', default='.audit_cache',
+                        help='증분 감사 캐시 디렉터리 (기본: .audit_cache)')
+    parser.add_argument('--no-cache', action='store_true', help='캐시 사용 안 함')
+    parser.add_argument('--watch', action='store_true',
+                        help='번들·페이지 저장을 감시하며 영향받은 검사만 재실행 (인덱스 상주)')
+    parser.add_argument('--poll', action='store_true', help='--watch 에서 inotify 대신 폴링 사용')
+    parser.add_argument('--profile', action='store_true',
+                        help='추출 단계·검사별 시간/패턴 스캔 횟수를 리포트 timings 에 기록 (순차·캐시 없이 실행)')
+    parser.add_argument('--profile-memory', action='store_true',
+                        help='--profile 에 단계별 최대 메모리(tracemalloc)도 기록 — 추적 부하로 시간은 부풀려짐')
+    args = parser.parse_args()
+    args.profile = args.profile or args.profile_memory
+    if args.profile and args.watch:
+        parser.error('--profile 과 --watch 는 함께 쓸 수 없음')
+    if args.new_only_exit and not args.since:
+        parser.error('--new-only-exit 은 --since 와 함께 써야 함')
+    
+    files = {'ko': args.ko_path, 'en': args.en_path, 'jp': args.jp_path}
+    for spec in args.locale:
+        code, sep, path = spec.partition('=')
+        if not sep or not code or not path:
+            parser.error(f'--locale 형식 오류: {spec} (CODE=PATH)')
+        if code not in LOCALES:
+            register_locale(code)
+        files[code] = path
     
-    ko_path, en_path, jp_path = sys.argv[1], sys.argv[2], sys.argv[3]
+    dist = os.path.join(os.path.dirname(os.path.abspath(args.ko_path)), 'dist')
+    engine_manifest, data_manifest = args.engine_manifest, args.data_manifest
+    if engine_manifest is None:
+        default = os.path.join(dist, build_bundles.MANIFEST_NAME)
+        engine_manifest = default if os.path.exists(default) else None
+    if data_manifest is None:
+        default = os.path.join(dist, build_bundles.DATA_DIR, build_bundles.DATA_MANIFEST_NAME)
+        data_manifest = default if os.path.exists(default) else None
     
-    for p in [ko_path, en_path, jp_path]:
+    for p in list(files.values()) + [p for p in (args.since, engine_manifest, data_manifest) if p]:
         if not os.path.exists(p):
             print(f"❌ 파일 없음: {p}")
             sys.exit(1)
     
-    auditor = ConsistencyAuditor(ko_path, en_path, jp_path)
-    report = auditor.run_all()
+    pages_dir = None
+    if not args.no_pages:
+        pages_dir = args.pages or os.path.join(os.path.dirname(os.path.abspath(args.ko_path)), 'archetype-pages')
+    
+    previous = None
+    if args.since:
+        with open(args.since, encoding='utf-8') as f:
+            previous = json.load(f).get('issues', [])
+    
+    cache = None if args.no_cache else AuditCache(args.cache_dir)
+    if args.profile:
+        # 캐시 적중·병렬 실행은 비용을 가리므로 모든 단계를 순차로 실제 실행
+        PROFILER = Profiler(memory=args.profile_memory)
+        cache = None
+    if args.watch:
+        # 인덱스·검사 결과를 메모리에 상주 — 저장 1회 처리는 프로세스 풀 기동보다 순차가 빠름
+        auditor = ConsistencyAuditor(files, jobs=args.jobs or 1, cache=MemoryCache(cache), pages_dir=pages_dir,
+                                     engine_manifest=engine_manifest, data_manifest=data_manifest)
+        auditor.watch(make_watcher(files.values(), [pages_dir] if pages_dir else [], polling=args.poll))
+        sys.exit(0)
+    auditor = ConsistencyAuditor(files, jobs=args.jobs, cache=cache, pages_dir=pages_dir,
+                                 engine_manifest=engine_manifest, data_manifest=data_manifest)
+    if previous is None:
+        report = auditor.run_all()
+    else:
+        # --since: 전체 리포트는 audit_report.json 에만 남기고 콘솔에는 변경분만
+        with redirect_stdout(io.StringIO()):
+            report = auditor.run_all()
+        print(f"📋 현재 이슈 {len(report['issues'])}건 (전체 목록: audit_report.json)")
+    
+    if cache:
+        cache.sweep()
+    
+    if previous is not None:
+        new, resolved = auditor.diff_issues(previous, report['issues'])
+        auditor.print_since(args.since, new, resolved)
+        if args.new_only_exit:
+            blocking = [i for i in new if i.get('severity') in ('CRITICAL', 'HIGH')]
+            sys.exit(1 if blocking else 0)
     
     critical = report['summary']['critical']
     high = report['summary']['high']
@@ -0,0 +1,444 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+K-MUDANG 세운(歲運) 판정 규칙 엔진 v1.0
+브라우저 calcYearLuck 의 세운 점수·등급 Python 이식판 (ylCheck* 규칙 + ylDetermineRating, 문구는 옮기지 않음).
+
+사용법:
+  python year_luck_engine.py rate ko.html 1990 5 17 [--siji 6] [--from 2026] [--years 10] [--trace]
+  python year_luck_engine.py batch ko.html charts.csv [--from 1950] [--years 100] [--out year_luck.npz]
+
+세운 규칙이 읽는 것은 원국(명식 단위 특징)과 그해 세운 간지뿐이고, 세운 간지는
+calcYearPillar(연도, 6, 1) = (연도 - 4) % 60 이다. 그래서 명식 C 개 × 세운 60갑자를 한 번에
+채점한 (C, 60) 표를 만들고, 연도 구간은 그 표의 열을 골라 읽는다 (100년 = 표 1개).
+
+RULES    calcYearLuck 의 r 객체 순서 그대로의 규칙 표. 한 행 = (키, JS 함수, 발동 조건, 점수).
+         조건·점수는 Frame 의 (C, 60) 배열 식이고, 앞 행 결과(r)를 읽을 수 있다
+         (월지충은 삼합국이 서면 무효, 용신부재는 용신 공격 여부, 쇠신충왕은 삼합국 원소).
+RATINGS  ylDetermineRating 의 위→아래 첫 일치 표 (np.select 로 한 번에 평가).
+평가 결과에는 규칙별 발동 비트·점수(trace)와 등급을 정한 RATINGS 행이 함께 남는다.
+batch 는 saju_engine.py 배치 출력 CSV 의 명식 전체를 다시 판정해 .npz 로 저장한다
+(규칙이 바뀌면 다시 돌리는 용도). 원국 특징은 chart_engine 에서 오므로 이식 기준은 ko.html 이고,
+god.k 를 '비견'·'편재' 같은 한국어 이름과 비교하는 규칙도 JS 원문 그대로다.
+"""
+
+import sys, json, time, argparse, hashlib, functools
+from collections import namedtuple
+
+import numpy as np
+
+from build_bundles import bundle_functions, source_sha
+from chart_engine import ChartEngine, TABLE_NAMES, load_tables, stale_ports, split_pillars
+from match_engine import read_candidates
+from year_luck_rules import RATING_RULES
+
+YEAR_LUCK_TABLE_NAMES = ('YEAR_LUCK_CONFIG',)
+
+# 이식 기준 JS 함수 원문 해시 (build_bundles.source_sha, ko.html)
+PORTED_SHA = {
+    'calcYearLuck': 'ebc86d3bf4b17aab',
+    'ylDetermineRating': '30186751733f4bbf',
+    'ylCheckYongGi': '3703bf47689f70a0',
+    'ylCheckYongAttack': 'ae97ca317d0199c9',
+    'ylCheckRobWealth': '8a2045bad5e8bcff',
+    'ylCheckExpressorPeer': 'a39a43ae38ad098a',
+    'ylCheckClimateClash': 'aacff2339aeb21b9',
+    'ylCheckBureau': '1ecb2837d36541f2',
+    'ylCheckMonthClash': 'a71bc48875820ddf',
+    'ylCheckDayClash': '419809493f88f2a1',
+    'ylCheckYanginClash': '90252d4b6efa5349',
+    'ylCheckTripleBranch': 'acebdbdc541e2515',
+    'ylCheckMissingBridge': 'e41b682f4b401104',
+    'ylCheckStemCombine': '04a2d492395489d9',
+    'ylCheckBranchCombine': '019c85c817983321',
+    'ylCheckSelfPunishment': 'fc3c0b1c2c15cc01',
+    'ylCheckScandal': '4e4ed6773a1496d4',
+    'ylCheckMissingYong': '3eb32001e435bf1e',
+    'ylCheckHarmBetrayal': 'cf11f4ae5cc134d0',
+    'checkYongOverwhelmed': 'c8806c634fc5663b',
+    'checkPyunInDoShik': '3c0bff1824d79530',
+    'checkWangShinChungBal': '42738c008af2f004',
+}
+
+PEER = ('비견', '겁재')           # god.k 와 비교 (번들의 k 가 한국어 이름일 때만 맞음)
+WEALTH = ('편재', '정재')
+EXPRESSION = ('식신', '상관')
+WANG_BRANCHES = (0, 3, 6, 9)     # ylCheckMonthClash 왕지
+HALF_BUREAU = ((2, 6, 'fire'), (6, 10, 'fire'), (8, 0, 'water'), (0, 4, 'water'),
+               (5, 9, 'metal'), (9, 1, 'metal'), (11, 3, 'wood'), (3, 7, 'wood'))   # ylCheckBureau 반합 (년지+일지)
+SEASON_EL = ('water', 'water', 'wood', 'wood', 'wood', 'fire', 'fire', 'fire',
+             'metal', 'metal', 'metal', 'water')                                     # ylCheckStemCombine 월령
+RESULT_FILE = 'year_luck.npz'
+CHUNK = 20000                    # table() 한 번에 평가하는 4주 조합 수
+
+
+# ── 명식 단위 특징 × 세운 60갑자 ──────────────────────────────────────────────
+
+class Frame:
+    """규칙 식이 읽는 배열 묶음 — 명식 특징은 (C, 1), 세운 특징은 (1, 60) 으로 두어 (C, 60) 으로 퍼진다"""
+
+    def __init__(self, engine, profiles):
+        e = engine
+        col = lambda key, dtype=np.int16: np.array([p[key] for p in profiles], dtype=dtype)[:, None]
+        self.size = len(profiles)
+        year_gz = np.arange(60)[None, :]
+        self.ys, self.yb = year_gz % 10, year_gz % 12
+        self.ys_el, self.yb_el = e.stem_el[self.ys], e.branch_el[self.yb]
+        for key in ('ds', 'db', 'mb', 'hs', 'hb', 'yong', 'hee', 'gi', 'yangin', 'bureau_month_el'):
+            setattr(self, key, col(key))
+        for key in ('branch_mask', 'stem_mask', 'gm_mask'):
+            setattr(self, key, col(key, np.int32))
+        for key in ('strong', 'weak', 'dry', 'cold', 'sanggwan', 'missing_yong', 'overwhelmed', 'pyunin', 'harm'):
+            setattr(self, key, col(key, bool))
+        self.branches = np.array([p['branches'] for p in profiles], dtype=np.int16).T[:, :, None]   # (4, C, 1), 없음 = -1
+        self.counts = np.array([p['counts'] for p in profiles], dtype=np.int16)                      # (C, 5)
+        self.god = e.god_names
+        self.ke, self.stem_el, self.branch_el = e.ke, e.stem_el, e.branch_el
+        self.stem_partner, self.stem_result = e.stem_partner, e.stem_result
+        self.branch_partner, self.branch_result = e.branch_partner, e.branch_result
+        self.samhap, self.self_punish = e.samhap, e.self_punish
+        self.el = e.el
+
+    # ── 식 도우미 ──
+
+    def has_branch(self, idx):
+        return ((self.branch_mask >> idx) & 1).astype(bool)
+
+    def has_stem(self, idx):
+        return ((self.stem_mask >> idx) & 1).astype(bool)
+
+    def year_count(self, el):
+        """세운 간지 두 글자 중 오행 el 인 글자 수"""
+        return (self.ys_el == el).astype(np.int16) + (self.yb_el == el)
+
+    def year_has(self, el):
+        return (self.ys_el == el) | (self.yb_el == el)
+
+    def god_in(self, si, names):
+        """getTenGod(STEM[si], 일간).k ∈ names"""
+        return np.isin(self.god[si, self.ds], names)
+
+    def count_of(self, el):
+        """원국 8글자 중 오행 el 인 글자 수 (el 은 (C, 60) 으로 퍼질 수 있는 배열)"""
+        el = np.broadcast_to(el, (self.size, 60))
+        return np.take_along_axis(self.counts, el, axis=1)
+
+    def clash(self, bi):
+        return np.abs(self.yb - bi) == 6
+
+    # ── 식이 긴 규칙 ──
+
+    @functools.cached_property
+    def bureau(self):
+        """ylCheckBureau → (점수, 원소 인덱스 | -1) — 삼합국 3점, 년지+일지 반합 2점, 앞 패턴 우선"""
+        score = np.zeros((self.size, 60), dtype=np.int16)
+        element = np.full((self.size, 60), -1, dtype=np.int16)
+        patterns = [((self.yb == b) & self.has_branch(a) & self.has_branch(c))
+                    | ((self.yb == a) & self.has_branch(b) & self.has_branch(c))
+                    | ((self.yb == c) & self.has_branch(b) & self.has_branch(a)) for a, b, c, _ in self.samhap]
+        patterns += [((self.yb == a) & (self.db == b)) | ((self.yb == b) & (self.db == a)) for a, b, _ in HALF_BUREAU]
+        values = [(3, self.el[el]) for *_, el in self.samhap] + [(2, self.el[el]) for *_, el in HALF_BUREAU]
+        for hit, (points, el) in zip(reversed(patterns), reversed(values)):   # 뒤에서부터 덮어써 첫 일치가 남게
+            score = np.where(hit, points, score)
+            element = np.where(hit, el, element)
+        return score, element
+
+    def stem_combine(self):
+        """ylCheckStemCombine 점수 (합 상대가 원국 천간에 있을 때만 의미 있음)"""
+        tgt, res = self.stem_partner[self.ys], self.stem_result[self.ys]
+        in_branches = sum((self.branch_el[np.maximum(b, 0)] == res) & (b >= 0) for b in self.branches)
+        is_hwa = (self.bureau_month_el == res) | (in_branches >= 2)
+        gi_hit = is_hwa & (res == self.gi)
+        return np.select([self.god_in(self.ys, PEER) & np.isin(self.god[tgt, self.ds], WEALTH) & gi_hit,
+                          gi_hit,
+                          (self.ys_el == self.yong) & np.isin(self.god[tgt, self.ds], EXPRESSION)],
+                         [-2, -1, 1], 0)
+
+    def branch_combine(self):
+        """ylCheckBranchCombine 점수 — 합 상대가 시지면 시지 규칙, 일지면 일지 규칙, 그 밖은 0 (공망이면 반감)"""
+        tgt, res = self.branch_partner[self.yb], self.branch_result[self.yb]
+        gi_hit, yong_hit = self.weak & (res == self.gi), res == self.yong
+        gm = ((self.gm_mask >> tgt) & 1).astype(bool)
+        hour = np.select([gi_hit, yong_hit], [np.where(gm, -1, -2), np.where(gm, 1, 2)], np.where(gm, 0, 1))
+        return np.select([self.hb == tgt, self.db == tgt], [hour, np.where(gi_hit, -1, 1)], 0)
+
+    def wang_shin_chung_bal(self):
+        """checkWangShinChungBal — 세운 지지가 충하는 원국 지지의 오행이 4개 이상"""
+        target = (self.yb + 6) % 12
+        return self.has_branch(target) & (self.count_of(self.branch_el[target]) >= 4)
+
+
+# ── 규칙 표 ───────────────────────────────────────────────────────────────────
+# when: (f, r) → bool (C, 60) | None (점수만 있는 규칙), score: 정수 | (f, r) → 정수 배열
+# r 은 앞 행까지의 결과 {키: Result}. 점수는 발동한 칸에만 더한다.
+
+Rule = namedtuple('Rule', 'key js when score')
+Result = namedtuple('Result', 'active score')
+Rating = namedtuple('Rating', 'key rules when')
+
+RULES = (
+    Rule('yongGi', 'ylCheckYongGi', None,
+         lambda f, r: 3 * f.year_has(f.yong) + 2 * f.year_has(f.hee) - 3 * f.year_has(f.gi)),
+    Rule('yongAttack', 'ylCheckYongAttack',
+         lambda f, r: (f.ke[f.ys_el] == f.yong) | (f.ke[f.yb_el] == f.yong), -4),
+    Rule('robWealth', 'ylCheckRobWealth', lambda f, r: f.strong & f.god_in(f.ys, PEER), -3),
+    Rule('expressorPeer', 'ylCheckExpressorPeer', lambda f, r: f.sanggwan & f.god_in(f.ys, PEER), -2),
+    Rule('climateClash', 'ylCheckClimateClash',
+         lambda f, r: (f.dry & f.year_has(f.el['fire'])) | (f.cold & f.year_has(f.el['water'])),
+         lambda f, r: -3 * np.where(f.dry & f.year_has(f.el['fire']),
+                                    f.year_count(f.el['fire']), f.year_count(f.el['water']))),
+    Rule('bureau', 'ylCheckBureau', lambda f, r: f.bureau[0] > 0, lambda f, r: f.bureau[0]),
+    Rule('monthClash', 'ylCheckMonthClash', lambda f, r: f.clash(f.mb) & ~r['bureau'].active,
+         lambda f, r: np.where(np.isin(f.yb, WANG_BRANCHES) & np.isin(f.mb, WANG_BRANCHES), -4, -2)),
+    Rule('dayClash', 'ylCheckDayClash', lambda f, r: f.clash(f.db), 0),
+    Rule('yanginClash', 'ylCheckYanginClash', lambda f, r: (f.db == f.yangin) & f.clash(f.db), 0),
+    Rule('tripleBranch', 'ylCheckTripleBranch',
+         lambda f, r: f.has_branch(f.yb) & f.has_branch((f.yb + 6) % 12), 0),
+    Rule('missingBridge', 'ylCheckMissingBridge',
+         lambda f, r: (f.yong == f.el['fire']) & f.year_has(f.el['fire'])
+                      & (((f.count_of(f.el['water']) >= 3) & (f.count_of(f.el['wood']) == 0))
+                         | ((f.count_of(f.el['metal']) >= 3) & (f.count_of(f.el['earth']) == 0))), 0),
+    Rule('stemCombine', 'ylCheckStemCombine', lambda f, r: f.has_stem(f.stem_partner[f.ys]),
+         lambda f, r: f.stem_combine()),
+    Rule('branchCombine', 'ylCheckBranchCombine', lambda f, r: f.has_branch(f.branch_partner[f.yb]),
+         lambda f, r: f.branch_combine()),
+    Rule('selfPunishment', 'ylCheckSelfPunishment',
+         lambda f, r: np.isin(f.yb, f.self_punish) & f.has_branch(f.yb), 0),
+    Rule('scandal', 'ylCheckScandal',
+         lambda f, r: (f.hs >= 0) & np.isin(f.god[np.maximum(f.hs, 0), f.ds], ('편재',))
+                      & f.god_in(f.ys, ('편재',)), -2),
+    Rule('missingYong', 'ylCheckMissingYong', lambda f, r: f.missing_yong,
+         lambda f, r: np.where(r['yongAttack'].active, -2, 0)),
+    Rule('harmBetrayal', 'ylCheckHarmBetrayal', lambda f, r: f.harm, 0),
+    Rule('yongOverwhelmed', 'checkYongOverwhelmed',
+         lambda f, r: f.overwhelmed & ~(r['bureau'].active & (f.bureau[1] == f.yong)), -2),
+    Rule('pyunInDoShik', 'checkPyunInDoShik', lambda f, r: f.pyunin, -2),
+    Rule('wangShinChungBal', 'checkWangShinChungBal', lambda f, r: f.wang_shin_chung_bal(), -3),
+)
+
+# 등급 순서·규칙 키는 year_luck_rules.RATING_RULES (감사기와 공유), 여기서는 판정식만 붙인다
+RATING_WHEN = {
+    'wang_shin_chung_bal': lambda r, s: r['wangShinChungBal'].active,
+    'yong_overwhelmed': lambda r, s: r['yongOverwhelmed'].active,
+    'pyunin_doshik': lambda r, s: r['pyunInDoShik'].active,
+    'breakthrough': lambda r, s: r['bureau'].active & (r['yongGi'].score > 0),
+    'yong_attacked': lambda r, s: r['yongAttack'].active,
+    'rob_wealth': lambda r, s: r['robWealth'].active,
+    'surgery_risk': lambda r, s: r['yanginClash'].active,
+    'volatile_wealth': lambda r, s: r['dayClash'].active & (r['yongGi'].score > 0),
+    'volatile': lambda r, s: r['monthClash'].active & (s > 0),
+    'great': lambda r, s: s >= 4,
+    'good': lambda r, s: s >= 1,
+    'danger': lambda r, s: s <= -4,
+    'bad': lambda r, s: s <= -2,
+}
+RATINGS = tuple(Rating(key, rules, RATING_WHEN.get(key)) for key, rules in RATING_RULES)
+RATING_KEYS = tuple(rating.key for rating in RATINGS)
+RULE_KEYS = tuple(rule.key for rule in RULES)
+
+
+def evaluate(frame, rules=RULES, ratings=RATINGS):
+    """규칙 표 → {'active': (R, C, 60) bool, 'score': (R, C, 60) int16, 'total': (C, 60), 'rating': (C, 60)}
+
+    rating 은 ratings 행 번호 (첫 일치). 점수만 있는 규칙(when=None)은 점수가 0 이 아니면 발동으로 센다.
+    """
+    shape = (frame.size, 60)
+    r = {}
+    for rule in rules:
+        score = rule.score(frame, r) if callable(rule.score) else rule.score
+        score = np.broadcast_to(np.asarray(score, dtype=np.int16), shape)
+        if rule.when is None:
+            active = score != 0
+        else:
+            active = np.broadcast_to(rule.when(frame, r), shape)
+            score = np.where(active, score, 0).astype(np.int16)
+        r[rule.key] = Result(active, score)
+    total = sum(res.score for res in r.values()).astype(np.int16)
+    conditions = [np.broadcast_to(rating.when(r, total), shape) for rating in ratings if rating.when]
+    rating = np.select(conditions, np.arange(len(conditions)), len(conditions)).astype(np.int8)
+    return {'active': np.stack([r[rule.key].active for rule in rules]),
+            'score': np.stack([r[rule.key].score for rule in rules]),
+            'total': total, 'rating': rating}
+
+
+def bundle_key(html):
+    """규칙이 의존하는 표·이식 함수 원문이 같으면 같은 값 — 저장된 일괄 판정 결과의 유효성 확인용"""
+    from chart_engine import PORTED_SHA as CHART_PORTED_SHA
+    functions, _ = bundle_functions(html)
+    sources = {name: source_sha(html[functions[name][0]:functions[name][1]]) if name in functions else None
+               for name in sorted({**CHART_PORTED_SHA, **PORTED_SHA})}
+    tables = load_tables(html, TABLE_NAMES + YEAR_LUCK_TABLE_NAMES)
+    blob = json.dumps([sources, tables], ensure_ascii=False, sort_keys=True)
+    return hashlib.sha256(blob.encode('utf-8')).hexdigest()[:16]
+
+
+def year_columns(years):
+    """연도 배열 → (C, 60) 표의 열 번호 (calcYearPillar(연도, 6, 1) 의 60갑자)"""
+    return (np.asarray(years) - 4) % 60
+
+
+# ── 엔진 ─────────────────────────────────────────────────────────────────────
+
+class YearLuckEngine:
+    """명식 단위 특징(스칼라) + 규칙 표 일괄 평가"""
+
+    def __init__(self, html, chart=None):
+        self.chart = c = chart or ChartEngine(html)
+        cfg = load_tables(html, YEAR_LUCK_TABLE_NAMES)['YEAR_LUCK_CONFIG']
+        self.stale = stale_ports(html, PORTED_SHA) + c.stale
+        self.key = bundle_key(html)
+        self.el = {el: i for i, el in enumerate(c.EL_ORDER)}
+        self.stem_el = np.array([self.el[s['e']] for s in c.STEM])
+        self.branch_el = np.array([self.el[b['e']] for b in c.BRANCH])
+        self.ke = np.array([self.el[cfg['keMap'][el]] for el in c.EL_ORDER])
+        self.god_names = np.array([[c.ten_god(si, dmi)['k'] for dmi in range(10)] for si in range(10)])
+        self.stem_partner, self.stem_result = self._pairs(cfg['stemCombineMap'], 10)
+        self.branch_partner, self.branch_result = self._pairs(cfg['branchCombineMap'], 12)
+        self.samhap = [tuple(p) for p in cfg['samhapPatterns']]
+        self.self_punish = list(cfg['selfPunishBranches'])
+        self.harm = [tuple(p) for p in cfg['harmPairs']]
+        self.yangin = cfg['yanginBranches']
+
+    def _pairs(self, table, n):
+        """[[a, b, 결과오행], ...] → (상대 인덱스, 결과 오행 인덱스) — 짝이 없으면 자기 자신·-1"""
+        partner, result = np.arange(n), np.full(n, -1)
+        for a, b, el in table:
+            partner[a], partner[b] = b, a
+            result[a] = result[b] = self.el[el]
+        return partner, result
+
+    def profile(self, gz):
+        """4주 (시 모름 = -1) → 규칙이 읽는 명식 단위 특징"""
+        c = self.chart
+        gz = tuple(g for g in gz if g >= 0)
+        stems, brs = split_pillars(gz)
+        ds, db, mb = stems[2], brs[2], brs[1]
+        counts = [0] * 5
+        for s in stems:
+            counts[self.stem_el[s]] += 1
+        for b in brs:
+            counts[self.branch_el[b]] += 1
+        yong, hee, gi = (self.el[e] for e in c.yongsin(gz))
+        st = c.strength(gz)
+        climate = c.climate(stems, brs)['type']
+        dm = c.STEM[ds]
+        dm_el = self.el[dm['e']]
+        shik_el, pyunin_el = (dm_el + 1) % 5, (dm_el + 4) % 5
+        return {
+            'ds': ds, 'db': db, 'mb': mb,
+            'hs': stems[3] if len(stems) > 3 else -1, 'hb': brs[3] if len(brs) > 3 else -1,
+            'branches': list(brs) + [-1] * (4 - len(brs)),
+            'branch_mask': sum(1 << b for b in set(brs)), 'stem_mask': sum(1 << s for s in set(stems)),
+            'gm_mask': sum(1 << b for b in c.void(gz[2])[0]),
+            'counts': counts, 'yong': yong, 'hee': hee, 'gi': gi,
+            'strong': st['type'] == 'strong', 'weak': st['pct'] < 30,
+            'dry': '조' in climate, 'cold': '한' in climate,
+            'sanggwan': '상관' in (c.format(gz, False).get('god') or ''),
+            'yangin': self.yangin.get(dm['e'] + ('+' if dm.get('p') else '-'), -1),
+            'bureau_month_el': self.el[SEASON_EL[mb]],
+            'missing_yong': counts[yong] == 0,
+            'overwhelmed': counts[gi] >= 3 and counts[yong] <= 1 and counts[gi] >= counts[yong] * 3,
+            'pyunin': self.branch_el[mb] == shik_el and any(
+                self.branch_el[b] == pyunin_el and abs(b - mb) == 6 for b in brs),
+            'harm': any((mb, db) in ((a, b), (b, a)) for a, b in self.harm),
+        }
+
+    def table(self, gz, progress=None):
+        """명식 4주 (N, 4) 배열 → {'rating', 'total', 'trace'} 각 (N, 60) — 세운 60갑자별 등급 번호·점수·발동 규칙 비트
+
+        같은 4주 조합은 한 번만 평가하고, 규칙별 (R, C, 60) 중간 배열이 메모리를 넘지 않게
+        CHUNK 조합씩 나눠 평가한다. 규칙별 점수가 필요하면 rate() 를 쓴다.
+        """
+        gz = np.asarray(gz, dtype=np.int8).reshape(-1, 4)
+        uniq, inverse = np.unique(gz, axis=0, return_inverse=True)
+        out = {'rating': np.empty((len(uniq), 60), dtype=np.int8),
+               'total': np.empty((len(uniq), 60), dtype=np.int16),
+               'trace': np.empty((len(uniq), 60), dtype=np.uint32)}
+        rows = uniq.tolist()
+        for lo in range(0, len(rows), CHUNK):
+            part = evaluate(Frame(self, [self.profile(row) for row in rows[lo:lo + CHUNK]]))
+            out['rating'][lo:lo + CHUNK], out['total'][lo:lo + CHUNK] = part['rating'], part['total']
+            out['trace'][lo:lo + CHUNK] = pack_trace(part['active'])
+            if progress:
+                progress(min(lo + CHUNK, len(rows)), len(rows))
+        inverse = inverse.reshape(-1)
+        return {key: value[inverse] for key, value in out.items()}
+
+    def rate(self, gz, years):
+        """명식 1건 × 연도 목록 → [(연도, 점수, 등급, {규칙: 점수 (발동한 것만)}), ...]"""
+        out = evaluate(Frame(self, [self.profile(gz)]))
+        rows = []
+        for year, col in zip(years, year_columns(years)):
+            trace = {rule: int(out['score'][i, 0, col]) for i, rule in enumerate(RULE_KEYS) if out['active'][i, 0, col]}
+            rows.append((int(year), int(out['total'][0, col]), RATING_KEYS[out['rating'][0, col]], trace))
+        return rows
+
+
+def pack_trace(active):
+    """(R, …) 발동 bool → … 모양의 규칙 비트 (비트 i = RULES[i])"""
+    bits = np.zeros(active.shape[1:], dtype=np.uint32)
+    for i in range(active.shape[0]):
+        bits |= active[i].astype(np.uint32) << i
+    return bits
+
+
+# ── 진입점 ──────────────────────────────────────────────────────────────────
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='K-MUDANG 세운 판정 규칙 엔진')
+    sub = parser.add_subparsers(dest='command', required=True)
+    p_rate = sub.add_parser('rate', help='명식 1건의 연도별 세운 점수·등급')
+    p_rate.add_argument('html_path')
+    p_rate.add_argument('year', type=int)
+    p_rate.add_argument('month', type=int)
+    p_rate.add_argument('day', type=int)
+    p_rate.add_argument('--siji', type=int, default=-1, help='시지 인덱스 0~11 (모름 = -1)')
+    p_rate.add_argument('--from', dest='start', type=int, default=time.localtime().tm_year)
+    p_rate.add_argument('--years', type=int, default=10)
+    p_rate.add_argument('--trace', action='store_true', help='연도마다 발동한 규칙과 점수 출력')
+    p_batch = sub.add_parser('batch', help='명식 CSV 전체 × 연도 구간 재판정 → .npz')
+    p_batch.add_argument('html_path')
+    p_batch.add_argument('csv_path', help='saju_engine.py 배치 출력 CSV')
+    p_batch.add_argument('--from', dest='start', type=int, default=1950)
+    p_batch.add_argument('--years', type=int, default=100)
+    p_batch.add_argument('--out', default=RESULT_FILE)
+    args = parser.parse_args()
+
+    with open(args.html_path, encoding='utf-8') as f:
+        html = f.read()
+    try:
+        engine = YearLuckEngine(html)
+    except ValueError as e:
+        print(f"❌ {args.html_path}: {e}")
+        sys.exit(1)
+    if engine.stale:
+        print(f"⚠️ 이식 뒤 번들에서 바뀐 JS 함수: {', '.join(engine.stale)}", file=sys.stderr)
+    years = np.arange(args.start, args.start + args.years)
+
+    if args.command == 'rate':
+        from saju_engine import PillarEngine, load_profile
+        out = PillarEngine(load_profile(args.html_path, engine.chart.lang)).compute([args.year], [args.month], [args.day], [args.siji])
+        me = tuple(int(out[pos][0]) for pos in ('year', 'month', 'day', 'hour'))
+        c = engine.chart
+        for year, total, rating, trace in engine.rate(me, years):
+            gz = int(year_columns(year))
+            print(f"  {year} {c.STEM[gz % 10]['c']}{c.BRANCH[gz % 12]['c']}  {total:>+4d}  {rating}")
+            if args.trace:
+                print('        ' + (' · '.join(f'{k} {v:+d}' if v else k for k, v in trace.items()) or '-'))
+        sys.exit(0)
+
+    try:
+        gz = read_candidates(args.csv_path)
+    except (OSError, ValueError) as e:
+        print(f"❌ {e}")
+        sys.exit(1)
+    t0 = time.perf_counter()
+    out = engine.table(gz, progress=lambda i, n: print(f"  … {i:,}/{n:,} 조합"))
+    cols = year_columns(years)
+    np.savez_compressed(args.out, key=np.array(engine.key), gz=gz, years=years,
+                        rules=np.array(RULE_KEYS), ratings=np.array(RATING_KEYS),
+                        rating=out['rating'][:, cols], total=out['total'][:, cols],
+                        trace=out['trace'][:, cols])
+    elapsed = time.perf_counter() - t0
+    counts = np.bincount(out['rating'][:, cols].ravel(), minlength=len(RATING_KEYS))
+    print(f"✅ 명식 {len(gz):,}건 × {len(years)}년 재판정 → {args.out} ({elapsed:.1f}s)")
+    print('   ' + ' · '.join(f'{k} {n / counts.sum():.1%}' for k, n in zip(RATING_KEYS, counts) if n))
@@ -0,0 +1,25 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+K-MUDANG 세운 등급 → 규칙 키 표 (numpy 불필요)
+ylDetermineRating 의 위→아래 첫 일치 순서 그대로의 (등급, 등급을 정하는 calcYearLuck 규칙 키) 목록.
+year_luck_engine.py 가 여기에 판정식을 붙여 RATINGS 를 만들고, verify_consistency.py 는
+엔진(numpy·chart_engine)을 불러오지 않고 이 표만 읽는다. 'score' 는 규칙 점수 합계를 뜻한다.
+"""
+
+RATING_RULES = (
+    ('wang_shin_chung_bal', ('wangShinChungBal',)),
+    ('yong_overwhelmed', ('yongOverwhelmed',)),
+    ('pyunin_doshik', ('pyunInDoShik',)),
+    ('breakthrough', ('bureau', 'yongGi')),
+    ('yong_attacked', ('yongAttack',)),
+    ('rob_wealth', ('robWealth',)),
+    ('surgery_risk', ('yanginClash',)),
+    ('volatile_wealth', ('dayClash', 'yongGi')),
+    ('volatile', ('monthClash', 'score')),
+    ('great', ('score',)),
+    ('good', ('score',)),
+    ('danger', ('score',)),
+    ('bad', ('score',)),
+    ('neutral', ()),
+)